@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Optional
+
+from benchmarks.solver_benchmark.synthetic_workflow import SHAPES, SyntheticWorkflow
+from caribou.common.constants import WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE
+from caribou.common.models.remote_client.integration_test_remote_client import IntegrationTestRemoteClient
+from caribou.deployment_solver.deployment_input.input_manager import InputManager
+from caribou.deployment_solver.deployment_metrics_calculator.vectorized_deployment_metrics_calculator import (
+    VectorizedDeploymentMetricsCalculator,
+)
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.region_indexer import RegionIndexer
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+from caribou.monitors.deployment_manager import deployment_algorithm_mapping
+
+CALCULATOR_TYPES = ("simple", "vectorized", "go")
+# Number of samples the selected deployments are re-evaluated with, such that the quality of the
+# solutions of all calculators and algorithms is measured with the same (more accurate) simulation
+REFERENCE_N_SAMPLES = 20000
+# The metric the solutions are compared on, the number one priority of the synthetic workflows
+QUALITY_METRIC = "average_carbon"
+
+
+def run_solver(
+    workflow_config: WorkflowConfig, calculator_type: str, timeout: float, seed: int
+) -> tuple[dict[str, Any], float]:
+    client = IntegrationTestRemoteClient()
+    # The result of a previous run of the workflow would warm start this one
+    client.remove_key(WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE, workflow_config.workflow_id)
+
+    start_time = time.perf_counter()
+    deployment_algorithm = deployment_algorithm_mapping[workflow_config.deployment_algorithm](
+        workflow_config, deployment_metrics_calculator_type=calculator_type, random_seed=seed
+    )
+    # Every run gets the same budget, rather than the one of a remote (lambda) solve
+    deployment_algorithm._timeout = timeout  # pylint: disable=protected-access
+    deployment_algorithm.run()
+    wall_seconds = time.perf_counter() - start_time
+
+    result_json, _ = client.get_value_from_table(
+        WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE, workflow_config.workflow_id
+    )
+    client.remove_key(WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE, workflow_config.workflow_id)
+    return json.loads(result_json), wall_seconds
+
+
+class ReferenceEvaluator:
+    """
+    Re-evaluates the placements selected by the solver runs of a workflow with a vectorized
+    calculator of many samples and a fixed seed, such that they are compared on equal terms.
+    """
+
+    def __init__(self, workflow_config: WorkflowConfig, regions: list[str], seed: int) -> None:
+        self._region_indexer = RegionIndexer(regions)
+        self._instance_indexer = InstanceIndexer(list(workflow_config.instances.values()))
+        input_manager = InputManager(workflow_config=workflow_config, random_seed=seed)
+        input_manager.setup(self._region_indexer, self._instance_indexer)
+        self._calculator = VectorizedDeploymentMetricsCalculator(
+            workflow_config,
+            input_manager,
+            self._region_indexer,
+            self._instance_indexer,
+            n_samples=REFERENCE_N_SAMPLES,
+        )
+        self._home_region = workflow_config.home_region
+
+    def evaluate(self, placement: dict[str, Any]) -> dict[str, float]:
+        instance_indices = self._instance_indexer.get_value_indices()
+        region_indices = self._region_indexer.get_value_indices()
+        deployment = [0] * len(instance_indices)
+        for instance_name, instance_placement in placement.items():
+            provider_region = instance_placement["provider_region"]
+            deployment[instance_indices[instance_name]] = region_indices[
+                f"{provider_region['provider']}:{provider_region['region']}"
+            ]
+        return self._calculator.calculate_deployment_metrics(deployment)
+
+    def evaluate_home_deployment(self) -> dict[str, float]:
+        home_region_index = self._region_indexer.value_to_index(self._home_region)
+        return self._calculator.calculate_deployment_metrics(
+            [home_region_index] * len(self._instance_indexer.get_value_indices())
+        )
+
+
+def benchmark_workflow(  # pylint: disable=too-many-locals
+    synthetic_workflow: SyntheticWorkflow, args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    synthetic_workflow.store(IntegrationTestRemoteClient())
+
+    results = []
+    for algorithm in args.algorithms:
+        workflow_config = WorkflowConfig(synthetic_workflow.get_workflow_config(algorithm))
+        for calculator_type in args.calculators:
+            result: dict[str, Any] = {
+                "workflow_id": synthetic_workflow.workflow_id,
+                "shape": synthetic_workflow.shape,
+                "n_instances": len(workflow_config.instances),
+                "algorithm": algorithm,
+                "calculator": calculator_type,
+            }
+            print(f"Solving {synthetic_workflow.workflow_id} with {algorithm} and the {calculator_type} calculator")
+            try:
+                solver_result, wall_seconds = run_solver(workflow_config, calculator_type, args.timeout, args.seed)
+            except Exception as e:  # pylint: disable=broad-except
+                # A calculator may not be available here (such as the go calculator, if its library is not built)
+                result["error"] = f"{type(e).__name__}: {e}"
+                results.append(result)
+                continue
+
+            instrumentation = solver_result["instrumentation"]
+            simulation_seconds = instrumentation["phases"].get("simulation", {}).get("seconds", 0.0)
+            simulated_deployments = instrumentation["counters"].get("simulated_deployments", 0)
+            simulated_samples = instrumentation["counters"].get("simulated_samples", 0)
+            result.update(
+                {
+                    "wall_seconds": wall_seconds,
+                    "simulated_deployments": simulated_deployments,
+                    "simulated_samples": simulated_samples,
+                    "deployments_per_second": simulated_deployments / max(simulation_seconds, 1e-9),
+                    "samples_per_second": simulated_samples / max(simulation_seconds, 1e-9),
+                    "phases": {phase: summary["seconds"] for phase, summary in instrumentation["phases"].items()},
+                    "placement": next(iter(solver_result["time_keys_to_staging_area_data"].values())),
+                }
+            )
+            results.append(result)
+
+    # The quality of every selected placement, relative to the home deployment and to the best run of the workflow
+    reference_evaluator = ReferenceEvaluator(
+        WorkflowConfig(synthetic_workflow.get_workflow_config(args.algorithms[0])),
+        synthetic_workflow.regions,
+        args.seed,
+    )
+    home_metric = reference_evaluator.evaluate_home_deployment()[QUALITY_METRIC]
+    solved_results = [result for result in results if "error" not in result]
+    for result in solved_results:
+        result["reference_metrics"] = reference_evaluator.evaluate(result.pop("placement"))
+        result["relative_to_home"] = result["reference_metrics"][QUALITY_METRIC] / home_metric
+    if len(solved_results) > 0:
+        best_metric = min(result["reference_metrics"][QUALITY_METRIC] for result in solved_results)
+        for result in solved_results:
+            result["relative_to_best"] = result["reference_metrics"][QUALITY_METRIC] / best_metric
+    return results
+
+
+def compare_to_baseline(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> list[str]:
+    # Regressions of throughput or solution quality beyond the (relative) tolerance
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        baseline_results = json.load(baseline_file)["results"]
+
+    def get_run_key(result: dict[str, Any]) -> tuple[str, str, str]:
+        return (result["workflow_id"], result["algorithm"], result["calculator"])
+
+    baseline_runs = {get_run_key(result): result for result in baseline_results if "error" not in result}
+    regressions = []
+    for result in results:
+        baseline_result: Optional[dict[str, Any]] = baseline_runs.get(get_run_key(result))
+        if baseline_result is None:
+            continue
+        run_name = " ".join(get_run_key(result))
+        if "error" in result:
+            regressions.append(f"{run_name}: failed with {result['error']}")
+            continue
+        if result["deployments_per_second"] < baseline_result["deployments_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{run_name}: {result['deployments_per_second']:.1f} deployments per second, "
+                f"baseline {baseline_result['deployments_per_second']:.1f}"
+            )
+        if result["relative_to_home"] > baseline_result["relative_to_home"] * (1 + tolerance):
+            regressions.append(
+                f"{run_name}: {QUALITY_METRIC} {result['relative_to_home']:.3f} of the home deployment, "
+                f"baseline {baseline_result['relative_to_home']:.3f}"
+            )
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    workdir = tempfile.mkdtemp()
+
+    os.environ["MULTI_X_SERVERLESS_INTEGRATION_TEST_DB_PATH"] = os.path.join(workdir, "benchmark_database.sqlite")
+    os.environ["INTEGRATIONTEST_ON"] = "True"
+
+    try:
+        results = []
+        for shape in args.shapes:
+            for n_instances in args.sizes:
+                synthetic_workflow = SyntheticWorkflow(shape, n_instances, args.regions, seed=args.seed)
+                results.extend(benchmark_workflow(synthetic_workflow, args))
+    finally:
+        shutil.rmtree(workdir)
+        os.environ.pop("MULTI_X_SERVERLESS_INTEGRATION_TEST_DB_PATH")
+        os.environ.pop("INTEGRATIONTEST_ON")
+
+    output = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python_version": platform.python_version(),
+            "machine": platform.machine(),
+            "arguments": {key: value for key, value in vars(args).items() if key != "baseline"},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(output, output_file, indent=2)
+    print(f"Wrote the results of {len(results)} runs to {args.output}")
+
+    if args.baseline is not None:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the deployment solver on synthetic workflows")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[4, 8, 16], help="Numbers of instances")
+    parser.add_argument("--regions", type=int, default=4, help="Number of regions of the workflows")
+    parser.add_argument("--calculators", nargs="+", choices=CALCULATOR_TYPES, default=list(CALCULATOR_TYPES))
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=list(deployment_algorithm_mapping.keys()),
+        default=list(deployment_algorithm_mapping.keys()),
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Solver time budget of every run in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="solver_benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Results of a previous run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative regression tolerance")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_arguments()))
@@ -0,0 +1,337 @@
+import json
+import math
+import random
+from typing import Any
+
+from caribou.common.constants import (
+    AVAILABLE_REGIONS_TABLE,
+    CARBON_REGION_TABLE,
+    GLOBAL_SYSTEM_REGION,
+    PERFORMANCE_REGION_TABLE,
+    PROVIDER_REGION_TABLE,
+    WORKFLOW_INSTANCE_TABLE,
+)
+from caribou.common.models.remote_client.remote_client import RemoteClient
+
+SHAPES = ("chain", "fan_out", "diamond")
+
+# Regions of the synthetic workflows, the home region first and the system region second,
+# such that the input manager finds data for both whatever the number of regions
+SYNTHETIC_REGIONS = (
+    "us-east-1",
+    GLOBAL_SYSTEM_REGION,
+    "ca-central-1",
+    "eu-west-1",
+    "eu-central-1",
+    "ap-southeast-2",
+    "ap-northeast-1",
+    "sa-east-1",
+)
+# Number of measurements of every distribution of the synthetic workflow data
+N_MEASUREMENTS = 4
+
+
+class SyntheticWorkflow:  # pylint: disable=too-many-instance-attributes
+    """
+    Generates a workflow of the given shape and number of instances, together with the data
+    the solver loads for it (the workflow, performance, carbon and datacenter tables), such
+    that the solver can be run without any collected data or cloud access.
+
+    - chain: every instance invokes the next one.
+    - fan_out: the entry point invokes every other instance.
+    - diamond: a sequence of diamonds, the entry point of each diamond invoking two branches
+      that both invoke a sync node, which is the entry point of the next diamond.
+    """
+
+    def __init__(self, shape: str, n_instances: int, n_regions: int, seed: int = 0) -> None:
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown workflow shape {shape}, expected one of {SHAPES}")
+        if n_instances < 2:
+            raise ValueError("A synthetic workflow needs at least 2 instances")
+        if not 2 <= n_regions <= len(SYNTHETIC_REGIONS):
+            raise ValueError(f"The number of regions must be between 2 and {len(SYNTHETIC_REGIONS)}")
+
+        self.shape = shape
+        self.workflow_id = f"synthetic_{shape}_{n_instances}-0.0.1"
+        self._random = random.Random(seed)
+        self._regions = [f"aws:{region}" for region in SYNTHETIC_REGIONS[:n_regions]]
+        self._home_region = self._regions[0]
+
+        self._edges = self._generate_edges(shape, n_instances)
+        self._sync_nodes = {
+            to_index
+            for to_index in range(n_instances)
+            if sum(1 for _, edge_to_index in self._edges if edge_to_index == to_index) > 1
+        }
+        self._instance_names = [self._get_instance_name(index) for index in range(n_instances)]
+
+        # Characteristics of every region, relative to the home region
+        self._region_speed = {region: 1.0 + 0.15 * self._random.random() for region in self._regions}
+        self._region_price = {region: 1.0 + 0.3 * self._random.random() for region in self._regions}
+        self._region_carbon = {region: 50.0 + 450.0 * self._random.random() for region in self._regions}
+        self._instance_durations = [0.2 + 1.8 * self._random.random() for _ in range(n_instances)]
+
+    @property
+    def regions(self) -> list[str]:
+        return list(self._regions)
+
+    def _generate_edges(self, shape: str, n_instances: int) -> list[tuple[int, int]]:
+        if shape == "chain":
+            return [(index, index + 1) for index in range(n_instances - 1)]
+        if shape == "fan_out":
+            return [(0, index) for index in range(1, n_instances)]
+
+        edges = []
+        entry_point = 0
+        next_index = 1
+        while next_index + 3 <= n_instances:
+            first_branch, second_branch, sync_node = next_index, next_index + 1, next_index + 2
+            edges.extend(
+                [
+                    (entry_point, first_branch),
+                    (entry_point, second_branch),
+                    (first_branch, sync_node),
+                    (second_branch, sync_node),
+                ]
+            )
+            entry_point = sync_node
+            next_index += 3
+        # The instances that do not fit in a diamond are chained to the last sync node
+        for index in range(next_index, n_instances):
+            edges.append((index - 1 if index > next_index else entry_point, index))
+        return edges
+
+    def _get_instance_name(self, index: int) -> str:
+        if index == 0:
+            return f"{self.workflow_id}-f0:entry_point:0"
+        if index in self._sync_nodes:
+            return f"{self.workflow_id}-f{index}:sync:"
+        predecessor = next(from_index for from_index, to_index in self._edges if to_index == index)
+        return f"{self.workflow_id}-f{index}:f{predecessor}_0_0:{index}"
+
+    def get_workflow_config(self, deployment_algorithm: str) -> dict[str, Any]:
+        regions_and_providers = {
+            "allowed_regions": None,
+            "disallowed_regions": None,
+            "providers": {"aws": {"config": {"memory": 1024, "timeout": 60}}},
+        }
+        return {
+            "workflow_name": f"synthetic_{self.shape}",
+            "workflow_version": "0.0.1",
+            "workflow_id": self.workflow_id,
+            "regions_and_providers": regions_and_providers,
+            "instances": {
+                instance_name: {
+                    "instance_name": instance_name,
+                    "regions_and_providers": regions_and_providers,
+                    "succeeding_instances": [
+                        self._instance_names[to_index] for from_index, to_index in self._edges if from_index == index
+                    ],
+                    "preceding_instances": [
+                        self._instance_names[from_index] for from_index, to_index in self._edges if to_index == index
+                    ],
+                }
+                for index, instance_name in enumerate(self._instance_names)
+            },
+            "constraints": {
+                "hard_resource_constraints": {},
+                "soft_resource_constraints": {},
+                "priority_order": ["carbon", "cost", "runtime"],
+            },
+            "home_region": {"provider": "aws", "region": self._home_region.split(":")[1]},
+            "num_calls_in_one_month": 1000000,
+            "deployment_algorithm": deployment_algorithm,
+        }
+
+    def store(self, client: RemoteClient) -> None:
+        # Writes the data the solver loads for the workflow and its regions, replacing the data
+        # of the regions stored for a previous synthetic workflow
+        tables_to_values = {
+            AVAILABLE_REGIONS_TABLE: {region: {"provider": "aws"} for region in self._regions},
+            PERFORMANCE_REGION_TABLE: {region: self._get_performance_data(region) for region in self._regions},
+            CARBON_REGION_TABLE: {region: self._get_carbon_data(region) for region in self._regions},
+            PROVIDER_REGION_TABLE: {region: self._get_datacenter_data(region) for region in self._regions},
+            WORKFLOW_INSTANCE_TABLE: {self.workflow_id: self._get_workflow_data()},
+        }
+        for table_name, keys_to_values in tables_to_values.items():
+            for key, value in keys_to_values.items():
+                client.remove_key(table_name, key)
+                client.set_value_in_table(table_name, key, json.dumps(value))
+
+    def _get_region_distance(self, from_region: str, to_region: str) -> float:
+        # Regions further apart in the list are further apart geographically
+        return 1000.0 * abs(self._regions.index(from_region) - self._regions.index(to_region))
+
+    def _get_latencies(self, from_region: str, to_region: str) -> list[float]:
+        base_latency = 0.02 + self._get_region_distance(from_region, to_region) / 50000.0
+        return [base_latency * (1.0 + 0.5 * self._random.random()) for _ in range(N_MEASUREMENTS)]
+
+    def _get_performance_data(self, region: str) -> dict[str, Any]:
+        return {
+            "relative_performance": self._region_speed[region],
+            "transmission_latency": {
+                to_region: {"latency_distribution": self._get_latencies(region, to_region)}
+                for to_region in self._regions
+            },
+        }
+
+    def _get_carbon_data(self, region: str) -> dict[str, Any]:
+        carbon_intensity = self._region_carbon[region]
+        hourly_averages = {
+            str(hour): {"carbon_intensity": carbon_intensity * (1.0 + 0.3 * math.sin(2 * math.pi * hour / 24))}
+            for hour in range(24)
+        }
+        return {
+            "averages": {"overall": {"carbon_intensity": carbon_intensity}, **hourly_averages},
+            "transmission_distances": {
+                to_region: self._get_region_distance(region, to_region) for to_region in self._regions
+            },
+        }
+
+    def _get_datacenter_data(self, region: str) -> dict[str, Any]:
+        price = self._region_price[region]
+        return {
+            "pue": 1.1 + 0.1 * self._random.random(),
+            "cfe": 0.5 * self._random.random(),
+            "average_memory_power": 0.0003725,
+            "max_cpu_power_kWh": 0.0035,
+            "min_cpu_power_kWh": 0.00074,
+            "execution_cost": {
+                "compute_cost": {"x86_64": 1.66667e-05 * price, "arm64": 1.33334e-05 * price},
+                "invocation_cost": {"x86_64": 2e-07 * price, "arm64": 2e-07 * price},
+            },
+            "transmission_cost": {"provider_data_transfer": 0.02 * price, "global_data_transfer": 0.09 * price},
+            "sns_cost": {"sns_cost": 5e-07 * price},
+            "dynamodb_cost": {"read_cost": 2.5e-07 * price, "write_cost": 1.25e-06 * price},
+            "ecr_cost": {"storage_cost": 0.1 * price},
+        }
+
+    def _get_workflow_data(self) -> dict[str, Any]:
+        instance_summary = {
+            instance_name: self._get_instance_summary(index) for index, instance_name in enumerate(self._instance_names)
+        }
+
+        # Transfers from the redirector (at the home region) to the entry point
+        entry_point = self._instance_names[0]
+        start_hop_sizes = self._get_transfer_sizes()
+        instance_summary[entry_point]["to_instance"][entry_point] = {
+            "transfer_sizes_gb": start_hop_sizes,
+            "regions_to_regions": {
+                self._home_region: {
+                    to_region: self._get_transfer_latencies(self._home_region, to_region, start_hop_sizes)
+                    for to_region in self._regions
+                }
+            },
+        }
+
+        redirector_durations = [round(0.05 + 0.02 * index, 2) for index in range(2)]
+        return {
+            "start_hop_summary": {
+                "workflow_placement_decision_size_gb": 2e-06,
+                "wpd_at_function_probability": 0.7,
+                "at_redirector": {
+                    entry_point: {
+                        "cpu_utilization": 0.2,
+                        "executions": {
+                            "at_region": {
+                                self._home_region: {
+                                    "durations_s": redirector_durations,
+                                    "auxiliary_data": {
+                                        self._get_duration_key(duration): [[duration * 0.9, 1e-05]]
+                                        for duration in redirector_durations
+                                    },
+                                }
+                            },
+                            "auxiliary_index_translation": {entry_point: 0, "data_transfer_during_execution_gb": 1},
+                        },
+                    }
+                },
+                "from_client": {"transfer_sizes_gb": [1e-06, 2e-06], "received_region": {}},
+            },
+            "instance_summary": instance_summary,
+        }
+
+    def _get_instance_summary(self, index: int) -> dict[str, Any]:
+        successors = [to_index for from_index, to_index in self._edges if from_index == index]
+        auxiliary_index_translation = {
+            self._instance_names[to_index]: position for position, to_index in enumerate(successors)
+        }
+        auxiliary_index_translation["data_transfer_during_execution_gb"] = len(successors)
+
+        at_region = {}
+        for region in self._regions:
+            durations = [
+                round(
+                    self._instance_durations[index] * self._region_speed[region] * (0.8 + 0.4 * self._random.random()),
+                    2,
+                )
+                for _ in range(N_MEASUREMENTS)
+            ]
+            at_region[region] = {
+                "durations_s": durations,
+                "auxiliary_data": {
+                    self._get_duration_key(duration): [
+                        [duration * self._random.random() for _ in successors] + [1e-05 + 1e-03 * self._random.random()]
+                    ]
+                    for duration in durations
+                },
+            }
+
+        to_instance = {}
+        for to_index in successors:
+            sizes = self._get_transfer_sizes()
+            to_instance_summary: dict[str, Any] = {
+                "transfer_sizes_gb": sizes,
+                # Most, but not all, of the invocations of a fan out reach every branch
+                "invocation_probability": 1.0 if self.shape == "chain" else 0.7 + 0.3 * self._random.random(),
+                "regions_to_regions": {
+                    from_region: {
+                        to_region: self._get_transfer_latencies(from_region, to_region, sizes)
+                        for to_region in self._regions
+                    }
+                    for from_region in self._regions
+                },
+            }
+            if to_index in self._sync_nodes:
+                to_instance_summary["sync_sizes_gb"] = 1e-06 + 1e-05 * self._random.random()
+                to_instance_summary["sns_only_sizes_gb"] = 1e-06 + 1e-05 * self._random.random()
+            to_instance[self._instance_names[to_index]] = to_instance_summary
+
+        # If a branch of a diamond is not invoked, its sync node is notified in its place
+        for to_index in successors:
+            non_execution_info = {
+                f"{self._instance_names[other_index]}>{self._instance_names[sync_node]}": {
+                    "sync_data_response_size_gb": 2e-06,
+                    "sns_transfer_size_gb": 3e-06,
+                }
+                for other_index in successors
+                if other_index != to_index
+                for from_index, sync_node in self._edges
+                if from_index == other_index and sync_node in self._sync_nodes
+            }
+            if len(non_execution_info) > 0:
+                to_instance[self._instance_names[to_index]]["non_execution_info"] = non_execution_info
+
+        return {
+            "cpu_utilization": 0.2 + 0.6 * self._random.random(),
+            "executions": {"at_region": at_region, "auxiliary_index_translation": auxiliary_index_translation},
+            "to_instance": to_instance,
+        }
+
+    def _get_transfer_sizes(self) -> list[float]:
+        return [1e-06 + 5e-05 * self._random.random() for _ in range(N_MEASUREMENTS)]
+
+    def _get_transfer_latencies(self, from_region: str, to_region: str, sizes: list[float]) -> dict[str, Any]:
+        return {
+            "transfer_size_gb_to_transfer_latencies_s": {
+                self._get_size_key(size): self._get_latencies(from_region, to_region) for size in sizes
+            }
+        }
+
+    def _get_size_key(self, size: float) -> str:
+        # Sizes are looked up rounded up to the next 10 KB (see the workflow loader)
+        return str(math.ceil(size * (1024**2) / 10) * 10 / (1024**2))
+
+    def _get_duration_key(self, duration: float) -> str:
+        # Durations are looked up rounded up to the next 10 ms (see the workflow loader)
+        return str(math.ceil(duration * 1000 / 10) * 10 / 1000)
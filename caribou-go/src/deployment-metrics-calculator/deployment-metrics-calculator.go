@@ -14,6 +14,18 @@ import (
 	"gonum.org/v1/gonum/stat/distuv"
 )
 
+// Order of the metrics in the flat arrays of the binary (ctypes) interface
+var DeploymentMetricNames = []string{
+	"average_cost",
+	"average_runtime",
+	"average_carbon",
+	"tail_cost",
+	"tail_runtime",
+	"tail_carbon",
+	"average_execution_carbon",
+	"average_transmission_carbon",
+}
+
 type DeploymentMetricsCalculator struct {
 	inputManager                      *deploymentinput.InputManager
 	tailLatencyThreshold              float64
@@ -100,8 +112,12 @@ type SimpleDeploymentMetricsCalculator struct {
 }
 
 func SetupSimpleDeploymentMetricsCalculator(dataString string) *SimpleDeploymentMetricsCalculator {
+	deploymentMetricsCalculator := SetupDeploymentMetricsCalculator(dataString)
+	if deploymentMetricsCalculator == nil {
+		return nil
+	}
 	return &SimpleDeploymentMetricsCalculator{
-		*SetupDeploymentMetricsCalculator(dataString),
+		*deploymentMetricsCalculator,
 		200,
 	}
 }
@@ -228,7 +244,48 @@ func (sd *SimpleDeploymentMetricsCalculator) CalculateDeploymentMetrics(dataStri
 	return sd.PerformMonteCarloSimulation(deployment)
 }
 
+func (sd *SimpleDeploymentMetricsCalculator) CalculateDeploymentMetricsBatch(dataString string) []map[string]float64 {
+	var data [][]interface{}
+	err := json.Unmarshal([]byte(dataString), &data)
+	if err != nil {
+		fmt.Println("Error unmarshaling JSON:", err)
+		return nil
+	}
+	results := make([]map[string]float64, len(data))
+	for i, rawDeployment := range data {
+		deployment := make([]int, len(rawDeployment))
+		for j, d := range rawDeployment {
+			deployment[j] = int(d.(float64))
+		}
+		results[i] = sd.PerformMonteCarloSimulation(deployment)
+	}
+	return results
+}
+
 func (sd *SimpleDeploymentMetricsCalculator) UpdateDataForNewHour(data string) string {
 	sd.inputManager.AlterCarbonSetting(&data)
 	return "void"
 }
+
+// CalculateDeploymentMetricsInto simulates the row-major (deployment x instance) deployments
+// and writes their metrics into the row-major (deployment x metric) output, in the order of
+// DeploymentMetricNames. Metrics that are not recorded are left at zero.
+func (sd *SimpleDeploymentMetricsCalculator) CalculateDeploymentMetricsInto(
+	deployments []int64, numberOfInstances int, metrics []float64,
+) {
+	numberOfDeployments := len(deployments) / numberOfInstances
+	for i := 0; i < numberOfDeployments; i++ {
+		deployment := make([]int, numberOfInstances)
+		for j := range deployment {
+			deployment[j] = int(deployments[i*numberOfInstances+j])
+		}
+		result := sd.PerformMonteCarloSimulation(deployment)
+		for k, name := range DeploymentMetricNames {
+			metrics[i*len(DeploymentMetricNames)+k] = result[name]
+		}
+	}
+}
+
+func (sd *SimpleDeploymentMetricsCalculator) AlterCarbonSetting(setting *string) {
+	sd.inputManager.AlterCarbonSetting(setting)
+}
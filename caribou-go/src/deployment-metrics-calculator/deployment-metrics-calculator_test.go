@@ -35,3 +35,37 @@ func TestSimpleDeploymentMetricsCalculator_PerformMonteCarloSimulation(t *testin
 	assert.Equal(t, result["tail_carbon"], 1.0)
 	assert.Equal(t, callCounter, 2000)
 }
+
+func TestSimpleDeploymentMetricsCalculator_CalculateDeploymentMetricsBatch(t *testing.T) {
+	defer monkey.UnpatchAll()
+	dc := DeploymentMetricsCalculator{}
+	sdc := SimpleDeploymentMetricsCalculator{dc, 200}
+	var deployments [][]int
+	monkey.PatchInstanceMethod(reflect.TypeOf(&sdc), "PerformMonteCarloSimulation", func(sd *SimpleDeploymentMetricsCalculator, deployment []int) map[string]float64 {
+		deployments = append(deployments, deployment)
+		return map[string]float64{"average_cost": float64(deployment[0])}
+	})
+	result := sdc.CalculateDeploymentMetricsBatch("[[1, 1], [2, 0]]")
+	assert.Equal(t, [][]int{{1, 1}, {2, 0}}, deployments)
+	assert.Equal(t, 2, len(result))
+	assert.Equal(t, 1.0, result[0]["average_cost"])
+	assert.Equal(t, 2.0, result[1]["average_cost"])
+}
+
+func TestSimpleDeploymentMetricsCalculator_CalculateDeploymentMetricsInto(t *testing.T) {
+	defer monkey.UnpatchAll()
+	dc := DeploymentMetricsCalculator{}
+	sdc := SimpleDeploymentMetricsCalculator{dc, 200}
+	var deployments [][]int
+	monkey.PatchInstanceMethod(reflect.TypeOf(&sdc), "PerformMonteCarloSimulation", func(sd *SimpleDeploymentMetricsCalculator, deployment []int) map[string]float64 {
+		deployments = append(deployments, deployment)
+		return map[string]float64{"average_cost": float64(deployment[0]), "tail_carbon": 3.0}
+	})
+	metrics := make([]float64, 2*len(DeploymentMetricNames))
+	sdc.CalculateDeploymentMetricsInto([]int64{1, 1, 2, 0}, 2, metrics)
+	assert.Equal(t, [][]int{{1, 1}, {2, 0}}, deployments)
+	assert.Equal(t, 1.0, metrics[0])
+	assert.Equal(t, 3.0, metrics[5])
+	assert.Equal(t, 2.0, metrics[len(DeploymentMetricNames)])
+	assert.Equal(t, 0.0, metrics[len(DeploymentMetricNames)+6])
+}
@@ -4,9 +4,11 @@ import (
 	"C"
 	"bufio"
 	"encoding/json"
+	"fmt"
 	"math/rand"
 	"os"
 	"reflect"
+	"unsafe"
 
 	deploymentmetricscalculator "caribou-go/src/deployment-metrics-calculator"
 	"caribou-go/src/utils"
@@ -14,6 +16,10 @@ import (
 
 const (
 	maxCapacity = 6 * 512 * 1024
+
+	// Status codes returned by the binary (ctypes) interface
+	directStatusOk    = 0
+	directStatusError = 1
 )
 
 var (
@@ -21,6 +27,9 @@ var (
 	mainRunning      bool
 	datapipefileSend string
 	datapipefileRec  string
+
+	// Calculator of the binary (ctypes) interface, which bypasses the named pipes and JSON
+	directMetricsCalculator *deploymentmetricscalculator.SimpleDeploymentMetricsCalculator
 )
 
 func parseInputData(byteValue *[]byte) (command string, data string, err error) {
@@ -125,6 +134,60 @@ func goRead() {
 	return
 }
 
+// A panic must not unwind into the (Python) host process, which it would abort,
+// so the calls of the binary interface report it as an error status instead
+func recoverDirectStatus(status *C.int) {
+	if r := recover(); r != nil {
+		fmt.Println("Error in the deployment metrics calculator:", r)
+		*status = directStatusError
+	}
+}
+
+//export setupDirect
+func setupDirect(data *C.char, length C.int) (status C.int) {
+	defer recoverDirectStatus(&status)
+	directMetricsCalculator = deploymentmetricscalculator.SetupSimpleDeploymentMetricsCalculator(
+		C.GoStringN(data, length),
+	)
+	if directMetricsCalculator == nil {
+		return directStatusError
+	}
+	return directStatusOk
+}
+
+//export calculateDeploymentMetricsDirect
+func calculateDeploymentMetricsDirect(
+	deployments *C.longlong, numberOfDeployments C.int, numberOfInstances C.int, metrics *C.double,
+) (status C.int) {
+	defer recoverDirectStatus(&status)
+	if directMetricsCalculator == nil || numberOfInstances <= 0 {
+		return directStatusError
+	}
+	// The arrays are owned by the caller and only valid for the duration of the call
+	deploymentsSlice := unsafe.Slice((*int64)(unsafe.Pointer(deployments)), int(numberOfDeployments)*int(numberOfInstances))
+	metricsSlice := unsafe.Slice(
+		(*float64)(unsafe.Pointer(metrics)),
+		int(numberOfDeployments)*len(deploymentmetricscalculator.DeploymentMetricNames),
+	)
+	directMetricsCalculator.CalculateDeploymentMetricsInto(deploymentsSlice, int(numberOfInstances), metricsSlice)
+	return directStatusOk
+}
+
+//export updateDataForNewHourDirect
+func updateDataForNewHourDirect(hourToRun *C.char) (status C.int) {
+	defer recoverDirectStatus(&status)
+	if directMetricsCalculator == nil {
+		return directStatusError
+	}
+	if hourToRun == nil {
+		directMetricsCalculator.AlterCarbonSetting(nil)
+		return directStatusOk
+	}
+	setting := C.GoString(hourToRun)
+	directMetricsCalculator.AlterCarbonSetting(&setting)
+	return directStatusOk
+}
+
 func main() {
 	rand.Seed(0)
 	mainRunning = true
@@ -16,6 +16,7 @@ WORKFLOW_PLACEMENT_DECISION_TABLE = "workflow_placement_decision_table"
 
 # Solver Tables
 DEPLOYMENT_MANAGER_RESOURCE_TABLE = "deployment_manager_resource_table"
+DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE = "deployment_algorithm_checkpoint_table"
 
 # Solver Update Checker Tables
 DEPLOYMENT_MANAGER_WORKFLOW_INFO_TABLE = "deployment_manager_workflow_info_table"
@@ -116,11 +117,43 @@ DEFAULT_MONITOR_COOLDOWN = 60 * 60 * 24
 MINIMAL_SOLVE_THRESHOLD = 10
 DISTANCE_FOR_POTENTIAL_MIGRATION = 4000
 
+# Number of deployments submitted at once to the deployment metrics calculator
+DEPLOYMENT_METRICS_BATCH_SIZE = 16
+# Maximum number of deployment metrics memoized during a solve (512 deployments for each of the 24 hours)
+DEPLOYMENT_METRICS_CACHE_SIZE = 512 * 24
+# Number of proposals of each chain of the stochastic heuristic between two exchanges of their best deployments
+STOCHASTIC_HEURISTIC_MIGRATION_INTERVAL = DEPLOYMENT_METRICS_BATCH_SIZE * 4
+# Candidates predicted by the surrogate to be this much worse than the best simulated deployment are not simulated
+SURROGATE_PREFILTER_TOLERANCE = 0.5
+# Number of the best ranked deployments of the Pareto frontier of every hour stored with the placement decision
+PARETO_FRONTIER_OUTPUT_SIZE = 16
+# Minimum number of seconds between two checkpoints of a solve continued over several invocations
+DEPLOYMENT_ALGORITHM_CHECKPOINT_INTERVAL = 60
+# Number of the most recently used deployment metrics kept in a checkpoint
+DEPLOYMENT_ALGORITHM_CHECKPOINT_CACHE_SIZE = 1024
+# Maximum number of continuation invocations of a remote solve
+DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS = 8
+# Age (in seconds since its solve started) after which a checkpoint is discarded rather than continued,
+# allowing every continuation up to 30 minutes (a 15 minute invocation and its scheduling)
+DEPLOYMENT_ALGORITHM_CHECKPOINT_EXPIRY_SECONDS = (DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS + 1) * 30 * 60
+# Number of seconds the solver waits for its worker processes to exit, before terminating them
+SOLVER_WORKER_SHUTDOWN_TIMEOUT = 5
+# Number of the functions with the most cumulative time reported by a profiled solve
+SOLVER_PROFILE_OUTPUT_SIZE = 25
+# Version of the binary snapshot format of the solver inputs (bumped on incompatible changes)
+SOLVER_INPUT_SNAPSHOT_VERSION = 1
+# Alignment (in bytes) of the sections of a solver input snapshot, such that arrays can be mapped in place
+SOLVER_INPUT_SNAPSHOT_ALIGNMENT = 64
+
 # Logging
 LOG_VERSION = "0.0.4"
 
 # Tail latency threshold
 TAIL_LATENCY_THRESHOLD = 95
+# Number of samples kept exactly per level of the streaming tail percentile sketch
+MONTE_CARLO_QUANTILE_SKETCH_CAPACITY = 1024
+# Significance of the sequential test stopping the simulation of a deployment exceeding a hard constraint
+HARD_CONSTRAINT_EARLY_ABORT_SIGNIFICANCE = 0.001
 
 # Average USA Carbon Intensity of Electric Grid
 ## Contiguous United States Carbon intensity of energy grid
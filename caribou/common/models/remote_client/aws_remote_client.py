@@ -32,6 +32,12 @@ logger = logging.getLogger(__name__)
 class AWSRemoteClient(RemoteClient):  # pylint: disable=too-many-public-methods
     LAMBDA_CREATE_ATTEMPTS = 30
     DELAY_TIME = 5
+    # Maximum number of keys of a DynamoDB BatchGetItem request
+    BATCH_GET_ITEM_LIMIT = 100
+    # Initial delay before unprocessed keys of a BatchGetItem request are requested again
+    BATCH_GET_ITEM_RETRY_DELAY = 0.05
+    # Maximum number of BatchGetItem requests of a chunk of keys, until no keys remain unprocessed
+    BATCH_GET_ITEM_ATTEMPTS = 8
 
     def __init__(self, region: str) -> None:
         self._session = Session(region_name=region)
@@ -721,6 +727,42 @@ class AWSRemoteClient(RemoteClient):  # pylint: disable=too-many-public-methods
 
         return "", consumed_read_capacity
 
+    def get_values_from_table(self, table_name: str, keys: list[str], consistent_read: bool = True) -> dict[str, str]:
+        client = self._client("dynamodb")
+        unique_keys = list(dict.fromkeys(keys))
+
+        values: dict[str, str] = {}
+        for start in range(0, len(unique_keys), self.BATCH_GET_ITEM_LIMIT):
+            request_items: dict[str, Any] = {
+                table_name: {
+                    "Keys": [{"key": {"S": key}} for key in unique_keys[start : start + self.BATCH_GET_ITEM_LIMIT]],
+                    "ConsistentRead": consistent_read,
+                }
+            }
+            for attempt in range(self.BATCH_GET_ITEM_ATTEMPTS):
+                if attempt > 0:
+                    # Keys that exceeded the provisioned throughput are requested again, with exponential backoff
+                    time.sleep(self.BATCH_GET_ITEM_RETRY_DELAY * 2 ** (attempt - 1))
+                response = client.batch_get_item(RequestItems=request_items)
+                for item in response.get("Responses", {}).get(table_name, []):
+                    if "value" not in item:
+                        continue
+                    # Detect if the value is compressed (in bytes) and decompress it
+                    if "B" in item["value"]:
+                        values[item["key"]["S"]] = decompress_json_str(item["value"]["B"])
+                    else:
+                        values[item["key"]["S"]] = item["value"]["S"]
+
+                request_items = response.get("UnprocessedKeys", {})
+                if len(request_items) == 0:
+                    break
+            else:
+                raise RuntimeError(
+                    f"Keys of table {table_name} remained unprocessed after {self.BATCH_GET_ITEM_ATTEMPTS} attempts"
+                )
+
+        return values
+
     def remove_value_from_table(self, table_name: str, key: str) -> None:
         client = self._client("dynamodb")
         client.delete_item(TableName=table_name, Key={"key": {"S": key}})
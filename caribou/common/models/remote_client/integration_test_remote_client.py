@@ -223,6 +223,16 @@ class IntegrationTestRemoteClient(RemoteClient):  # pylint: disable=too-many-pub
         conn.close()
         return (result[0], 0.0) if result else ("", 0.0)
 
+    def get_values_from_table(self, table_name: str, keys: list[str], consistent_read: bool = True) -> dict[str, str]:
+        if len(keys) == 0:
+            return {}
+        conn = self._db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT key, value FROM {table_name} WHERE key IN ({', '.join('?' * len(keys))})", keys)
+        result = cursor.fetchall()
+        conn.close()
+        return {data[0]: data[1] for data in result}
+
     def upload_resource(self, key: str, resource: bytes) -> None:
         conn = self._db_connection()
         cursor = conn.cursor()
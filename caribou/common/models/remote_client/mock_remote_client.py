@@ -46,6 +46,9 @@ class MockRemoteClient(RemoteClient):  # pylint: disable=too-many-public-methods
     def get_value_from_table(self, table_name, key, consistent_read: bool = True):
         pass
 
+    def get_values_from_table(self, table_name, keys, consistent_read: bool = True):
+        pass
+
     def upload_resource(self, key, resource):
         pass
 
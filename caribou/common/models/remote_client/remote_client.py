@@ -163,6 +163,10 @@ class RemoteClient(ABC):  # pylint: disable=too-many-public-methods
     def get_value_from_table(self, table_name: str, key: str, consistent_read: bool = True) -> tuple[str, float]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_values_from_table(self, table_name: str, keys: list[str], consistent_read: bool = True) -> dict[str, str]:
+        raise NotImplementedError()
+
     @abstractmethod
     def remove_value_from_table(self, table_name: str, key: str) -> None:
         raise NotImplementedError()
@@ -62,11 +62,14 @@ def handle_remove_workflow(event: dict[str, Any]) -> dict[str, Any]:
 def handle_manage_deployments(event: dict[str, Any]) -> dict[str, Any]:
     deployment_metrics_calculator_type: str = event.get("deployment_metrics_calculator_type", "simple")
 
-    if deployment_metrics_calculator_type not in ("simple", "go"):
-        logger.error("Invalid deployment_metrics_calculator_type specified. Allowed values are 'simple', 'go'")
+    if deployment_metrics_calculator_type not in ("simple", "go", "vectorized"):
+        logger.error(
+            "Invalid deployment_metrics_calculator_type specified. Allowed values are 'simple', 'go', 'vectorized'"
+        )
         return {
             "status": 400,
-            "message": "Invalid deployment_metrics_calculator_type specified. Allowed values are 'simple', 'go'",
+            "message": "Invalid deployment_metrics_calculator_type specified. "
+            "Allowed values are 'simple', 'go', 'vectorized'",
         }
 
     logger.info("Deployment check started, using %s calculator", deployment_metrics_calculator_type)
@@ -220,8 +223,11 @@ def _handle_run_deployment_algorithm(event: dict[str, Any]) -> dict[str, Any]:
         logger.error("No leftover_tokens specified")
         return {"status": 400, "message": "No leftover_tokens specified"}
 
+    # Number of invocations the solve has already been continued over
+    continuation: int = event.get("continuation", 0)
+
     deployment_manager = DeploymentManager(deployment_metrics_calculator_type, deployed_remotely=True)
-    deployment_manager.run_deployment_algorithm(workflow_id, solve_hours, leftover_tokens)
+    deployment_manager.run_deployment_algorithm(workflow_id, solve_hours, leftover_tokens, continuation)
     return {"status": 200, "message": f"Deployment algorithm performed on {workflow_id}"}
 
 
@@ -1,13 +1,31 @@
 import json
+import logging
+import math
+import multiprocessing
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from itertools import islice
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Iterable, Optional, Sequence
 
 from caribou.common.constants import (
     AWS_TIMEOUT_SECONDS,
     DEFAULT_MONITOR_COOLDOWN,
+    DEPLOYMENT_ALGORITHM_CHECKPOINT_CACHE_SIZE,
+    DEPLOYMENT_ALGORITHM_CHECKPOINT_EXPIRY_SECONDS,
+    DEPLOYMENT_ALGORITHM_CHECKPOINT_INTERVAL,
+    DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE,
+    DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS,
+    DEPLOYMENT_METRICS_BATCH_SIZE,
+    DEPLOYMENT_METRICS_CACHE_SIZE,
     GLOBAL_TIME_ZONE,
+    PARETO_FRONTIER_OUTPUT_SIZE,
+    SOLVER_WORKER_SHUTDOWN_TIMEOUT,
+    SURROGATE_PREFILTER_TOLERANCE,
     TIME_FORMAT,
+    WORKFLOW_PLACEMENT_DECISION_TABLE,
     WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE,
 )
 from caribou.common.models.endpoints import Endpoints
@@ -21,12 +39,21 @@ from caribou.deployment_solver.deployment_metrics_calculator.go_deployment_metri
 from caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator import (
     SimpleDeploymentMetricsCalculator,
 )
+from caribou.deployment_solver.deployment_metrics_calculator.vectorized_deployment_metrics_calculator import (
+    VectorizedDeploymentMetricsCalculator,
+)
 from caribou.deployment_solver.formatter.formatter import Formatter
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.deployment_surrogate import DeploymentSurrogate
 from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.pareto_archive import ParetoArchive
 from caribou.deployment_solver.models.region_indexer import RegionIndexer
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
 from caribou.deployment_solver.ranker.ranker import Ranker
 from caribou.deployment_solver.workflow_config import WorkflowConfig
 
+logger = logging.getLogger(__name__)
+
 
 class DeploymentAlgorithm(ABC):  # pylint: disable=too-many-instance-attributes
     def __init__(
@@ -37,39 +64,64 @@ class DeploymentAlgorithm(ABC):  # pylint: disable=too-many-instance-attributes
         record_transmission_execution_carbon: bool = False,
         deployment_metrics_calculator_type: str = "simple",
         lambda_timeout: bool = False,
+        random_seed: Optional[int] = None,
+        n_hour_processes: int = 1,
+        surrogate_prefilter: bool = False,
+        resumable: bool = False,
+        warm_start: bool = True,
+        profile: bool = False,
     ):
         self._workflow_config = workflow_config
 
-        self._input_manager = InputManager(workflow_config=workflow_config)
-
-        self._workflow_level_permitted_regions = self._get_workflow_level_permitted_regions()
-
-        self._region_indexer = RegionIndexer(self._workflow_level_permitted_regions)
-        self._instance_indexer = InstanceIndexer(list(self._workflow_config.instances.values()))
-
-        # Complete the setup of the input manager
-        self._input_manager.setup(self._region_indexer, self._instance_indexer)
-
-        if deployment_metrics_calculator_type == "go":
-            deployment_metrics_calculator: DeploymentMetricsCalculator = GoDeploymentMetricsCalculator(
-                workflow_config,
-                self._input_manager,
-                self._region_indexer,
-                self._instance_indexer,
-                record_transmission_execution_carbon=record_transmission_execution_carbon,
-            )
-        else:
-            deployment_metrics_calculator = SimpleDeploymentMetricsCalculator(
-                workflow_config,
-                self._input_manager,
-                self._region_indexer,
-                self._instance_indexer,
-                n_processes=n_workers,
-                record_transmission_execution_carbon=record_transmission_execution_carbon,
-            )
+        # Phase timers and counters of the solve (and optionally its cProfile), uploaded with its result
+        self._instrumentation = SolverInstrumentation(profile=profile)
+
+        with self._instrumentation.time_phase("input_setup"):
+            # The seed makes the simulated deployment metrics reproducible
+            self._input_manager = InputManager(workflow_config=workflow_config, random_seed=random_seed)
+
+            self._workflow_level_permitted_regions = self._get_workflow_level_permitted_regions()
+
+            self._region_indexer = RegionIndexer(self._workflow_level_permitted_regions)
+            self._instance_indexer = InstanceIndexer(list(self._workflow_config.instances.values()))
+
+            # Complete the setup of the input manager
+            self._input_manager.setup(self._region_indexer, self._instance_indexer)
+
+        with self._instrumentation.time_phase("calculator_setup"):
+            if deployment_metrics_calculator_type == "go":
+                deployment_metrics_calculator: DeploymentMetricsCalculator = GoDeploymentMetricsCalculator(
+                    workflow_config,
+                    self._input_manager,
+                    self._region_indexer,
+                    self._instance_indexer,
+                    record_transmission_execution_carbon=record_transmission_execution_carbon,
+                )
+            elif deployment_metrics_calculator_type == "vectorized":
+                deployment_metrics_calculator = VectorizedDeploymentMetricsCalculator(
+                    workflow_config,
+                    self._input_manager,
+                    self._region_indexer,
+                    self._instance_indexer,
+                    record_transmission_execution_carbon=record_transmission_execution_carbon,
+                )
+            else:
+                deployment_metrics_calculator = SimpleDeploymentMetricsCalculator(
+                    workflow_config,
+                    self._input_manager,
+                    self._region_indexer,
+                    self._instance_indexer,
+                    n_processes=n_workers,
+                    record_transmission_execution_carbon=record_transmission_execution_carbon,
+                )
 
         self._deployment_metrics_calculator: DeploymentMetricsCalculator = deployment_metrics_calculator
 
+        # Memoizes the metrics of the deployments simulated during the solve (across phases and hours)
+        self._deployment_metrics_cache = DeploymentMetricsCache(DEPLOYMENT_METRICS_CACHE_SIZE)
+        self._hour_to_run: Optional[str] = None
+        self._hours_to_run: list[Optional[str]] = [None]
+
         self._home_region_index = self._region_indexer.value_to_index(self._workflow_config.home_region)
 
         self._number_of_instances = len(self._instance_indexer.get_value_indices().values())
@@ -91,44 +143,455 @@ class DeploymentAlgorithm(ABC):  # pylint: disable=too-many-instance-attributes
         if lambda_timeout:
             print(f"Remote Deployment: Setting timeout to {AWS_TIMEOUT_SECONDS} seconds")
 
-    def run(self, hours_to_run: Optional[list[str]] = None) -> None:
-        hour_to_run_to_result: dict[str, Any] = {"time_keys_to_staging_area_data": {}, "deployment_metrics": {}}
+        self._n_hour_processes = n_hour_processes
+        if n_hour_processes > 1 and not self._can_fork_solver():
+            print("Solving the hours sequentially, as the deployment metrics calculator cannot be forked")
+            self._n_hour_processes = 1
+
+        # Cheap model scoring the candidates, such that clearly inferior ones are never simulated
+        self._surrogate: Optional[DeploymentSurrogate] = (
+            DeploymentSurrogate(workflow_config, self._input_manager, self._instance_indexer)
+            if surrogate_prefilter
+            else None
+        )
+        # Best simulated number one priority metric of the hour, and its prediction by the surrogate
+        self._best_simulated_metric = float("inf")
+        self._best_surrogate_metric = float("inf")
+
+        # A resumable solve checkpoints its progress, such that another invocation can continue it
+        self._resumable = resumable
+        if resumable and self._n_hour_processes > 1:
+            print("Solving the hours sequentially, as the solve is resumable")
+            self._n_hour_processes = 1
+        self._selected_deployments: list[tuple[list[int], dict[str, float]]] = []
+        # Search state of the hour being solved, set by the algorithms that can continue their search
+        self._search_state: Optional[dict[str, Any]] = None
+        # Time spent on the search of the hour being solved, over all the invocations of the solve
+        self._hour_search_time = 0.0
+        self._last_invocation = False
+        self._last_checkpoint_time = 0.0
+        # Start of the solve (in its first invocation), checkpoints of solves started too long ago are discarded
+        self._solve_start_time = time.time()
+
+        # The search of every hour is seeded with the deployment the previous solve selected for it
+        self._warm_start = warm_start
+        self._previous_deployments: dict[str, list[int]] = {}
+
+        # Best ranked deployments of the frontier of every solved hour, by their time key
+        self._pareto_frontiers: dict[str, list[tuple[list[int], dict[str, float]]]] = {}
+
+    def run(self, hours_to_run: Optional[list[str]] = None, last_invocation: bool = False) -> bool:
+        # Returns whether the solve was completed, or checkpointed to be continued by another invocation.
+        # The last invocation of a resumable solve completes it in its time, whatever is left to solve.
+        self._last_invocation = last_invocation
+        hour_to_run_to_result: dict[str, Any] = {
+            "time_keys_to_staging_area_data": {},
+            "deployment_metrics": {},
+            "pareto_frontiers": {},
+        }
         if hours_to_run is None:
             hours_to_run = [None]  # type: ignore
-        # The solver for every hour must terminate in `timeout_per_hour` seconds
-        timeout_per_hour = self._timeout / len(hours_to_run)
-        for hour_to_run in hours_to_run:
-            self._update_data_for_new_hour(hour_to_run)
-            deployments = self._run_algorithm(timeout=timeout_per_hour)
-            ranked_deployments = self._ranker.rank(deployments)
-            selected_deployment = self._select_deployment(ranked_deployments)
+        self._hours_to_run = list(hours_to_run)
+        self._instrumentation.start_profiling()
+        try:
+            selected_deployments = self._solve_hours()
+        finally:
+            self._instrumentation.stop_profiling()
+        instrumentation_summary = self._get_instrumentation_summary()
+        if selected_deployments is None:
+            return False
+
+        for hour_to_run, selected_deployment in zip(self._hours_to_run, selected_deployments):
             formatted_deployment = self._formatter.format(
                 selected_deployment,
                 self._instance_indexer.indicies_to_values(),
                 self._region_indexer.indicies_to_values(),
             )
-            if hour_to_run is None:
-                # If the hour_to_run is None, we have used the daily average and thus only have one result
-                # For this result to be selected at all times, we set the key to "0"
-                hour_to_run = "0"
+            hour_to_run = self._get_time_key(hour_to_run)
             hour_to_run_to_result["time_keys_to_staging_area_data"][hour_to_run] = formatted_deployment
             hour_to_run_to_result["deployment_metrics"][hour_to_run] = selected_deployment[1]
+            hour_to_run_to_result["pareto_frontiers"][hour_to_run] = [
+                {
+                    "placement": self._formatter.format(
+                        frontier_deployment,
+                        self._instance_indexer.indicies_to_values(),
+                        self._region_indexer.indicies_to_values(),
+                    ),
+                    "deployment_metrics": frontier_deployment[1],
+                }
+                for frontier_deployment in self._pareto_frontiers.get(hour_to_run, [])
+            ]
 
         self._add_expiry_date_to_results(hour_to_run_to_result)
+        hour_to_run_to_result["instrumentation"] = instrumentation_summary
 
         self._upload_result(hour_to_run_to_result)
+        return True
+
+    def _solve_hours(self) -> Optional[list[tuple[list[int], dict[str, float]]]]:
+        # Returns the selected deployment of every hour, or None if the solve was checkpointed instead
+        if self._warm_start:
+            with self._instrumentation.time_phase("load_previous_deployments"):
+                self._previous_deployments = self._load_previous_deployments()
+        if self._resumable:
+            if not self._solve_hours_resumably():
+                return None
+            return self._selected_deployments
+        if self._n_hour_processes > 1 and len(self._hours_to_run) > 1:
+            return self._solve_hours_in_parallel(self._hours_to_run)
+        # The solver for every hour must terminate in `timeout_per_hour` seconds
+        timeout_per_hour = self._timeout / len(self._hours_to_run)
+        return [self._solve_hour(hour_to_run, timeout=timeout_per_hour) for hour_to_run in self._hours_to_run]
+
+    def _get_instrumentation_summary(self) -> dict[str, Any]:
+        summary = self._instrumentation.get_summary()
+        for counter, value in self._get_component_counters().items():
+            summary["counters"][counter] = summary["counters"].get(counter, 0) + value
+        summary["samples_per_simulated_deployment"] = summary["counters"]["simulated_samples"] / max(
+            summary["counters"].get("simulated_deployments", 0), 1
+        )
+        # One structured line per solve, such that the solver budgets can be tuned from the logs
+        logger.info("Solver instrumentation of workflow %s: %s", self._workflow_config.workflow_id, json.dumps(summary))
+        return summary
+
+    def _get_component_counters(self) -> dict[str, int]:
+        # The calculators and the cache count their own work, as they are on the hot path of the solve
+        deployment_metrics_cache_statistics = self._deployment_metrics_cache.get_statistics()
+        counters = {
+            "simulated_samples": self._deployment_metrics_calculator.simulated_samples,
+            "deployment_metrics_cache_hits": deployment_metrics_cache_statistics["hits"],
+            "deployment_metrics_cache_misses": deployment_metrics_cache_statistics["misses"],
+        }
+        for calculator_name, cache_statistics in self._input_manager.get_calculator_cache_statistics().items():
+            for statistic, value in cache_statistics.items():
+                counters[f"{calculator_name}_{statistic}"] = value
+        return counters
+
+    def _solve_hours_resumably(self) -> bool:
+        # Continues the solve from the checkpoint of the previous invocation (if any), and solves the
+        # remaining hours one after the other until the time of the invocation runs out.
+        deadline = time.time() + self._timeout
+        # Every hour may search for its share of all the invocations of the solve, but no longer
+        # than a whole invocation (as the only hour of a solve that is not resumable)
+        hour_budget = min(
+            self._timeout, self._timeout * (DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS + 1) / len(self._hours_to_run)
+        )
+        self._load_checkpoint()
+        remaining_hours_to_run = self._hours_to_run[len(self._selected_deployments) :]
+        for index, hour_to_run in enumerate(remaining_hours_to_run):
+            search_start_time = time.time()
+            invocation_time = deadline - search_start_time
+            if self._last_invocation:
+                # No invocation continues the solve, so the hours left share the time that is left
+                invocation_time /= len(remaining_hours_to_run) - index
+            selected_deployment = self._solve_hour(
+                hour_to_run, timeout=min(hour_budget - self._hour_search_time, invocation_time)
+            )
+            self._hour_search_time += time.time() - search_start_time
+            is_out_of_time = time.time() >= deadline and not self._last_invocation
+            if is_out_of_time and self._hour_search_time < hour_budget:
+                # The invocation rather than the budget of the hour ended its search, the next invocation
+                # continues it (from its search state, if the algorithm can continue its search)
+                self._save_checkpoint()
+                return False
+            self._selected_deployments.append(selected_deployment)
+            self._search_state = None
+            self._hour_search_time = 0.0
+            if is_out_of_time and index < len(remaining_hours_to_run) - 1:
+                self._save_checkpoint()
+                return False
+            if self._is_checkpoint_due():
+                self._save_checkpoint()
+
+        self.remove_checkpoint()
+        return True
+
+    def remove_checkpoint(self) -> None:
+        # Also called when a resumable solve is abandoned, such that no later solve continues it
+        self._endpoints.get_deployment_algorithm_workflow_placement_decision_client().remove_key(
+            DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE, self._workflow_config.workflow_id
+        )
+
+    def _is_checkpoint_due(self) -> bool:
+        return (
+            self._resumable and (time.time() - self._last_checkpoint_time) >= DEPLOYMENT_ALGORITHM_CHECKPOINT_INTERVAL
+        )
+
+    def _checkpoint_search(self, search_state: dict[str, Any]) -> None:
+        # Called by the algorithms during the search of an hour, in case the invocation is stopped abruptly
+        self._search_state = search_state
+        self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        # Only the most recently used deployment metrics are kept, to bound the size of the checkpoint
+        cached_deployment_metrics = self._deployment_metrics_cache.items()[-DEPLOYMENT_ALGORITHM_CHECKPOINT_CACHE_SIZE:]
+        checkpoint = {
+            "solve_start_time": self._solve_start_time,
+            "hours_to_run": self._hours_to_run,
+            "random_seed": self._input_manager.get_random_stream().seed,
+            "selected_deployments": self._selected_deployments,
+            "search_state": self._search_state,
+            "hour_search_time": self._hour_search_time,
+            "pareto_frontiers": self._pareto_frontiers,
+            "deployment_metrics": [
+                [list(deployment), hour_to_run, deployment_metrics]
+                for deployment, hour_to_run, deployment_metrics in cached_deployment_metrics
+            ],
+        }
+        with self._instrumentation.time_phase("checkpoint"):
+            self._endpoints.get_deployment_algorithm_workflow_placement_decision_client().set_value_in_table(
+                DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE,
+                self._workflow_config.workflow_id,
+                json.dumps(checkpoint),
+                convert_to_bytes=True,
+            )
+        self._last_checkpoint_time = time.time()
+
+    def _load_checkpoint(self) -> None:
+        self._selected_deployments = []
+        self._search_state = None
+        self._hour_search_time = 0.0
+        (
+            checkpoint_json,
+            _,
+        ) = self._endpoints.get_deployment_algorithm_workflow_placement_decision_client().get_value_from_table(
+            DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE, self._workflow_config.workflow_id
+        )
+        if not checkpoint_json:
+            return
+        checkpoint = json.loads(checkpoint_json)
+        if checkpoint["hours_to_run"] != self._hours_to_run:
+            # Left behind by a solve of other hours, which is started over
+            return
+        if time.time() - checkpoint.get("solve_start_time", 0.0) > DEPLOYMENT_ALGORITHM_CHECKPOINT_EXPIRY_SECONDS:
+            # Left behind by a solve that crashed or was abandoned, its metrics are based on outdated data
+            logger.info("Discarding the expired checkpoint of workflow %s", self._workflow_config.workflow_id)
+            return
+
+        # The same random numbers are drawn as in the previous invocations, so that the
+        # metrics of the restored deployments are comparable with the newly simulated ones
+        random_stream = self._input_manager.get_random_stream()
+        random_stream.seed = checkpoint["random_seed"]
+        random_stream.reset()
+        self._solve_start_time = checkpoint["solve_start_time"]
+        for deployment, hour_to_run, deployment_metrics in checkpoint["deployment_metrics"]:
+            self._deployment_metrics_cache.put(deployment, hour_to_run, deployment_metrics)
+        # The (deployment, metrics) pairs are decoded as lists, which are used the same way
+        self._selected_deployments = checkpoint["selected_deployments"]
+        self._search_state = checkpoint["search_state"]
+        self._hour_search_time = checkpoint.get("hour_search_time", 0.0)
+        self._pareto_frontiers = checkpoint["pareto_frontiers"]
+
+    def _load_previous_deployments(self) -> dict[str, list[int]]:
+        # The deployments of the previous solve are either still in the staging area (not deployed
+        # yet), or deployed and part of the current deployment of the workflow placement decision
+        client = self._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        staging_area_data_json, _ = client.get_value_from_table(
+            WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE, self._workflow_config.workflow_id
+        )
+        if staging_area_data_json:
+            time_keys_to_instances = json.loads(staging_area_data_json)["time_keys_to_staging_area_data"]
+        else:
+            workflow_placement_decision_json, _ = client.get_value_from_table(
+                WORKFLOW_PLACEMENT_DECISION_TABLE, self._workflow_config.workflow_id
+            )
+            if not workflow_placement_decision_json:
+                return {}
+            workflow_placement = json.loads(workflow_placement_decision_json).get("workflow_placement", {})
+            if "current_deployment" not in workflow_placement:
+                return {}
+            time_keys_to_instances = workflow_placement["current_deployment"]["instances"]
+
+        previous_deployments: dict[str, list[int]] = {}
+        for time_key, instances in time_keys_to_instances.items():
+            previous_deployment = self._parse_previous_deployment(instances)
+            if previous_deployment is not None:
+                previous_deployments[time_key] = previous_deployment
+        return previous_deployments
+
+    def _parse_previous_deployment(self, instances: dict[str, Any]) -> Optional[list[int]]:
+        # Deployments of instances or to regions that are no longer permitted are of no use
+        region_indices = self._region_indexer.get_value_indices()
+        deployment = [self._home_region_index] * self._number_of_instances
+        for instance_name, instance_index in self._instance_indexer.get_value_indices().items():
+            if instance_name not in instances:
+                return None
+            provider_region = instances[instance_name]["provider_region"]
+            region = f"{provider_region['provider']}:{provider_region['region']}"
+            if region not in region_indices:
+                return None
+            deployment[instance_index] = region_indices[region]
+        return deployment if self._is_permitted_deployment(deployment) else None
+
+    def _get_previous_deployment(self, hour_to_run: Optional[str]) -> Optional[list[int]]:
+        # The deployment that is used at the hour, which is the one of the latest time key up to the hour
+        hour = int(hour_to_run) if hour_to_run is not None else 0
+        time_keys = [time_key for time_key in self._previous_deployments if int(time_key) <= hour]
+        if len(time_keys) == 0:
+            return None
+        return self._previous_deployments[max(time_keys, key=int)]
+
+    def _get_warm_start_deployments(self) -> list[tuple[list[int], dict[str, float]]]:
+        # The previous deployment of the hour, re-evaluated with the latest data (unless it is the
+        # home deployment, which is always evaluated)
+        previous_deployment = self._get_previous_deployment(self._hour_to_run)
+        if previous_deployment is None or previous_deployment == self._home_deployment:
+            return []
+        previous_deployment_metrics = self._calculate_deployment_metrics_batch([previous_deployment])[0]
+        if self._is_hard_constraint_failed(previous_deployment_metrics):
+            return []
+        return [(previous_deployment, previous_deployment_metrics)]
+
+    def _solve_hour(self, hour_to_run: Optional[str], timeout: float) -> tuple[list[int], dict[str, float]]:
+        with self._instrumentation.time_phase("hour_setup"):
+            self._update_data_for_new_hour(hour_to_run)  # type: ignore
+        with self._instrumentation.time_phase("search"):
+            deployments = self._run_algorithm(timeout=timeout)
+        self._instrumentation.increment("solved_hours")
+        # Besides the deployments kept by the algorithm, every deployment simulated for the hour that
+        # is still cached is a candidate. The best ranked deployment is always non-dominated (as any
+        # deployment dominating it would rank higher), so only the Pareto frontier is ranked.
+        with self._instrumentation.time_phase("ranking"):
+            pareto_archive = ParetoArchive()
+            pareto_archive.add(deployments)
+            pareto_archive.add(
+                [
+                    (list(deployment), deployment_metrics)
+                    for deployment, cached_hour_to_run, deployment_metrics in self._deployment_metrics_cache.items()
+                    if cached_hour_to_run == hour_to_run and not self._is_hard_constraint_failed(deployment_metrics)
+                ]
+            )
+            ranked_deployments = self._ranker.rank(pareto_archive.get_frontier())
+        self._pareto_frontiers[self._get_time_key(hour_to_run)] = ranked_deployments[:PARETO_FRONTIER_OUTPUT_SIZE]
+        return self._select_deployment(ranked_deployments)
+
+    def _get_time_key(self, hour_to_run: Optional[str]) -> str:
+        # If the hour_to_run is None, we have used the daily average and thus only have one result
+        # For this result to be selected at all times, we set the key to "0"
+        return hour_to_run if hour_to_run is not None else "0"
+
+    def _can_fork_solver(self) -> bool:
+        # The solver can only be forked if the calculator does not own worker processes
+        # or a Go runtime, neither of which survive a fork.
+        if "fork" not in multiprocessing.get_all_start_methods():
+            # Without fork, the whole algorithm (and its clients) would have to be pickled
+            return False
+        if isinstance(self._deployment_metrics_calculator, VectorizedDeploymentMetricsCalculator):
+            return True
+        return (
+            isinstance(self._deployment_metrics_calculator, SimpleDeploymentMetricsCalculator)
+            and self._deployment_metrics_calculator.n_processes == 1
+        )
+
+    def _solve_hours_in_parallel(self, hours_to_run: list[Optional[str]]) -> list[tuple[list[int], dict[str, float]]]:
+        # The processes are forked from the loaded solver, so they all share its input
+        # data (copy-on-write) and only the selected deployments are sent back.
+        # Pipes are used instead of a pool, as pools are not supported on AWS Lambda.
+        context = multiprocessing.get_context("fork")
+        n_processes = min(self._n_hour_processes, len(hours_to_run))
+        # Every process solves its hours one after the other within the overall timeout
+        timeout_per_hour = self._timeout / math.ceil(len(hours_to_run) / n_processes)
+        # The workers only check the clock between batches, so they are given some slack to report back
+        deadline = time.time() + self._timeout + SOLVER_WORKER_SHUTDOWN_TIMEOUT
+
+        processes: list[tuple[BaseProcess, Connection]] = []
+        for process_index in range(n_processes):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=self._hour_worker,
+                args=(list(range(process_index, len(hours_to_run), n_processes)), timeout_per_hour, child_connection),
+            )
+            process.start()
+            # Only the worker holds its end of the pipe, such that the pipe is closed if the worker dies
+            child_connection.close()
+            processes.append((process, parent_connection))
+
+        selected_deployments: dict[int, tuple[list[int], dict[str, float]]] = {}
+        try:
+            for _, parent_connection in processes:
+                hour_results, worker_instrumentation_summary = self._receive_from_worker(parent_connection, deadline)
+                self._instrumentation.merge(worker_instrumentation_summary)
+                for hour_index, (selected_deployment, pareto_frontier) in hour_results.items():
+                    selected_deployments[hour_index] = selected_deployment
+                    if pareto_frontier is not None:
+                        self._pareto_frontiers[self._get_time_key(hours_to_run[hour_index])] = pareto_frontier
+        finally:
+            self._stop_workers(processes)
+
+        return [selected_deployments[hour_index] for hour_index in range(len(hours_to_run))]
+
+    @staticmethod
+    def _receive_from_worker(connection: Connection, deadline: float) -> Any:
+        if not connection.poll(None if math.isinf(deadline) else max(deadline - time.time(), 0.0)):
+            raise TimeoutError("A solver worker process did not report back before the deadline")
+        try:
+            worker_result = connection.recv()
+        except EOFError as e:
+            # The worker exited without reporting, such as when it was killed for running out of memory
+            raise RuntimeError("A solver worker process exited without reporting back") from e
+        if isinstance(worker_result, Exception):
+            raise worker_result
+        return worker_result
+
+    @staticmethod
+    def _stop_workers(workers: list[tuple[BaseProcess, Connection]]) -> None:
+        deadline = time.time() + SOLVER_WORKER_SHUTDOWN_TIMEOUT
+        for process, connection in workers:
+            connection.close()
+            process.join(max(deadline - time.time(), 0.0))
+        # Workers still running (such as the others after one of them failed) are not waited for
+        for process, _ in workers:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    def _hour_worker(self, hour_indices: list[int], timeout_per_hour: float, connection: Connection) -> None:
+        try:
+            # The process only reports its own work, everything before the fork is reported by the parent
+            self._instrumentation = SolverInstrumentation()
+            initial_component_counters = self._get_component_counters()
+            hour_results = {}
+            for hour_index in hour_indices:
+                hour_to_run = self._hours_to_run[hour_index]
+                selected_deployment = self._solve_hour(hour_to_run, timeout=timeout_per_hour)
+                hour_results[hour_index] = (
+                    selected_deployment,
+                    self._pareto_frontiers.get(self._get_time_key(hour_to_run)),
+                )
+            for counter, value in self._get_component_counters().items():
+                self._instrumentation.increment(counter, value - initial_component_counters[counter])
+            connection.send((hour_results, self._instrumentation.get_summary()))
+        except Exception as e:  # pylint: disable=broad-except
+            connection.send(e)
+        finally:
+            connection.close()
 
     def _update_data_for_new_hour(self, hour_to_run: str) -> None:
+        self._hour_to_run = hour_to_run
         self._input_manager.alter_carbon_setting(hour_to_run)
         if isinstance(
-            self._deployment_metrics_calculator, (SimpleDeploymentMetricsCalculator, GoDeploymentMetricsCalculator)
+            self._deployment_metrics_calculator,
+            (SimpleDeploymentMetricsCalculator, GoDeploymentMetricsCalculator, VectorizedDeploymentMetricsCalculator),
         ):
             self._deployment_metrics_calculator.update_data_for_new_hour(hour_to_run)
-        (
-            self._home_deployment,  # pylint: disable=attribute-defined-outside-init
-            self._home_deployment_metrics,  # pylint: disable=attribute-defined-outside-init
-        ) = self._initialise_home_deployment()
+        # The home deployment is simulated in full, as the relative hard constraints depend on it
+        self._deployment_metrics_calculator.set_hard_constraints(None, None)
+        with self._instrumentation.time_phase("home_deployment"):
+            (
+                self._home_deployment,  # pylint: disable=attribute-defined-outside-init
+                self._home_deployment_metrics,  # pylint: disable=attribute-defined-outside-init
+            ) = self._initialise_home_deployment()
         self._ranker.update_home_deployment_metrics(self._home_deployment_metrics)
+        if self._workflow_config.constraints is not None:
+            self._deployment_metrics_calculator.set_hard_constraints(
+                self._workflow_config.constraints.get("hard_resource_constraints"), self._home_deployment_metrics
+            )
+
+        if self._surrogate is not None:
+            self._surrogate.update_data_for_new_hour(hour_to_run)
+            self._best_simulated_metric = float("inf")
+            self._best_surrogate_metric = float("inf")
+            self._update_best_surrogate_metric(self._home_deployment, self._home_deployment_metrics)
 
     def _add_expiry_date_to_results(self, hour_to_run_to_result: dict[str, Any]) -> None:
         expiry_date = datetime.now(GLOBAL_TIME_ZONE) + timedelta(seconds=self._expiry_time_delta_seconds)
@@ -214,10 +677,107 @@ class DeploymentAlgorithm(ABC):  # pylint: disable=too-many-instance-attributes
             )
         )
 
+    def _is_permitted_deployment(self, deployment: Sequence[int]) -> bool:
+        return all(
+            deployment[instance] in self._per_instance_permitted_regions[instance]
+            for instance in range(self._number_of_instances)
+        )
+
+    def _calculate_deployment_metrics_batch(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        # The metrics of the home deployment are already known, and others may already be cached
+        known_metrics: dict[tuple[int, ...], dict[str, float]] = {}
+        deployments_to_calculate: list[list[int]] = []
+        deployment_keys_to_calculate: set[tuple[int, ...]] = set()
+        for deployment in deployments:
+            deployment_key = tuple(deployment)
+            if deployment_key in known_metrics or deployment_key in deployment_keys_to_calculate:
+                continue
+            if deployment == self._home_deployment:
+                known_metrics[deployment_key] = self._home_deployment_metrics
+                continue
+            cached_metrics = self._deployment_metrics_cache.get(deployment, self._hour_to_run)
+            if cached_metrics is not None:
+                known_metrics[deployment_key] = cached_metrics
+            else:
+                deployments_to_calculate.append(deployment)
+                deployment_keys_to_calculate.add(deployment_key)
+
+        if len(deployments_to_calculate) > 0:
+            calculated_metrics = self._calculate_and_cache_deployment_metrics(deployments_to_calculate)
+            for deployment, deployment_metrics in zip(deployments_to_calculate, calculated_metrics):
+                known_metrics[tuple(deployment)] = deployment_metrics
+                if self._surrogate is not None:
+                    self._update_best_surrogate_metric(deployment, deployment_metrics)
+
+        return [known_metrics[tuple(deployment)] for deployment in deployments]
+
+    def _calculate_and_cache_deployment_metrics(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        self._instrumentation.increment("simulated_deployments", len(deployments))
+        self._instrumentation.increment("simulation_batches")
+        with self._instrumentation.time_phase("simulation"):
+            return self._simulate_and_cache_deployment_metrics(deployments)
+
+    def _simulate_and_cache_deployment_metrics(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        if isinstance(self._deployment_metrics_calculator, VectorizedDeploymentMetricsCalculator) and (
+            len(self._hours_to_run) > 1
+        ):
+            # Only the carbon differs between hours, so the deployments are simulated once and the
+            # metrics of all the hours to run are cached for when the solver gets to those hours.
+            hourly_metrics = self._deployment_metrics_calculator.calculate_hourly_deployment_metrics_batch(
+                deployments, self._hours_to_run
+            )
+            for deployment, deployment_hourly_metrics in zip(deployments, hourly_metrics):
+                for hour_to_run, deployment_metrics in deployment_hourly_metrics.items():
+                    self._deployment_metrics_cache.put(deployment, hour_to_run, deployment_metrics)
+            return [deployment_hourly_metrics[self._hour_to_run] for deployment_hourly_metrics in hourly_metrics]
+
+        calculated_metrics = self._deployment_metrics_calculator.calculate_deployment_metrics_batch(deployments)
+        for deployment, deployment_metrics in zip(deployments, calculated_metrics):
+            self._deployment_metrics_cache.put(deployment, self._hour_to_run, deployment_metrics)
+        return calculated_metrics
+
+    def _is_promising_deployment(self, deployment: list[int]) -> bool:
+        # Without a surrogate, every candidate is worth simulating
+        if self._surrogate is None:
+            return True
+        predicted_metric = self._surrogate.predict(deployment)[self._ranker.number_one_priority]
+        if predicted_metric > self._best_surrogate_metric * (1.0 + SURROGATE_PREFILTER_TOLERANCE):
+            self._instrumentation.increment("surrogate_rejected_deployments")
+            return False
+        return True
+
+    def _update_best_surrogate_metric(self, deployment: list[int], deployment_metrics: dict[str, float]) -> None:
+        # Candidates are compared with the prediction for the best simulated deployment rather than with
+        # its simulated metrics, so that the systematic error of the surrogate cancels out.
+        priority = self._ranker.number_one_priority
+        if deployment_metrics[priority] >= self._best_simulated_metric or self._is_hard_constraint_failed(
+            deployment_metrics
+        ):
+            return
+        self._best_simulated_metric = deployment_metrics[priority]
+        self._best_surrogate_metric = self._surrogate.predict(deployment)[priority]  # type: ignore
+
+    def _check_deployments_in_batches(
+        self, candidate_deployments: Iterable[list[int]], timeout: float = float("inf")
+    ) -> list[tuple[list[int], dict[str, float]]]:
+        deployments = []
+        candidate_deployments_iterator = iter(candidate_deployments)
+        start_time = time.time()
+        while (time.time() - start_time) < timeout:
+            batch = list(islice(candidate_deployments_iterator, DEPLOYMENT_METRICS_BATCH_SIZE))
+            if len(batch) == 0:
+                break
+            for deployment, deployment_metrics in zip(batch, self._calculate_deployment_metrics_batch(batch)):
+                if not self._is_hard_constraint_failed(deployment_metrics):
+                    deployments.append((deployment, deployment_metrics))
+        return deployments
+
     def _initialise_home_deployment(self) -> tuple[list[int], dict[str, float]]:
         home_deployment = [self._home_region_index for _ in range(self._number_of_instances)]
 
-        home_deployment_metrics = self._deployment_metrics_calculator.calculate_deployment_metrics(home_deployment)
+        home_deployment_metrics = self._deployment_metrics_cache.get(home_deployment, self._hour_to_run)
+        if home_deployment_metrics is None:
+            home_deployment_metrics = self._calculate_and_cache_deployment_metrics([home_deployment])[0]
 
         return home_deployment, home_deployment_metrics
 
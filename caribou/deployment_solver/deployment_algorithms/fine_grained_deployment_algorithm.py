@@ -1,51 +1,265 @@
 import time
-from itertools import product
-from typing import Optional
+from itertools import islice, product
+from typing import Iterator, Optional
 
+import numpy as np
+
+from caribou.common.constants import DEPLOYMENT_METRICS_BATCH_SIZE
 from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import DeploymentAlgorithm
+from caribou.deployment_solver.models.dag import DAG
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+
+# Metrics with a lower bound, and whether the bound of a deployment is the maximum (rather than
+# the sum) of the bounds of its instances. The tail bounds are used to check the hard constraints.
+BOUNDED_METRICS = {
+    "average_cost": False,
+    "average_carbon": False,
+    "average_runtime": True,
+    "tail_cost": False,
+    "tail_carbon": False,
+    "tail_runtime": True,
+}
 
 
 class FineGrainedDeploymentAlgorithm(DeploymentAlgorithm):
+    def __init__(
+        self,
+        workflow_config: WorkflowConfig,
+        expiry_time_delta_seconds: int = 604800,
+        n_workers: int = 1,
+        record_transmission_execution_carbon: bool = False,
+        deployment_metrics_calculator_type: str = "simple",
+        lambda_timeout: bool = False,
+        random_seed: Optional[int] = None,
+        n_hour_processes: int = 1,
+        surrogate_prefilter: bool = False,
+        branch_and_bound: bool = False,
+        resumable: bool = False,
+    ) -> None:
+        super().__init__(
+            workflow_config,
+            expiry_time_delta_seconds,
+            n_workers,
+            record_transmission_execution_carbon,
+            deployment_metrics_calculator_type,
+            lambda_timeout=lambda_timeout,
+            random_seed=random_seed,
+            n_hour_processes=n_hour_processes,
+            surrogate_prefilter=surrogate_prefilter,
+            resumable=resumable,
+        )
+        self._branch_and_bound = branch_and_bound
+        # Best number one priority metric of the simulated deployments of the branch and bound
+        self._incumbent_metric = float("inf")
+
     def _run_algorithm(self, timeout: float = float("inf")) -> list[tuple[list[int], dict[str, float]]]:
+        if self._branch_and_bound:
+            return self._generate_branch_and_bound_fine_deployments(timeout)
         deployments = self._generate_all_possible_fine_deployments(timeout)
         return deployments
 
     def _generate_all_possible_fine_deployments(
         self, timeout: float = float("inf")
     ) -> list[tuple[list[int], dict[str, float]]]:
-        deployments = []
-        all_combinations = product(
-            self._region_indexer.get_value_indices().values(),
-            repeat=self._number_of_instances,
-        )
+        deadline = time.time() + timeout
+        return self._check_deployments_in_batches(self._generate_permitted_fine_deployments(deadline), timeout)
+
+    def _generate_permitted_fine_deployments(self, deadline: float) -> Iterator[list[int]]:
+        # Only the permitted regions of every instance are enumerated, rather than filtering all combinations
+        region_indices = set(self._region_indexer.get_value_indices().values())
+        permitted_regions = [
+            sorted(region_indices.intersection(self._per_instance_permitted_regions[instance]))
+            for instance in range(self._number_of_instances)
+        ]
+        for deployment_tuple in product(*permitted_regions):
+            # The clock is checked for every candidate, as many in a row may be filtered out by the surrogate
+            if time.time() >= deadline:
+                return
+            deployment = list(deployment_tuple)
+            if self._is_promising_deployment(deployment):
+                yield deployment
+
+    def _generate_branch_and_bound_fine_deployments(
+        self, timeout: float = float("inf")
+    ) -> list[tuple[list[int], dict[str, float]]]:
+        # Depth first enumeration of the permitted regions of every instance, where a partial
+        # deployment is pruned if an optimistic lower bound of its metrics cannot beat the best
+        # simulated deployment (the incumbent) on the number one priority, or must fail the hard
+        # constraints. Only the complete deployments that survive are simulated, in batches.
         start_time = time.time()
-        for deployment_tuple in all_combinations:
-            if (time.time() - start_time) > timeout:
+        priority = self._ranker.number_one_priority
+        deployments: list[tuple[list[int], dict[str, float]]] = []
+        self._incumbent_metric = float("inf")
+        if not self._is_hard_constraint_failed(self._home_deployment_metrics):
+            deployments.append((self._home_deployment, self._home_deployment_metrics))
+            self._incumbent_metric = self._home_deployment_metrics[priority]
+        # The previous deployment of the hour is usually a good incumbent, pruning from the start
+        warm_start_deployments = self._get_warm_start_deployments()
+        for deployment, deployment_metrics in warm_start_deployments:
+            deployments.append((deployment, deployment_metrics))
+            self._incumbent_metric = min(self._incumbent_metric, deployment_metrics[priority])
+        seeded_deployments = [self._home_deployment] + [deployment for deployment, _ in warm_start_deployments]
+
+        candidate_deployments = (
+            deployment
+            for deployment in self._generate_bounded_deployments(self._get_metric_lower_bounds())
+            if deployment not in seeded_deployments and self._is_promising_deployment(deployment)
+        )
+        while (time.time() - start_time) < timeout:
+            # The candidates are generated lazily, so every batch is pruned with the latest incumbent
+            batch = list(islice(candidate_deployments, DEPLOYMENT_METRICS_BATCH_SIZE))
+            if len(batch) == 0:
                 break
-            deployment = self._generate_and_check_deployment(deployment_tuple)
-            if deployment is not None:
-                deployments.append(deployment)
+            for deployment, deployment_metrics in zip(batch, self._calculate_deployment_metrics_batch(batch)):
+                if self._is_hard_constraint_failed(deployment_metrics):
+                    continue
+                deployments.append((deployment, deployment_metrics))
+                self._incumbent_metric = min(self._incumbent_metric, deployment_metrics[priority])
+
+        if len(deployments) == 0:
+            deployments.append((self._home_deployment, self._home_deployment_metrics))
         return deployments
 
-    def _generate_and_check_deployment(
-        self, deployment_tuple: tuple[int, ...]
-    ) -> Optional[tuple[list[int], dict[str, float]]]:
-        if any(
-            deployment_tuple[instance] not in self._per_instance_permitted_regions[instance]
+    def _generate_bounded_deployments(self, metric_lower_bounds: dict[str, np.ndarray]) -> Iterator[list[int]]:
+        priority_lower_bounds = metric_lower_bounds[self._ranker.number_one_priority]
+
+        # Branch on the instances whose region matters the most first, as they prune the most
+        spreads = [
+            float(np.ptp(priority_lower_bounds[instance, self._per_instance_permitted_regions[instance]]))
             for instance in range(self._number_of_instances)
+        ]
+        instance_order = sorted(range(self._number_of_instances), key=lambda instance: -spreads[instance])
+
+        # Lower bounds of the instances that are not assigned yet, for every depth of the search
+        remaining_lower_bounds: dict[str, list[float]] = {}
+        for metric, lower_bounds in metric_lower_bounds.items():
+            remaining_lower_bounds[metric] = [0.0] * (self._number_of_instances + 1)
+            for position in range(self._number_of_instances - 1, -1, -1):
+                instance = instance_order[position]
+                remaining_lower_bounds[metric][position] = self._combine_lower_bounds(
+                    metric,
+                    remaining_lower_bounds[metric][position + 1],
+                    float(lower_bounds[instance, self._per_instance_permitted_regions[instance]].min()),
+                )
+
+        yield from self._branch(
+            0,
+            [self._home_region_index] * self._number_of_instances,
+            {metric: 0.0 for metric in metric_lower_bounds},
+            instance_order,
+            metric_lower_bounds,
+            remaining_lower_bounds,
+        )
+
+    def _branch(  # pylint: disable=too-many-arguments
+        self,
+        position: int,
+        deployment: list[int],
+        assigned_lower_bounds: dict[str, float],
+        instance_order: list[int],
+        metric_lower_bounds: dict[str, np.ndarray],
+        remaining_lower_bounds: dict[str, list[float]],
+    ) -> Iterator[list[int]]:
+        if position == len(instance_order):
+            yield list(deployment)
+            return
+
+        priority = self._ranker.number_one_priority
+        instance = instance_order[position]
+        # Explore the most promising regions first, to find a good incumbent early
+        for region in sorted(
+            self._per_instance_permitted_regions[instance],
+            key=lambda region_index: metric_lower_bounds[priority][instance, region_index],
         ):
-            return None
+            region_lower_bounds = {
+                metric: self._combine_lower_bounds(
+                    metric, lower_bound, float(metric_lower_bounds[metric][instance, region])
+                )
+                for metric, lower_bound in assigned_lower_bounds.items()
+            }
+            optimistic_metrics = {
+                metric: self._combine_lower_bounds(metric, lower_bound, remaining_lower_bounds[metric][position + 1])
+                for metric, lower_bound in region_lower_bounds.items()
+            }
+            if optimistic_metrics[priority] >= self._incumbent_metric or self._is_hard_constraint_failed(
+                optimistic_metrics
+            ):
+                continue
+
+            deployment[instance] = region
+            yield from self._branch(
+                position + 1,
+                deployment,
+                region_lower_bounds,
+                instance_order,
+                metric_lower_bounds,
+                remaining_lower_bounds,
+            )
 
-        # Type matching
-        deployment: list[int] = list(deployment_tuple)
+    def _combine_lower_bounds(self, metric: str, first_lower_bound: float, second_lower_bound: float) -> float:
+        if BOUNDED_METRICS[metric]:
+            return max(first_lower_bound, second_lower_bound)
+        return first_lower_bound + second_lower_bound
 
-        # Calculate the deployment metrics for the mapping
-        if deployment == self._home_deployment:
-            deployment_metrics = self._home_deployment_metrics
-        else:
-            deployment_metrics = self._deployment_metrics_calculator.calculate_deployment_metrics(deployment)
+    def _get_metric_lower_bounds(self) -> dict[str, np.ndarray]:
+        # Lower bounds of the contribution of every instance in every region, as [instance, region] arrays.
+        # They only account for the execution of the instance with its shortest runtime, as any
+        # transmission only adds to the metrics. Averages weigh the execution by a lower bound of the
+        # invocation probability, tails only count the instances that are always invoked.
+        number_of_regions = max(self._region_indexer.get_value_indices().values()) + 1
+        execution_time = np.full((self._number_of_instances, number_of_regions), np.inf)
+        execution_cost = np.full((self._number_of_instances, number_of_regions), np.inf)
+        execution_carbon = np.full((self._number_of_instances, number_of_regions), np.inf)
+        for instance in range(self._number_of_instances):
+            for region in self._per_instance_permitted_regions[instance]:
+                runtime_distribution = self._input_manager.get_node_runtime_distribution(instance, region, False)
+                shortest_execution_time = (
+                    min(runtime_distribution["runtimes"]) * runtime_distribution["relative_performance"]
+                )
+                execution_factors = self._input_manager.get_execution_factors(instance, region, False)
+                execution_time[instance, region] = shortest_execution_time
+                execution_cost[instance, region] = (
+                    execution_factors["cost_per_second"] * shortest_execution_time
+                    + execution_factors["invocation_cost"]
+                )
+                execution_carbon[instance, region] = (
+                    execution_factors["energy_factor"]
+                    * shortest_execution_time
+                    * self._input_manager.get_grid_carbon_intensity(region, self._hour_to_run)
+                )
 
-        if self._is_hard_constraint_failed(deployment_metrics):
-            return None
+        invocation_probabilities = self._get_invocation_probability_lower_bounds()
+        always_invoked = (invocation_probabilities >= 1.0).astype(np.float64)
+        return {
+            "average_cost": self._weigh_lower_bounds(execution_cost, invocation_probabilities),
+            "average_carbon": self._weigh_lower_bounds(execution_carbon, invocation_probabilities),
+            "average_runtime": self._weigh_lower_bounds(execution_time, invocation_probabilities),
+            "tail_cost": self._weigh_lower_bounds(execution_cost, always_invoked),
+            "tail_carbon": self._weigh_lower_bounds(execution_carbon, always_invoked),
+            "tail_runtime": self._weigh_lower_bounds(execution_time, always_invoked),
+        }
+
+    def _weigh_lower_bounds(self, lower_bounds: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        # Regions that are not permitted keep an infinite bound, the product (0 * inf) is only taken of the finite ones
+        return np.multiply(
+            lower_bounds,
+            weights[:, np.newaxis],
+            out=np.full_like(lower_bounds, np.inf),
+            where=np.isfinite(lower_bounds),
+        )
 
-        return (deployment, deployment_metrics)
+    def _get_invocation_probability_lower_bounds(self) -> np.ndarray:
+        # An instance is invoked at least as often as its most likely incoming edge is triggered
+        dag = DAG(list(self._workflow_config.instances.values()), self._instance_indexer)
+        prerequisites = dag.get_prerequisites_dict()
+        invocation_probabilities = np.zeros(self._number_of_instances)
+        for instance in dag.topological_sort():
+            if len(prerequisites[instance]) == 0:
+                invocation_probabilities[instance] = 1.0
+                continue
+            invocation_probabilities[instance] = max(
+                invocation_probabilities[predecessor]
+                * self._input_manager.get_invocation_probability(predecessor, instance)
+                for predecessor in prerequisites[instance]
+            )
+        return invocation_probabilities
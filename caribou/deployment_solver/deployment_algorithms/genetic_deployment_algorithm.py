@@ -0,0 +1,147 @@
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from caribou.common.constants import DEPLOYMENT_METRICS_BATCH_SIZE
+from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import DeploymentAlgorithm
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+
+
+class GeneticDeploymentAlgorithm(DeploymentAlgorithm):  # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        workflow_config: WorkflowConfig,
+        expiry_time_delta_seconds: int = 604800,
+        n_workers: int = 1,
+        record_transmission_execution_carbon: bool = False,
+        deployment_metrics_calculator_type: str = "simple",
+        lambda_timeout: bool = False,
+        random_seed: Optional[int] = None,
+        n_hour_processes: int = 1,
+        resumable: bool = False,
+    ) -> None:
+        super().__init__(
+            workflow_config,
+            expiry_time_delta_seconds,
+            n_workers,
+            record_transmission_execution_carbon,
+            deployment_metrics_calculator_type,
+            lambda_timeout=lambda_timeout,
+            random_seed=random_seed,
+            n_hour_processes=n_hour_processes,
+            resumable=resumable,
+        )
+        self._setup()
+
+    def _setup(self) -> None:
+        # Every generation is evaluated as a single batch of the deployment metrics calculator
+        self._population_size = DEPLOYMENT_METRICS_BATCH_SIZE * 2
+        self._elite_size = 2
+        self._tournament_size = 3
+        # On average, one instance of every child is moved to a random permitted region
+        self._mutation_probability = 1.0 / self._number_of_instances
+        # Same budget of evaluated deployments as the stochastic heuristic
+        self._num_generations = math.ceil(
+            len(self._region_indexer.get_value_indices().values())
+            * len(self._instance_indexer.get_value_indices().values())
+            * 3
+            / self._population_size
+        )
+        self._random_generator = np.random.default_rng(self._input_manager.get_random_stream().seed)
+
+        # The permitted regions of every instance, padded into a table to sample them all at once
+        self._permitted_region_counts = np.array(
+            [len(permitted_regions) for permitted_regions in self._per_instance_permitted_regions], dtype=np.int64
+        )
+        self._permitted_region_table = np.zeros(
+            (self._number_of_instances, int(self._permitted_region_counts.max())), dtype=np.int64
+        )
+        for instance, permitted_regions in enumerate(self._per_instance_permitted_regions):
+            self._permitted_region_table[instance, : len(permitted_regions)] = permitted_regions
+
+    def _run_algorithm(self, timeout: float = float("inf")) -> list[tuple[list[int], dict[str, float]]]:
+        start_time = time.time()
+        evaluated_deployments: dict[tuple[int, ...], tuple[list[int], dict[str, float]]] = {}
+
+        population = self._generate_initial_population()
+        fitness = self._evaluate_population(population, evaluated_deployments)
+        for _ in range(self._num_generations):
+            if (time.time() - start_time) >= timeout:
+                break
+
+            elites = np.argsort(fitness, kind="stable")[: self._elite_size]
+            children = self._mutate(self._crossover(population, fitness))[: self._population_size - len(elites)]
+            children_fitness = self._evaluate_population(children, evaluated_deployments)
+
+            population = np.concatenate((population[elites], children))
+            fitness = np.concatenate((fitness[elites], children_fitness))
+            self._instrumentation.increment("genetic_generations")
+
+        deployments = list(evaluated_deployments.values())
+        if len(deployments) == 0:
+            deployments.append((self._home_deployment, self._home_deployment_metrics))
+        return deployments
+
+    def _generate_initial_population(self) -> np.ndarray:
+        # Seed the population with the home deployment, the previous deployment of the hour and the
+        # permitted coarse deployments, the rest of the population are random permitted deployments.
+        seeded_deployments = [self._home_deployment]
+        previous_deployment = self._get_previous_deployment(self._hour_to_run)
+        if previous_deployment is not None and previous_deployment != self._home_deployment:
+            seeded_deployments.append(previous_deployment)
+        seeded_deployments += [
+            deployment
+            for deployment in (
+                [region_index] * self._number_of_instances
+                for region_index in self._region_indexer.get_value_indices().values()
+            )
+            if self._is_permitted_deployment(deployment) and deployment not in seeded_deployments
+        ]
+        seeded_population = np.array(seeded_deployments[: self._population_size], dtype=np.int64)
+        random_population = self._sample_permitted_regions(self._population_size - len(seeded_population))
+        return np.concatenate((seeded_population, random_population))
+
+    def _sample_permitted_regions(self, number_of_deployments: int) -> np.ndarray:
+        region_choices = (
+            self._random_generator.random((number_of_deployments, self._number_of_instances))
+            * self._permitted_region_counts
+        ).astype(np.int64)
+        return self._permitted_region_table[np.arange(self._number_of_instances), region_choices]
+
+    def _evaluate_population(
+        self,
+        population: np.ndarray,
+        evaluated_deployments: dict[tuple[int, ...], tuple[list[int], dict[str, float]]],
+    ) -> np.ndarray:
+        # The fitness is the number one priority metric, deployments failing the hard constraints
+        # are kept out of the results and never selected as parents.
+        deployments: list[list[int]] = population.tolist()
+        fitness = np.full(len(deployments), np.inf)
+        for index, (deployment, deployment_metrics) in enumerate(
+            zip(deployments, self._calculate_deployment_metrics_batch(deployments))
+        ):
+            if self._is_hard_constraint_failed(deployment_metrics):
+                continue
+            fitness[index] = deployment_metrics[self._ranker.number_one_priority]
+            evaluated_deployments[tuple(deployment)] = (deployment, deployment_metrics)
+        return fitness
+
+    def _select_parents(self, fitness: np.ndarray, number_of_parents: int) -> np.ndarray:
+        # Tournament selection, the fittest of a few random individuals becomes a parent
+        tournaments = self._random_generator.integers(0, len(fitness), size=(number_of_parents, self._tournament_size))
+        winners = np.argmin(fitness[tournaments], axis=1)
+        return tournaments[np.arange(number_of_parents), winners]
+
+    def _crossover(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        # Uniform crossover, every instance is taken from either parent, so that the
+        # children only ever use permitted regions.
+        first_parents = population[self._select_parents(fitness, self._population_size)]
+        second_parents = population[self._select_parents(fitness, self._population_size)]
+        from_first_parent = self._random_generator.random(first_parents.shape) < 0.5
+        return np.where(from_first_parent, first_parents, second_parents)
+
+    def _mutate(self, children: np.ndarray) -> np.ndarray:
+        mutations = self._random_generator.random(children.shape) < self._mutation_probability
+        return np.where(mutations, self._sample_permitted_regions(len(children)), children)
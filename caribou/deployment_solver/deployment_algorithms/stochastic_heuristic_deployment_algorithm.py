@@ -1,13 +1,23 @@
+import multiprocessing
 import random
 import time
 from copy import deepcopy
-from typing import Optional
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Optional
 
+import numpy as np
+
+from caribou.common.constants import (
+    DEPLOYMENT_METRICS_BATCH_SIZE,
+    SOLVER_WORKER_SHUTDOWN_TIMEOUT,
+    STOCHASTIC_HEURISTIC_MIGRATION_INTERVAL,
+)
 from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import DeploymentAlgorithm
 from caribou.deployment_solver.workflow_config import WorkflowConfig
 
 
-class StochasticHeuristicDeploymentAlgorithm(DeploymentAlgorithm):
+class StochasticHeuristicDeploymentAlgorithm(DeploymentAlgorithm):  # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
         workflow_config: WorkflowConfig,
@@ -16,6 +26,11 @@ class StochasticHeuristicDeploymentAlgorithm(DeploymentAlgorithm):
         record_transmission_execution_carbon: bool = False,
         deployment_metrics_calculator_type: str = "simple",
         lambda_timeout: bool = False,
+        random_seed: Optional[int] = None,
+        n_hour_processes: int = 1,
+        surrogate_prefilter: bool = False,
+        n_chains: int = 1,
+        resumable: bool = False,
     ) -> None:
         super().__init__(
             workflow_config,
@@ -24,7 +39,16 @@ class StochasticHeuristicDeploymentAlgorithm(DeploymentAlgorithm):
             record_transmission_execution_carbon,
             deployment_metrics_calculator_type,
             lambda_timeout=lambda_timeout,
+            random_seed=random_seed,
+            n_hour_processes=n_hour_processes,
+            surrogate_prefilter=surrogate_prefilter,
+            resumable=resumable,
         )
+        # Several chains (islands) are run in forked processes, exchanging their best deployments
+        self._n_chains = n_chains
+        if n_chains > 1 and not self._can_fork_solver():
+            print("Running a single chain, as the deployment metrics calculator cannot be forked")
+            self._n_chains = 1
         self._setup()
 
     def _setup(self) -> None:
@@ -44,88 +68,306 @@ class StochasticHeuristicDeploymentAlgorithm(DeploymentAlgorithm):
             self._max_number_combinations *= len(self._per_instance_permitted_regions[instance])
 
     def _run_algorithm(self, timeout: float = float("inf")) -> list[tuple[list[int], dict[str, float]]]:
+        if self._search_state is not None and self._n_chains == 1:
+            # Continue the search of the hour where the previous invocation stopped
+            return self._resume_stochastic_heuristic_deployments(self._search_state, timeout=timeout)
         start_time = time.time()
         remaining_time = timeout
         self._best_deployment_metrics = deepcopy(  # pylint: disable=attribute-defined-outside-init
             self._home_deployment_metrics
         )
-        deployments = self._generate_all_possible_coarse_deployments(timeout=remaining_time)
+        # The chains start from the previous deployment of the hour, which is re-evaluated first
+        initial_deployment = self._home_deployment
+        warm_start_deployments = self._get_warm_start_deployments()
+        for deployment, deployment_metrics in warm_start_deployments:
+            initial_deployment = deployment
+            if (
+                deployment_metrics[self._ranker.number_one_priority]
+                < self._best_deployment_metrics[self._ranker.number_one_priority]
+            ):
+                self._best_deployment_metrics = deepcopy(  # pylint: disable=attribute-defined-outside-init
+                    deployment_metrics
+                )
+                self._store_bias_regions(deployment, self._home_deployment)
+        with self._instrumentation.time_phase("coarse_sweep"):
+            deployments = warm_start_deployments + self._generate_all_possible_coarse_deployments(
+                timeout=remaining_time
+            )
         if len(deployments) == 0:
             deployments.append((self._home_deployment, self._home_deployment_metrics))
         remaining_time -= time.time() - start_time
         if remaining_time <= 0:
             return deployments
-        self._generate_stochastic_heuristic_deployments(deployments, timeout=remaining_time)
+        with self._instrumentation.time_phase("heuristic_search"):
+            if self._n_chains > 1:
+                self._generate_island_model_deployments(
+                    deployments, timeout=remaining_time, initial_deployment=initial_deployment
+                )
+            else:
+                self._generate_stochastic_heuristic_deployments(
+                    deployments, timeout=remaining_time, initial_deployment=initial_deployment
+                )
         return deployments
 
     def _generate_stochastic_heuristic_deployments(
-        self, deployments: list[tuple[list[int], dict[str, float]]], timeout: float = float("inf")
+        self,
+        deployments: list[tuple[list[int], dict[str, float]]],
+        timeout: float = float("inf"),
+        initial_deployment: Optional[list[int]] = None,
     ) -> None:
-        start_time = time.time()
+        generated_deployments: set[tuple[int, ...]] = {tuple(deployment) for deployment, _ in deployments}
+        current_deployment, n_iterations = self._advance_chain(
+            deepcopy(initial_deployment if initial_deployment is not None else self._home_deployment),
+            deployments,
+            generated_deployments,
+            self._num_iterations,
+            time.time() + timeout,
+        )
+        if self._resumable:
+            self._search_state = self._get_search_state(
+                current_deployment, deployments, generated_deployments, self._num_iterations - n_iterations
+            )
 
-        current_deployment = deepcopy(self._home_deployment)
+    def _resume_stochastic_heuristic_deployments(
+        self, search_state: dict[str, Any], timeout: float = float("inf")
+    ) -> list[tuple[list[int], dict[str, float]]]:
+        self._temperature = search_state["temperature"]
+        self._bias_regions = set(search_state["bias_regions"])
+        self._best_deployment_metrics = search_state[  # pylint: disable=attribute-defined-outside-init
+            "best_deployment_metrics"
+        ]
+        deployments: list[tuple[list[int], dict[str, float]]] = search_state["deployments"]
+        generated_deployments = {tuple(deployment) for deployment in search_state["generated_deployments"]}
+        current_deployment, n_iterations = self._advance_chain(
+            search_state["current_deployment"],
+            deployments,
+            generated_deployments,
+            search_state["remaining_iterations"],
+            time.time() + timeout,
+        )
+        self._search_state = self._get_search_state(
+            current_deployment,
+            deployments,
+            generated_deployments,
+            search_state["remaining_iterations"] - n_iterations,
+        )
+        return deployments
 
-        generated_deployments: set[tuple[int, ...]] = {tuple(deployment) for deployment, _ in deployments}
-        for _ in range(self._num_iterations):
-            if len(generated_deployments) >= self._max_number_combinations or (time.time() - start_time) >= timeout:
+    def _get_search_state(
+        self,
+        current_deployment: list[int],
+        deployments: list[tuple[list[int], dict[str, float]]],
+        generated_deployments: set[tuple[int, ...]],
+        remaining_iterations: int,
+    ) -> dict[str, Any]:
+        return {
+            "current_deployment": current_deployment,
+            "deployments": deployments,
+            "generated_deployments": [list(deployment) for deployment in generated_deployments],
+            "remaining_iterations": remaining_iterations,
+            "temperature": self._temperature,
+            "bias_regions": sorted(self._bias_regions),
+            "best_deployment_metrics": self._best_deployment_metrics,
+        }
+
+    def _advance_chain(
+        self,
+        current_deployment: list[int],
+        deployments: list[tuple[list[int], dict[str, float]]],
+        generated_deployments: set[tuple[int, ...]],
+        n_iterations: int,
+        deadline: float,
+    ) -> tuple[list[int], int]:
+        # Runs up to n_iterations proposals from the current deployment, appending the accepted
+        # deployments. Returns the new current deployment and the number of proposals made.
+        iteration = 0
+        while iteration < n_iterations:
+            if len(generated_deployments) >= self._max_number_combinations or time.time() >= deadline:
                 break
 
-            new_deployment = self._generate_new_deployment(current_deployment)
-            if tuple(new_deployment) in generated_deployments:
+            # Propose a batch of new deployments from the current deployment
+            new_deployments: list[list[int]] = []
+            while (
+                iteration < n_iterations
+                and len(new_deployments) < DEPLOYMENT_METRICS_BATCH_SIZE
+                and len(generated_deployments) < self._max_number_combinations
+            ):
+                iteration += 1
+                new_deployment = self._generate_new_deployment(current_deployment)
+                if tuple(new_deployment) in generated_deployments:
+                    continue
+                generated_deployments.add(
+                    tuple(new_deployment)
+                )  # Add the current deployment to the set (as it is generated)
+                if not self._is_promising_deployment(new_deployment):
+                    continue
+                new_deployments.append(new_deployment)
+
+            if len(new_deployments) == 0:
                 continue
-            generated_deployments.add(
-                tuple(new_deployment)
-            )  # Add the current deployment to the set (as it is generated)
 
-            new_deployment_metrics = self._deployment_metrics_calculator.calculate_deployment_metrics(new_deployment)
+            for new_deployment, new_deployment_metrics in zip(
+                new_deployments, self._calculate_deployment_metrics_batch(new_deployments)
+            ):
+                if self._is_hard_constraint_failed(new_deployment_metrics):
+                    continue
 
-            if self._is_hard_constraint_failed(new_deployment_metrics):
-                continue
+                if self._is_improvement(new_deployment_metrics, new_deployment, current_deployment):
+                    current_deployment = deepcopy(new_deployment)
+                    deployments.append((current_deployment, new_deployment_metrics))
 
-            if self._is_improvement(new_deployment_metrics, new_deployment, current_deployment):
-                current_deployment = deepcopy(new_deployment)
-                deployments.append((current_deployment, new_deployment_metrics))
+                self._temperature *= 0.99
 
-            self._temperature *= 0.99
+            # The chains of the island model are not checkpointed, their hour is started over instead
+            if self._is_checkpoint_due() and self._n_chains == 1:
+                self._checkpoint_search(
+                    self._get_search_state(
+                        current_deployment, deployments, generated_deployments, n_iterations - iteration
+                    )
+                )
 
-    def _generate_all_possible_coarse_deployments(
-        self, timeout: float = float("inf")
-    ) -> list[tuple[list[int], dict[str, float]]]:
-        deployments = []
-        start_time = time.time()
-        for index_value in self._region_indexer.get_value_indices().values():
-            if (time.time() - start_time) > timeout:
-                break
-            deployment = self._generate_and_check_deployment(index_value)
-            if deployment is not None:
-                deployments.append(deployment)
-        return deployments
+        self._instrumentation.increment("heuristic_iterations", iteration)
+        return current_deployment, iteration
 
-    def _generate_and_check_deployment(self, region_index: int) -> Optional[tuple[list[int], dict[str, float]]]:
-        if any(
-            region_index not in self._per_instance_permitted_regions[instance_index]
-            for instance_index in range(self._number_of_instances)
-        ):
-            return None
-        deployment = self._generate_deployment(region_index)
-        if deployment == self._home_deployment:
-            deployment_metrics = self._home_deployment_metrics
-        else:
-            deployment_metrics = self._deployment_metrics_calculator.calculate_deployment_metrics(deployment)
+    def _generate_island_model_deployments(
+        self,
+        deployments: list[tuple[list[int], dict[str, float]]],
+        timeout: float = float("inf"),
+        initial_deployment: Optional[list[int]] = None,
+    ) -> None:
+        # Every chain runs in a process forked from the solver (sharing its inputs) with its own seed.
+        # After every migration interval, the chains report their accepted deployments, and the best
+        # deployment and the bias regions found by any chain are sent back to all of them.
+        # Pipes are used instead of a pool, as pools are not supported on AWS Lambda.
+        context = multiprocessing.get_context("fork")
+        deadline = time.time() + timeout
+        seed_sequences = np.random.SeedSequence(self._input_manager.get_random_stream().seed).spawn(self._n_chains)
+
+        chains: list[tuple[BaseProcess, Connection]] = []
+        for seed_sequence in seed_sequences:
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=self._chain_worker,
+                args=(
+                    int(seed_sequence.generate_state(1)[0]),
+                    deadline,
+                    deployments,
+                    initial_deployment if initial_deployment is not None else self._home_deployment,
+                    child_connection,
+                    [connection for _, connection in chains] + [parent_connection],
+                ),
+            )
+            process.start()
+            # Only the chain holds its end of the pipe, such that the pipe is closed if the chain dies
+            child_connection.close()
+            chains.append((process, parent_connection))
 
-        if self._is_hard_constraint_failed(deployment_metrics):
-            return None
+        priority = self._ranker.number_one_priority
+        best_deployment, best_deployment_metrics = min(deployments, key=lambda deployment: deployment[1][priority])
+        known_deployments: set[tuple[int, ...]] = {tuple(deployment) for deployment, _ in deployments}
+        bias_regions: set[int] = set(self._bias_regions)
+        active_connections = [parent_connection for _, parent_connection in chains]
+        try:
+            while len(active_connections) > 0:
+                migrating_connections = []
+                for parent_connection in active_connections:
+                    accepted_deployments, chain_bias_regions, finished = self._receive_from_worker(
+                        parent_connection, deadline + SOLVER_WORKER_SHUTDOWN_TIMEOUT
+                    )
+                    for deployment, deployment_metrics in accepted_deployments:
+                        if tuple(deployment) not in known_deployments:
+                            known_deployments.add(tuple(deployment))
+                            deployments.append((deployment, deployment_metrics))
+                        if deployment_metrics[priority] < best_deployment_metrics[priority]:
+                            best_deployment, best_deployment_metrics = deployment, deployment_metrics
+                    bias_regions.update(chain_bias_regions)
+                    if not finished:
+                        migrating_connections.append(parent_connection)
 
-        if (
-            deployment_metrics[self._ranker.number_one_priority]
-            < self._best_deployment_metrics[self._ranker.number_one_priority]
-        ):
+                for parent_connection in migrating_connections:
+                    parent_connection.send((best_deployment, best_deployment_metrics, bias_regions))
+                active_connections = migrating_connections
+        finally:
+            self._stop_workers(chains)
+
+        self._best_deployment_metrics = deepcopy(  # pylint: disable=attribute-defined-outside-init
+            best_deployment_metrics
+        )
+        self._bias_regions = bias_regions
+
+    def _chain_worker(
+        self,
+        seed: int,
+        deadline: float,
+        deployments: list[tuple[list[int], dict[str, float]]],
+        initial_deployment: list[int],
+        connection: Connection,
+        inherited_connections: list[Connection],
+    ) -> None:
+        # The forked chain holds copies of the coordinator's ends of the pipes (of its own and of the chains
+        # started before it), which would keep them open if the coordinator closed them after an error
+        for inherited_connection in inherited_connections:
+            inherited_connection.close()
+        random.seed(seed)
+        current_deployment = deepcopy(initial_deployment)
+        generated_deployments: set[tuple[int, ...]] = {tuple(deployment) for deployment, _ in deployments}
+        remaining_iterations = self._num_iterations
+        try:
+            while True:
+                accepted_deployments: list[tuple[list[int], dict[str, float]]] = []
+                current_deployment, n_iterations = self._advance_chain(
+                    current_deployment,
+                    accepted_deployments,
+                    generated_deployments,
+                    min(STOCHASTIC_HEURISTIC_MIGRATION_INTERVAL, remaining_iterations),
+                    deadline,
+                )
+                remaining_iterations -= n_iterations
+                finished = n_iterations == 0 or remaining_iterations <= 0
+                connection.send((accepted_deployments, self._bias_regions, finished))
+                if finished:
+                    break
+
+                current_deployment = self._migrate(current_deployment, connection.recv())
+        except (EOFError, BrokenPipeError):
+            # The search was stopped by another chain failing
+            pass
+        except Exception as e:  # pylint: disable=broad-except
+            connection.send(e)
+        finally:
+            connection.close()
+
+    def _migrate(self, current_deployment: list[int], migration: tuple[list[int], dict[str, float], Any]) -> list[int]:
+        best_deployment, best_deployment_metrics, bias_regions = migration
+        self._bias_regions.update(bias_regions)
+        priority = self._ranker.number_one_priority
+        if best_deployment_metrics[priority] < self._best_deployment_metrics[priority]:
+            # Another chain found a better deployment, continue the search from there
             self._best_deployment_metrics = deepcopy(  # pylint: disable=attribute-defined-outside-init
-                deployment_metrics
+                best_deployment_metrics
             )
-            self._store_bias_regions(deployment, self._home_deployment)
+            return deepcopy(best_deployment)
+        return current_deployment
 
-        return (deployment, deployment_metrics)
+    def _generate_all_possible_coarse_deployments(
+        self, timeout: float = float("inf")
+    ) -> list[tuple[list[int], dict[str, float]]]:
+        candidate_deployments = (
+            deployment
+            for deployment in map(self._generate_deployment, self._region_indexer.get_value_indices().values())
+            if self._is_permitted_deployment(deployment)
+        )
+        deployments = self._check_deployments_in_batches(candidate_deployments, timeout)
+        for deployment, deployment_metrics in deployments:
+            if (
+                deployment_metrics[self._ranker.number_one_priority]
+                < self._best_deployment_metrics[self._ranker.number_one_priority]
+            ):
+                self._best_deployment_metrics = deepcopy(  # pylint: disable=attribute-defined-outside-init
+                    deployment_metrics
+                )
+                self._store_bias_regions(deployment, self._home_deployment)
+        return deployments
 
     def _generate_deployment(self, region_index: int) -> list[int]:
         return [region_index for _ in range(self._number_of_instances)]
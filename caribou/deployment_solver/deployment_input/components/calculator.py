@@ -5,9 +5,17 @@ from typing import Any
 class InputCalculator(ABC):
     _data_cache: dict[str, Any]
 
+    def __init__(self) -> None:
+        # Number of lookups answered by the caches of the calculator, and of those that had to be calculated
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def setup(self) -> None:
         self._data_cache = {}
 
+    def get_cache_statistics(self) -> dict[str, int]:
+        return {"cache_hits": self._cache_hits, "cache_misses": self._cache_misses}
+
     def __str__(self) -> str:
         return f"InputCalculator(name={self.__class__.__name__})"
 
@@ -95,6 +95,17 @@ class CarbonCalculator(InputCalculator):  # pylint: disable=too-many-instance-at
 
         return execution_carbon, transmission_carbon
 
+    def get_grid_carbon_intensity(self, region_name: str, carbon_setting: Optional[str]) -> float:
+        return self._carbon_loader.get_grid_carbon_intensity(region_name, carbon_setting)
+
+    def get_execution_energy_factor(self, instance_name: str, region_name: str, is_redirector: bool) -> float:
+        # The grid energy (kWh) drawn per second of execution, such that the execution
+        # carbon is this factor multiplied by the execution time and the grid carbon intensity.
+        compute_factor_kw_h, memory_factor_kw_h, grid_factor = self._get_execution_energy_factors(
+            instance_name, region_name, is_redirector
+        )
+        return (compute_factor_kw_h + memory_factor_kw_h) * grid_factor
+
     def _calculate_data_transfer_carbon(
         self,
         current_region_name: Optional[str],
@@ -211,8 +222,31 @@ class CarbonCalculator(InputCalculator):  # pylint: disable=too-many-instance-at
         # Check if the conversion ratio is in the cache
         cache_key = f"{instance_name}_{region_name}"
         if cache_key in self._execution_conversion_ratio_cache:
+            self._cache_hits += 1
             return self._execution_conversion_ratio_cache[cache_key]
+        self._cache_misses += 1
+
+        compute_factor_kw_h, memory_factor_kw_h, grid_factor = self._get_execution_energy_factors(
+            instance_name, region_name, is_redirector
+        )
+
+        ## Get the carbon intensity of the grid in the given region (gCO2e/kWh)
+        grid_co2e_gco2e_kwh: float = self._carbon_loader.get_grid_carbon_intensity(
+            region_name, self._hourly_carbon_setting
+        )
+        power_factor_gco2e_kwh = grid_factor * grid_co2e_gco2e_kwh
 
+        # Add the conversion ratio to the cache
+        self._execution_conversion_ratio_cache[cache_key] = (
+            compute_factor_kw_h,
+            memory_factor_kw_h,
+            power_factor_gco2e_kwh,
+        )
+        return self._execution_conversion_ratio_cache[cache_key]
+
+    def _get_execution_energy_factors(
+        self, instance_name: str, region_name: str, is_redirector: bool
+    ) -> tuple[float, float, float]:
         ## Get the average power consumption of the instance in the given region (kw_GB)
         average_memory_power_kw_gb: float = self._datacenter_loader.get_average_memory_power(region_name)
 
@@ -224,11 +258,6 @@ class CarbonCalculator(InputCalculator):  # pylint: disable=too-many-instance-at
         ## Get the power usage effectiveness of the datacenter in the given region
         pue: float = self._datacenter_loader.get_pue(region_name)
 
-        ## Get the carbon intensity of the grid in the given region (gCO2e/kWh)
-        grid_co2e_gco2e_kwh: float = self._carbon_loader.get_grid_carbon_intensity(
-            region_name, self._hourly_carbon_setting
-        )
-
         ## Get the number of vCPUs and Memory of the instance
         provider, _ = region_name.split(":")  # Get the provider from the region name
         vcpu: float = self._workflow_loader.get_vcpu(instance_name, provider)
@@ -247,15 +276,11 @@ class CarbonCalculator(InputCalculator):  # pylint: disable=too-many-instance-at
 
         compute_factor_kw_h = average_cpu_power_kw * vcpu / 3600
         memory_factor_kw_h = average_memory_power_kw_gb * memory_gb / 3600
-        power_factor_gco2e_kwh = (1 - cfe) * pue * grid_co2e_gco2e_kwh
 
-        # Add the conversion ratio to the cache
-        self._execution_conversion_ratio_cache[cache_key] = (
-            compute_factor_kw_h,
-            memory_factor_kw_h,
-            power_factor_gco2e_kwh,
-        )
-        return self._execution_conversion_ratio_cache[cache_key]
+        # Portion of the consumed energy that is drawn from the grid
+        grid_factor = (1 - cfe) * pue
+
+        return compute_factor_kw_h, memory_factor_kw_h, grid_factor
 
     def to_dict(self) -> dict[str, Any]:
         return {
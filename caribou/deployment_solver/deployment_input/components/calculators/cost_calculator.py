@@ -86,6 +86,19 @@ class CostCalculator(InputCalculator):
 
         return total_cost
 
+    def get_execution_cost_factors(self, instance_name: str, region_name: str) -> tuple[float, float]:
+        # Returns the cost per second of execution (USD / s) and the cost per invocation (USD)
+        return self._get_execution_conversion_ratio(instance_name, region_name)
+
+    def get_region_cost_factors(self, region_name: str) -> dict[str, float]:
+        read_cost, write_cost = self._datacenter_loader.get_dynamodb_read_write_cost(region_name)
+        return {
+            "transmission_cost": self._datacenter_loader.get_transmission_cost(region_name, True),
+            "dynamodb_read_cost": read_cost,
+            "dynamodb_write_cost": write_cost,
+            "sns_request_cost": self._datacenter_loader.get_sns_request_cost(region_name),
+        }
+
     def _calculate_dynamodb_cost(
         self, current_region_name: str, dynamodb_read_capacity: float, dynamodb_write_capacity: float
     ) -> float:
@@ -160,7 +173,9 @@ class CostCalculator(InputCalculator):
         # Check if the conversion ratio is in the cache
         key = instance_name + "_" + region_name
         if key in self._execution_conversion_ratio_cache:
+            self._cache_hits += 1
             return self._execution_conversion_ratio_cache[key]
+        self._cache_misses += 1
 
         # Get the number of vCPUs and Memory of the instance
         provider, _ = region_name.split(":")
@@ -1,4 +1,3 @@
-import random
 from typing import Any, Optional
 
 import numpy as np
@@ -8,20 +7,56 @@ from caribou.deployment_solver.deployment_input.components.calculator import Inp
 from caribou.deployment_solver.deployment_input.components.loaders.performance_loader import PerformanceLoader
 from caribou.deployment_solver.deployment_input.components.loaders.workflow_loader import WorkflowLoader
 from caribou.deployment_solver.models.indexer import Indexer
+from caribou.deployment_solver.models.random_stream import RandomStream
 
 
-class RuntimeCalculator(InputCalculator):
-    def __init__(self, performance_loader: PerformanceLoader, workflow_loader: WorkflowLoader) -> None:
+class RuntimeCalculator(InputCalculator):  # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        performance_loader: PerformanceLoader,
+        workflow_loader: WorkflowLoader,
+        random_stream: Optional[RandomStream] = None,
+    ) -> None:
         super().__init__()
         self._performance_loader: PerformanceLoader = performance_loader
         self._workflow_loader: WorkflowLoader = workflow_loader
+        self._random_stream: RandomStream = random_stream if random_stream is not None else RandomStream()
         self._transmission_latency_distribution_cache: dict[str, list[float]] = {}
         self._transmission_size_distribution_cache: dict[str, list[float]] = {}
 
+        # Fallback latency of the region pairs, indexed by [from_region, to_region]
+        self._fallback_region_indices: dict[str, int] = {}
+        self._fallback_latency_differences: np.ndarray = np.zeros((0, 0))
+        self._home_region_latency_distribution_cache: dict[tuple[str, str, float], list[float]] = {}
+
     def reset_cache(self) -> None:
         self._transmission_latency_distribution_cache = {}
         self._transmission_size_distribution_cache = {}
 
+    def setup_fallback_latencies(self, region_names: list[str]) -> None:
+        """
+        Precomputes, for every pair of the given regions, the added cloud ping latency
+        over the home region used when a transmission has no measured latency.
+        None of this depends on the carbon setting, so it is computed once per solve.
+        """
+        home_region_average_latency = self._get_average_cloud_ping_latency(
+            self._workflow_loader.get_home_region(), self._workflow_loader.get_home_region()
+        )
+        average_latencies = np.array(
+            [
+                [
+                    self._get_average_cloud_ping_latency(from_region_name, to_region_name)
+                    for to_region_name in region_names
+                ]
+                for from_region_name in region_names
+            ],
+            dtype=np.float64,
+        ).reshape(len(region_names), len(region_names))
+
+        # The difference in latency to the home region should never be below 0
+        self._fallback_latency_differences = np.maximum(average_latencies - home_region_average_latency, 0.0)
+        self._fallback_region_indices = {region_name: index for index, region_name in enumerate(region_names)}
+
     def calculate_simulated_transmission_size_and_latency(
         self,
         from_instance_name: str,
@@ -31,6 +66,34 @@ class RuntimeCalculator(InputCalculator):
         from_region_name: str,
         to_region_name: str,
     ) -> tuple[float, float]:
+        (
+            transmission_size,
+            transmission_latency_distribution,
+        ) = self.get_simulated_transmission_size_and_latency_distribution(
+            from_instance_name,
+            uninvoked_instance_name,
+            simulated_sync_predecessor_name,
+            sync_node_name,
+            from_region_name,
+            to_region_name,
+        )
+
+        # Pick a transmission latency
+        transmission_latency: float = transmission_latency_distribution[
+            int(self._random_stream.random() * (len(transmission_latency_distribution) - 1))
+        ]
+
+        return transmission_size, transmission_latency
+
+    def get_simulated_transmission_size_and_latency_distribution(
+        self,
+        from_instance_name: str,
+        uninvoked_instance_name: str,
+        simulated_sync_predecessor_name: str,
+        sync_node_name: str,
+        from_region_name: str,
+        to_region_name: str,
+    ) -> tuple[float, list[float]]:
         sync_to_from_instance = f"{simulated_sync_predecessor_name}>{sync_node_name}"
 
         # Get the average transmission size of the from_instance to the sync node from
@@ -62,12 +125,7 @@ class RuntimeCalculator(InputCalculator):
                 False,  # Does not affect the latency (as it is never the start hop)
             )
 
-        # Pick a transmission latency
-        transmission_latency: float = transmission_latency_distribution[
-            int(random.random() * (len(transmission_latency_distribution) - 1))
-        ]
-
-        return transmission_size, transmission_latency
+        return transmission_size, transmission_latency_distribution
 
     def calculate_transmission_size_and_latency(
         self,
@@ -87,7 +145,7 @@ class RuntimeCalculator(InputCalculator):
 
         # Pick a transmission size
         transmission_size: float = transmission_size_distribution[
-            int(random.random() * (len(transmission_size_distribution) - 1))
+            int(self._random_stream.random() * (len(transmission_size_distribution) - 1))
         ]
 
         # Get the transmission latency distribution of the input size
@@ -103,11 +161,40 @@ class RuntimeCalculator(InputCalculator):
 
         # Pick a transmission latency
         transmission_latency: float = transmission_latency_distribution[
-            int(random.random() * (len(transmission_latency_distribution) - 1))
+            int(self._random_stream.random() * (len(transmission_latency_distribution) - 1))
         ]
 
         return transmission_size, transmission_latency
 
+    def get_transmission_size_and_latency_distributions(
+        self,
+        from_instance_name: Optional[str],
+        from_region_name: Optional[str],
+        to_instance_name: str,
+        to_region_name: str,
+        is_sync_predecessor: bool,
+        consider_from_client_latency: bool,
+    ) -> tuple[list[float], list[list[float]]]:
+        # Retrieve the whole size distribution together with the latency distribution
+        # of every size in it, such that sampling can be done outside of this class.
+        transmission_size_distribution: list[float] = self._get_transmission_size_distribution(
+            from_instance_name, to_instance_name
+        )
+        transmission_latency_distributions: list[list[float]] = [
+            self._get_transmission_latency_distribution(
+                from_instance_name,
+                from_region_name,
+                to_instance_name,
+                to_region_name,
+                transmission_size,
+                is_sync_predecessor,
+                consider_from_client_latency,
+            )
+            for transmission_size in transmission_size_distribution
+        ]
+
+        return transmission_size_distribution, transmission_latency_distributions
+
     def _get_transmission_latency_distribution(
         self,
         from_instance_name: Optional[str],
@@ -120,7 +207,9 @@ class RuntimeCalculator(InputCalculator):
     ) -> list[float]:
         cache_key = f"{from_instance_name}-{to_instance_name}-{from_region_name}-{to_region_name}-{data_transfer_size}"
         if cache_key in self._transmission_latency_distribution_cache:
+            self._cache_hits += 1
             return self._transmission_latency_distribution_cache[cache_key]
+        self._cache_misses += 1
 
         if from_instance_name and from_region_name:
             transmission_latency_distribution = self._workflow_loader.get_latency_distribution(
@@ -168,37 +257,13 @@ class RuntimeCalculator(InputCalculator):
         is_sync_predecessor: bool,
     ) -> list[float]:
         # No size information, we rely on performance loader to get the transmission latency
-        # between two regions from cloud ping.
-        cloud_ping_transmission_latency_distribution = self._performance_loader.get_transmission_latency_distribution(
-            from_region_name, to_region_name
-        )
-        average_cloud_ping_transmission_latency_performance: float = float(
-            np.mean(cloud_ping_transmission_latency_distribution)
-        )
-
-        home_region_name = self._workflow_loader.get_home_region()
-        cloud_ping_home_region_latency_distribution_performance = (
-            self._performance_loader.get_transmission_latency_distribution(home_region_name, home_region_name)
-        )
-        average_cloud_ping_home_region_latency_performance: float = float(
-            np.mean(cloud_ping_home_region_latency_distribution_performance)
-        )
-
-        # Calculate the difference in latency between the home region and the current region (Should never be below 0)
-        average_cloud_ping_latency_difference = max(
-            average_cloud_ping_transmission_latency_performance - average_cloud_ping_home_region_latency_performance,
-            0.0,
-        )
+        # between two regions from cloud ping, relative to the one of the home region.
+        average_cloud_ping_latency_difference = self._get_fallback_latency_difference(from_region_name, to_region_name)
 
         # Get the measure latency from the home region (actual latency)
-        home_region_latency_distribution_measured = self._workflow_loader.get_latency_distribution(
-            from_instance_name, to_instance_name, home_region_name, home_region_name, data_transfer_size
+        home_region_latency_distribution_measured = self._get_home_region_latency_distribution(
+            from_instance_name, to_instance_name, data_transfer_size
         )
-        if len(home_region_latency_distribution_measured) == 0:
-            # For cases where its a sync predecessor, there might be no latency data
-            # even for the home region, in this case we default to the average latency between
-            # two of the same region (A default value)
-            home_region_latency_distribution_measured = [SOLVER_HOME_REGION_TRANSMISSION_LATENCY_DEFAULT]
 
         # Calculate the multiplier to apply to the added latency
         # For sync nodes this would be x(1 + 4), as it involves one update to sync_decision_table
@@ -217,6 +282,47 @@ class RuntimeCalculator(InputCalculator):
 
         return added_latency_distribution
 
+    def _get_fallback_latency_difference(self, from_region_name: str, to_region_name: str) -> float:
+        from_region_index = self._fallback_region_indices.get(from_region_name)
+        to_region_index = self._fallback_region_indices.get(to_region_name)
+        if from_region_index is not None and to_region_index is not None:
+            return float(self._fallback_latency_differences[from_region_index, to_region_index])
+
+        # Region pair outside of the precomputed ones
+        home_region_name = self._workflow_loader.get_home_region()
+        return max(
+            self._get_average_cloud_ping_latency(from_region_name, to_region_name)
+            - self._get_average_cloud_ping_latency(home_region_name, home_region_name),
+            0.0,
+        )
+
+    def _get_average_cloud_ping_latency(self, from_region_name: str, to_region_name: str) -> float:
+        return float(
+            np.mean(self._performance_loader.get_transmission_latency_distribution(from_region_name, to_region_name))
+        )
+
+    def _get_home_region_latency_distribution(
+        self, from_instance_name: str, to_instance_name: str, data_transfer_size: float
+    ) -> list[float]:
+        cache_key = (from_instance_name, to_instance_name, data_transfer_size)
+        if cache_key in self._home_region_latency_distribution_cache:
+            self._cache_hits += 1
+            return self._home_region_latency_distribution_cache[cache_key]
+        self._cache_misses += 1
+
+        home_region_name = self._workflow_loader.get_home_region()
+        home_region_latency_distribution_measured = self._workflow_loader.get_latency_distribution(
+            from_instance_name, to_instance_name, home_region_name, home_region_name, data_transfer_size
+        )
+        if len(home_region_latency_distribution_measured) == 0:
+            # For cases where its a sync predecessor, there might be no latency data
+            # even for the home region, in this case we default to the average latency between
+            # two of the same region (A default value)
+            home_region_latency_distribution_measured = [SOLVER_HOME_REGION_TRANSMISSION_LATENCY_DEFAULT]
+
+        self._home_region_latency_distribution_cache[cache_key] = home_region_latency_distribution_measured
+        return home_region_latency_distribution_measured
+
     def _handle_missing_start_hop_latency_distribution(
         self, to_region_name: str, data_transfer_size: float
     ) -> list[float]:
@@ -252,7 +358,9 @@ class RuntimeCalculator(InputCalculator):
     ) -> list[float]:
         cache_key = f"{from_instance_name}-{to_instance_name}"
         if cache_key in self._transmission_size_distribution_cache:
+            self._cache_hits += 1
             return self._transmission_size_distribution_cache[cache_key]
+        self._cache_misses += 1
         # Get the data transfer size distribution
         if from_instance_name:
             transmission_size_distribution = self._workflow_loader.get_data_transfer_size_distribution(
@@ -282,10 +390,64 @@ class RuntimeCalculator(InputCalculator):
     ) -> tuple[dict[str, Any], float, float]:
         # Calculate the current runtime of this instance when executed in the given region
         # Get the runtime distribution of the instance in the given region
+        runtime_distribution, original_runtime_region_name = self._get_runtime_distribution(
+            instance_name, region_name, is_redirector
+        )
+        desired_runtime_region_name = region_name
+
+        # Pick a random runtime from the distribution
+        runtime: float = runtime_distribution[int(self._random_stream.random() * (len(runtime_distribution) - 1))]
+        return self._retrieve_runtimes_and_data_transfer(
+            instance_name,
+            original_runtime_region_name,
+            desired_runtime_region_name,
+            runtime,
+            previous_cumulative_runtime,
+            instance_indexer,
+            is_redirector,
+        )
+
+    def get_node_runtime_distribution(
+        self,
+        instance_name: str,
+        region_name: str,
+        instance_indexer: Indexer,
+        is_redirector: bool,
+    ) -> dict[str, Any]:
+        # Retrieve everything needed to sample the execution of this instance in the given region,
+        # namely the runtime distribution and the auxiliary data distribution of every runtime.
+        runtime_distribution, original_runtime_region_name = self._get_runtime_distribution(
+            instance_name, region_name, is_redirector
+        )
+        auxiliary_index_translation = self._workflow_loader.get_auxiliary_index_translation(
+            instance_name, is_redirector
+        )
+
+        return {
+            "runtimes": runtime_distribution,
+            "auxiliary_data": [
+                self._workflow_loader.get_auxiliary_data_distribution(
+                    instance_name, original_runtime_region_name, runtime, is_redirector
+                )
+                for runtime in runtime_distribution
+            ],
+            "relative_performance": self._get_relative_region_performance(original_runtime_region_name, region_name),
+            "successor_auxiliary_indices": {
+                instance_indexer.value_to_index(key): index
+                for key, index in auxiliary_index_translation.items()
+                if key != "data_transfer_during_execution_gb"
+            },
+            "data_transfer_during_execution_auxiliary_index": auxiliary_index_translation[
+                "data_transfer_during_execution_gb"
+            ],
+        }
+
+    def _get_runtime_distribution(
+        self, instance_name: str, region_name: str, is_redirector: bool
+    ) -> tuple[list[float], str]:
         runtime_distribution: list[float] = self._workflow_loader.get_runtime_distribution(
             instance_name, region_name, is_redirector
         )
-        original_runtime_region_name = desired_runtime_region_name = region_name
         if len(runtime_distribution) == 0:
             # No runtime data for this instance in this region, default to home region
             home_region = self._workflow_loader.get_home_region()
@@ -299,19 +461,22 @@ class RuntimeCalculator(InputCalculator):
             runtime_distribution = self._workflow_loader.get_runtime_distribution(
                 instance_name, home_region, is_redirector
             )
-            original_runtime_region_name = home_region
+            return runtime_distribution, home_region
 
-        # Pick a random runtime from the distribution
-        runtime: float = runtime_distribution[int(random.random() * (len(runtime_distribution) - 1))]
-        return self._retrieve_runtimes_and_data_transfer(
-            instance_name,
-            original_runtime_region_name,
-            desired_runtime_region_name,
-            runtime,
-            previous_cumulative_runtime,
-            instance_indexer,
-            is_redirector,
-        )
+        return runtime_distribution, region_name
+
+    def _get_relative_region_performance(
+        self, original_runtime_region_name: str, desired_runtime_region_name: str
+    ) -> float:
+        # Calculate the relative region performance
+        # to original region
+        if original_runtime_region_name == desired_runtime_region_name:
+            return 1.0
+
+        # Get the relative performance of the region
+        original_region_performance = self._performance_loader.get_relative_performance(original_runtime_region_name)
+        desired_region_performance = self._performance_loader.get_relative_performance(desired_runtime_region_name)
+        return desired_region_performance / original_region_performance
 
     def _retrieve_runtimes_and_data_transfer(
         self,
@@ -336,19 +501,14 @@ class RuntimeCalculator(InputCalculator):
 
         # Pick a random auxiliary data from the distribution
         auxiliary_data: list[float] = execution_auxiliary_data[
-            int(random.random() * (len(execution_auxiliary_data) - 1))
+            int(self._random_stream.random() * (len(execution_auxiliary_data) - 1))
         ]
 
         # Calculate the relative region performance
         # to original region
-        relative_region_performance = 1.0
-        if original_runtime_region_name != desired_runtime_region_name:
-            # Get the relative performance of the region
-            original_region_performance = self._performance_loader.get_relative_performance(
-                original_runtime_region_name
-            )
-            desired_region_performance = self._performance_loader.get_relative_performance(desired_runtime_region_name)
-            relative_region_performance = desired_region_performance / original_region_performance
+        relative_region_performance = self._get_relative_region_performance(
+            original_runtime_region_name, desired_runtime_region_name
+        )
 
         # Create the successor dictionary
         # Go through the auxiliary translation index and get every value other than data_transfer_during_execution_gb
@@ -1,32 +1,42 @@
 import json
 from abc import ABC
-from typing import Any
+from typing import Any, Optional
 
 from caribou.common.models.remote_client.remote_client import RemoteClient
 
 
 class InputLoader(ABC):
-    def __init__(self, client: RemoteClient, primary_table: str) -> None:
-        self._client: RemoteClient = client
+    def __init__(self, client: Optional[RemoteClient], primary_table: str) -> None:
+        # Loaders set up from a solver input snapshot have no client
+        self._client: Optional[RemoteClient] = client
         self._primary_table: str = primary_table
 
     def _retrieve_region_data(self, available_regions: set[str]) -> dict[str, Any]:
-        all_data: dict[str, Any] = {}
+        return self._retrieve_bulk_data(self._primary_table, available_regions)
 
-        for region in available_regions:
-            all_data[region] = self._retrieve_data(self._primary_table, region)
+    def _retrieve_bulk_data(self, table_name: str, data_keys: set[str]) -> dict[str, Any]:
+        # All keys are read in one bulk request, rather than one request per key
+        values = self._get_client().get_values_from_table(table_name, sorted(data_keys))
 
-        return all_data
+        return {data_key: self._load_value(values.get(data_key)) for data_key in data_keys}
 
     def _retrieve_data(self, table_name: str, data_key: str) -> dict[str, Any]:
-        value, _ = self._client.get_value_from_table(table_name, data_key)
+        value, _ = self._get_client().get_value_from_table(table_name, data_key)
 
+        return self._load_value(value)
+
+    def _load_value(self, value: Optional[str]) -> dict[str, Any]:
         loaded_data: dict[str, Any] = {}
         if value is not None and value != "":
             loaded_data = json.loads(value)
 
         return loaded_data
 
+    def _get_client(self) -> RemoteClient:
+        if self._client is None:
+            raise RuntimeError(f"{self} has no remote client to retrieve its data from")
+        return self._client
+
     def __str__(self) -> str:
         return f"InputLoader(name={self.__class__.__name__})"
 
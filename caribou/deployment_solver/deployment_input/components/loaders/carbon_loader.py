@@ -13,7 +13,7 @@ class CarbonLoader(InputLoader):
 
     def __init__(
         self,
-        client: RemoteClient,
+        client: Optional[RemoteClient],
     ) -> None:
         super().__init__(client, CARBON_REGION_TABLE)
 
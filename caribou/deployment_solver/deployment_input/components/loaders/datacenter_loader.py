@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from caribou.common.constants import (
     PROVIDER_REGION_TABLE,
@@ -25,11 +25,17 @@ class DatacenterLoader(InputLoader):
     _provider_data: dict[str, Any]
     _provider_table: str
 
-    def __init__(self, client: RemoteClient) -> None:
+    def __init__(self, client: Optional[RemoteClient]) -> None:
         super().__init__(client, PROVIDER_REGION_TABLE)
         self._provider_table = PROVIDER_TABLE
 
-    def setup(self, available_regions: set[str]) -> None:
+    def setup(self, available_regions: set[str], datacenter_data: Optional[dict[str, Any]] = None) -> None:
+        if datacenter_data is not None:
+            # The provider data is not used (yet), so it is not part of the solver inputs
+            self._datacenter_data = datacenter_data
+            self._provider_data = {}
+            return
+
         self._datacenter_data = self._retrieve_region_data(available_regions)
 
         # Get the set of providers from the available regions
@@ -103,12 +109,7 @@ class DatacenterLoader(InputLoader):
         )
 
     def _retrieve_provider_data(self, available_providers: set[str]) -> dict[str, Any]:
-        all_data: dict[str, Any] = {}
-
-        for provider in available_providers:
-            all_data[provider] = self._retrieve_data(self._provider_table, provider)
-
-        return all_data
+        return self._retrieve_bulk_data(self._provider_table, available_providers)
 
     def to_dict(self) -> dict[str, Any]:
         return self._datacenter_data
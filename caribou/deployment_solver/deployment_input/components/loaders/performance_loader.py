@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from caribou.common.constants import (
     PERFORMANCE_REGION_TABLE,
@@ -12,11 +12,14 @@ from caribou.deployment_solver.deployment_input.components.loader import InputLo
 class PerformanceLoader(InputLoader):
     _performance_data: dict[str, Any]
 
-    def __init__(self, client: RemoteClient) -> None:
+    def __init__(self, client: Optional[RemoteClient]) -> None:
         super().__init__(client, PERFORMANCE_REGION_TABLE)
 
-    def setup(self, available_regions: set[str]) -> None:
-        self._performance_data = self._retrieve_region_data(available_regions)
+    def setup(self, available_regions: set[str], performance_data: Optional[dict[str, Any]] = None) -> None:
+        if performance_data is not None:
+            self._performance_data = performance_data
+        else:
+            self._performance_data = self._retrieve_region_data(available_regions)
 
     def get_relative_performance(self, region_name: str) -> float:
         return self._performance_data.get(region_name, {}).get(
@@ -6,7 +6,7 @@ from caribou.deployment_solver.deployment_input.components.loader import InputLo
 
 
 class RegionViabilityLoader(InputLoader):
-    def __init__(self, client: RemoteClient) -> None:
+    def __init__(self, client: Optional[RemoteClient]) -> None:
         super().__init__(client, AVAILABLE_REGIONS_TABLE)
         self._available_regions: list[str] = []
 
@@ -14,7 +14,7 @@ class RegionViabilityLoader(InputLoader):
         if available_regions is not None:
             self._available_regions = available_regions
         else:
-            all_regions = self._client.get_keys(self._primary_table)
+            all_regions = self._get_client().get_keys(self._primary_table)
 
             # TODO: Check if the available regions are updated
             # Now go through the available regions and only select the ones
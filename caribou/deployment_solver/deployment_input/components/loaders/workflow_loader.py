@@ -21,7 +21,7 @@ class WorkflowLoader(InputLoader):
     _instances_regions_and_providers: dict[str, Any]
     _home_region: str
 
-    def __init__(self, client: RemoteClient, workflow_config: WorkflowConfig) -> None:
+    def __init__(self, client: Optional[RemoteClient], workflow_config: WorkflowConfig) -> None:
         super().__init__(client, WORKFLOW_INSTANCE_TABLE)
 
         # Parse the workflow config to get the instances, regions, and providers
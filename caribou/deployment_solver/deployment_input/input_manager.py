@@ -1,6 +1,4 @@
 import math
-import random
-import time
 from typing import Any, Optional
 
 from caribou.common.constants import GLOBAL_SYSTEM_REGION, TAIL_LATENCY_THRESHOLD
@@ -14,20 +12,26 @@ from caribou.deployment_solver.deployment_input.components.loaders.datacenter_lo
 from caribou.deployment_solver.deployment_input.components.loaders.performance_loader import PerformanceLoader
 from caribou.deployment_solver.deployment_input.components.loaders.region_viability_loader import RegionViabilityLoader
 from caribou.deployment_solver.deployment_input.components.loaders.workflow_loader import WorkflowLoader
+from caribou.deployment_solver.deployment_input.solver_input_snapshot import SolverInputSnapshot
 from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.random_stream import RandomStream
 from caribou.deployment_solver.models.region_indexer import RegionIndexer
 from caribou.deployment_solver.workflow_config import WorkflowConfig
 
-random.seed(time.time())
 
-
-class InputManager:  # pylint: disable=too-many-instance-attributes
+class InputManager:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     _region_indexer: RegionIndexer
     _instance_indexer: InstanceIndexer
     _execution_latency_distribution_cache: dict[str, list[float]]
     _invocation_probability_cache: dict[str, float]
 
-    def __init__(self, workflow_config: WorkflowConfig, tail_latency_threshold: int = TAIL_LATENCY_THRESHOLD) -> None:
+    def __init__(
+        self,
+        workflow_config: WorkflowConfig,
+        tail_latency_threshold: int = TAIL_LATENCY_THRESHOLD,
+        random_seed: Optional[int] = None,
+        snapshot_path: Optional[str] = None,
+    ) -> None:
         super().__init__()
         # Set the workflow config
         self._workflow_config: WorkflowConfig = workflow_config
@@ -38,8 +42,11 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
             raise ValueError("Tail threshold must be between 50 and 100")
         self._tail_latency_threshold: float = tail_latency_threshold
 
-        # Initialize remote client
-        self._data_collector_client: RemoteClient = Endpoints().get_data_collector_client()
+        # Initialize remote client, not needed if the inputs are loaded from a snapshot
+        self._snapshot_path: Optional[str] = snapshot_path
+        self._data_collector_client: Optional[RemoteClient] = (
+            Endpoints().get_data_collector_client() if snapshot_path is None else None
+        )
 
         # Initialize loaders
         self._region_viability_loader = RegionViabilityLoader(self._data_collector_client)
@@ -49,13 +56,34 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         self._workflow_loader = WorkflowLoader(self._data_collector_client, workflow_config)
 
         # Setup the viability loader and load the availability regions
-        self._region_viability_loader.setup()  # Setup the viability loader -> This loads data from the database
+        if snapshot_path is None:
+            self._region_viability_loader.setup()  # Setup the viability loader -> This loads data from the database
+
+        # Source of all the random draws of the simulations
+        self._random_stream = RandomStream(random_seed)
 
         # Setup the calculator
-        self._runtime_calculator = RuntimeCalculator(self._performance_loader, self._workflow_loader)
+        self._runtime_calculator = RuntimeCalculator(
+            self._performance_loader, self._workflow_loader, self._random_stream
+        )
         self._carbon_calculator = CarbonCalculator(self._carbon_loader, self._datacenter_loader, self._workflow_loader)
         self._cost_calculator = CostCalculator(self._datacenter_loader, self._workflow_loader)
 
+        # Integer indexed lookup tables, built at setup
+        self._region_names: list[Optional[str]] = []
+        self._instance_names: list[Optional[str]] = []
+        self._transmission_distribution_table: dict[
+            tuple[int, int, int, int, bool, bool], tuple[list[float], list[list[float]]]
+        ] = {}
+        self._simulated_transmission_distribution_table: dict[
+            tuple[int, int, int, int, int, int], tuple[float, list[float]]
+        ] = {}
+        self._node_runtime_distribution_table: dict[tuple[int, int, bool], dict[str, Any]] = {}
+
+        # An input manager loaded from a snapshot is set up by the snapshot (rather than by `setup`)
+        if snapshot_path is not None:
+            self._setup_from_snapshot(SolverInputSnapshot(snapshot_path))
+
     def setup(self, regions_indexer: RegionIndexer, instance_indexer: InstanceIndexer) -> None:
         self._region_indexer = regions_indexer
         self._instance_indexer = instance_indexer
@@ -83,19 +111,43 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         self._datacenter_loader.setup(requested_regions)
         self._performance_loader.setup(requested_regions)
         self._carbon_loader.setup(requested_regions)
+        self._runtime_calculator.setup_fallback_latencies(list(regions_indexer.get_value_indices().keys()))
 
         # Clear cache
         self._invocation_probability_cache: dict[str, float] = {}
         self._execution_latency_distribution_cache: dict[str, list[float]] = {}
 
+        self._build_index_tables()
+
+    def _build_index_tables(self) -> None:
+        # Integer indexed views of the indexers, such that the hot paths of the simulation
+        # index lists instead of translating every index back to its name.
+        # The trailing entries resolve the negative indices used by the simulation:
+        # region -2 is the system region, and -1 (both instance and region) is the client.
+        region_names = self._region_indexer.indicies_to_values()
+        self._region_names = [region_names[index] for index in range(len(region_names))]
+        self._region_names.extend([f"aws:{GLOBAL_SYSTEM_REGION}", None])
+        instance_names = self._instance_indexer.indicies_to_values()
+        self._instance_names = [instance_names[index] for index in range(len(instance_names))]
+        self._instance_names.append(None)
+
+        self._reset_distribution_tables()
+
+    def _reset_distribution_tables(self) -> None:
+        # Distributions keyed by the integer indices of the edge or node, filled the
+        # first time a combination is simulated (most region combinations never are).
+        self._transmission_distribution_table = {}
+        self._simulated_transmission_distribution_table = {}
+        self._node_runtime_distribution_table = {}
+
     def alter_carbon_setting(self, carbon_setting: Optional[str]) -> None:
         """
         Input should either be 'None' or a string from '0' to '23' indicating the hour of the day.
         """
         self._carbon_calculator.alter_carbon_setting(carbon_setting)
-        self._runtime_calculator.reset_cache()
 
         # Clear the cache
+        # (The runtime and latency distributions do not depend on the carbon setting and are kept)
         self._execution_latency_distribution_cache = {}
         self._invocation_probability_cache = {}
 
@@ -125,12 +177,29 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         # If not, retrieve the value from the workflow loader
         return self._workflow_loader.get_start_hop_retrieve_wpd_probability()
 
+    def get_random_stream(self) -> RandomStream:
+        return self._random_stream
+
+    def reset_random_stream(self, substream: int = 0) -> None:
+        """
+        Replay the random draws from the start of the given substream, every deployment
+        simulated after a reset sees the same draws (common random numbers).
+        """
+        self._random_stream.reset(substream)
+
     def get_all_regions(self) -> list[str]:
         return self._region_viability_loader.get_available_regions()
 
     def get_all_carbon_data(self) -> dict[str, Any]:
         return self._carbon_loader.get_carbon_data()
 
+    def get_calculator_cache_statistics(self) -> dict[str, dict[str, int]]:
+        return {
+            "runtime_calculator": self._runtime_calculator.get_cache_statistics(),
+            "cost_calculator": self._cost_calculator.get_cache_statistics(),
+            "carbon_calculator": self._carbon_calculator.get_cache_statistics(),
+        }
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "region_viability_loader": self._region_viability_loader.to_dict(),
@@ -150,6 +219,51 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
             "region_indexer": self._region_indexer.to_dict(),
         }
 
+    def save_snapshot(self, path: str) -> None:
+        """
+        Writes the inputs of the solve to a binary snapshot, from which workers load them
+        without a remote client (see the `snapshot_path` of the constructor).
+        """
+        SolverInputSnapshot.write(path, self.to_dict())
+
+    def _setup_from_snapshot(self, snapshot: SolverInputSnapshot) -> None:
+        region_indices = snapshot.get_section("region_indexer")["value_indices"]
+        instance_indices = snapshot.get_section("instance_indexer")["value_indices"]
+        self._region_indexer = RegionIndexer(sorted(region_indices, key=region_indices.get))
+        self._instance_indexer = InstanceIndexer(
+            [{"instance_name": instance_name} for instance_name in sorted(instance_indices, key=instance_indices.get)]
+        )
+        self._load_snapshot(snapshot)
+
+        # Clear cache
+        self._invocation_probability_cache = {}
+        self._execution_latency_distribution_cache = {}
+
+        self._build_index_tables()
+
+    def _load_snapshot(self, snapshot: SolverInputSnapshot) -> None:
+        requested_regions: set[str] = set(self._region_indexer.get_value_indices().keys())
+        requested_regions.add(f"aws:{GLOBAL_SYSTEM_REGION}")
+
+        self._region_viability_loader.setup(snapshot.get_section("region_viability_loader"))
+        self._workflow_loader.set_workflow_data(snapshot.get_section("workflow_loader")["workflow_data"])
+        self._datacenter_loader.setup(requested_regions, datacenter_data=snapshot.get_section("datacenter_loader"))
+        self._performance_loader.setup(requested_regions, performance_data=snapshot.get_section("performance_loader"))
+        self._carbon_loader.setup(requested_regions, carbon_data=snapshot.get_section("carbon_loader"))
+        # The carbon calculator is set up with the settings of the solve the snapshot was taken from
+        self._carbon_calculator = CarbonCalculator(
+            self._carbon_loader,
+            self._datacenter_loader,
+            self._workflow_loader,
+            energy_factor_of_transmission=snapshot.get_section("energy_factor"),
+            carbon_free_intra_region_transmission=snapshot.get_section("carbon_free_intra_region_transmission"),
+            carbon_free_dt_during_execution_at_home_region=snapshot.get_section(
+                "carbon_free_dt_during_execution_at_home_region"
+            ),
+            consider_cfe=snapshot.get_section("consider_cfe"),
+        )
+        self._runtime_calculator.setup_fallback_latencies(list(self._region_indexer.get_value_indices().keys()))
+
     def __getstate__(self):  # type: ignore
         state = self.__dict__.copy()
         state.pop("_data_collector_client", None)
@@ -157,6 +271,11 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         state.pop("_performance_loader", None)
         state.pop("_runtime_calculator", None)
         state.pop("_cost_calculator", None)
+        if self._snapshot_path is not None:
+            # The loaders are loaded from the snapshot, rather than pickled
+            for loader in ("_region_viability_loader", "_carbon_loader", "_workflow_loader", "_carbon_calculator"):
+                state.pop(loader, None)
+            return state
         state["_region_viability_loader"] = self._region_viability_loader.get_available_regions()
         state["_carbon_loader"] = self._carbon_loader.get_carbon_data()
         state["_workflow_loader"] = self._workflow_loader.get_workflow_data()
@@ -168,7 +287,21 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
 
     def __setstate__(self, state):  # type: ignore
         self.__dict__.update(state)
-        self._data_collector_client: RemoteClient = Endpoints().get_data_collector_client()  # type: ignore
+        snapshot_path = self.__dict__.get("_snapshot_path")
+        if snapshot_path is not None:
+            self._data_collector_client = None
+            self._region_viability_loader = RegionViabilityLoader(None)
+            self._datacenter_loader = DatacenterLoader(None)
+            self._performance_loader = PerformanceLoader(None)
+            self._carbon_loader = CarbonLoader(None)
+            self._workflow_loader = WorkflowLoader(None, self._workflow_config)
+            self._runtime_calculator = RuntimeCalculator(
+                self._performance_loader, self._workflow_loader, self._random_stream
+            )
+            self._cost_calculator = CostCalculator(self._datacenter_loader, self._workflow_loader)
+            self._load_snapshot(SolverInputSnapshot(snapshot_path))
+            return
+        self._data_collector_client = Endpoints().get_data_collector_client()
         self._region_viability_loader = RegionViabilityLoader(self._data_collector_client)
         self._datacenter_loader = DatacenterLoader(self._data_collector_client)
         self._performance_loader = PerformanceLoader(self._data_collector_client)
@@ -177,7 +310,9 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         self._region_viability_loader.setup(state.get("_region_viability_loader"))
 
         # Setup the calculator
-        self._runtime_calculator = RuntimeCalculator(self._performance_loader, self._workflow_loader)
+        self._runtime_calculator = RuntimeCalculator(
+            self._performance_loader, self._workflow_loader, self._random_stream
+        )
         self._carbon_calculator = CarbonCalculator(self._carbon_loader, self._datacenter_loader, self._workflow_loader)
         self._cost_calculator = CostCalculator(self._datacenter_loader, self._workflow_loader)
         self._carbon_calculator._energy_factor_of_transmission = state.get("_carbon_calculator").get(
@@ -206,6 +341,7 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
             requested_regions,
             carbon_data=state.get("_carbon_loader"),
         )
+        self._runtime_calculator.setup_fallback_latencies(list(self._region_indexer.get_value_indices().keys()))
 
     def get_transmission_info(
         self,
@@ -217,39 +353,41 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         to_instance_is_sync_node: bool,
         consider_from_client_latency: bool,
     ) -> dict[str, Any]:
-        # Convert the instance and region indices to their names
-        ## For start hop, from_instance_index and from_region_index will be -1
-        from_instance_name: Optional[str] = None
-        from_region_name: Optional[str] = None
-        if from_instance_index != -1:
-            from_instance_name = self._instance_indexer.index_to_value(from_instance_index)
-        if from_region_index != -1:
-            from_region_name = self._region_indexer.index_to_value(from_region_index)
-
-        ## To instance and region will always have region and instance index
-        to_instance_name = self._instance_indexer.index_to_value(to_instance_index)
-        to_region_name = self._region_indexer.index_to_value(to_region_index)
-
-        # Get a transmission size and latency sample
-        transmission_size, transmission_latency = self._runtime_calculator.calculate_transmission_size_and_latency(
-            from_instance_name,
-            from_region_name,
-            to_instance_name,
-            to_region_name,
+        key = (
+            from_instance_index,
+            from_region_index,
+            to_instance_index,
+            to_region_index,
             to_instance_is_sync_node,
             consider_from_client_latency,
         )
+        distributions = self._transmission_distribution_table.get(key)
+        if distributions is None:
+            distributions = self.get_transmission_distributions(*key)
+            self._transmission_distribution_table[key] = distributions
+        transmission_size_distribution, transmission_latency_distributions = distributions
+
+        # Get a transmission size and latency sample
+        size_index = int(self._random_stream.random() * (len(transmission_size_distribution) - 1))
+        transmission_size = transmission_size_distribution[size_index]
+        transmission_latency_distribution = transmission_latency_distributions[size_index]
+        transmission_latency = transmission_latency_distribution[
+            int(self._random_stream.random() * (len(transmission_latency_distribution) - 1))
+        ]
 
         sns_transmission_size = transmission_size
         sync_info: Optional[dict[str, Any]] = None
         if to_instance_is_sync_node:
+            from_instance_name = self._instance_names[from_instance_index]
             if not from_instance_name:
                 raise ValueError("Start hop cannot have a sync node as a successor")
 
             # If to instance is a sync node, then at the same time,
             # we can retrieve the sync_sizes_gb and sns_only_sizes_gb
             # And then calculate the sync node related information.
-            sns_only_size, sync_size, wcu = self._get_upload_sync_size_and_wcu(from_instance_name, to_instance_name)
+            sns_only_size, sync_size, wcu = self._get_upload_sync_size_and_wcu(
+                from_instance_name, self._instance_names[to_instance_index]  # type: ignore
+            )
             sns_transmission_size = sns_only_size
             sync_info = {
                 "dynamodb_upload_size": transmission_size,
@@ -316,25 +454,24 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         to_region_index: int,
         cumulative_runtime: float,
     ) -> dict[str, Any]:
-        # Convert the instance and region indices to their names
-        from_instance_name: str = self._instance_indexer.index_to_value(from_instance_index)
-        uninvoked_instance_name: str = self._instance_indexer.index_to_value(uninvoked_instance_index)
-        simulated_sync_predecessor_name: str = self._instance_indexer.index_to_value(simulated_sync_predecessor_index)
-        sync_node_name: str = self._instance_indexer.index_to_value(sync_node_index)
-        from_region_name: str = self._region_indexer.index_to_value(from_region_index)
-        to_region_name: str = self._region_indexer.index_to_value(to_region_index)
-
-        (
-            sns_transmission_size,
-            transmission_latency,
-        ) = self._runtime_calculator.calculate_simulated_transmission_size_and_latency(
-            from_instance_name,
-            uninvoked_instance_name,
-            simulated_sync_predecessor_name,
-            sync_node_name,
-            from_region_name,
-            to_region_name,
+        key = (
+            from_instance_index,
+            uninvoked_instance_index,
+            simulated_sync_predecessor_index,
+            sync_node_index,
+            from_region_index,
+            to_region_index,
         )
+        distribution = self._simulated_transmission_distribution_table.get(key)
+        if distribution is None:
+            distribution = self.get_simulated_transmission_distribution(*key)
+            self._simulated_transmission_distribution_table[key] = distribution
+        sns_transmission_size, transmission_latency_distribution = distribution
+
+        # Pick a transmission latency
+        transmission_latency = transmission_latency_distribution[
+            int(self._random_stream.random() * (len(transmission_latency_distribution) - 1))
+        ]
 
         return {
             "starting_runtime": cumulative_runtime,
@@ -375,17 +512,36 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
     def get_node_runtimes_and_data_transfer(
         self, instance_index: int, region_index: int, previous_cumulative_runtime: float, is_redirector: bool
     ) -> tuple[dict[str, Any], float, float]:
-        # Convert the instance and region indices to their names
-        instance_name: str = self._instance_indexer.index_to_value(instance_index)
-        region_name: str = self._region_indexer.index_to_value(region_index)
-
-        # Get the node runtimes and data transfer information
-        node_runtime_data_transfer_data = self._runtime_calculator.calculate_node_runtimes_and_data_transfer(
-            instance_name, region_name, previous_cumulative_runtime, self._instance_indexer, is_redirector
+        key = (instance_index, region_index, is_redirector)
+        distribution = self._node_runtime_distribution_table.get(key)
+        if distribution is None:
+            distribution = self.get_node_runtime_distribution(*key)
+            self._node_runtime_distribution_table[key] = distribution
+
+        # Pick a random runtime, then a random auxiliary data of that runtime
+        runtime_index = int(self._random_stream.random() * (len(distribution["runtimes"]) - 1))
+        execution_auxiliary_data: list[list[float]] = distribution["auxiliary_data"][runtime_index]
+        auxiliary_data = execution_auxiliary_data[
+            int(self._random_stream.random() * (len(execution_auxiliary_data) - 1))
+        ]
+
+        # The successors are keyed by their instance index, the value is the
+        # cumulative runtime of when this node invokes the successor
+        relative_region_performance: float = distribution["relative_performance"]
+        current_node_execution_time = distribution["runtimes"][runtime_index] * relative_region_performance
+        return (
+            {
+                "current": previous_cumulative_runtime + current_node_execution_time,
+                "successors": {
+                    successor_index: previous_cumulative_runtime
+                    + auxiliary_data[auxiliary_index] * relative_region_performance
+                    for successor_index, auxiliary_index in distribution["successor_auxiliary_indices"].items()
+                },
+            },
+            current_node_execution_time,
+            auxiliary_data[distribution["data_transfer_during_execution_auxiliary_index"]],
         )
 
-        return node_runtime_data_transfer_data
-
     def calculate_cost_and_carbon_of_instance(
         self,
         execution_time: float,
@@ -401,8 +557,8 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         is_redirector: bool,
     ) -> dict[str, float]:
         # Convert the instance and region indices to their names
-        instance_name: str = self._instance_indexer.index_to_value(instance_index)
-        region_name: str = self._region_indexer.index_to_value(region_index)
+        instance_name: str = self._instance_names[instance_index]  # type: ignore
+        region_name: str = self._region_names[region_index]  # type: ignore
 
         data_output_sizes_str_dict = self._get_converted_region_name_dict(data_output_sizes)
         execution_carbon, transmission_carbon = self._carbon_calculator.calculate_instance_carbon(
@@ -453,17 +609,9 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
         }
 
     def _get_converted_region_name_dict(self, input_region_index_dict: dict[int, Any]) -> dict[Optional[str], Any]:
-        system_region_full_name: str = f"aws:{GLOBAL_SYSTEM_REGION}"
-        return {
-            (
-                self._region_indexer.index_to_value(region_index)
-                if region_index >= 0
-                else system_region_full_name
-                if region_index == -2  # -2 Indicates the system region
-                else None
-            ): value
-            for region_index, value in input_region_index_dict.items()
-        }
+        # -2 Indicates the system region and -1 the client (no region)
+        region_names = self._region_names
+        return {region_names[region_index]: value for region_index, value in input_region_index_dict.items()}
 
     def calculate_dynamodb_capacity_unit_of_sync_edges(
         self, sync_edge_upload_edges_auxiliary_data: list[tuple[float, float]]
@@ -499,3 +647,90 @@ class InputManager:  # pylint: disable=too-many-instance-attributes
 
     def get_home_region_index(self) -> int:
         return self._region_indexer.value_to_index(self._workflow_loader.get_home_region())
+
+    def get_node_runtime_distribution(
+        self, instance_index: int, region_index: int, is_redirector: bool
+    ) -> dict[str, Any]:
+        # Convert the instance and region indices to their names
+        instance_name: str = self._instance_names[instance_index]  # type: ignore
+        region_name: str = self._region_names[region_index]  # type: ignore
+
+        return self._runtime_calculator.get_node_runtime_distribution(
+            instance_name, region_name, self._instance_indexer, is_redirector
+        )
+
+    def get_transmission_distributions(
+        self,
+        from_instance_index: int,
+        from_region_index: int,
+        to_instance_index: int,
+        to_region_index: int,
+        to_instance_is_sync_node: bool,
+        consider_from_client_latency: bool,
+    ) -> tuple[list[float], list[list[float]]]:
+        # Convert the instance and region indices to their names
+        ## For start hop, from_instance_index and from_region_index will be -1 (None)
+        return self._runtime_calculator.get_transmission_size_and_latency_distributions(
+            self._instance_names[from_instance_index],
+            self._region_names[from_region_index],
+            self._instance_names[to_instance_index],  # type: ignore
+            self._region_names[to_region_index],  # type: ignore
+            to_instance_is_sync_node,
+            consider_from_client_latency,
+        )
+
+    def get_simulated_transmission_distribution(
+        self,
+        from_instance_index: int,
+        uninvoked_instance_index: int,
+        simulated_sync_predecessor_index: int,
+        sync_node_index: int,
+        from_region_index: int,
+        to_region_index: int,
+    ) -> tuple[float, list[float]]:
+        return self._runtime_calculator.get_simulated_transmission_size_and_latency_distribution(
+            self._instance_names[from_instance_index],  # type: ignore
+            self._instance_names[uninvoked_instance_index],  # type: ignore
+            self._instance_names[simulated_sync_predecessor_index],  # type: ignore
+            self._instance_names[sync_node_index],  # type: ignore
+            self._region_names[from_region_index],  # type: ignore
+            self._region_names[to_region_index],  # type: ignore
+        )
+
+    def get_upload_sync_size_and_wcu(
+        self, from_instance_index: int, to_instance_index: int
+    ) -> tuple[float, float, float]:
+        return self._get_upload_sync_size_and_wcu(
+            self._instance_indexer.index_to_value(from_instance_index),
+            self._instance_indexer.index_to_value(to_instance_index),
+        )
+
+    def get_execution_factors(self, instance_index: int, region_index: int, is_redirector: bool) -> dict[str, float]:
+        # Convert the instance and region indices to their names
+        instance_name: str = self._instance_indexer.index_to_value(instance_index)
+        region_name: str = self._region_indexer.index_to_value(region_index)
+
+        cost_per_second, invocation_cost = self._cost_calculator.get_execution_cost_factors(instance_name, region_name)
+        return {
+            "cost_per_second": cost_per_second,
+            "invocation_cost": invocation_cost,
+            "energy_factor": self._carbon_calculator.get_execution_energy_factor(
+                instance_name, region_name, is_redirector
+            ),
+        }
+
+    def get_region_cost_factors(self, region_index: int) -> dict[str, float]:
+        # -2 Indicates the system region
+        return self._cost_calculator.get_region_cost_factors(self.get_region_name(region_index))
+
+    def get_grid_carbon_intensity(self, region_index: int, carbon_setting: Optional[str]) -> float:
+        # -2 Indicates the system region
+        return self._carbon_calculator.get_grid_carbon_intensity(self.get_region_name(region_index), carbon_setting)
+
+    def get_carbon_calculator_settings(self) -> dict[str, Any]:
+        return self._carbon_calculator.to_dict()
+
+    def get_region_name(self, region_index: int) -> str:
+        if region_index == -2:
+            return f"aws:{GLOBAL_SYSTEM_REGION}"
+        return self._region_indexer.index_to_value(region_index)
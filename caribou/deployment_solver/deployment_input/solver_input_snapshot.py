@@ -0,0 +1,104 @@
+import json
+import mmap
+import os
+import struct
+from typing import Any
+
+import numpy as np
+
+from caribou.common.constants import SOLVER_INPUT_SNAPSHOT_ALIGNMENT, SOLVER_INPUT_SNAPSHOT_VERSION
+
+# Magic bytes, format version and length of the index, at the start of every snapshot
+SNAPSHOT_MAGIC = b"CRBSNAP\x00"
+SNAPSHOT_HEADER_FORMAT = "<8sIQ"
+
+
+def _align(offset: int) -> int:
+    return -(-offset // SOLVER_INPUT_SNAPSHOT_ALIGNMENT) * SOLVER_INPUT_SNAPSHOT_ALIGNMENT
+
+
+class SolverInputSnapshot:
+    """
+    Binary snapshot of the inputs of a solve (the data of all loaders), written once and memory
+    mapped by every reader, such as worker processes or the Go library.
+
+    The file starts with a header (magic bytes, format version and length of the index), followed
+    by a JSON index of the sections and then the sections themselves, each aligned to
+    SOLVER_INPUT_SNAPSHOT_ALIGNMENT bytes. Section offsets are relative to the first (aligned) byte
+    after the index. A section is either UTF-8 JSON, decoded on its first use, or the raw bytes of
+    a NumPy array, read as a view of the mapped file without copying.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as snapshot_file:
+            self._buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_size = struct.calcsize(SNAPSHOT_HEADER_FORMAT)
+        if len(self._buffer) < header_size:
+            raise ValueError(f"{path} is not a solver input snapshot")
+        magic, version, index_length = struct.unpack_from(SNAPSHOT_HEADER_FORMAT, self._buffer)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a solver input snapshot")
+        if version != SOLVER_INPUT_SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported solver input snapshot version {version}, expected {SOLVER_INPUT_SNAPSHOT_VERSION}"
+            )
+
+        self._sections: dict[str, dict[str, Any]] = json.loads(self._buffer[header_size : header_size + index_length])[
+            "sections"
+        ]
+        self._data_offset = _align(header_size + index_length)
+        self._decoded_sections: dict[str, Any] = {}
+
+    @staticmethod
+    def write(path: str, sections: dict[str, Any]) -> None:
+        index: dict[str, dict[str, Any]] = {}
+        payloads: list[bytes] = []
+        offset = 0
+        for name, value in sections.items():
+            if isinstance(value, np.ndarray):
+                if value.dtype.hasobject:
+                    raise ValueError(f"Section {name} is an array of objects, which cannot be mapped")
+                payload = np.ascontiguousarray(value).tobytes()
+                index[name] = {"encoding": "array", "dtype": value.dtype.str, "shape": list(value.shape)}
+            else:
+                payload = json.dumps(value).encode("utf-8")
+                index[name] = {"encoding": "json"}
+            index[name].update({"offset": offset, "length": len(payload)})
+            payloads.append(payload)
+            offset = _align(offset + len(payload))
+
+        index_bytes = json.dumps({"sections": index}).encode("utf-8")
+        header = struct.pack(SNAPSHOT_HEADER_FORMAT, SNAPSHOT_MAGIC, SOLVER_INPUT_SNAPSHOT_VERSION, len(index_bytes))
+        data_offset = _align(len(header) + len(index_bytes))
+
+        # Written next to the final path and then renamed, such that readers never see a partial snapshot
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(header + index_bytes)
+            for name, payload in zip(index, payloads):
+                snapshot_file.seek(data_offset + index[name]["offset"])
+                snapshot_file.write(payload)
+            # Pads the file to its aligned size
+            snapshot_file.truncate(data_offset + offset)
+        os.replace(temporary_path, path)
+
+    def get_section_names(self) -> list[str]:
+        return list(self._sections.keys())
+
+    def get_section(self, name: str) -> Any:
+        if name not in self._sections:
+            raise KeyError(f"Section {name} is not in the solver input snapshot")
+        if name not in self._decoded_sections:
+            section = self._sections[name]
+            start = self._data_offset + section["offset"]
+            if section["encoding"] == "array":
+                self._decoded_sections[name] = np.frombuffer(
+                    self._buffer, dtype=np.dtype(section["dtype"]), count=int(np.prod(section["shape"])), offset=start
+                ).reshape(section["shape"])
+            else:
+                self._decoded_sections[name] = json.loads(self._buffer[start : start + section["length"]])
+        return self._decoded_sections[name]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: self.get_section(name) for name in self._sections}
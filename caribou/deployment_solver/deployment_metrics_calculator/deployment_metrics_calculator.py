@@ -1,5 +1,5 @@
-import random
 from abc import ABC
+from typing import Any, Optional
 
 from caribou.common.constants import TAIL_LATENCY_THRESHOLD
 from caribou.deployment_solver.deployment_input.input_manager import InputManager
@@ -27,10 +27,10 @@ class DeploymentMetricsCalculator(ABC):  # pylint: disable=too-many-instance-att
         self._consider_from_client_latency: bool = consider_from_client_latency
 
         # Set up the DAG structure and get the prerequisites and successor dictionaries
-        dag: DAG = DAG(list(workflow_config.instances.values()), instance_indexer)
-        self._prerequisites_dictionary = dag.get_prerequisites_dict()
-        self._successor_dictionary = dag.get_preceeding_dict()
-        self._topological_order = dag.topological_sort()
+        self._dag: DAG = DAG(list(workflow_config.instances.values()), instance_indexer)
+        self._prerequisites_dictionary = self._dag.get_prerequisites_dict()
+        self._successor_dictionary = self._dag.get_preceeding_dict()
+        self._topological_order = self._dag.topological_sort()
 
         # Get the home region index -> this is the region that the workflow starts from
         self._home_region_index = region_indexer.get_value_indices()[workflow_config.home_region]
@@ -38,10 +38,54 @@ class DeploymentMetricsCalculator(ABC):  # pylint: disable=too-many-instance-att
         # Set the record transmission execution carbon flag
         self._record_transmission_execution_carbon = record_transmission_execution_carbon
 
+        # Bounds on the tail cost, runtime and carbon set by the hard constraints (if any)
+        self._tail_bounds: dict[str, float] = {}
+
+        # Number of workflow invocations simulated over all deployments, reported by the solver instrumentation
+        self.simulated_samples = 0
+
     def calculate_deployment_metrics(self, deployment: list[int]) -> dict[str, float]:
+        # Every deployment is simulated with the same random draws (common random numbers)
+        self._reset_random_stream()
+
         # Get average and tail cost/carbon/runtime from Monte Carlo simulation
         return self._perform_monte_carlo_simulation(deployment)
 
+    def _reset_random_stream(self) -> None:
+        self._input_manager.reset_random_stream()
+
+    def set_hard_constraints(
+        self,
+        hard_resource_constraints: Optional[dict[str, Any]],
+        home_deployment_metrics: Optional[dict[str, float]],
+    ) -> None:
+        """
+        Set the hard resource constraints of the workflow, relative constraints being resolved
+        against the metrics of the home deployment, such that calculators may stop simulating
+        a deployment as soon as it is known to fail them. None clears the constraints.
+        """
+        tail_bounds: dict[str, float] = {}
+        if hard_resource_constraints is not None and home_deployment_metrics is not None:
+            for metric in ("cost", "runtime", "carbon"):
+                constraint = hard_resource_constraints.get(metric)
+                if not constraint or "value" not in constraint:
+                    continue
+                if constraint["type"] == "absolute":
+                    tail_bounds[metric] = constraint["value"]
+                elif constraint["type"] == "relative":
+                    tail_bounds[metric] = constraint["value"] * (home_deployment_metrics[f"tail_{metric}"] / 100)
+        self.set_tail_bounds(tail_bounds)
+
+    def set_tail_bounds(self, tail_bounds: dict[str, float]) -> None:
+        self._tail_bounds = tail_bounds
+
+    def calculate_deployment_metrics_batch(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        """
+        Calculate the deployment metrics of multiple deployments, in the order they are given.
+        Calculators that can amortize the overhead of a call over many deployments should override this.
+        """
+        return [self.calculate_deployment_metrics(deployment) for deployment in deployments]
+
     def _perform_monte_carlo_simulation(self, deployment: list[int]) -> dict[str, float]:
         """
         Perform a Monte Carlo simulation to get the average cost, runtime, and carbon footprint of the deployment.
@@ -82,4 +126,4 @@ class DeploymentMetricsCalculator(ABC):  # pylint: disable=too-many-instance-att
 
     def _is_invoked(self, from_instance_index: int, to_instance_index: int) -> bool:
         invocation_probability = self._input_manager.get_invocation_probability(from_instance_index, to_instance_index)
-        return random.random() < invocation_probability
+        return self._input_manager.get_random_stream().random() < invocation_probability
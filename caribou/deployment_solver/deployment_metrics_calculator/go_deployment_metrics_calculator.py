@@ -1,9 +1,11 @@
 import ctypes
 import json
 import os
-from typing import Any
+from typing import Any, Optional
 from uuid import uuid4
 
+import numpy as np
+
 from caribou.common.constants import GO_PATH, TAIL_LATENCY_THRESHOLD
 from caribou.deployment_solver.deployment_input.input_manager import InputManager
 from caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator import (
@@ -20,6 +22,27 @@ TMP_DIR = "/tmp/go_deployment_metrics_calculator_bridge"
 if not os.path.exists(TMP_DIR):
     os.makedirs(TMP_DIR)
 
+# Order of the metrics in the flat arrays of the binary interface (DeploymentMetricNames in Go)
+GO_DEPLOYMENT_METRICS = (
+    "average_cost",
+    "average_runtime",
+    "average_carbon",
+    "tail_cost",
+    "tail_runtime",
+    "tail_carbon",
+    "average_execution_carbon",
+    "average_transmission_carbon",
+)
+
+# Status returned by the calls of the binary interface when they succeed
+GO_STATUS_OK = 0
+
+
+def _check_go_status(status: int, call: str) -> None:
+    # The calls of the binary interface report failures (e.g., a calculator that was not set up) by status
+    if status != GO_STATUS_OK:
+        raise RuntimeError(f"The Go deployment metrics calculator failed in {call} (status {status})")
+
 
 def send_to_go(channel_path: str, command: str, data: Any) -> None:
     with open(channel_path, "w", encoding="utf-8") as ch:
@@ -54,7 +77,12 @@ class GoDeploymentMetricsCalculator(DeploymentMetricsCalculator):
             record_transmission_execution_carbon,
         )
         self._caribougo = ctypes.CDLL(f"{GO_PATH}/caribougo.so")
-        self.setup_go()
+        # Libraries built before the binary interface only support the named pipe bridge
+        self._use_binary_interface = hasattr(self._caribougo, "calculateDeploymentMetricsDirect")
+        if self._use_binary_interface:
+            self.setup_go_binary()
+        else:
+            self.setup_go()
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -82,18 +110,77 @@ class GoDeploymentMetricsCalculator(DeploymentMetricsCalculator):
         send_to_go(self.py_go_file, "Setup", go_data)
         receive_from_go(self.go_py_file)
 
+    def setup_go_binary(self) -> None:
+        # The (one off) setup data is passed by pointer and length, so it is not bound by a buffer size
+        self._caribougo.setupDirect.argtypes = [ctypes.c_char_p, ctypes.c_int]
+        self._caribougo.setupDirect.restype = ctypes.c_int
+        self._caribougo.calculateDeploymentMetricsDirect.argtypes = [
+            ctypes.POINTER(ctypes.c_longlong),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.POINTER(ctypes.c_double),
+        ]
+        self._caribougo.calculateDeploymentMetricsDirect.restype = ctypes.c_int
+        self._caribougo.updateDataForNewHourDirect.argtypes = [ctypes.c_char_p]
+        self._caribougo.updateDataForNewHourDirect.restype = ctypes.c_int
+
+        go_data = json.dumps(self.to_dict()).encode("utf-8")
+        _check_go_status(self._caribougo.setupDirect(go_data, len(go_data)), "setupDirect")
+
+    def _calculate_deployment_metrics_binary(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        deployments_array = np.ascontiguousarray(deployments, dtype=np.int64)
+        metrics_array = np.zeros((len(deployments), len(GO_DEPLOYMENT_METRICS)), dtype=np.float64)
+        status = self._caribougo.calculateDeploymentMetricsDirect(
+            deployments_array.ctypes.data_as(ctypes.POINTER(ctypes.c_longlong)),
+            deployments_array.shape[0],
+            deployments_array.shape[1],
+            metrics_array.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+        )
+        _check_go_status(status, "calculateDeploymentMetricsDirect")
+
+        number_of_metrics = len(GO_DEPLOYMENT_METRICS) if self._record_transmission_execution_carbon else 6
+        return [
+            dict(zip(GO_DEPLOYMENT_METRICS[:number_of_metrics], metrics[:number_of_metrics].tolist()))
+            for metrics in metrics_array
+        ]
+
     def calculate_deployment_metrics(self, deployment: list[int]) -> dict[str, float]:
+        if self._use_binary_interface:
+            return self._calculate_deployment_metrics_binary([deployment])[0]
+
         self._caribougo.goRead()
         go_data = json.dumps(deployment)
         send_to_go(self.py_go_file, "CalculateDeploymentMetrics", go_data)
         ret_data = receive_from_go(self.go_py_file)
         return ret_data["data"]
 
-    def update_data_for_new_hour(self, hour_to_run: str) -> None:
+    def calculate_deployment_metrics_batch(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        if len(deployments) == 0:
+            return []
+        if self._use_binary_interface:
+            return self._calculate_deployment_metrics_binary(deployments)
+
+        # A single round trip through the bridge for all the deployments
+        self._caribougo.goRead()
+        go_data = json.dumps(deployments)
+        send_to_go(self.py_go_file, "CalculateDeploymentMetricsBatch", go_data)
+        ret_data = receive_from_go(self.go_py_file)
+        return ret_data["data"]
+
+    def update_data_for_new_hour(self, hour_to_run: Optional[str]) -> None:
+        if self._use_binary_interface:
+            status = self._caribougo.updateDataForNewHourDirect(
+                None if hour_to_run is None else hour_to_run.encode("utf-8")
+            )
+            _check_go_status(status, "updateDataForNewHourDirect")
+            return
+
         self._caribougo.goRead()
         send_to_go(self.py_go_file, "UpdateDataForNewHour", hour_to_run)
         _ = receive_from_go(self.go_py_file)
 
     def __del__(self) -> None:
+        if getattr(self, "_use_binary_interface", True):
+            return
         os.remove(self.go_py_file)
         os.remove(self.py_go_file)
@@ -0,0 +1,116 @@
+import math
+from typing import Sequence, Union
+
+import numpy as np
+import scipy.stats as st
+
+
+class StreamingQuantileSketch:
+    """
+    Compacting quantile sketch of a stream of samples.
+
+    Samples are kept exactly until a level holds more than ``capacity`` values,
+    then every other value of the sorted level is promoted to the next level with
+    twice the weight, so the memory stays bounded regardless of the stream length.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 2:
+            raise ValueError("The quantile sketch capacity must be at least 2")
+        self._capacity = capacity
+        self._levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        # Alternate the kept half on each compaction of a level to avoid a bias
+        self._compaction_offsets: list[int] = [0]
+
+    def update(self, samples: Union[Sequence[float], np.ndarray]) -> None:
+        self._levels[0] = np.concatenate((self._levels[0], np.asarray(samples, dtype=np.float64)))
+        level = 0
+        while level < len(self._levels):
+            if self._levels[level].size > self._capacity:
+                self._compact(level)
+            level += 1
+
+    def _compact(self, level: int) -> None:
+        values = np.sort(self._levels[level])
+        if values.size % 2:
+            # Keep the odd value out on this level
+            self._levels[level] = values[-1:]
+            values = values[:-1]
+        else:
+            self._levels[level] = np.empty(0, dtype=np.float64)
+
+        if level + 1 == len(self._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+            self._compaction_offsets.append(0)
+        offset = self._compaction_offsets[level]
+        self._compaction_offsets[level] = 1 - offset
+        self._levels[level + 1] = np.concatenate((self._levels[level + 1], values[offset::2]))
+
+    def percentile(self, percentile: float) -> float:
+        if len(self._levels) == 1:
+            # Nothing has been compacted yet, the percentile is exact
+            if self._levels[0].size == 0:
+                raise ValueError("The quantile sketch is empty")
+            return float(np.percentile(self._levels[0], percentile))
+
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.size, 2.0**index) for index, level in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        weights = weights[order]
+        # Interpolate between the centers of the weighted samples
+        cumulative_weights = np.cumsum(weights) - weights / 2
+        target = percentile / 100 * weights.sum()
+        return float(np.interp(target, cumulative_weights, values))
+
+    def __len__(self) -> int:
+        return sum(level.size for level in self._levels)
+
+
+class StreamingStatistics:
+    """
+    Running mean and variance (Welford, merged per batch) of a stream of
+    samples, together with a quantile sketch for the tail percentile.
+    """
+
+    def __init__(self, quantile_sketch_capacity: int) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._sum_of_squared_deviations = 0.0
+        self._quantile_sketch = StreamingQuantileSketch(quantile_sketch_capacity)
+
+    def update(self, samples: Union[Sequence[float], np.ndarray]) -> None:
+        batch = np.asarray(samples, dtype=np.float64)
+        if batch.size == 0:
+            return
+
+        batch_count = batch.size
+        batch_mean = float(batch.mean())
+        batch_sum_of_squared_deviations = float(np.square(batch - batch_mean).sum())
+
+        total_count = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total_count
+        self._sum_of_squared_deviations += (
+            batch_sum_of_squared_deviations + delta * delta * self.count * batch_count / total_count
+        )
+        self.count = total_count
+        self._quantile_sketch.update(batch)
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self._sum_of_squared_deviations / (self.count - 1)
+
+    def relative_confidence_interval_width(self, threshold: float) -> float:
+        """
+        Width of the (1 - threshold) Student-t confidence interval of the mean,
+        relative to the mean.
+        """
+        standard_error = math.sqrt(self.variance / self.count)
+        t_value = st.t.ppf(1 - threshold / 2, self.count - 1)
+        return float(2 * t_value * standard_error / self.mean)
+
+    def percentile(self, percentile: float) -> float:
+        return self._quantile_sketch.percentile(percentile)
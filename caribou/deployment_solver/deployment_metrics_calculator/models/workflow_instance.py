@@ -1,4 +1,3 @@
-import random
 from typing import Any, Optional
 
 from caribou.deployment_solver.deployment_input.input_manager import InputManager
@@ -520,4 +519,4 @@ class WorkflowInstance:  # pylint: disable=too-many-instance-attributes
 
     def _retrieved_wpd_at_function(self) -> bool:
         retrieved_wpd_at_function_probability = self._input_manager.get_start_hop_retrieve_wpd_probability()
-        return random.random() < retrieved_wpd_at_function_probability
+        return self._input_manager.get_random_stream().random() < retrieved_wpd_at_function_probability
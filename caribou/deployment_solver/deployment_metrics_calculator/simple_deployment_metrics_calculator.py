@@ -1,61 +1,152 @@
-import statistics
-from multiprocessing import Manager, Process
-from queue import Queue
-from typing import Any, Tuple
+import mmap
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Any, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import scipy.stats as st
 
-from caribou.common.constants import TAIL_LATENCY_THRESHOLD
+from caribou.common.constants import (
+    HARD_CONSTRAINT_EARLY_ABORT_SIGNIFICANCE,
+    MONTE_CARLO_QUANTILE_SKETCH_CAPACITY,
+    TAIL_LATENCY_THRESHOLD,
+)
 from caribou.deployment_solver.deployment_input.input_manager import InputManager
 from caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator import (
     DeploymentMetricsCalculator,
 )
+from caribou.deployment_solver.deployment_metrics_calculator.models.streaming_statistics import StreamingStatistics
 from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
 from caribou.deployment_solver.models.region_indexer import RegionIndexer
 from caribou.deployment_solver.workflow_config import WorkflowConfig
 
+# Metrics written by the workers into the shared samples buffer (in this order)
+SAMPLE_METRICS = ("cost", "runtime", "carbon", "transmission_carbon", "execution_carbon")
+
+
+class _MappedFileBuffer:
+    """
+    Stand-in for a shared memory block where there is no /dev/shm (such as on AWS Lambda),
+    backed by a memory mapped temporary file that every worker maps by its name (path).
+    """
+
+    def __init__(self, name: Optional[str] = None, size: int = 0) -> None:
+        if name is None:
+            file_descriptor, name = tempfile.mkstemp(prefix="caribou_samples_")
+            os.ftruncate(file_descriptor, size)
+            os.close(file_descriptor)
+        self.name: str = name
+        with open(name, "r+b") as buffer_file:
+            self._mmap = mmap.mmap(buffer_file.fileno(), 0)
+        self.buf = memoryview(self._mmap)
+
+    def close(self) -> None:
+        self.buf.release()
+        self._mmap.close()
+
+    def unlink(self) -> None:
+        os.remove(self.name)
+
+
+def _create_samples_buffer(size: int) -> Union[shared_memory.SharedMemory, _MappedFileBuffer]:
+    try:
+        return shared_memory.SharedMemory(create=True, size=size)
+    except OSError:
+        return _MappedFileBuffer(size=size)
+
+
+def _open_samples_buffer(name: str, mapped_file: bool) -> Union[shared_memory.SharedMemory, _MappedFileBuffer]:
+    return _MappedFileBuffer(name) if mapped_file else shared_memory.SharedMemory(name=name)
+
+
+def _get_worker_context() -> BaseContext:
+    # Forking lets the workers share the read-only input tables of the parent
+    # (copy-on-write) instead of pickling the input manager into every process.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
 
 def _simulation_worker(
-    input_manager: InputManager,
+    input_manager: Optional[InputManager],
+    snapshot_path: Optional[str],
+    random_seed: int,
     workflow_config: WorkflowConfig,
     region_indexer: RegionIndexer,
     instance_indexer: InstanceIndexer,
     tail_latency_threshold: int,
+    record_transmission_execution_carbon: bool,
+    worker_index: int,
     n_iterations: int,
-    input_queue: Queue,
-    output_queue: Queue,
+    samples_buffer_name: str,
+    samples_buffer_mapped_file: bool,
+    samples_shape: tuple[int, int, int],
+    connection: Connection,
 ) -> None:
-    deployment_metrics_calculator: DeploymentMetricsCalculator = DeploymentMetricsCalculator(
-        workflow_config, input_manager, region_indexer, instance_indexer, tail_latency_threshold
+    if input_manager is None:
+        # Without fork, the inputs are loaded from the snapshot of the pool rather than pickled
+        input_manager = InputManager(workflow_config, random_seed=random_seed, snapshot_path=snapshot_path)
+    # The in-process calculator samples a share of a batch, or simulates whole deployments
+    deployment_metrics_calculator = SimpleDeploymentMetricsCalculator(
+        workflow_config,
+        input_manager,
+        region_indexer,
+        instance_indexer,
+        tail_latency_threshold,
+        n_processes=1,
+        record_transmission_execution_carbon=record_transmission_execution_carbon,
+        n_sample_substreams=samples_shape[0],
     )
-    while True:
-        received_input = input_queue.get()
-        if isinstance(received_input, str) or received_input is None:
-            if received_input == "exit":
-                break
-            input_manager.alter_carbon_setting(received_input)
-            output_queue.put("OK")
-            continue
-        deployment = received_input
-        costs_distribution_list: list[float] = []
-        runtimes_distribution_list: list[float] = []
-        carbons_distribution_list: list[float] = []
-        for _ in range(n_iterations):
-            results = deployment_metrics_calculator.calculate_workflow(deployment)
-            costs_distribution_list.append(results["cost"])
-            runtimes_distribution_list.append(results["runtime"])
-            carbons_distribution_list.append(results["carbon"])
-        output_queue.put(
-            (
-                costs_distribution_list,
-                runtimes_distribution_list,
-                carbons_distribution_list,
-            )
-        )
+    samples_buffer = _open_samples_buffer(samples_buffer_name, samples_buffer_mapped_file)
+    samples: np.ndarray = np.ndarray(samples_shape, dtype=np.float64, buffer=samples_buffer.buf)
+    try:
+        while True:
+            received_input = connection.recv()
+            if isinstance(received_input, str) or received_input is None:
+                if received_input == "exit":
+                    break
+                if received_input == "reset_random_stream":
+                    # Each worker replays its own substream, so the samples of the workers stay independent
+                    input_manager.reset_random_stream(worker_index + 1)
+                    connection.send("OK")
+                    continue
+                input_manager.alter_carbon_setting(received_input)
+                connection.send("OK")
+                continue
+            if isinstance(received_input, dict):
+                deployment_metrics_calculator.set_tail_bounds(received_input)
+                connection.send("OK")
+                continue
+            if isinstance(received_input, tuple):
+                # A share of a batch of deployments, the (small) metrics are sent back directly
+                connection.send(
+                    [
+                        deployment_metrics_calculator.calculate_deployment_metrics(deployment)
+                        for deployment in received_input
+                    ]
+                )
+                continue
+            deployment = received_input
+            for iteration in range(n_iterations):
+                results = deployment_metrics_calculator.calculate_workflow(deployment)
+                for metric_index, metric in enumerate(SAMPLE_METRICS):
+                    samples[worker_index, metric_index, iteration] = results.get(metric, 0.0)
+            # Only signal completion, the samples are read from the shared buffer
+            connection.send("OK")
+    finally:
+        # The view on the buffer must be released before it can be closed
+        del samples
+        samples_buffer.close()
 
 
-class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
+class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):  # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
         workflow_config: WorkflowConfig,
@@ -65,6 +156,7 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
         tail_latency_threshold: int = TAIL_LATENCY_THRESHOLD,
         n_processes: int = 4,
         record_transmission_execution_carbon: bool = False,
+        n_sample_substreams: int = 0,
     ):
         super().__init__(
             workflow_config,
@@ -76,6 +168,10 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
         )
         self.n_processes = n_processes
         self.batch_size = 200
+        # A worker of a parallel calculator simulating whole deployments draws every batch from the
+        # substreams of all the workers, the same samples the workers would draw sharing the deployment
+        self._n_sample_substreams = n_sample_substreams
+        self._substream_states: list[tuple[int, np.random.Generator, random.Random]] = []
         if n_processes > 1:
             self._setup(
                 workflow_config,
@@ -95,52 +191,106 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
         tail_latency_threshold: int,
         n_processes: int,
     ) -> None:
-        self._manager = Manager()
-        self._input_queue: Queue = self._manager.Queue()
-        self._output_queue: Queue = self._manager.Queue()
+        context = _get_worker_context()
+        n_iterations = self.batch_size // n_processes
+
+        # Without fork, every worker loads the inputs from a snapshot written for this pool, which the workers
+        # map rather than retrieving the inputs from the remote client again
+        self._snapshot_directory: Optional[str] = None
+        snapshot_path: Optional[str] = None
+        if context.get_start_method() != "fork":
+            self._snapshot_directory = tempfile.mkdtemp()
+            snapshot_path = os.path.join(self._snapshot_directory, "solver_inputs.snapshot")
+            input_manager.save_snapshot(snapshot_path)
+
+        # Preallocated buffer where every worker writes the samples of a batch
+        # (worker x metric x iteration), avoiding to send them back through IPC
+        self._samples_shape: tuple[int, int, int] = (n_processes, len(SAMPLE_METRICS), n_iterations)
+        self._samples_buffer = _create_samples_buffer(int(np.prod(self._samples_shape)) * np.dtype(np.float64).itemsize)
+        self._samples: np.ndarray = np.ndarray(self._samples_shape, dtype=np.float64, buffer=self._samples_buffer.buf)
+
+        pipes = [context.Pipe() for _ in range(n_processes)]
+        self._connections: list[Connection] = [parent_connection for parent_connection, _ in pipes]
         self._pool = self._init_workers(
             workflow_config,
             input_manager,
+            snapshot_path,
             region_indexer,
             instance_indexer,
             tail_latency_threshold,
-            n_processes,
-            self.batch_size // n_processes,
-            self._input_queue,
-            self._output_queue,
+            n_iterations,
+            self._samples_buffer.name,
+            isinstance(self._samples_buffer, _MappedFileBuffer),
+            self._samples_shape,
+            [worker_connection for _, worker_connection in pipes],
+            context,
         )
 
     def _init_workers(
         self,
         workflow_config: WorkflowConfig,
         input_manager: InputManager,
+        snapshot_path: Optional[str],
         region_indexer: RegionIndexer,
         instance_indexer: InstanceIndexer,
         tail_latency_threshold: int,
-        n_processes: int,
         n_iterations: int,
-        input_queue: Queue,
-        output_queue: Queue,
-    ) -> list[Process]:
+        samples_buffer_name: str,
+        samples_buffer_mapped_file: bool,
+        samples_shape: tuple[int, int, int],
+        connections: Sequence[Connection],
+        context: BaseContext,
+    ) -> list[BaseProcess]:
         pool = []
-        for _ in range(n_processes):
-            p = Process(
+        for worker_index, connection in enumerate(connections):
+            p = context.Process(  # type: ignore
                 target=_simulation_worker,
                 args=(
-                    input_manager,
+                    input_manager if snapshot_path is None else None,
+                    snapshot_path,
+                    input_manager.get_random_stream().seed,
                     workflow_config,
                     region_indexer,
                     instance_indexer,
                     tail_latency_threshold,
+                    self._record_transmission_execution_carbon,
+                    worker_index,
                     n_iterations,
-                    input_queue,
-                    output_queue,
+                    samples_buffer_name,
+                    samples_buffer_mapped_file,
+                    samples_shape,
+                    connection,
                 ),
+                daemon=True,
             )
             p.start()
             pool.append(p)
         return pool
 
+    def _broadcast(self, message: Any) -> None:
+        for connection in self._connections:
+            connection.send(message)
+        for connection in self._connections:
+            connection.recv()
+
+    def set_tail_bounds(self, tail_bounds: dict[str, float]) -> None:
+        super().set_tail_bounds(tail_bounds)
+        if self.n_processes > 1:
+            # The workers simulate whole deployments of a batch on their own
+            self._broadcast(tail_bounds)
+
+    def _reset_random_stream(self) -> None:
+        if self.n_processes > 1:
+            self._broadcast("reset_random_stream")
+            return
+        super()._reset_random_stream()
+        if self._n_sample_substreams > 0:
+            random_stream = self._input_manager.get_random_stream()
+            self._substream_states = []
+            for substream in range(1, self._n_sample_substreams + 1):
+                random_stream.reset(substream)
+                self._substream_states.append(random_stream.get_state())
+
     def calculate_workflow_loop(
         self, deployment: list
     ) -> Tuple[list[float], list[float], list[float], list[float], list[float]]:
@@ -150,25 +300,31 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
         transmission_carbon_list: list[float] = []
         execution_carbon_list: list[float] = []
         if self.n_processes > 1:
-            for _ in range(self.n_processes):
-                self._input_queue.put(deployment)
-            for _ in range(self.n_processes):
-                result = self._output_queue.get()
-                costs_distribution_list.extend(result[0])
-                runtimes_distribution_list.extend(result[1])
-                carbons_distribution_list.extend(result[2])
-            assert self._input_queue.empty()
-            assert self._output_queue.empty()
+            self._broadcast(deployment)
+            # (metric, worker * iteration) view of the samples of all workers
+            samples = self._samples.transpose(1, 0, 2).reshape(len(SAMPLE_METRICS), -1)
+            costs_distribution_list = samples[0].tolist()
+            runtimes_distribution_list = samples[1].tolist()
+            carbons_distribution_list = samples[2].tolist()
+
+            if self._record_transmission_execution_carbon:
+                transmission_carbon_list = samples[3].tolist()
+                execution_carbon_list = samples[4].tolist()
         else:
-            for _ in range(self.batch_size):
-                results = self.calculate_workflow(deployment)
-                costs_distribution_list.append(results["cost"])
-                runtimes_distribution_list.append(results["runtime"])
-                carbons_distribution_list.append(results["carbon"])
+            random_stream = self._input_manager.get_random_stream()
+            # In the order of the samples of the workers in the shared buffer (worker x iteration)
+            substream_states = self._substream_states or [random_stream.get_state()]
+            for substream_state in substream_states:
+                random_stream.set_state(substream_state)
+                for _ in range(self.batch_size // len(substream_states)):
+                    results = self.calculate_workflow(deployment)
+                    costs_distribution_list.append(results["cost"])
+                    runtimes_distribution_list.append(results["runtime"])
+                    carbons_distribution_list.append(results["carbon"])
 
-                if self._record_transmission_execution_carbon:
-                    transmission_carbon_list.append(results["transmission_carbon"])
-                    execution_carbon_list.append(results["execution_carbon"])
+                    if self._record_transmission_execution_carbon:
+                        transmission_carbon_list.append(results["transmission_carbon"])
+                        execution_carbon_list.append(results["execution_carbon"])
 
         return (
             costs_distribution_list,
@@ -178,74 +334,108 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
             execution_carbon_list,
         )
 
+    def calculate_deployment_metrics_batch(self, deployments: list[list[int]]) -> list[dict[str, float]]:
+        if self.n_processes == 1 or len(deployments) < self.n_processes:
+            # Not enough deployments to keep all workers busy, parallelize the samples instead.
+            # Either way a deployment is simulated with the same draws (see n_sample_substreams).
+            return super().calculate_deployment_metrics_batch(deployments)
+
+        # Spread whole deployments over the workers, each simulating its share
+        for worker_index, connection in enumerate(self._connections):
+            connection.send(tuple(deployments[worker_index :: self.n_processes]))
+        results: list[dict[str, float]] = [{} for _ in deployments]
+        for worker_index, connection in enumerate(self._connections):
+            results[worker_index :: self.n_processes] = connection.recv()
+        return results
+
     def _perform_monte_carlo_simulation(self, deployment: list[int]) -> dict[str, float]:
         """
         Perform a Monte Carlo simulation to both the average and tail
         cost, runtime, and carbon footprint of the deployment.
         """
-        costs_distribution_list: list[float] = []
-        runtimes_distribution_list: list[float] = []
-        carbons_distribution_list: list[float] = []
+        # Convergence checks and the final metrics only need running statistics,
+        # so the samples of each batch are folded in and then dropped.
+        costs_statistics = StreamingStatistics(MONTE_CARLO_QUANTILE_SKETCH_CAPACITY)
+        runtimes_statistics = StreamingStatistics(MONTE_CARLO_QUANTILE_SKETCH_CAPACITY)
+        carbons_statistics = StreamingStatistics(MONTE_CARLO_QUANTILE_SKETCH_CAPACITY)
 
-        execution_carbon_list: list[float] = []
-        transmission_carbon_list: list[float] = []
+        execution_carbon_statistics = StreamingStatistics(MONTE_CARLO_QUANTILE_SKETCH_CAPACITY)
+        transmission_carbon_statistics = StreamingStatistics(MONTE_CARLO_QUANTILE_SKETCH_CAPACITY)
 
         max_number_of_iterations = 2000
         threshold = 0.05
         number_of_iterations = 0
+        # Number of samples exceeding the bound of every tail metric with a hard constraint
+        tail_bound_exceedances = {metric: 0 for metric in self._tail_bounds}
         while number_of_iterations < max_number_of_iterations:
             results = self.calculate_workflow_loop(deployment)
-            costs_distribution_list.extend(results[0])
-            runtimes_distribution_list.extend(results[1])
-            carbons_distribution_list.extend(results[2])
+            costs_statistics.update(results[0])
+            runtimes_statistics.update(results[1])
+            carbons_statistics.update(results[2])
 
             if self._record_transmission_execution_carbon:
-                transmission_carbon_list.extend(results[3])
-                execution_carbon_list.extend(results[4])
+                transmission_carbon_statistics.update(results[3])
+                execution_carbon_statistics.update(results[4])
 
             number_of_iterations += self.batch_size
 
+            for metric, samples in (("cost", results[0]), ("runtime", results[1]), ("carbon", results[2])):
+                if metric in tail_bound_exceedances:
+                    tail_bound_exceedances[metric] += int(
+                        np.count_nonzero(np.asarray(samples) > self._tail_bounds[metric])
+                    )
+            if self._is_tail_bound_exceeded(tail_bound_exceedances, costs_statistics.count, max_number_of_iterations):
+                # The deployment fails a hard constraint, the remaining samples would not change that
+                break
+
             all_within_threshold = True
 
-            for distribution in [runtimes_distribution_list, carbons_distribution_list, costs_distribution_list]:
-                mean = np.mean(distribution)
-                len_distribution = len(distribution)
-                if mean and len_distribution > 1:
-                    ci_low, ci_up = st.t.interval(
-                        1 - threshold, len_distribution - 1, loc=mean, scale=st.sem(distribution)
-                    )
-                    ci_width = ci_up - ci_low
-                    relative_ci_width = ci_width / mean
+            for distribution_statistics in [runtimes_statistics, carbons_statistics, costs_statistics]:
+                if distribution_statistics.mean and distribution_statistics.count > 1:
+                    relative_ci_width = distribution_statistics.relative_confidence_interval_width(threshold)
                     if relative_ci_width > threshold:
                         all_within_threshold = False
                         break
                 elif all_within_threshold:
                     break
 
+        self.simulated_samples += costs_statistics.count
+
         result = {
-            "average_cost": float(statistics.mean(costs_distribution_list)),
-            "average_runtime": float(statistics.mean(runtimes_distribution_list)),
-            "average_carbon": float(statistics.mean(carbons_distribution_list)),
-            "tail_cost": float(np.percentile(costs_distribution_list, self._tail_latency_threshold)),
-            "tail_runtime": float(np.percentile(runtimes_distribution_list, self._tail_latency_threshold)),
-            "tail_carbon": float(np.percentile(carbons_distribution_list, self._tail_latency_threshold)),
+            "average_cost": costs_statistics.mean,
+            "average_runtime": runtimes_statistics.mean,
+            "average_carbon": carbons_statistics.mean,
+            "tail_cost": costs_statistics.percentile(self._tail_latency_threshold),
+            "tail_runtime": runtimes_statistics.percentile(self._tail_latency_threshold),
+            "tail_carbon": carbons_statistics.percentile(self._tail_latency_threshold),
         }
 
         if self._record_transmission_execution_carbon:
-            result["average_execution_carbon"] = float(statistics.mean(execution_carbon_list))
-            result["average_transmission_carbon"] = float(statistics.mean(transmission_carbon_list))
+            result["average_execution_carbon"] = execution_carbon_statistics.mean
+            result["average_transmission_carbon"] = transmission_carbon_statistics.mean
 
         return result
 
+    def _is_tail_bound_exceeded(
+        self, tail_bound_exceedances: dict[str, int], number_of_samples: int, max_number_of_iterations: int
+    ) -> bool:
+        """
+        Sequential one sided binomial test of whether the tail percentile of a metric exceeds its bound,
+        which is the case if more than (100 - tail threshold)% of the samples exceed the bound.
+        The significance is split over all the batches the test may be repeated on (Bonferroni).
+        """
+        exceedance_probability = 1 - self._tail_latency_threshold / 100
+        significance = HARD_CONSTRAINT_EARLY_ABORT_SIGNIFICANCE * self.batch_size / max_number_of_iterations
+        return any(
+            exceedances > exceedance_probability * number_of_samples
+            and st.binom.sf(exceedances - 1, number_of_samples, exceedance_probability) < significance
+            for exceedances in tail_bound_exceedances.values()
+        )
+
     def update_data_for_new_hour(self, hour_to_run: str) -> None:
         if self.n_processes == 1:
             return
-        for _ in range(self.n_processes):
-            self._input_queue.put(hour_to_run)
-        for _ in range(self.n_processes):
-            _ = self._output_queue.get()
-        assert self._input_queue.empty()
-        assert self._output_queue.empty()
+        self._broadcast(hour_to_run)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -260,7 +450,19 @@ class SimpleDeploymentMetricsCalculator(DeploymentMetricsCalculator):
 
     def __del__(self) -> None:
         if self.n_processes > 1:
-            for _ in range(self.n_processes):
-                self._input_queue.put("exit")
+            for connection in self._connections:
+                try:
+                    connection.send("exit")
+                except OSError:
+                    # The worker is already gone (e.g., terminated at interpreter exit)
+                    pass
             for p in self._pool:
+                p.join(timeout=1)
                 p.kill()
+            for connection in self._connections:
+                connection.close()
+            del self._samples
+            self._samples_buffer.close()
+            self._samples_buffer.unlink()
+            if self._snapshot_directory is not None:
+                shutil.rmtree(self._snapshot_directory, ignore_errors=True)
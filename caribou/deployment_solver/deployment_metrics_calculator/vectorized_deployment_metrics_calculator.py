@@ -0,0 +1,828 @@
+from typing import Any, Optional
+
+import numpy as np
+
+from caribou.common.constants import AVERAGE_USA_CARBON_INTENSITY, GLOBAL_SYSTEM_REGION, TAIL_LATENCY_THRESHOLD
+from caribou.deployment_solver.deployment_input.input_manager import InputManager
+from caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator import (
+    DeploymentMetricsCalculator,
+)
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.region_indexer import RegionIndexer
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+
+
+class _SampleAccumulator:
+    """
+    Per sample accumulators of a batch of simulated workflow invocations.
+    Carbon is kept as the grid energy and data transfer per region column,
+    such that it can be projected with the grid carbon intensities afterwards.
+    """
+
+    def __init__(self, n_samples: int, n_region_columns: int) -> None:
+        self.cost: np.ndarray = np.zeros(n_samples)
+        self.runtime: np.ndarray = np.zeros(n_samples)
+
+        # Grid energy (kWh) consumed by the execution of the instances in each region
+        self.execution_energy: np.ndarray = np.zeros((n_samples, n_region_columns))
+
+        # Data transfer (GB) weighted towards the grid carbon intensity of each region
+        self.transmission_data: np.ndarray = np.zeros((n_samples, n_region_columns))
+
+        # Data transfer (GB) at the average carbon intensity of the USA
+        self.transmission_data_usa: np.ndarray = np.zeros(n_samples)
+
+
+class _NodeSamples:
+    """
+    Samples of a simulated instance: whether it was invoked, its cumulative runtimes,
+    the invocation of its outgoing edges and its contribution to the accumulators.
+    """
+
+    def __init__(
+        self,
+        invoked: np.ndarray,
+        cumulative_runtimes: dict[str, Any],
+        edge_invoked: dict[int, np.ndarray],
+        contribution: _SampleAccumulator,
+    ) -> None:
+        self.invoked = invoked
+        self.cumulative_runtimes = cumulative_runtimes
+        self.edge_invoked = edge_invoked
+        self.contribution = contribution
+
+
+class VectorizedDeploymentMetricsCalculator(
+    DeploymentMetricsCalculator
+):  # pylint: disable=too-many-instance-attributes
+    """
+    Simulates a whole batch of workflow invocations at once with NumPy array operations.
+    The semantics follow the ones of the WorkflowInstance model (start hop, redirector,
+    sync nodes and non-execution simulated edges), but rather than building an object graph
+    per sample, the distributions are compiled into arrays once and sampled per batch.
+    """
+
+    def __init__(
+        self,
+        workflow_config: WorkflowConfig,
+        input_manager: InputManager,
+        region_indexer: RegionIndexer,
+        instance_indexer: InstanceIndexer,
+        tail_latency_threshold: int = TAIL_LATENCY_THRESHOLD,
+        record_transmission_execution_carbon: bool = False,
+        n_samples: int = 2000,
+    ):
+        super().__init__(
+            workflow_config,
+            input_manager,
+            region_indexer,
+            instance_indexer,
+            tail_latency_threshold,
+            record_transmission_execution_carbon,
+        )
+        self.n_samples = n_samples
+        # Replaced by the generator of the input manager random stream of each simulated node
+        self._rng: np.random.Generator = np.random.default_rng()
+
+        # Node samples of the last simulated deployment, as ((seed, substream, n_samples), deployment, node samples).
+        # Only the nodes affected by the instances moved since then are simulated again.
+        self._previous_simulation: Optional[tuple[tuple[int, int, int], list[int], dict[int, _NodeSamples]]] = None
+
+        # The carbon setting (hour of the day) that the carbon is projected with
+        self._carbon_setting: Optional[str] = None
+
+        self._compile_regions(region_indexer)
+        self._compile_workflow_structure()
+        self._compile_static_inputs()
+
+        # Tables of distributions, compiled lazily as they are first needed.
+        # None of them depend on the carbon setting, so they are kept across hours.
+        self._runtime_tables: dict[tuple[int, int, bool], dict[str, Any]] = {}
+        self._transmission_tables: dict[tuple[int, int, int, int, bool], dict[str, np.ndarray]] = {}
+        self._simulated_transmission_tables: dict[tuple[int, int, int, int, int, int], tuple[float, np.ndarray]] = {}
+        self._sync_transfer_info: dict[tuple[int, int], tuple[float, float, float]] = {}
+        self._execution_factors: dict[tuple[int, int, bool], dict[str, float]] = {}
+        self._region_cost_factors: dict[int, dict[str, float]] = {}
+
+        # Grid carbon intensity of the region columns for every carbon setting used so far
+        self._grid_carbon_intensities: dict[Optional[str], dict[int, float]] = {}
+
+    def _compile_regions(self, region_indexer: RegionIndexer) -> None:
+        region_value_indices = region_indexer.get_value_indices()
+        region_names = sorted(region_value_indices.keys(), key=lambda region: region_value_indices[region])
+        self._number_of_regions = len(region_names)
+
+        # The system region is appended as an extra column, unless it is already a permitted region
+        system_region_name = f"aws:{GLOBAL_SYSTEM_REGION}"
+        self._system_region_column = region_value_indices.get(system_region_name, len(region_names))
+        region_names.append(system_region_name)
+        self._number_of_region_columns = len(region_names)
+
+        # [current_region][other_region] lookup tables
+        self._is_same_region = np.array([[current == other for other in region_names] for current in region_names])
+        self._is_egress = np.array(
+            [[not other.startswith(current) for other in region_names] for current in region_names]
+        )
+
+    def _compile_workflow_structure(self) -> None:
+        start_hop_instances = [
+            instance_index
+            for instance_index in self._topological_order
+            if len(self._prerequisites_dictionary[instance_index]) == 0
+        ]
+        if len(start_hop_instances) != 1:
+            raise ValueError("The vectorized calculator requires a workflow with exactly one start hop instance")
+        self._start_hop_instance_index: int = start_hop_instances[0]
+
+        # Predecessors are ordered by when they are processed, which is the
+        # order the edges are created in the WorkflowInstance.
+        topological_position = {instance_index: index for index, instance_index in enumerate(self._topological_order)}
+        self._ordered_predecessors: dict[int, list[int]] = {
+            instance_index: sorted(predecessors, key=lambda predecessor: topological_position[predecessor])
+            for instance_index, predecessors in self._prerequisites_dictionary.items()
+        }
+
+        self._invocation_probabilities: dict[tuple[int, int], float] = {
+            (instance_index, successor_index): self._input_manager.get_invocation_probability(
+                instance_index, successor_index
+            )
+            for instance_index in self._topological_order
+            for successor_index in self._successor_dictionary[instance_index]
+        }
+
+        # Non-execution of an edge (from, to) creates simulated edges from the "from" instance
+        # to sync nodes. A later simulated edge for the same (sync node, from) pair overrides
+        # the earlier one, so every pair is a slot holding the index of its current candidate.
+        self._non_execution_entries: dict[tuple[int, int], list[tuple[int, int, float, float]]] = {}
+        self._simulated_edge_candidates: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self._simulated_edge_sources: dict[int, list[int]] = {}
+        for instance_index in self._topological_order:
+            for predecessor_index in self._ordered_predecessors[instance_index]:
+                entries: list[tuple[int, int, float, float]] = []
+                for non_execution_info in self._input_manager.get_non_execution_info(predecessor_index, instance_index)[
+                    "non_execution_info"
+                ]:
+                    sync_node_index = non_execution_info["sync_node_instance_id"]
+                    slot = (sync_node_index, predecessor_index)
+                    if slot not in self._simulated_edge_candidates:
+                        self._simulated_edge_candidates[slot] = []
+                        self._simulated_edge_sources.setdefault(sync_node_index, []).append(predecessor_index)
+                    candidates = self._simulated_edge_candidates[slot]
+                    candidates.append((instance_index, non_execution_info["predecessor_instance_id"]))
+                    entries.append(
+                        (
+                            sync_node_index,
+                            len(candidates) - 1,
+                            non_execution_info["sync_size"],
+                            non_execution_info["consumed_dynamodb_write_capacity_units"],
+                        )
+                    )
+                self._non_execution_entries[(predecessor_index, instance_index)] = entries
+
+        # A node reads the samples of its predecessors and of the sources of its simulated edges,
+        # and its samples depend on the regions of those and of the sync nodes of its non-executed edges
+        self._topological_position = topological_position
+        region_dependencies: dict[int, set[int]] = {}
+        for instance_index in self._topological_order:
+            region_dependencies[instance_index] = {
+                instance_index,
+                *self._ordered_predecessors[instance_index],
+                *self._simulated_edge_sources.get(instance_index, []),
+            }
+            for predecessor_index in self._ordered_predecessors[instance_index]:
+                region_dependencies[instance_index].update(
+                    entry[0] for entry in self._non_execution_entries[(predecessor_index, instance_index)]
+                )
+        # The nodes to resimulate when an instance moves (as bitsets): the nodes depending on its region and
+        # their descendants, which include every node reading their samples (the sources of the simulated
+        # edges of a sync node are its ancestors)
+        self._affected_nodes: dict[int, int] = {
+            instance_index: self._dag.get_downstream_bitset(
+                [
+                    dependent_index
+                    for dependent_index, dependencies in region_dependencies.items()
+                    if instance_index in dependencies
+                ]
+            )
+            for instance_index in self._topological_order
+        }
+
+    def _compile_static_inputs(self) -> None:
+        start_hop_info = self._input_manager.get_start_hop_info()
+        self._workflow_placement_decision_size: float = start_hop_info["workflow_placement_decision_size"]
+        self._workflow_placement_decision_read_capacity: float = start_hop_info["read_capacity_units"]
+        self._retrieve_wpd_at_function_probability: float = self._input_manager.get_start_hop_retrieve_wpd_probability()
+
+        carbon_calculator_settings = self._input_manager.get_carbon_calculator_settings()
+        self._energy_factor_of_transmission: float = carbon_calculator_settings["energy_factor"]
+        self._carbon_free_intra_region_transmission: bool = carbon_calculator_settings[
+            "carbon_free_intra_region_transmission"
+        ]
+        self._carbon_free_dt_during_execution_at_home_region: bool = carbon_calculator_settings[
+            "carbon_free_dt_during_execution_at_home_region"
+        ]
+
+    def _perform_monte_carlo_simulation(self, deployment: list[int]) -> dict[str, float]:
+        """
+        Perform a Monte Carlo simulation to both the average and tail
+        cost, runtime, and carbon footprint of the deployment.
+        """
+        return self.calculate_hourly_deployment_metrics(deployment, [self._carbon_setting])[self._carbon_setting]
+
+    def calculate_hourly_deployment_metrics(
+        self, deployment: list[int], hours_to_run: list[Optional[str]]
+    ) -> dict[Optional[str], dict[str, float]]:
+        """
+        Calculate the deployment metrics for every requested carbon setting (hour of the day).
+        Only the carbon intensity differs between the hours, so the workflow is simulated once
+        and the carbon of every hour is projected from the same runtime and energy samples.
+        """
+        accumulator = self._simulate(deployment, self.n_samples)
+        cost_and_runtime_metrics = {
+            "average_cost": float(np.mean(accumulator.cost)),
+            "average_runtime": float(np.mean(accumulator.runtime)),
+            "tail_cost": float(np.percentile(accumulator.cost, self._tail_latency_threshold)),
+            "tail_runtime": float(np.percentile(accumulator.runtime, self._tail_latency_threshold)),
+        }
+
+        hourly_metrics: dict[Optional[str], dict[str, float]] = {}
+        for hour_to_run in hours_to_run:
+            execution_carbon, transmission_carbon = self._project_carbon(accumulator, hour_to_run)
+            carbons = execution_carbon + transmission_carbon
+            result = {
+                **cost_and_runtime_metrics,
+                "average_carbon": float(np.mean(carbons)),
+                "tail_carbon": float(np.percentile(carbons, self._tail_latency_threshold)),
+            }
+
+            if self._record_transmission_execution_carbon:
+                result["average_execution_carbon"] = float(np.mean(execution_carbon))
+                result["average_transmission_carbon"] = float(np.mean(transmission_carbon))
+
+            hourly_metrics[hour_to_run] = result
+
+        return hourly_metrics
+
+    def calculate_hourly_deployment_metrics_batch(
+        self, deployments: list[list[int]], hours_to_run: list[Optional[str]]
+    ) -> list[dict[Optional[str], dict[str, float]]]:
+        return [self.calculate_hourly_deployment_metrics(deployment, hours_to_run) for deployment in deployments]
+
+    def simulate_samples(self, deployment: list[int], n_samples: int) -> dict[str, np.ndarray]:
+        """
+        Simulate n_samples invocations of the workflow under the deployment, returning
+        the per sample cost, runtime, execution carbon and transmission carbon.
+        """
+        accumulator = self._simulate(deployment, n_samples)
+        execution_carbon, transmission_carbon = self._project_carbon(accumulator, self._carbon_setting)
+        return {
+            "cost": accumulator.cost,
+            "runtime": accumulator.runtime,
+            "execution_carbon": execution_carbon,
+            "transmission_carbon": transmission_carbon,
+        }
+
+    def _simulate(self, deployment: list[int], n_samples: int) -> _SampleAccumulator:
+        # Every node draws from its own generator of the random stream, so all deployments are
+        # simulated with the same draws (common random numbers) and the samples of a node only
+        # change if its inputs do. The nodes not affected by the instances moved since the last
+        # simulated deployment keep their samples.
+        self.simulated_samples += n_samples
+        random_stream = self._input_manager.get_random_stream()
+        simulation_key = (random_stream.seed, random_stream.substream, n_samples)
+        node_samples: dict[int, _NodeSamples] = {}
+        moved_instances: set[int] = set()
+        if self._previous_simulation is not None and self._previous_simulation[0] == simulation_key:
+            _, previous_deployment, previous_node_samples = self._previous_simulation
+            node_samples = dict(previous_node_samples)
+            moved_instances = {
+                instance_index
+                for instance_index, (previous_region, region) in enumerate(zip(previous_deployment, deployment))
+                if previous_region != region
+            }
+
+        affected_nodes = 0
+        for instance_index in moved_instances:
+            affected_nodes |= self._affected_nodes[instance_index]
+        for instance_index in self._topological_order:
+            if instance_index in node_samples and not affected_nodes >> instance_index & 1:
+                continue
+            self._rng = random_stream.generator_for(instance_index)
+            node_samples[instance_index] = self._simulate_node(instance_index, deployment, n_samples, node_samples)
+        self._previous_simulation = (simulation_key, list(deployment), node_samples)
+
+        accumulator = _SampleAccumulator(n_samples, self._number_of_region_columns)
+        for instance_index in self._topological_order:
+            contribution = node_samples[instance_index].contribution
+            accumulator.cost += contribution.cost
+            accumulator.runtime = np.maximum(accumulator.runtime, contribution.runtime)
+            accumulator.execution_energy += contribution.execution_energy
+            accumulator.transmission_data += contribution.transmission_data
+            accumulator.transmission_data_usa += contribution.transmission_data_usa
+        return accumulator
+
+    def _simulate_node(
+        self, instance_index: int, deployment: list[int], n_samples: int, node_samples: dict[int, _NodeSamples]
+    ) -> _NodeSamples:
+        contribution = _SampleAccumulator(n_samples, self._number_of_region_columns)
+        if instance_index == self._start_hop_instance_index:
+            node_invoked, cumulative_runtime = self._simulate_start_hop(deployment, n_samples, contribution)
+        else:
+            node_invoked, cumulative_runtime = self._simulate_incoming_edges(
+                instance_index, deployment, n_samples, contribution, node_samples
+            )
+
+        cumulative_runtimes = self._simulate_node_execution(
+            instance_index, deployment[instance_index], False, node_invoked, cumulative_runtime, contribution
+        )
+
+        # Even if the node was not invoked we still need the edges (for non-execution)
+        edge_invoked = {
+            successor_index: node_invoked
+            & (self._rng.random(n_samples) < self._invocation_probabilities[(instance_index, successor_index)])
+            for successor_index in self._successor_dictionary[instance_index]
+        }
+        return _NodeSamples(node_invoked, cumulative_runtimes, edge_invoked, contribution)
+
+    def _project_carbon(
+        self, accumulator: _SampleAccumulator, carbon_setting: Optional[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Per sample execution and transmission carbon under the carbon setting
+        grid_carbon_intensities = self._get_grid_carbon_intensities(accumulator, carbon_setting)
+        execution_carbon = accumulator.execution_energy @ grid_carbon_intensities
+        transmission_carbon = self._energy_factor_of_transmission * (
+            accumulator.transmission_data @ grid_carbon_intensities
+            + accumulator.transmission_data_usa * AVERAGE_USA_CARBON_INTENSITY
+        )
+        return execution_carbon, transmission_carbon
+
+    def _simulate_start_hop(
+        self, deployment: list[int], n_samples: int, accumulator: _SampleAccumulator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        start_hop_index = self._start_hop_instance_index
+        start_hop_region = deployment[start_hop_index]
+        home_region = self._home_region_index
+        system_region = self._system_region_column
+
+        # The WPD is either retrieved at the client or at the function, where retrieving it at
+        # a function outside of the home region means that the request goes through a redirector.
+        retrieved_wpd_at_function = self._rng.random(n_samples) < self._retrieve_wpd_at_function_probability
+        redirector_exists = retrieved_wpd_at_function & (start_hop_region != home_region)
+        retrieved_wpd_at_client = ~retrieved_wpd_at_function
+        retrieved_wpd_at_start_hop = retrieved_wpd_at_function & ~redirector_exists
+
+        # The WPD is read from the system region table and downloaded to the retrieval node
+        wpd_size = self._workflow_placement_decision_size
+        wpd_read_capacity = self._workflow_placement_decision_read_capacity
+        ## The virtual client accesses the table as the system region, at the average USA intensity
+        accumulator.cost += (
+            retrieved_wpd_at_client
+            * wpd_read_capacity
+            * self._get_region_cost_factors(system_region)["dynamodb_read_cost"]
+        )
+        accumulator.transmission_data_usa += retrieved_wpd_at_client * wpd_size
+        for retrieval_mask, retrieval_region in (
+            (redirector_exists, home_region),
+            (retrieved_wpd_at_start_hop, start_hop_region),
+        ):
+            accumulator.cost += (
+                retrieval_mask
+                * wpd_read_capacity
+                * self._get_region_cost_factors(retrieval_region)["dynamodb_read_cost"]
+            )
+            self._add_data_input(accumulator, retrieval_region, system_region, retrieval_mask * wpd_size)
+
+        # Client invokes the start hop directly (SNS from the virtual client)
+        direct_invocation = ~redirector_exists
+        transmission_size, transmission_latency = self._sample_transmission(
+            (-1, -1, start_hop_index, start_hop_region, False), direct_invocation, n_samples
+        )
+        accumulator.transmission_data_usa += direct_invocation * transmission_size
+        accumulator.cost += direct_invocation * self._get_sns_cost(transmission_size, start_hop_region)
+        cumulative_runtime = np.where(direct_invocation, transmission_latency, 0.0)
+
+        if redirector_exists.any():
+            # Client invokes the redirector in the home region
+            transmission_size, transmission_latency = self._sample_transmission(
+                (-1, -1, start_hop_index, home_region, False), redirector_exists, n_samples
+            )
+            accumulator.transmission_data_usa += redirector_exists * transmission_size
+            accumulator.cost += redirector_exists * self._get_sns_cost(transmission_size, home_region)
+
+            redirector_cumulative_runtimes = self._simulate_node_execution(
+                start_hop_index, home_region, True, redirector_exists, transmission_latency, accumulator
+            )
+
+            # Redirector invokes the start hop
+            redirector_runtime = redirector_cumulative_runtimes["successors"].get(
+                start_hop_index, redirector_cumulative_runtimes["current"]
+            )
+            transmission_size, transmission_latency = self._sample_transmission(
+                (start_hop_index, home_region, start_hop_index, start_hop_region, False), redirector_exists, n_samples
+            )
+            transmission_size = redirector_exists * transmission_size
+            self._add_sns_invocation(accumulator, home_region, start_hop_region, transmission_size)
+            cumulative_runtime = np.where(
+                redirector_exists, redirector_runtime + transmission_latency, cumulative_runtime
+            )
+
+        # The start hop is always invoked
+        return np.ones(n_samples, dtype=bool), cumulative_runtime
+
+    def _simulate_incoming_edges(  # pylint: disable=too-many-locals, too-many-branches, too-many-statements
+        self,
+        instance_index: int,
+        deployment: list[int],
+        n_samples: int,
+        accumulator: _SampleAccumulator,
+        node_samples: dict[int, _NodeSamples],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        region_index = deployment[instance_index]
+        predecessors = self._ordered_predecessors[instance_index]
+        is_sync_node = len(predecessors) > 1
+
+        node_invoked = np.zeros(n_samples, dtype=bool)
+        sync_upload_starts: list[np.ndarray] = []
+        sync_upload_sizes: list[np.ndarray] = []
+
+        # Candidates for the SNS invocation of this node, as (start, arrival, size, from region)
+        sns_candidates: list[tuple[np.ndarray, np.ndarray, np.ndarray, int]] = []
+        for predecessor_index in predecessors:
+            predecessor_region = deployment[predecessor_index]
+            predecessor_samples = node_samples[predecessor_index]
+            invoked_edge = predecessor_samples.edge_invoked[instance_index]
+
+            if invoked_edge.any():
+                node_invoked |= invoked_edge
+                starting_runtime = self._get_cumulative_runtime(predecessor_samples.cumulative_runtimes, instance_index)
+                transmission_size, transmission_latency = self._sample_transmission(
+                    (predecessor_index, predecessor_region, instance_index, region_index, is_sync_node),
+                    invoked_edge,
+                    n_samples,
+                )
+                transmission_size = invoked_edge * transmission_size
+
+                sns_transmission_size = transmission_size
+                if is_sync_node:
+                    # Payload is uploaded to the sync table rather than sent through SNS
+                    sns_only_size, sync_size, consumed_wcu = self._get_sync_transfer_info(
+                        predecessor_index, instance_index
+                    )
+                    sns_transmission_size = invoked_edge * sns_only_size
+                    accumulator.cost += (
+                        invoked_edge * consumed_wcu * self._get_region_cost_factors(region_index)["dynamodb_write_cost"]
+                    )
+                    self._add_data_transfer(accumulator, predecessor_region, region_index, transmission_size)
+                    self._add_data_transfer(accumulator, region_index, predecessor_region, invoked_edge * sync_size)
+
+                    sync_upload_starts.append(np.where(invoked_edge, starting_runtime, np.inf))
+                    sync_upload_sizes.append(transmission_size)
+
+                sns_candidates.append(
+                    (
+                        np.where(invoked_edge, starting_runtime, -np.inf),
+                        starting_runtime + transmission_latency,
+                        sns_transmission_size,
+                        predecessor_region,
+                    )
+                )
+
+            # The predecessor was invoked but did not invoke this node
+            non_executed_edge = predecessor_samples.invoked & ~invoked_edge
+            if non_executed_edge.any():
+                for sync_node_index, _, sync_size, consumed_wcu in self._non_execution_entries[
+                    (predecessor_index, instance_index)
+                ]:
+                    sync_node_region = deployment[sync_node_index]
+                    accumulator.cost += (
+                        non_executed_edge
+                        * consumed_wcu
+                        * self._get_region_cost_factors(sync_node_region)["dynamodb_write_cost"]
+                    )
+                    self._add_data_transfer(
+                        accumulator, sync_node_region, predecessor_region, non_executed_edge * sync_size
+                    )
+
+        if len(sync_upload_sizes) > 0:
+            self._add_sync_node_capacity_units(accumulator, region_index, sync_upload_starts, sync_upload_sizes)
+
+        # Simulated edges only matter if the node was invoked
+        for source_index in self._simulated_edge_sources.get(instance_index, []):
+            source_samples = node_samples[source_index]
+            source_region = deployment[source_index]
+            candidates = self._simulated_edge_candidates[(instance_index, source_index)]
+            choices = self._get_simulated_edge_choices(instance_index, source_samples, candidates, n_samples)
+            for candidate_index, (uninvoked_index, simulated_predecessor_index) in enumerate(candidates):
+                simulated_edge = node_invoked & (choices == candidate_index)
+                if not simulated_edge.any():
+                    continue
+
+                # The time to call the sync node is when the source would have called the uninvoked node
+                starting_runtime = self._get_cumulative_runtime(source_samples.cumulative_runtimes, uninvoked_index)
+                sns_transmission_size, latency_distribution = self._get_simulated_transmission_table(
+                    (
+                        source_index,
+                        uninvoked_index,
+                        simulated_predecessor_index,
+                        instance_index,
+                        source_region,
+                        region_index,
+                    )
+                )
+                transmission_latency = latency_distribution[self._sample_indices(len(latency_distribution), n_samples)]
+                sns_candidates.append(
+                    (
+                        np.where(simulated_edge, starting_runtime, -np.inf),
+                        starting_runtime + transmission_latency,
+                        simulated_edge * sns_transmission_size,
+                        source_region,
+                    )
+                )
+
+        # Only the last edge to reach the node performs the SNS invocation
+        cumulative_runtime = np.zeros(n_samples)
+        if len(sns_candidates) > 0:
+            sns_invoker = np.argmax(np.stack([candidate[0] for candidate in sns_candidates], axis=1), axis=1)
+            for candidate_index, (_, arrival_runtime, sns_transmission_size, from_region) in enumerate(sns_candidates):
+                selected = node_invoked & (sns_invoker == candidate_index)
+                cumulative_runtime = np.where(selected, arrival_runtime, cumulative_runtime)
+                self._add_sns_invocation(accumulator, from_region, region_index, selected * sns_transmission_size)
+
+        return node_invoked, cumulative_runtime
+
+    def _get_simulated_edge_choices(
+        self,
+        sync_node_index: int,
+        source_samples: _NodeSamples,
+        candidates: list[tuple[int, int]],
+        n_samples: int,
+    ) -> np.ndarray:
+        # Every non-executed edge from the source (processed before the sync node) overrides
+        # the simulated edge of the earlier ones, so the last candidate not executed is chosen
+        choices = np.full(n_samples, -1)
+        for candidate_index, (uninvoked_index, _) in enumerate(candidates):
+            if self._topological_position[uninvoked_index] < self._topological_position[sync_node_index]:
+                choices[source_samples.invoked & ~source_samples.edge_invoked[uninvoked_index]] = candidate_index
+        return choices
+
+    def _simulate_node_execution(
+        self,
+        instance_index: int,
+        region_index: int,
+        is_redirector: bool,
+        node_invoked: np.ndarray,
+        cumulative_runtime: np.ndarray,
+        accumulator: _SampleAccumulator,
+    ) -> dict[str, Any]:
+        n_samples = len(node_invoked)
+        if not node_invoked.any():
+            return {"current": np.zeros(n_samples), "successors": {}}
+
+        runtime_table = self._get_runtime_table(instance_index, region_index, is_redirector)
+        if len(runtime_table["runtimes"]) == 0:
+            raise ValueError(
+                f"Instance {instance_index} has no runtime data in region {region_index} or the home region"
+            )
+
+        # Pick a runtime, then pick an auxiliary data entry of that runtime
+        runtime_indices = self._sample_indices(len(runtime_table["runtimes"]), n_samples)
+        auxiliary_indices = runtime_table["auxiliary_offsets"][runtime_indices] + self._sample_indices(
+            runtime_table["auxiliary_counts"][runtime_indices], n_samples
+        )
+        auxiliary_data = runtime_table["auxiliary_data"][auxiliary_indices]
+        relative_performance = runtime_table["relative_performance"]
+
+        execution_time = node_invoked * runtime_table["runtimes"][runtime_indices] * relative_performance
+        data_transfer_during_execution = (
+            node_invoked * auxiliary_data[:, runtime_table["data_transfer_during_execution_index"]]
+        )
+        current_runtime = np.where(node_invoked, cumulative_runtime + execution_time, 0.0)
+        accumulator.runtime = np.maximum(accumulator.runtime, current_runtime)
+
+        execution_factors = self._get_execution_factors(instance_index, region_index, is_redirector)
+        accumulator.cost += (
+            execution_factors["cost_per_second"] * execution_time + node_invoked * execution_factors["invocation_cost"]
+        )
+        accumulator.execution_energy[:, region_index] += execution_time * execution_factors["energy_factor"]
+        self._add_data_transfer_during_execution(accumulator, region_index, data_transfer_during_execution)
+
+        return {
+            "current": current_runtime,
+            "successors": {
+                successor_index: cumulative_runtime + auxiliary_data[:, auxiliary_index] * relative_performance
+                for successor_index, auxiliary_index in runtime_table["successor_auxiliary_indices"].items()
+            },
+        }
+
+    def _add_sync_node_capacity_units(
+        self,
+        accumulator: _SampleAccumulator,
+        region_index: int,
+        sync_upload_starts: list[np.ndarray],
+        sync_upload_sizes: list[np.ndarray],
+    ) -> None:
+        # Sync uploads are performed as UpdateItem calls in the order the predecessors reach the
+        # sync node, each consuming write capacity of the whole (cumulative) size of the table.
+        upload_starts = np.stack(sync_upload_starts, axis=1)
+        upload_order = np.argsort(upload_starts, axis=1, kind="stable")
+        ordered_uploaded = np.isfinite(np.take_along_axis(upload_starts, upload_order, axis=1))
+        cumulative_sizes = np.cumsum(
+            np.take_along_axis(np.stack(sync_upload_sizes, axis=1), upload_order, axis=1), axis=1
+        )
+
+        write_capacity_units = np.sum(np.ceil(cumulative_sizes * 1024**2) * ordered_uploaded, axis=1)
+        read_capacity_units = np.ceil(cumulative_sizes[:, -1] * 1024**2 / 4)
+
+        region_cost_factors = self._get_region_cost_factors(region_index)
+        accumulator.cost += (
+            write_capacity_units * region_cost_factors["dynamodb_write_cost"]
+            + read_capacity_units * region_cost_factors["dynamodb_read_cost"]
+        )
+
+    def _add_sns_invocation(
+        self, accumulator: _SampleAccumulator, from_region: int, to_region: int, transmission_size: np.ndarray
+    ) -> None:
+        # Payload moves from the invoker to the invoked node through SNS
+        self._add_data_transfer(accumulator, from_region, to_region, transmission_size)
+        accumulator.cost += self._get_sns_cost(transmission_size, to_region)
+
+    def _get_sns_cost(self, transmission_size: np.ndarray, to_region: int) -> np.ndarray:
+        # According to AWS documentation, each 64KB chunk of delivered data is billed as 1 request
+        requests = np.ceil(transmission_size * 1024**2 / 64)
+        return requests * self._get_region_cost_factors(to_region)["sns_request_cost"]
+
+    def _add_data_transfer(
+        self, accumulator: _SampleAccumulator, from_region: int, to_region: int, transmission_size: np.ndarray
+    ) -> None:
+        # Data moves out of the from region (egress cost) into the to region (transmission carbon)
+        if self._is_egress[from_region, to_region]:
+            accumulator.cost += transmission_size * self._get_region_cost_factors(from_region)["transmission_cost"]
+        self._add_data_input(accumulator, to_region, from_region, transmission_size)
+
+    def _add_data_input(
+        self, accumulator: _SampleAccumulator, region: int, from_region: int, transmission_size: np.ndarray
+    ) -> None:
+        if self._is_same_region[region, from_region]:
+            if not self._carbon_free_intra_region_transmission:
+                accumulator.transmission_data[:, region] += transmission_size
+        else:
+            # Inter-region transmission is at the average intensity of both regions
+            accumulator.transmission_data[:, region] += transmission_size / 2
+            accumulator.transmission_data[:, from_region] += transmission_size / 2
+
+    def _add_data_transfer_during_execution(
+        self, accumulator: _SampleAccumulator, region: int, data_transfer_during_execution: np.ndarray
+    ) -> None:
+        # Half of the data transfer is from the internet, and the other half is from the home region
+        half_data_transfer = data_transfer_during_execution / 2
+        accumulator.transmission_data_usa += half_data_transfer
+        if region == self._home_region_index:
+            if not self._carbon_free_dt_during_execution_at_home_region:
+                accumulator.transmission_data[:, region] += half_data_transfer
+        else:
+            self._add_data_input(accumulator, region, self._home_region_index, half_data_transfer)
+
+    def _get_cumulative_runtime(self, cumulative_runtimes: dict[str, Any], successor_index: int) -> np.ndarray:
+        # If there are no specific runtime for the successor, then use the current runtime (Worse case scenario)
+        return cumulative_runtimes["successors"].get(successor_index, cumulative_runtimes["current"])
+
+    def _sample_transmission(
+        self, key: tuple[int, int, int, int, bool], mask: np.ndarray, n_samples: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if not mask.any():
+            return np.zeros(n_samples), np.zeros(n_samples)
+
+        transmission_table = self._get_transmission_table(key)
+        size_indices = self._sample_indices(len(transmission_table["sizes"]), n_samples)
+        latency_indices = transmission_table["latency_offsets"][size_indices] + self._sample_indices(
+            transmission_table["latency_counts"][size_indices], n_samples
+        )
+        return transmission_table["sizes"][size_indices], transmission_table["latencies"][latency_indices]
+
+    def _sample_indices(self, lengths: Any, n_samples: int) -> np.ndarray:
+        # Same picking scheme as the runtime calculator (int(random * (len - 1)))
+        return (self._rng.random(n_samples) * (np.asarray(lengths) - 1)).astype(np.int64)
+
+    def _get_runtime_table(self, instance_index: int, region_index: int, is_redirector: bool) -> dict[str, Any]:
+        key = (instance_index, region_index, is_redirector)
+        if key not in self._runtime_tables:
+            distribution = self._input_manager.get_node_runtime_distribution(
+                instance_index, region_index, is_redirector
+            )
+            auxiliary_width = (
+                max(
+                    [
+                        distribution["data_transfer_during_execution_auxiliary_index"],
+                        *distribution["successor_auxiliary_indices"].values(),
+                    ]
+                )
+                + 1
+            )
+
+            # Flatten the auxiliary data of every runtime into one table
+            # (a runtime without auxiliary data gets a single empty entry)
+            auxiliary_rows: list[list[float]] = []
+            auxiliary_offsets: list[int] = []
+            auxiliary_counts: list[int] = []
+            for auxiliary_data in distribution["auxiliary_data"]:
+                if len(auxiliary_data) == 0:
+                    auxiliary_data = [[0.0] * auxiliary_width]
+                auxiliary_offsets.append(len(auxiliary_rows))
+                auxiliary_counts.append(len(auxiliary_data))
+                auxiliary_rows.extend(auxiliary_data)
+
+            self._runtime_tables[key] = {
+                "runtimes": np.asarray(distribution["runtimes"], dtype=float),
+                "auxiliary_data": np.asarray(auxiliary_rows, dtype=float).reshape(-1, auxiliary_width),
+                "auxiliary_offsets": np.asarray(auxiliary_offsets, dtype=np.int64),
+                "auxiliary_counts": np.asarray(auxiliary_counts, dtype=np.int64),
+                "relative_performance": distribution["relative_performance"],
+                "successor_auxiliary_indices": distribution["successor_auxiliary_indices"],
+                "data_transfer_during_execution_index": distribution["data_transfer_during_execution_auxiliary_index"],
+            }
+        return self._runtime_tables[key]
+
+    def _get_transmission_table(self, key: tuple[int, int, int, int, bool]) -> dict[str, np.ndarray]:
+        if key not in self._transmission_tables:
+            sizes, latency_distributions = self._input_manager.get_transmission_distributions(
+                *key, self._consider_from_client_latency
+            )
+            latency_counts = [len(latency_distribution) for latency_distribution in latency_distributions]
+            self._transmission_tables[key] = {
+                "sizes": np.asarray(sizes, dtype=float),
+                "latencies": np.asarray(
+                    [latency for latency_distribution in latency_distributions for latency in latency_distribution],
+                    dtype=float,
+                ),
+                "latency_offsets": np.concatenate(([0], np.cumsum(latency_counts)[:-1])).astype(np.int64),
+                "latency_counts": np.asarray(latency_counts, dtype=np.int64),
+            }
+        return self._transmission_tables[key]
+
+    def _get_simulated_transmission_table(self, key: tuple[int, int, int, int, int, int]) -> tuple[float, np.ndarray]:
+        if key not in self._simulated_transmission_tables:
+            transmission_size, latency_distribution = self._input_manager.get_simulated_transmission_distribution(*key)
+            self._simulated_transmission_tables[key] = (
+                transmission_size,
+                np.asarray(latency_distribution, dtype=float),
+            )
+        return self._simulated_transmission_tables[key]
+
+    def _get_sync_transfer_info(self, from_instance_index: int, to_instance_index: int) -> tuple[float, float, float]:
+        key = (from_instance_index, to_instance_index)
+        if key not in self._sync_transfer_info:
+            self._sync_transfer_info[key] = self._input_manager.get_upload_sync_size_and_wcu(
+                from_instance_index, to_instance_index
+            )
+        return self._sync_transfer_info[key]
+
+    def _get_execution_factors(self, instance_index: int, region_index: int, is_redirector: bool) -> dict[str, float]:
+        key = (instance_index, region_index, is_redirector)
+        if key not in self._execution_factors:
+            self._execution_factors[key] = self._input_manager.get_execution_factors(
+                instance_index, region_index, is_redirector
+            )
+        return self._execution_factors[key]
+
+    def _get_region_cost_factors(self, region_column: int) -> dict[str, float]:
+        if region_column not in self._region_cost_factors:
+            self._region_cost_factors[region_column] = self._input_manager.get_region_cost_factors(
+                self._get_region_index(region_column)
+            )
+        return self._region_cost_factors[region_column]
+
+    def _get_grid_carbon_intensities(
+        self, accumulator: _SampleAccumulator, carbon_setting: Optional[str]
+    ) -> np.ndarray:
+        # Only retrieve the intensities of the regions that were actually involved
+        grid_carbon_intensities = np.zeros(self._number_of_region_columns)
+        involved_regions = np.flatnonzero(
+            accumulator.execution_energy.any(axis=0) | accumulator.transmission_data.any(axis=0)
+        )
+        known_grid_carbon_intensities = self._grid_carbon_intensities.setdefault(carbon_setting, {})
+        for region_column in involved_regions:
+            if region_column not in known_grid_carbon_intensities:
+                known_grid_carbon_intensities[region_column] = self._input_manager.get_grid_carbon_intensity(
+                    self._get_region_index(region_column), carbon_setting
+                )
+            grid_carbon_intensities[region_column] = known_grid_carbon_intensities[region_column]
+        return grid_carbon_intensities
+
+    def _get_region_index(self, region_column: int) -> int:
+        # -2 Indicates the system region
+        return region_column if region_column < self._number_of_regions else -2
+
+    def update_data_for_new_hour(self, hour_to_run: Optional[str]) -> None:
+        self._carbon_setting = hour_to_run
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "input_manager": self._input_manager.to_dict(),
+            "tail_latency_threshold": self._tail_latency_threshold,
+            "successor_dictionary": self._successor_dictionary,
+            "prerequisites_dictionary": self._prerequisites_dictionary,
+            "topological_order": self._topological_order,
+            "home_region_index": self._home_region_index,
+            "record_transmission_execution_carbon": self._record_transmission_execution_carbon,
+            "n_samples": self.n_samples,
+        }
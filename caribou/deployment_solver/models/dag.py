@@ -1,11 +1,19 @@
 from collections import deque
+from typing import Optional
 
 import numpy as np
 
 from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
 
 
-class DAG:
+class DAG:  # pylint: disable=too-many-instance-attributes
+    """
+    The instances of a workflow and their edges, stored as sparse (CSR) arrays: the successors of
+    instance i are `successor_indices[successor_offsets[i]:successor_offsets[i + 1]]`, and likewise
+    for its predecessors. The topological order and the descendants of every instance (as bitsets,
+    bit j set for instance j) are computed on first use and kept.
+    """
+
     def __init__(self, workflow_config_instances: list[dict], instance_indexer: InstanceIndexer) -> None:
         super().__init__()
         self._nodes: list[dict] = [
@@ -14,22 +22,53 @@ class DAG:
         ]
 
         self._num_nodes: int = len(self._nodes)
-        self._adj_matrix: np.ndarray = np.zeros((self.num_nodes, self.num_nodes), dtype=int)
 
         self._value_indices: dict[str, int] = instance_indexer.get_value_indices()
 
+        self._edges: dict[tuple[int, int], None] = {}
         for instance in workflow_config_instances:
             for succeeding_instance in instance["succeeding_instances"]:
                 self._add_edge(instance["instance_name"], succeeding_instance)
 
+        self._build_adjacency()
+
     def _add_edge(self, from_node: str, to_node: str) -> None:
         if from_node in self._value_indices and to_node in self._value_indices:
-            from_index: int = self._value_indices[from_node]
-            to_index: int = self._value_indices[to_node]
-            self._adj_matrix[from_index, to_index] = 1
+            # An edge is only stored once, however often it is listed
+            self._edges[(self._value_indices[from_node], self._value_indices[to_node])] = None
+
+    def _build_adjacency(self) -> None:
+        edges = np.array(list(self._edges), dtype=np.int64).reshape(-1, 2)
+        self._successor_offsets, self._successor_indices = self._to_csr(edges[:, 0], edges[:, 1])
+        self._predecessor_offsets, self._predecessor_indices = self._to_csr(edges[:, 1], edges[:, 0])
+
+        self._topological_order: Optional[list[int]] = None
+        self._descendants: Optional[list[int]] = None
+
+    def _to_csr(self, rows: np.ndarray, columns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # The neighbours of every instance are sorted by index, as in a row of an adjacency matrix
+        order = np.lexsort((columns, rows))
+        offsets = np.zeros(self._num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self._num_nodes), out=offsets[1:])
+        return offsets, columns[order]
+
+    def get_successors(self, instance_index: int) -> list[int]:
+        return self._successor_indices[
+            self._successor_offsets[instance_index] : self._successor_offsets[instance_index + 1]
+        ].tolist()
+
+    def get_predecessors(self, instance_index: int) -> list[int]:
+        return self._predecessor_indices[
+            self._predecessor_offsets[instance_index] : self._predecessor_offsets[instance_index + 1]
+        ].tolist()
 
     def topological_sort(self) -> list[int]:
-        in_degree = np.sum(self._adj_matrix, axis=0)
+        if self._topological_order is None:
+            self._topological_order = self._compute_topological_order()
+        return list(self._topological_order)
+
+    def _compute_topological_order(self) -> list[int]:
+        in_degree = np.diff(self._predecessor_offsets)
         queue = deque([i for i in range(self._num_nodes) if in_degree[i] == 0])
 
         result = []
@@ -37,11 +76,10 @@ class DAG:
             node_index = queue.popleft()
             result.append(node_index)
 
-            for i in range(self._num_nodes):
-                if self._adj_matrix[node_index, i] == 1:
-                    in_degree[i] -= 1
-                    if in_degree[i] == 0:
-                        queue.append(i)
+            for i in self.get_successors(node_index):
+                in_degree[i] -= 1
+                if in_degree[i] == 0:
+                    queue.append(i)
 
         # Check for cycles
         if len(result) != self.num_nodes:
@@ -50,49 +88,45 @@ class DAG:
         return result
 
     def get_preceeding_dict(self) -> dict[int, list[int]]:
-        # Initialize an empty successors dictionary
-        preceeding: dict[int, list[int]] = {}
-
-        # Iterate through each row in the adjacency matrix to find successors for each node
-        for i, row in enumerate(self._adj_matrix):
-            preceeding[i] = []
-
-            # Find nodes that is the outgoing edge of the current node (successors)
-            for j, val in enumerate(row):
-                if val == 1:
-                    preceeding[i].append(j)
-
-        return preceeding
+        # The successors of every node
+        return {i: self.get_successors(i) for i in range(self._num_nodes)}
 
     def get_prerequisites_dict(self) -> dict[int, list[int]]:
-        # Initialize an empty prerequisites dictionary
-        prerequisites: dict[int, list[int]] = {}
-
-        # Iterate through each row in the adjacency matrix to find prerequisites for each node
-        for i, row in enumerate(self._adj_matrix):
-            prerequisites[i] = []
-
-        # Find nodes that have incoming edges to the current node (prerequisites)
-        for i, row in enumerate(self._adj_matrix):
-            for j, val in enumerate(row):
-                if val == 1:
-                    prerequisites[j].append(i)
-
-        return prerequisites
+        # The predecessors of every node
+        return {i: self.get_predecessors(i) for i in range(self._num_nodes)}
+
+    def get_descendants_bitset(self, instance_index: int) -> int:
+        if self._descendants is None:
+            # The descendants of an instance are its successors and their descendants
+            self._descendants = [0] * self._num_nodes
+            for node_index in reversed(self.topological_sort()):
+                for successor_index in self.get_successors(node_index):
+                    self._descendants[node_index] |= (1 << successor_index) | self._descendants[successor_index]
+        return self._descendants[instance_index]
+
+    def get_downstream_bitset(self, instance_indices: list[int]) -> int:
+        # The instances and all their descendants, such as the instances affected by moving them
+        downstream = 0
+        for instance_index in instance_indices:
+            downstream |= (1 << instance_index) | self.get_descendants_bitset(instance_index)
+        return downstream
 
     def get_leaf_nodes(self) -> list[int]:
-        in_degree = np.sum(self._adj_matrix, axis=1)
+        out_degree = np.diff(self._successor_offsets)
         leaf_nodes = []
 
         for i in range(self.num_nodes):
-            if in_degree[i] == 0:
+            if out_degree[i] == 0:
                 instance_name = self._nodes[i]["instance_name"]
                 leaf_nodes.append(self._value_indices[instance_name])
 
         return leaf_nodes
 
     def get_adj_matrix(self) -> np.ndarray:
-        return self._adj_matrix
+        # Dense view of the edges, only built on request
+        adj_matrix = np.zeros((self._num_nodes, self._num_nodes), dtype=int)
+        adj_matrix[np.repeat(np.arange(self._num_nodes), np.diff(self._successor_offsets)), self._successor_indices] = 1
+        return adj_matrix
 
     @property
     def num_nodes(self) -> int:
@@ -104,4 +138,4 @@ class DAG:
 
     @property
     def number_of_edges(self) -> int:
-        return np.sum(self._adj_matrix)
+        return len(self._successor_indices)
@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+
+class DeploymentMetricsCache:
+    """
+    Bounded (least recently used) cache of the deployment metrics of a solve,
+    keyed by the deployment and the carbon hour setting it was simulated for.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("The deployment metrics cache must hold at least one entry")
+        self._max_size = max_size
+        self._cache: OrderedDict[tuple[tuple[int, ...], Optional[str]], dict[str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, deployment: Sequence[int], hour_to_run: Optional[str]) -> Optional[dict[str, float]]:
+        key = (tuple(deployment), hour_to_run)
+        deployment_metrics = self._cache.get(key)
+        if deployment_metrics is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return deployment_metrics
+
+    def put(self, deployment: Sequence[int], hour_to_run: Optional[str], deployment_metrics: dict[str, float]) -> None:
+        key = (tuple(deployment), hour_to_run)
+        self._cache[key] = deployment_metrics
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get_statistics(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def items(self) -> list[tuple[tuple[int, ...], Optional[str], dict[str, float]]]:
+        # From the least to the most recently used entry
+        return [(deployment, hour_to_run, metrics) for (deployment, hour_to_run), metrics in self._cache.items()]
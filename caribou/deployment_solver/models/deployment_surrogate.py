@@ -0,0 +1,157 @@
+from typing import Optional
+
+import numpy as np
+
+from caribou.deployment_solver.deployment_input.input_manager import InputManager
+from caribou.deployment_solver.models.dag import DAG
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+
+
+class DeploymentSurrogate:  # pylint: disable=too-many-instance-attributes
+    """
+    Expected value model of the average deployment metrics, fitted from the same inputs as the
+    Monte Carlo simulation. Every instance contributes its expected execution in its region and
+    every edge its expected transmission between the regions of its endpoints, weighted by how
+    likely they are to happen. The runtime is the critical path of the expected execution and
+    transmission times. Redirectors, SNS and DynamoDB costs are left out, so the predictions are
+    only meant to compare deployments with each other, not to replace the simulated metrics.
+    """
+
+    def __init__(
+        self, workflow_config: WorkflowConfig, input_manager: InputManager, instance_indexer: InstanceIndexer
+    ) -> None:
+        self._input_manager = input_manager
+
+        dag = DAG(list(workflow_config.instances.values()), instance_indexer)
+        self._topological_order = dag.topological_sort()
+        self._prerequisites_dictionary = dag.get_prerequisites_dict()
+
+        # Probability of every edge being triggered, and of every instance being invoked
+        # (assuming its incoming edges are triggered independently)
+        self._edge_probabilities: dict[tuple[int, int], float] = {}
+        self._invocation_probabilities: dict[int, float] = {}
+        for instance_index in self._topological_order:
+            not_invoked_probability = 1.0
+            for predecessor_index in self._prerequisites_dictionary[instance_index]:
+                edge_probability = self._input_manager.get_invocation_probability(predecessor_index, instance_index)
+                self._edge_probabilities[(predecessor_index, instance_index)] = edge_probability
+                not_invoked_probability *= 1.0 - self._invocation_probabilities[predecessor_index] * edge_probability
+            self._invocation_probabilities[instance_index] = (
+                1.0 if len(self._prerequisites_dictionary[instance_index]) == 0 else 1.0 - not_invoked_probability
+            )
+
+        carbon_calculator_settings = self._input_manager.get_carbon_calculator_settings()
+        self._energy_factor_of_transmission: float = carbon_calculator_settings["energy_factor"]
+        self._carbon_free_intra_region_transmission: bool = carbon_calculator_settings[
+            "carbon_free_intra_region_transmission"
+        ]
+
+        # Terms fitted lazily as they are first needed, only the carbon intensities depend on the hour
+        self._node_terms: dict[tuple[int, int], tuple[float, float, float]] = {}
+        self._edge_terms: dict[tuple[int, int, int, int], tuple[float, float]] = {}
+        self._transmission_costs: dict[int, float] = {}
+        self._carbon_setting: Optional[str] = None
+        self._grid_carbon_intensities: dict[int, float] = {}
+
+    def update_data_for_new_hour(self, carbon_setting: Optional[str]) -> None:
+        self._carbon_setting = carbon_setting
+        self._grid_carbon_intensities = {}
+
+    def predict(self, deployment: list[int]) -> dict[str, float]:
+        cost = 0.0
+        carbon = 0.0
+        finish_times: dict[int, float] = {}
+        for instance_index in self._topological_order:
+            region_index = deployment[instance_index]
+            invocation_probability = self._invocation_probabilities[instance_index]
+            execution_time, execution_cost, execution_energy = self._get_node_term(instance_index, region_index)
+            cost += invocation_probability * execution_cost
+            carbon += invocation_probability * execution_energy * self._get_grid_carbon_intensity(region_index)
+
+            predecessors = self._prerequisites_dictionary[instance_index]
+            if len(predecessors) == 0:
+                # Invoked by the client
+                start_time = self._get_edge_term(-1, -1, instance_index, region_index)[1]
+            else:
+                start_time = 0.0
+                for predecessor_index in predecessors:
+                    predecessor_region_index = deployment[predecessor_index]
+                    transmission_size, transmission_latency = self._get_edge_term(
+                        predecessor_index, predecessor_region_index, instance_index, region_index
+                    )
+                    start_time = max(start_time, finish_times[predecessor_index] + transmission_latency)
+
+                    transmitted_data = (
+                        self._invocation_probabilities[predecessor_index]
+                        * self._edge_probabilities[(predecessor_index, instance_index)]
+                        * transmission_size
+                    )
+                    if predecessor_region_index != region_index:
+                        cost += transmitted_data * self._get_transmission_cost(predecessor_region_index)
+                    if predecessor_region_index != region_index or not self._carbon_free_intra_region_transmission:
+                        carbon += (
+                            transmitted_data
+                            * self._energy_factor_of_transmission
+                            * self._get_grid_carbon_intensity(region_index)
+                        )
+            finish_times[instance_index] = start_time + execution_time
+
+        return {
+            "average_cost": cost,
+            "average_runtime": max(finish_times.values()),
+            "average_carbon": carbon,
+        }
+
+    def _get_node_term(self, instance_index: int, region_index: int) -> tuple[float, float, float]:
+        # Expected execution time, cost and energy of the instance in the region
+        key = (instance_index, region_index)
+        if key not in self._node_terms:
+            runtime_distribution = self._input_manager.get_node_runtime_distribution(
+                instance_index, region_index, False
+            )
+            execution_time = (
+                float(np.mean(runtime_distribution["runtimes"])) * runtime_distribution["relative_performance"]
+            )
+            execution_factors = self._input_manager.get_execution_factors(instance_index, region_index, False)
+            self._node_terms[key] = (
+                execution_time,
+                execution_factors["cost_per_second"] * execution_time + execution_factors["invocation_cost"],
+                execution_factors["energy_factor"] * execution_time,
+            )
+        return self._node_terms[key]
+
+    def _get_edge_term(
+        self, from_instance_index: int, from_region_index: int, to_instance_index: int, to_region_index: int
+    ) -> tuple[float, float]:
+        # Expected transmission size and latency of the edge between the regions
+        key = (from_instance_index, from_region_index, to_instance_index, to_region_index)
+        if key not in self._edge_terms:
+            transmission_sizes, latency_distributions = self._input_manager.get_transmission_distributions(
+                from_instance_index,
+                from_region_index,
+                to_instance_index,
+                to_region_index,
+                len(self._prerequisites_dictionary[to_instance_index]) > 1,
+                False,
+            )
+            latencies = [latency for latency_distribution in latency_distributions for latency in latency_distribution]
+            self._edge_terms[key] = (
+                float(np.mean(transmission_sizes)) if len(transmission_sizes) > 0 else 0.0,
+                float(np.mean(latencies)) if len(latencies) > 0 else 0.0,
+            )
+        return self._edge_terms[key]
+
+    def _get_transmission_cost(self, region_index: int) -> float:
+        if region_index not in self._transmission_costs:
+            self._transmission_costs[region_index] = self._input_manager.get_region_cost_factors(region_index)[
+                "transmission_cost"
+            ]
+        return self._transmission_costs[region_index]
+
+    def _get_grid_carbon_intensity(self, region_index: int) -> float:
+        if region_index not in self._grid_carbon_intensities:
+            self._grid_carbon_intensities[region_index] = self._input_manager.get_grid_carbon_intensity(
+                region_index, self._carbon_setting
+            )
+        return self._grid_carbon_intensities[region_index]
@@ -0,0 +1,73 @@
+import numpy as np
+
+# The objectives of the frontier, all of which are minimised
+PARETO_OBJECTIVES = ("average_cost", "average_runtime", "average_carbon")
+# Number of new deployments compared with the frontier at once, bounding the size of the dominance matrices
+PARETO_ARCHIVE_CHUNK_SIZE = 256
+
+
+class ParetoArchive:
+    """
+    Archive of the non-dominated deployments of a solve over the average cost, runtime and carbon.
+    A deployment is dominated if another one is at least as good on every objective and better on
+    at least one. The archive only ever holds the frontier, and new deployments are compared with
+    it in vectorized chunks, rather than comparing or sorting all deployments with each other.
+    """
+
+    def __init__(self) -> None:
+        self._deployments: list[tuple[list[int], dict[str, float]]] = []
+        self._points = np.empty((0, len(PARETO_OBJECTIVES)))
+        # Every deployment added, as a dominated deployment stays dominated
+        self._known_deployments: set[tuple[int, ...]] = set()
+
+    def add(self, deployments: list[tuple[list[int], dict[str, float]]]) -> None:
+        new_deployments = []
+        for deployment, deployment_metrics in deployments:
+            if tuple(deployment) not in self._known_deployments:
+                self._known_deployments.add(tuple(deployment))
+                new_deployments.append((deployment, deployment_metrics))
+        if len(new_deployments) == 0:
+            return
+
+        points = np.array(
+            [
+                [deployment_metrics[objective] for objective in PARETO_OBJECTIVES]
+                for _, deployment_metrics in new_deployments
+            ],
+            dtype=np.float64,
+        )
+        # A deployment can only be dominated by deployments with a smaller sum of the objectives, so
+        # adding them in that order keeps the frontier (and the comparisons) as small as possible
+        order = np.argsort(points.sum(axis=1), kind="stable")
+        for start in range(0, len(order), PARETO_ARCHIVE_CHUNK_SIZE):
+            chunk = order[start : start + PARETO_ARCHIVE_CHUNK_SIZE]
+            self._add_chunk([new_deployments[index] for index in chunk], points[chunk])
+
+    def _add_chunk(self, new_deployments: list[tuple[list[int], dict[str, float]]], new_points: np.ndarray) -> None:
+        # The new deployments are checked against the frontier and each other, while the
+        # frontier only needs to be checked against the new deployments
+        is_new_dominated = get_dominance_matrix(np.concatenate((self._points, new_points)), new_points).any(axis=0)
+        is_frontier_dominated = get_dominance_matrix(new_points, self._points).any(axis=0)
+
+        self._deployments = [
+            deployment
+            for deployment, is_dominated in zip(
+                self._deployments + new_deployments,
+                np.concatenate((is_frontier_dominated, is_new_dominated)),
+            )
+            if not is_dominated
+        ]
+        self._points = np.concatenate((self._points[~is_frontier_dominated], new_points[~is_new_dominated]))
+
+    def get_frontier(self) -> list[tuple[list[int], dict[str, float]]]:
+        return list(self._deployments)
+
+    def __len__(self) -> int:
+        return len(self._deployments)
+
+
+def get_dominance_matrix(first_points: np.ndarray, second_points: np.ndarray) -> np.ndarray:
+    # Element [i, j] is whether first_points[i] dominates second_points[j]
+    first = first_points[:, np.newaxis, :]
+    second = second_points[np.newaxis, :, :]
+    return np.all(first <= second, axis=2) & np.any(first < second, axis=2)
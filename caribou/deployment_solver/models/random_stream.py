@@ -0,0 +1,46 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+
+class RandomStream:
+    """
+    Seedable source of the random draws of the deployment simulations.
+
+    Resetting the stream before simulating each candidate deployment replays the
+    same draws for every candidate (common random numbers), so the difference
+    between two candidates is not drowned by independent sampling noise.
+    Substreams give independent draws to the workers sharing a simulation.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        # Without a seed, draw fresh entropy once so that a solve still compares
+        # its candidates under common random numbers
+        self.seed: int = seed if seed is not None else int(np.random.SeedSequence().entropy)  # type: ignore
+        self.substream = 0
+        self.generator: np.random.Generator
+        self._random: random.Random
+        self.reset()
+
+    def reset(self, substream: int = 0) -> None:
+        self.substream = substream
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=(substream,))
+        self.generator = np.random.default_rng(seed_sequence)
+        self._random = random.Random(int(seed_sequence.generate_state(1, np.uint64)[0]))
+
+    def get_state(self) -> tuple[int, np.random.Generator, random.Random]:
+        # The generators themselves rather than copies, so a restored substream continues
+        # where its draws left off
+        return self.substream, self.generator, self._random
+
+    def set_state(self, state: tuple[int, np.random.Generator, random.Random]) -> None:
+        self.substream, self.generator, self._random = state
+
+    def random(self) -> float:
+        return self._random.random()
+
+    def generator_for(self, key: int) -> np.random.Generator:
+        # Independent generator of the current substream (e.g. per node), its draws
+        # do not depend on how many draws were made for the other keys
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(self.substream, key)))
@@ -0,0 +1,78 @@
+import cProfile
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from caribou.common.constants import SOLVER_PROFILE_OUTPUT_SIZE
+
+
+class SolverInstrumentation:
+    """
+    Records where the time of a solve goes: the wall time spent in each phase of the solve, counters
+    of the work done in them (such as the number of simulated deployments), and optionally a cProfile
+    of the whole solve. Phases may be nested and entered any number of times, their time adds up.
+    """
+
+    def __init__(self, profile: bool = False) -> None:
+        self._phase_seconds: dict[str, float] = {}
+        self._phase_calls: dict[str, int] = {}
+        self._counters: dict[str, int] = {}
+        self._profiler: Optional[cProfile.Profile] = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def time_phase(self, phase: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phase_seconds[phase] = self._phase_seconds.get(phase, 0.0) + time.perf_counter() - start_time
+            self._phase_calls[phase] = self._phase_calls.get(phase, 0) + 1
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def start_profiling(self) -> None:
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def stop_profiling(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def merge(self, summary: dict[str, Any]) -> None:
+        # Adds the phases and counters of the summary of another process, such as a process solving other hours
+        for phase, phase_summary in summary["phases"].items():
+            self._phase_seconds[phase] = self._phase_seconds.get(phase, 0.0) + phase_summary["seconds"]
+            self._phase_calls[phase] = self._phase_calls.get(phase, 0) + phase_summary["calls"]
+        for counter, amount in summary["counters"].items():
+            self.increment(counter, amount)
+
+    def get_summary(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {
+            "phases": {
+                phase: {"seconds": phase_seconds, "calls": self._phase_calls[phase]}
+                for phase, phase_seconds in self._phase_seconds.items()
+            },
+            "counters": dict(self._counters),
+        }
+        if self._profiler is not None:
+            summary["profile"] = self._get_profile()
+        return summary
+
+    def _get_profile(self) -> list[dict[str, Any]]:
+        # The functions with the most cumulative time, which is where a slow solve is best looked into first
+        profile_stats = pstats.Stats(self._profiler).stats  # type: ignore  # pylint: disable=no-member
+        function_stats = sorted(profile_stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{file_name}:{line_number}({function_name})",
+                "calls": number_of_calls,
+                "total_seconds": total_seconds,
+                "cumulative_seconds": cumulative_seconds,
+            }
+            for (
+                (file_name, line_number, function_name),
+                (_, number_of_calls, total_seconds, cumulative_seconds, _),
+            ) in function_stats[:SOLVER_PROFILE_OUTPUT_SIZE]
+        ]
@@ -14,10 +14,12 @@ class WorkflowConfig:
             self._workflow_config["regions_and_providers"]
         )
 
+        # The options of each deployment algorithm that may be set in the workflow config
         allowed_deployment_algorithms = {
-            "coarse_grained_deployment_algorithm",
-            "fine_grained_deployment_algorithm",
-            "stochastic_heuristic_deployment_algorithm",
+            "coarse_grained_deployment_algorithm": {"n_hour_processes", "surrogate_prefilter"},
+            "fine_grained_deployment_algorithm": {"n_hour_processes", "surrogate_prefilter", "branch_and_bound"},
+            "stochastic_heuristic_deployment_algorithm": {"n_hour_processes", "surrogate_prefilter", "n_chains"},
+            "genetic_deployment_algorithm": {"n_hour_processes"},
         }
         result = self._lookup("deployment_algorithm", "stochastic_heuristic_deployment_algorithm")
         if len(result) == 0:
@@ -26,6 +28,13 @@ class WorkflowConfig:
             raise ValueError(f"Invalid deployment algorithm: {result}")
         self.deployment_algorithm = result
 
+        # Passed on to the deployment algorithm, e.g., {"n_chains": 4} to run the stochastic heuristic on 4 islands
+        options = self._lookup("deployment_algorithm_options") or {}
+        invalid_options = set(options) - allowed_deployment_algorithms[result]
+        if invalid_options:
+            raise ValueError(f"Invalid options of deployment algorithm {result}: {sorted(invalid_options)}")
+        self.deployment_algorithm_options: dict[str, Any] = options
+
     def _verify(self, workflow_config: dict) -> None:
         try:
             WorkflowConfigSchema(**workflow_config)
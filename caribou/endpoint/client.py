@@ -9,6 +9,7 @@ import botocore.exceptions
 
 from caribou.common.constants import (
     CARIBOU_WORKFLOW_IMAGES_TABLE,
+    DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE,
     DEPLOYMENT_MANAGER_RESOURCE_TABLE,
     DEPLOYMENT_MANAGER_WORKFLOW_INFO_TABLE,
     DEPLOYMENT_RESOURCES_TABLE,
@@ -184,6 +185,7 @@ class Client:
         This method removes the workflow from the system. It removes the workflow from the following tables:
         - WORKFLOW_PLACEMENT_DECISION_TABLE
         - WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE
+        - DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE
         - DEPLOYMENT_MANAGER_RESOURCE_TABLE
         - DEPLOYMENT_RESOURCES_TABLE
         - WORKFLOW_INSTANCE_TABLE
@@ -209,6 +211,11 @@ class Client:
             WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE, self._workflow_id
         )
 
+        # Remove the checkpoint of an unfinished solve of the workflow
+        self._endpoints.get_deployment_algorithm_workflow_placement_decision_client().remove_key(
+            DEPLOYMENT_ALGORITHM_CHECKPOINT_TABLE, self._workflow_id
+        )
+
         # Remove all applicable entries from the deployment resources table
         # (Managing caribou workflow config + IAM roles, functions, ECR repositories)
         # And all associated SNS topics, ECR repositories, deployed lambda functions, and IAM roles
@@ -12,6 +12,7 @@ from caribou.common.constants import (
     CARBON_REGION_TABLE,
     COARSE_GRAINED_DEPLOYMENT_ALGORITHM_CARBON_PER_INSTANCE_INVOCATION_ESTIMATE,
     DEFAULT_MONITOR_COOLDOWN,
+    DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS,
     DEPLOYMENT_MANAGER_RESOURCE_TABLE,
     DEPLOYMENT_MANAGER_WORKFLOW_INFO_TABLE,
     DISTANCE_FOR_POTENTIAL_MIGRATION,
@@ -34,6 +35,7 @@ from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import
 from caribou.deployment_solver.deployment_algorithms.fine_grained_deployment_algorithm import (
     FineGrainedDeploymentAlgorithm,
 )
+from caribou.deployment_solver.deployment_algorithms.genetic_deployment_algorithm import GeneticDeploymentAlgorithm
 from caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deployment_algorithm import (
     StochasticHeuristicDeploymentAlgorithm,
 )
@@ -53,6 +55,7 @@ deployment_algorithm_mapping = {
     "coarse_grained_deployment_algorithm": CoarseGrainedDeploymentAlgorithm,
     "fine_grained_deployment_algorithm": FineGrainedDeploymentAlgorithm,
     "stochastic_heuristic_deployment_algorithm": StochasticHeuristicDeploymentAlgorithm,
+    "genetic_deployment_algorithm": GeneticDeploymentAlgorithm,
 }
 
 
@@ -87,7 +90,10 @@ class DeploymentManager(Monitor):
             },
         )
 
-    def remote_run_deployment_algorithm(self, workflow_id: str, solve_hours: list[str], leftover_tokens: int) -> None:
+    def remote_run_deployment_algorithm(
+        self, workflow_id: str, solve_hours: list[str], leftover_tokens: int, continuation: int = 0
+    ) -> None:
+        # A remote solve that runs out of time is continued by another invocation (the continuation)
         framework_cli_remote_client = self._endpoints.get_framework_cli_remote_client()
 
         framework_cli_remote_client.invoke_remote_framework_internal_action(
@@ -97,6 +103,7 @@ class DeploymentManager(Monitor):
                 "solve_hours": solve_hours,
                 "leftover_tokens": leftover_tokens,
                 "deployment_metrics_calculator_type": self._deployment_metrics_calculator_type,
+                "continuation": continuation,
             },
         )
 
@@ -172,11 +179,20 @@ class DeploymentManager(Monitor):
             # Invoke / run the deployment manager solve locally
             self.run_deployment_algorithm(workflow_id, solve_hours, leftover_tokens)
 
-    def run_deployment_algorithm(self, workflow_id: str, solve_hours: list[str], leftover_tokens: int) -> None:
+    def run_deployment_algorithm(
+        self, workflow_id: str, solve_hours: list[str], leftover_tokens: int, continuation: int = 0
+    ) -> None:
         logger.info(f"Running deployment algorithm with solve hours: {solve_hours}")
         expiry_delta_seconds = self._calculate_expiry_delta_seconds(leftover_tokens)
         workflow_config = self._get_workflow_config(workflow_id)
-        self._run_deployment_algorithm(workflow_config, solve_hours, expiry_delta_seconds)
+        # The last continuation is not resumable, it completes the solve and uploads the best deployments
+        # found within its time
+        resumable = continuation < DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS
+        if not self._run_deployment_algorithm(workflow_config, solve_hours, expiry_delta_seconds, resumable):
+            # The solve was checkpointed, as it did not complete within the time of the invocation
+            logger.info(f"Continuing the deployment algorithm of workflow {workflow_id} in another invocation")
+            self.remote_run_deployment_algorithm(workflow_id, solve_hours, leftover_tokens, continuation + 1)
+            return
 
         # Uploading the new workflow info should be done after the deployment algorithm has run
         # And is successful, if not the workflow will be checked again in the next iteration
@@ -232,14 +248,20 @@ class DeploymentManager(Monitor):
         workflow_config: WorkflowConfig,
         solve_hours: Optional[list[str]] = None,
         expiry_delta_seconds: int = DEFAULT_MONITOR_COOLDOWN,
-    ) -> None:
+        resumable: bool = True,
+    ) -> bool:
+        # Returns whether the solve completed, remote solves are checkpointed when they run out of time
         deployment_algorithm_class = deployment_algorithm_mapping.get(workflow_config.deployment_algorithm)
         if deployment_algorithm_class:
             logger.info(f"Running deployment algorithm: {workflow_config.deployment_algorithm}")
-            deployment_algorithm: DeploymentAlgorithm = deployment_algorithm_class(workflow_config, expiry_delta_seconds, deployment_metrics_calculator_type=self._deployment_metrics_calculator_type, lambda_timeout=self._deployed_remotely)  # type: ignore
-            deployment_algorithm.run(solve_hours)
-        else:
-            raise ValueError("Invalid deployment algorithm")
+            deployment_algorithm: DeploymentAlgorithm = deployment_algorithm_class(workflow_config, expiry_delta_seconds, deployment_metrics_calculator_type=self._deployment_metrics_calculator_type, lambda_timeout=self._deployed_remotely, resumable=self._deployed_remotely, **workflow_config.deployment_algorithm_options)  # type: ignore
+            if self._deployed_remotely and not resumable:
+                # The solve keeps the hours selected by the previous invocations, and solves the others in the time left
+                logger.warning(
+                    f"Deployment algorithm of workflow {workflow_config.workflow_id} is completed in this invocation"
+                )
+            return deployment_algorithm.run(solve_hours, last_invocation=not resumable)
+        raise ValueError("Invalid deployment algorithm")
 
     def _get_sigmoid_scale(self, x: float) -> float:
         return 3 / (1 + np.exp(-0.02 * x)) - 1
@@ -488,6 +488,65 @@ class TestAWSRemoteClient(unittest.TestCase):
         self.assertEqual(result, "")
         self.assertEqual(consumed_capacity, 1.0)
 
+    @patch("caribou.common.models.remote_client.aws_remote_client.time.sleep")
+    @patch.object(AWSRemoteClient, "_client")
+    def test_get_values_from_table(self, mock_client, mock_sleep):
+        table_name = "test_table"
+        keys = [f"key{i}" for i in range(150)] + ["key0"]
+        mock_client.return_value.batch_get_item.side_effect = [
+            # The first batch is read in two requests, as some of its keys are unprocessed
+            {
+                "Responses": {table_name: [{"key": {"S": "key0"}, "value": {"S": "value0"}}]},
+                "UnprocessedKeys": {table_name: {"Keys": [{"key": {"S": "key1"}}], "ConsistentRead": True}},
+            },
+            {"Responses": {table_name: [{"key": {"S": "key1"}, "value": {"B": b"compressed_value"}}]}},
+            {
+                "Responses": {
+                    table_name: [{"key": {"S": "key100"}, "value": {"S": "value100"}}, {"key": {"S": "key101"}}]
+                }
+            },
+        ]
+
+        with patch(
+            "caribou.common.models.remote_client.aws_remote_client.decompress_json_str",
+            return_value="value1",
+        ):
+            result = self.aws_client.get_values_from_table(table_name, keys)
+
+        self.assertEqual(result, {"key0": "value0", "key1": "value1", "key100": "value100"})
+        request_items = [call.kwargs["RequestItems"] for call in mock_client.return_value.batch_get_item.call_args_list]
+        self.assertEqual(len(request_items[0][table_name]["Keys"]), 100)
+        self.assertEqual(request_items[1][table_name]["Keys"], [{"key": {"S": "key1"}}])
+        self.assertEqual(len(request_items[2][table_name]["Keys"]), 50)
+        self.assertTrue(request_items[0][table_name]["ConsistentRead"])
+        mock_sleep.assert_called_once_with(AWSRemoteClient.BATCH_GET_ITEM_RETRY_DELAY)
+
+    @patch("caribou.common.models.remote_client.aws_remote_client.time.sleep")
+    @patch.object(AWSRemoteClient, "_client")
+    def test_get_values_from_table_unprocessed_keys(self, mock_client, mock_sleep):
+        table_name = "test_table"
+        mock_client.return_value.batch_get_item.return_value = {
+            "Responses": {table_name: []},
+            "UnprocessedKeys": {table_name: {"Keys": [{"key": {"S": "key0"}}], "ConsistentRead": True}},
+        }
+
+        with self.assertRaises(RuntimeError):
+            self.aws_client.get_values_from_table(table_name, ["key0"])
+
+        self.assertEqual(mock_client.return_value.batch_get_item.call_count, AWSRemoteClient.BATCH_GET_ITEM_ATTEMPTS)
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list],
+            [
+                AWSRemoteClient.BATCH_GET_ITEM_RETRY_DELAY * 2**attempt
+                for attempt in range(AWSRemoteClient.BATCH_GET_ITEM_ATTEMPTS - 1)
+            ],
+        )
+
+    @patch.object(AWSRemoteClient, "_client")
+    def test_get_values_from_table_without_keys(self, mock_client):
+        self.assertEqual(self.aws_client.get_values_from_table("test_table", []), {})
+        mock_client.return_value.batch_get_item.assert_not_called()
+
     @patch.object(AWSRemoteClient, "_client")
     def test_remove_value_from_table(self, mock_client):
         table_name = "test_table"
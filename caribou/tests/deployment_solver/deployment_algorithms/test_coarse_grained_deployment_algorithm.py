@@ -4,6 +4,8 @@ from unittest.mock import MagicMock, patch
 from caribou.deployment_solver.deployment_algorithms.coarse_grained_deployment_algorithm import (
     CoarseGrainedDeploymentAlgorithm,
 )
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
 
 
 class TestCoarseGrainedDeploymentAlgorithm(unittest.TestCase):
@@ -14,119 +16,93 @@ class TestCoarseGrainedDeploymentAlgorithm(unittest.TestCase):
     def setUp(self, mock_init):
         mock_workflow_config = MagicMock()
         self._algorithm = CoarseGrainedDeploymentAlgorithm(mock_workflow_config)
+        self._algorithm._deployment_metrics_cache = DeploymentMetricsCache(100)
+        self._algorithm._surrogate = None
+        self._algorithm._resumable = False
+        self._algorithm._instrumentation = SolverInstrumentation()
+        self._algorithm._warm_start = False
+        self._algorithm._previous_deployments = {}
+        self._algorithm._hour_to_run = None
+        self._algorithm._hours_to_run = [None]
+        self._algorithm._number_of_instances = 2
+        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
+        self._algorithm._home_deployment = [0, 0]
+        self._algorithm._home_deployment_metrics = {"metric1": 3.0, "metric2": 3.0}
+        self._algorithm._region_indexer = MagicMock()
+        self._algorithm._region_indexer.get_value_indices.return_value = {0: 0, 1: 1, 2: 2}
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        self._algorithm._is_hard_constraint_failed = MagicMock()
+        self._algorithm._is_hard_constraint_failed.return_value = False
 
-    @patch("multiprocessing.Pool")
-    def test_run_algorithm(self, mock_pool):
-        # Create a mock for the _generate_and_check_deployment method
-        mock_generate_and_check_deployment = MagicMock()
-        mock_generate_and_check_deployment.return_value = ([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})
-
-        # Create a mock for the _region_indexer attribute
-        mock_region_indexer = MagicMock()
-        mock_region_indexer.get_value_indices.return_value = {1: 1}
-
-        # Set the mocks on the instance
-        self._algorithm._generate_and_check_deployment = mock_generate_and_check_deployment
-        self._algorithm._region_indexer = mock_region_indexer
+    def test_run_algorithm(self):
+        # Arrange
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 1.0, "metric2": 2.0},
+            {"metric1": 2.0, "metric2": 1.0},
+        ]
 
-        # Call the _run_algorithm method
+        # Act
         result = self._algorithm._run_algorithm()
 
-        # Check the result
-        expected_result = [([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})]
+        # Assert
+        expected_result = [
+            ([0, 0], {"metric1": 3.0, "metric2": 3.0}),
+            ([1, 1], {"metric1": 1.0, "metric2": 2.0}),
+            ([2, 2], {"metric1": 2.0, "metric2": 1.0}),
+        ]
         self.assertEqual(result, expected_result)
+        # All candidates are evaluated in a single batch (the home deployment is known already)
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1], [2, 2]]
+        )
 
-    @patch("multiprocessing.Pool")
-    def test_run_algorithm_timeout(self, mock_pool):
-        # Create a mock for the _generate_and_check_deployment method
-        mock_generate_and_check_deployment = MagicMock()
-
-        results = [([1, 1, 1], {"metric1": 1.0, "metric2": 2.0}), ([0, 0, 0], {"metric1": 2.0, "metric2": 1.0})]
+    @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE", 2)
+    def test_run_algorithm_timeout(self):
+        # Arrange
+        results = [[{"metric1": 1.0, "metric2": 2.0}], [{"metric1": 2.0, "metric2": 1.0}]]
 
         def func(*args, **kwargs):
             time.sleep(2)
             return results.pop(0)
 
-        mock_generate_and_check_deployment.side_effect = func
-
-        # Create a mock for the _region_indexer attribute
-        mock_region_indexer = MagicMock()
-        mock_region_indexer.get_value_indices.return_value = {1: 1, 0: 0}
-
-        # Set the mocks on the instance
-        self._algorithm._generate_and_check_deployment = mock_generate_and_check_deployment
-        self._algorithm._region_indexer = mock_region_indexer
-
-        # Call the _run_algorithm method
-        result = self._algorithm._run_algorithm(timeout=1)
-
-        # Check the result
-        expected_result = [([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})]
-        self.assertEqual(result, expected_result)
-
-    def test_generate_and_check_deployment(self):
-        # Arrange
-        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
-        self._algorithm._number_of_instances = 2
-        self._algorithm._generate_deployment = MagicMock()
-        self._algorithm._generate_deployment.return_value = [1, 1]
-        self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
-        }
-        self._algorithm._is_hard_constraint_failed = MagicMock()
-        self._algorithm._is_hard_constraint_failed.return_value = False
-        self._algorithm._home_deployment = None
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = func
 
         # Act
-        result = self._algorithm._generate_and_check_deployment(1)
+        result = self._algorithm._run_algorithm(timeout=1)
 
         # Assert
-        expected_result = ([1, 1], {"metric1": 1.0, "metric2": 2.0})
+        expected_result = [([0, 0], {"metric1": 3.0, "metric2": 3.0}), ([1, 1], {"metric1": 1.0, "metric2": 2.0})]
         self.assertEqual(result, expected_result)
 
-    def test_generate_and_check_deployment_positive(self):
+    def test_generate_all_possible_coarse_deployments_not_permitted(self):
         # Arrange
-        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
-        self._algorithm._number_of_instances = 2
-        self._algorithm._generate_deployment = MagicMock()
-        self._algorithm._generate_deployment.return_value = [1, 1]
-        self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
-        }
-        self._algorithm._is_hard_constraint_failed = MagicMock()
-        self._algorithm._is_hard_constraint_failed.return_value = False
-        self._algorithm._home_deployment = None
+        self._algorithm._per_instance_permitted_regions = [[0, 2], [0, 1, 2]]
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 2.0, "metric2": 1.0},
+        ]
 
         # Act
-        result = self._algorithm._generate_and_check_deployment(1)
+        result = self._algorithm._generate_all_possible_coarse_deployments()
 
         # Assert
-        expected_result = ([1, 1], {"metric1": 1.0, "metric2": 2.0})
-        self.assertEqual(result, expected_result)
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[2, 2]]
+        )
+        self.assertEqual([deployment for deployment, _ in result], [[0, 0], [2, 2]])
 
-    def test_generate_and_check_deployment_negative(self):
+    def test_generate_all_possible_coarse_deployments_hard_constraint_failed(self):
         # Arrange
-        self._algorithm._per_instance_permitted_regions = [[0, 2], [0, 1, 2]]
-        self._algorithm._number_of_instances = 2
-        self._algorithm._generate_deployment = MagicMock()
-        self._algorithm._generate_deployment.return_value = [1, 1]
-        self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
-        }
-        self._algorithm._is_hard_constraint_failed = MagicMock()
-        self._algorithm._is_hard_constraint_failed.return_value = False
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 1.0, "metric2": 2.0},
+            {"metric1": 2.0, "metric2": 1.0},
+        ]
+        self._algorithm._is_hard_constraint_failed.side_effect = lambda metrics: metrics["metric1"] == 1.0
 
         # Act
-        result = self._algorithm._generate_and_check_deployment(1)
+        result = self._algorithm._generate_all_possible_coarse_deployments()
 
         # Assert
-        self.assertIsNone(result)
+        self.assertEqual([deployment for deployment, _ in result], [[0, 0], [2, 2]])
 
     def test_generate_deployment(self):
         # Arrange
@@ -1,18 +1,34 @@
+import json
+import multiprocessing
+import os
+import time
 import unittest
 from unittest.mock import patch, MagicMock
+from caribou.common.constants import WORKFLOW_PLACEMENT_DECISION_TABLE, WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE
 from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import DeploymentAlgorithm
+from caribou.deployment_solver.deployment_metrics_calculator.go_deployment_metrics_calculator import (
+    GoDeploymentMetricsCalculator,
+)
+from caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator import (
+    SimpleDeploymentMetricsCalculator,
+)
 from caribou.deployment_solver.workflow_config import WorkflowConfig
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
 
 
 class ConcreteDeploymentAlgorithm(DeploymentAlgorithm):
     def __init__(self, workflow_config):
         self._input_manager = MagicMock()
+        self._input_manager.get_calculator_cache_statistics.return_value = {}
+        self._deployment_metrics_calculator = MagicMock(simulated_samples=0)
+        self._instrumentation = SolverInstrumentation()
         self._timeout = float("inf")
-        pass
+        self._n_hour_processes = 1
 
     def _run_algorithm(self, timeout: float):
         # Example implementation for testing
-        return [(["r1"], {"cost": 100})]
+        return [(["r1"], {"average_cost": 100, "average_runtime": 1, "average_carbon": 1})]
 
 
 class ConcreteDeploymentAlgorithmCallingSuper(DeploymentAlgorithm):
@@ -32,6 +48,14 @@ class TestDeploymentAlgorithm(unittest.TestCase):
         self.workflow_config_mock = MagicMock(spec=WorkflowConfig)
         self.workflow_config_mock.home_region = "r1:p1"
         self.deployment_algorithm = ConcreteDeploymentAlgorithm(self.workflow_config_mock)
+        self.deployment_algorithm._deployment_metrics_cache = DeploymentMetricsCache(100)
+        self.deployment_algorithm._surrogate = None
+        self.deployment_algorithm._resumable = False
+        self.deployment_algorithm._warm_start = False
+        self.deployment_algorithm._previous_deployments = {}
+        self.deployment_algorithm._pareto_frontiers = {}
+        self.deployment_algorithm._hour_to_run = None
+        self.deployment_algorithm._hours_to_run = [None]
 
     @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.InputManager")
     @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.RegionIndexer")
@@ -85,7 +109,8 @@ class TestDeploymentAlgorithm(unittest.TestCase):
         self.deployment_algorithm._expiry_time_delta_seconds = 10
         self.deployment_algorithm._number_of_instances = 1
         self.deployment_algorithm._home_region_index = 0
-        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock(simulated_samples=0)
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
 
         # Act
         self.deployment_algorithm.run(["1"])
@@ -93,8 +118,481 @@ class TestDeploymentAlgorithm(unittest.TestCase):
         # Assert
         self.deployment_algorithm._ranker.rank.assert_called_once()
         self.deployment_algorithm._select_deployment.assert_called_once()
-        self.deployment_algorithm._formatter.format.assert_called_once()
+        # The selected deployment, and the single deployment of the frontier
+        self.assertEqual(self.deployment_algorithm._formatter.format.call_count, 2)
         self.deployment_algorithm._upload_result.assert_called_once()
+        instrumentation = self.deployment_algorithm._upload_result.call_args[0][0]["instrumentation"]
+        self.assertEqual(instrumentation["counters"]["solved_hours"], 1)
+        self.assertIn("search", instrumentation["phases"])
+
+    def test_solve_hour_ranks_pareto_frontier(self):
+        self.deployment_algorithm._update_data_for_new_hour = MagicMock()
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.constraints = None
+        self.deployment_algorithm._ranker = MagicMock()
+        self.deployment_algorithm._ranker.rank.side_effect = lambda deployments: sorted(
+            deployments, key=lambda deployment: deployment[1]["average_carbon"]
+        )
+        # Simulated by the algorithm for the hour, but not kept in its results
+        self.deployment_algorithm._deployment_metrics_cache.put(
+            ["r2"], "1", {"average_cost": 150, "average_runtime": 1, "average_carbon": 0}
+        )
+        self.deployment_algorithm._deployment_metrics_cache.put(
+            ["r3"], "1", {"average_cost": 200, "average_runtime": 2, "average_carbon": 2}
+        )
+        self.deployment_algorithm._deployment_metrics_cache.put(
+            ["r4"], "2", {"average_cost": 0, "average_runtime": 0, "average_carbon": 0}
+        )
+
+        selected_deployment = self.deployment_algorithm._solve_hour("1", timeout=1.0)
+
+        self.assertEqual(selected_deployment[0], ["r2"])
+        # The dominated deployment is never ranked
+        self.assertEqual(
+            [deployment for deployment, _ in self.deployment_algorithm._pareto_frontiers["1"]], [["r2"], ["r1"]]
+        )
+
+    def _setup_resumable_solve(self, checkpoint=None):
+        self.deployment_algorithm._resumable = True
+        self.deployment_algorithm._timeout = 800.0
+        self.deployment_algorithm._solve_start_time = time.time()
+        self.deployment_algorithm._last_checkpoint_time = time.time()
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.workflow_id = "workflow1"
+        self.deployment_algorithm._endpoints = MagicMock()
+        client = self.deployment_algorithm._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        client.get_value_from_table.return_value = (json.dumps(checkpoint) if checkpoint else "", 0.0)
+        self.deployment_algorithm._input_manager.get_random_stream.return_value.seed = 7
+        self.deployment_algorithm._formatter = MagicMock()
+        self.deployment_algorithm._region_indexer = MagicMock()
+        self.deployment_algorithm._instance_indexer = MagicMock()
+        self.deployment_algorithm._expiry_time_delta_seconds = 10
+        self.deployment_algorithm._upload_result = MagicMock()
+        return client
+
+    def test_run_resumable_checkpoints_when_out_of_time(self):
+        client = self._setup_resumable_solve()
+        self.deployment_algorithm._deployment_metrics_cache.put([1], "1", {"cost": 1.0})
+        clock = [1000.0]
+
+        def solve_hour(hour_to_run, timeout):
+            # Every search runs until it times out
+            clock[0] += timeout
+            return [0], {"cost": 0.0}
+
+        self.deployment_algorithm._solve_hour = MagicMock(side_effect=solve_hour)
+        hours_to_run = [str(hour) for hour in range(24)]
+
+        with patch(
+            "caribou.deployment_solver.deployment_algorithms.deployment_algorithm.time.time",
+            side_effect=lambda: clock[0],
+        ):
+            completed = self.deployment_algorithm.run(hours_to_run)
+
+        # Each hour may search for 300 s (its share of the 9 invocations of the solve), so the
+        # invocation ends the search of the third hour, which is left to the next invocation
+        self.assertFalse(completed)
+        self.assertEqual(
+            [call.kwargs["timeout"] for call in self.deployment_algorithm._solve_hour.call_args_list],
+            [300.0, 300.0, 200.0],
+        )
+        self.deployment_algorithm._upload_result.assert_not_called()
+        table, key, checkpoint_json = client.set_value_in_table.call_args.args
+        self.assertEqual((table, key), ("deployment_algorithm_checkpoint_table", "workflow1"))
+        checkpoint = json.loads(checkpoint_json)
+        self.assertEqual(checkpoint.pop("solve_start_time"), self.deployment_algorithm._solve_start_time)
+        self.assertEqual(
+            checkpoint,
+            {
+                "hours_to_run": hours_to_run,
+                "random_seed": 7,
+                "selected_deployments": [[[0], {"cost": 0.0}], [[0], {"cost": 0.0}]],
+                "search_state": None,
+                "hour_search_time": 200.0,
+                "pareto_frontiers": {},
+                "deployment_metrics": [[[1], "1", {"cost": 1.0}]],
+            },
+        )
+        self.assertTrue(client.set_value_in_table.call_args.kwargs["convert_to_bytes"])
+
+    def test_run_resumable_continues_hour_with_its_remaining_budget(self):
+        hours_to_run = [str(hour) for hour in range(24)]
+        checkpoint = {
+            "solve_start_time": time.time() - 1200,
+            "hours_to_run": hours_to_run,
+            "random_seed": 7,
+            "selected_deployments": [[[0], {"cost": 0.0}]] * 23,
+            "search_state": {"temperature": 0.5},
+            "hour_search_time": 200.0,
+            "pareto_frontiers": {},
+            "deployment_metrics": [],
+        }
+        self._setup_resumable_solve(checkpoint)
+        search_states = []
+        self.deployment_algorithm._solve_hour = MagicMock(
+            side_effect=lambda hour_to_run, timeout: search_states.append(self.deployment_algorithm._search_state)
+            or ([1], {"cost": 1.0})
+        )
+
+        self.assertTrue(self.deployment_algorithm.run(hours_to_run))
+
+        # The last hour continues its search for the rest of its budget
+        self.deployment_algorithm._solve_hour.assert_called_once()
+        self.assertEqual(self.deployment_algorithm._solve_hour.call_args.kwargs["timeout"], 100.0)
+        self.assertEqual(search_states, [{"temperature": 0.5}])
+
+    def test_run_resumable_continues_from_checkpoint(self):
+        self.deployment_algorithm._resumable = True
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.workflow_id = "workflow1"
+        self.deployment_algorithm._endpoints = MagicMock()
+        client = self.deployment_algorithm._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        checkpoint = {
+            "solve_start_time": time.time() - 1200,
+            "hours_to_run": ["1", "2"],
+            "random_seed": 7,
+            "selected_deployments": [[[0], {"cost": 0.0}]],
+            "search_state": {"temperature": 0.5},
+            "pareto_frontiers": {"1": [[[0], {"cost": 0.0}]]},
+            "deployment_metrics": [[[1], "2", {"cost": 1.0}]],
+        }
+        client.get_value_from_table.return_value = (json.dumps(checkpoint), 0.0)
+        self.deployment_algorithm._last_checkpoint_time = time.time()
+        search_states = []
+        self.deployment_algorithm._solve_hour = MagicMock(
+            side_effect=lambda hour_to_run, timeout: search_states.append(self.deployment_algorithm._search_state)
+            or ([1], {"cost": 1.0})
+        )
+        self.deployment_algorithm._formatter = MagicMock()
+        self.deployment_algorithm._region_indexer = MagicMock()
+        self.deployment_algorithm._instance_indexer = MagicMock()
+        self.deployment_algorithm._expiry_time_delta_seconds = 10
+        self.deployment_algorithm._upload_result = MagicMock()
+
+        completed = self.deployment_algorithm.run(["1", "2"])
+
+        # Only the second hour is solved, continuing its search with the restored state and cache
+        self.assertTrue(completed)
+        self.deployment_algorithm._solve_hour.assert_called_once()
+        self.assertEqual(self.deployment_algorithm._solve_hour.call_args.args[0], "2")
+        self.assertEqual(search_states, [{"temperature": 0.5}])
+        self.assertEqual(self.deployment_algorithm._deployment_metrics_cache.get([1], "2"), {"cost": 1.0})
+        random_stream = self.deployment_algorithm._input_manager.get_random_stream.return_value
+        self.assertEqual(random_stream.seed, 7)
+        random_stream.reset.assert_called_once()
+        result = self.deployment_algorithm._upload_result.call_args.args[0]
+        self.assertEqual(result["deployment_metrics"], {"1": {"cost": 0.0}, "2": {"cost": 1.0}})
+        client.remove_key.assert_called_once_with("deployment_algorithm_checkpoint_table", "workflow1")
+        # The solve keeps the start time of its first invocation
+        self.assertEqual(self.deployment_algorithm._solve_start_time, checkpoint["solve_start_time"])
+
+    def test_run_resumable_last_invocation(self):
+        hours_to_run = [str(hour) for hour in range(24)]
+        checkpoint = {
+            "solve_start_time": time.time() - 1200,
+            "hours_to_run": hours_to_run,
+            "random_seed": 7,
+            "selected_deployments": [[[0], {"cost": 0.0}]] * 20,
+            "search_state": None,
+            "hour_search_time": 0.0,
+            "pareto_frontiers": {},
+            "deployment_metrics": [],
+        }
+        client = self._setup_resumable_solve(checkpoint)
+        clock = [1000.0]
+
+        def solve_hour(hour_to_run, timeout):
+            clock[0] += timeout
+            return [1], {"cost": 1.0}
+
+        self.deployment_algorithm._solve_hour = MagicMock(side_effect=solve_hour)
+
+        with patch(
+            "caribou.deployment_solver.deployment_algorithms.deployment_algorithm.time.time",
+            side_effect=lambda: clock[0],
+        ):
+            completed = self.deployment_algorithm.run(hours_to_run, last_invocation=True)
+
+        # The hours selected by the previous invocations are kept, the 4 others share the invocation
+        self.assertTrue(completed)
+        self.assertEqual(
+            [call.kwargs["timeout"] for call in self.deployment_algorithm._solve_hour.call_args_list], [200.0] * 4
+        )
+        result = self.deployment_algorithm._upload_result.call_args.args[0]
+        self.assertEqual(len(result["deployment_metrics"]), 24)
+        self.assertEqual(result["deployment_metrics"]["0"], {"cost": 0.0})
+        self.assertEqual(result["deployment_metrics"]["23"], {"cost": 1.0})
+        client.remove_key.assert_called_once_with("deployment_algorithm_checkpoint_table", "workflow1")
+
+    def test_run_resumable_splits_time_between_hours(self):
+        self._setup_resumable_solve()
+        self.deployment_algorithm._solve_hour = MagicMock(return_value=([0], {"cost": 0.0}))
+
+        self.assertTrue(self.deployment_algorithm.run([str(hour) for hour in range(24)]))
+
+        # Every hour gets its share of the solve, rather than the whole remaining time of the invocation
+        for call in self.deployment_algorithm._solve_hour.call_args_list:
+            self.assertEqual(call.kwargs["timeout"], 300.0)
+
+    def test_load_expired_checkpoint(self):
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.deployment_algorithm._endpoints = MagicMock()
+        client = self.deployment_algorithm._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        checkpoint = {
+            "solve_start_time": time.time() - 7 * 24 * 60 * 60,
+            "hours_to_run": ["1", "2"],
+            "random_seed": 7,
+            "selected_deployments": [[[0], {"cost": 0.0}]],
+            "search_state": None,
+            "pareto_frontiers": {},
+            "deployment_metrics": [[[1], "2", {"cost": 1.0}]],
+        }
+        client.get_value_from_table.return_value = (json.dumps(checkpoint), 0.0)
+        self.deployment_algorithm._hours_to_run = ["1", "2"]
+
+        self.deployment_algorithm._load_checkpoint()
+
+        # A checkpoint left behind days ago is not continued, the solve starts over
+        self.assertEqual(self.deployment_algorithm._selected_deployments, [])
+        self.assertIsNone(self.deployment_algorithm._deployment_metrics_cache.get([1], "2"))
+        self.deployment_algorithm._input_manager.get_random_stream.return_value.reset.assert_not_called()
+
+    def test_load_checkpoint_of_other_hours(self):
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.deployment_algorithm._endpoints = MagicMock()
+        client = self.deployment_algorithm._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        checkpoint = {
+            "hours_to_run": ["1"],
+            "random_seed": 7,
+            "selected_deployments": [[[0], {"cost": 0.0}]],
+            "search_state": None,
+            "deployment_metrics": [],
+        }
+        client.get_value_from_table.return_value = (json.dumps(checkpoint), 0.0)
+        self.deployment_algorithm._hours_to_run = ["1", "2"]
+
+        self.deployment_algorithm._load_checkpoint()
+
+        self.assertEqual(self.deployment_algorithm._selected_deployments, [])
+        self.deployment_algorithm._input_manager.get_random_stream.return_value.reset.assert_not_called()
+
+    def _setup_previous_deployments(self, staging_area_data, workflow_placement_decision):
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.workflow_id = "workflow1"
+        self.deployment_algorithm._endpoints = MagicMock()
+        client = self.deployment_algorithm._endpoints.get_deployment_algorithm_workflow_placement_decision_client()
+        tables = {
+            WORKFLOW_PLACEMENT_SOLVER_STAGING_AREA_TABLE: staging_area_data,
+            WORKFLOW_PLACEMENT_DECISION_TABLE: workflow_placement_decision,
+        }
+        client.get_value_from_table.side_effect = lambda table, key: (
+            json.dumps(tables[table]) if tables[table] is not None else "",
+            0.0,
+        )
+        self.deployment_algorithm._region_indexer = MagicMock()
+        self.deployment_algorithm._region_indexer.get_value_indices.return_value = {"p1:r1": 0, "p1:r2": 1}
+        self.deployment_algorithm._instance_indexer = MagicMock()
+        self.deployment_algorithm._instance_indexer.get_value_indices.return_value = {"i1": 0, "i2": 1}
+        self.deployment_algorithm._home_region_index = 0
+        self.deployment_algorithm._number_of_instances = 2
+        self.deployment_algorithm._per_instance_permitted_regions = [[0, 1], [0]]
+
+    def test_load_previous_deployments_from_staging_area(self):
+        r1 = {"provider_region": {"provider": "p1", "region": "r1"}}
+        r2 = {"provider_region": {"provider": "p1", "region": "r2"}}
+        r3 = {"provider_region": {"provider": "p1", "region": "r3"}}
+        staging_area_data = {
+            "time_keys_to_staging_area_data": {
+                "0": {"i1": r2, "i2": r1},
+                # Regions that are not permitted (any more) are discarded
+                "6": {"i1": r1, "i2": r2},
+                "12": {"i1": r3, "i2": r1},
+            }
+        }
+        self._setup_previous_deployments(staging_area_data, None)
+
+        self.assertEqual(self.deployment_algorithm._load_previous_deployments(), {"0": [1, 0]})
+
+    def test_load_previous_deployments_from_workflow_placement_decision(self):
+        r2 = {"provider_region": {"provider": "p1", "region": "r2"}, "identifier": "id"}
+        r1 = {"provider_region": {"provider": "p1", "region": "r1"}, "identifier": "id"}
+        workflow_placement_decision = {
+            "workflow_placement": {
+                "home_deployment": {"i1": r1, "i2": r1},
+                "current_deployment": {"time_keys": ["0"], "instances": {"0": {"i1": r2, "i2": r1}}},
+            }
+        }
+        self._setup_previous_deployments(None, workflow_placement_decision)
+
+        self.assertEqual(self.deployment_algorithm._load_previous_deployments(), {"0": [1, 0]})
+
+        # Without a current deployment, the workflow is deployed to its home region only
+        del workflow_placement_decision["workflow_placement"]["current_deployment"]
+        self.assertEqual(self.deployment_algorithm._load_previous_deployments(), {})
+
+    def test_get_previous_deployment(self):
+        self.deployment_algorithm._previous_deployments = {"6": [1], "18": [2]}
+
+        # The latest time key up to the hour is in use at the hour
+        self.assertIsNone(self.deployment_algorithm._get_previous_deployment("5"))
+        self.assertEqual(self.deployment_algorithm._get_previous_deployment("6"), [1])
+        self.assertEqual(self.deployment_algorithm._get_previous_deployment("17"), [1])
+        self.assertEqual(self.deployment_algorithm._get_previous_deployment("23"), [2])
+        self.assertIsNone(self.deployment_algorithm._get_previous_deployment(None))
+
+    def test_get_warm_start_deployments(self):
+        self.deployment_algorithm._previous_deployments = {"0": [1, 0]}
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.constraints = None
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"cost": 1.0}
+        ]
+
+        self.assertEqual(self.deployment_algorithm._get_warm_start_deployments(), [([1, 0], {"cost": 1.0})])
+        # The previous deployment is re-evaluated for the current data of the hour
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 0]]
+        )
+
+        self.deployment_algorithm._previous_deployments = {"0": [0, 0]}
+        self.assertEqual(self.deployment_algorithm._get_warm_start_deployments(), [])
+
+    def test_update_data_for_new_hour_sets_hard_constraints(self):
+        self.deployment_algorithm._ranker = MagicMock()
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.workflow_config_mock.constraints = {
+            "hard_resource_constraints": {"cost": {"type": "absolute", "value": 1}}
+        }
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        calculator = self.deployment_algorithm._deployment_metrics_calculator
+        self.deployment_algorithm._initialise_home_deployment = MagicMock(
+            side_effect=lambda: calculator.set_hard_constraints.assert_called_once_with(None, None)
+            or ([0], {"tail_cost": 2.0})
+        )
+
+        self.deployment_algorithm._update_data_for_new_hour("1")
+
+        # The home deployment is simulated without the constraints, which are then set relative to it
+        calculator.set_hard_constraints.assert_called_with(
+            {"cost": {"type": "absolute", "value": 1}}, {"tail_cost": 2.0}
+        )
+
+    def _setup_hour_solving(self):
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.deployment_algorithm._formatter = MagicMock()
+        self.deployment_algorithm._formatter.format.side_effect = lambda deployment, *_: deployment[0]
+        self.deployment_algorithm._region_indexer = MagicMock()
+        self.deployment_algorithm._instance_indexer = MagicMock()
+        self.deployment_algorithm._upload_result = MagicMock()
+        self.deployment_algorithm._expiry_time_delta_seconds = 10
+
+        def solve_hour(hour_to_run, timeout):
+            self.deployment_algorithm._instrumentation.increment("solved_hours")
+            self.deployment_algorithm._deployment_metrics_calculator.simulated_samples += 100
+            return ([int(hour_to_run), os.getpid()], {"cost": float(hour_to_run), "timeout": timeout})
+
+        self.deployment_algorithm._solve_hour = solve_hour
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    def test_run_hours_in_parallel(self):
+        self._setup_hour_solving()
+        self.deployment_algorithm._n_hour_processes = 2
+        self.deployment_algorithm._timeout = 12.0
+
+        self.deployment_algorithm.run(["0", "1", "2", "3"])
+
+        result = self.deployment_algorithm._upload_result.call_args[0][0]
+        self.assertEqual(list(result["deployment_metrics"].keys()), ["0", "1", "2", "3"])
+        self.assertEqual([metrics["cost"] for metrics in result["deployment_metrics"].values()], [0.0, 1.0, 2.0, 3.0])
+        # Each process solves two hours within the whole timeout
+        self.assertEqual([metrics["timeout"] for metrics in result["deployment_metrics"].values()], [6.0] * 4)
+        process_ids = [deployment[1] for deployment in result["time_keys_to_staging_area_data"].values()]
+        self.assertEqual(len(set(process_ids)), 2)
+        self.assertNotIn(os.getpid(), process_ids)
+        # The work of the processes is added to the instrumentation of the solve
+        self.assertEqual(result["instrumentation"]["counters"]["solved_hours"], 4)
+        self.assertEqual(result["instrumentation"]["counters"]["simulated_samples"], 400)
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    def test_run_hours_in_parallel_error(self):
+        self._setup_hour_solving()
+        self.deployment_algorithm._n_hour_processes = 2
+
+        def solve_hour(hour_to_run, timeout):
+            raise ValueError(f"Failed hour {hour_to_run}")
+
+        self.deployment_algorithm._solve_hour = solve_hour
+
+        with self.assertRaises(ValueError):
+            self.deployment_algorithm.run(["0", "1"])
+        self.deployment_algorithm._upload_result.assert_not_called()
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    def test_run_hours_in_parallel_worker_killed(self):
+        self._setup_hour_solving()
+        self.deployment_algorithm._n_hour_processes = 2
+
+        def solve_hour(hour_to_run, timeout):
+            if hour_to_run == "0":
+                # The worker dies without reporting back, such as when it runs out of memory
+                os._exit(1)
+            time.sleep(60)
+
+        self.deployment_algorithm._solve_hour = solve_hour
+
+        start_time = time.time()
+        with self.assertRaises(RuntimeError):
+            self.deployment_algorithm.run(["0", "1"])
+        # The other worker is terminated, rather than waited for
+        self.assertLess(time.time() - start_time, 30)
+        self.deployment_algorithm._upload_result.assert_not_called()
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    def test_run_hours_in_parallel_deadline(self):
+        self._setup_hour_solving()
+        self.deployment_algorithm._n_hour_processes = 2
+        self.deployment_algorithm._timeout = 0.5
+
+        def solve_hour(hour_to_run, timeout):
+            time.sleep(60)
+
+        self.deployment_algorithm._solve_hour = solve_hour
+
+        start_time = time.time()
+        with self.assertRaises(TimeoutError):
+            with patch(
+                "caribou.deployment_solver.deployment_algorithms.deployment_algorithm.SOLVER_WORKER_SHUTDOWN_TIMEOUT",
+                0.5,
+            ):
+                self.deployment_algorithm.run(["0", "1"])
+        self.assertLess(time.time() - start_time, 30)
+
+    def test_run_hours_sequentially(self):
+        self._setup_hour_solving()
+        self.deployment_algorithm._timeout = 12.0
+
+        self.deployment_algorithm.run(["0", "1", "2", "3"])
+
+        result = self.deployment_algorithm._upload_result.call_args[0][0]
+        self.assertEqual([metrics["timeout"] for metrics in result["deployment_metrics"].values()], [3.0] * 4)
+        process_ids = [deployment[1] for deployment in result["time_keys_to_staging_area_data"].values()]
+        self.assertEqual(set(process_ids), {os.getpid()})
+
+    def test_can_fork_solver(self):
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock(spec=SimpleDeploymentMetricsCalculator)
+        self.deployment_algorithm._deployment_metrics_calculator.n_processes = 4
+        self.assertFalse(self.deployment_algorithm._can_fork_solver())
+
+        self.deployment_algorithm._deployment_metrics_calculator.n_processes = 1
+        self.assertEqual(
+            self.deployment_algorithm._can_fork_solver(),
+            "fork" in multiprocessing.get_all_start_methods(),
+        )
+
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock(spec=GoDeploymentMetricsCalculator)
+        self.assertFalse(self.deployment_algorithm._can_fork_solver())
 
     @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.InputManager.get_all_regions")
     def test_get_workflow_level_permitted_regions(self, mock_get_all_regions):
@@ -190,24 +688,213 @@ class TestDeploymentAlgorithm(unittest.TestCase):
 
         self.assertEqual(selected_deployment, mock_deployments[0])
 
-    @patch(
-        "caribou.deployment_solver.deployment_algorithms.deployment_algorithm.SimpleDeploymentMetricsCalculator.calculate_deployment_metrics"
-    )
-    def test_initialise_home_deployment(self, mock_calculate_deployment_metrics):
-        mock_calculate_deployment_metrics.return_value = {"cost": 100}
+    def test_initialise_home_deployment(self):
         self.deployment_algorithm._home_region_index = 0  # Assuming 0 is the index for the home region
         self.deployment_algorithm._number_of_instances = 1
 
         self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
-        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "cost": 100
-        }
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"cost": 100}
+        ]
 
         home_deployment, home_deployment_metrics = self.deployment_algorithm._initialise_home_deployment()
 
         self.assertEqual(home_deployment, [0])
         self.assertEqual(home_deployment_metrics, {"cost": 100})
 
+    def test_is_permitted_deployment(self):
+        self.deployment_algorithm._number_of_instances = 2
+        self.deployment_algorithm._per_instance_permitted_regions = [[0, 2], [0, 1, 2]]
+
+        self.assertTrue(self.deployment_algorithm._is_permitted_deployment((2, 1)))
+        self.assertFalse(self.deployment_algorithm._is_permitted_deployment([1, 1]))
+
+    def test_calculate_deployment_metrics_batch(self):
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._home_deployment_metrics = {"cost": 100}
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"cost": 1},
+            {"cost": 2},
+        ]
+
+        result = self.deployment_algorithm._calculate_deployment_metrics_batch([[1, 1], [0, 0], [1, 0]])
+
+        # The home deployment is not recalculated
+        self.assertEqual(result, [{"cost": 1}, {"cost": 100}, {"cost": 2}])
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1], [1, 0]]
+        )
+
+    def test_get_instrumentation_summary(self):
+        self.deployment_algorithm._workflow_config = self.workflow_config_mock
+        self.deployment_algorithm._deployment_metrics_calculator.simulated_samples = 300
+        self.deployment_algorithm._input_manager.get_calculator_cache_statistics.return_value = {
+            "cost_calculator": {"cache_hits": 5, "cache_misses": 1}
+        }
+        self.deployment_algorithm._instrumentation.increment("simulated_deployments", 2)
+        self.deployment_algorithm._deployment_metrics_cache.get([0], None)
+
+        with self.assertLogs(
+            "caribou.deployment_solver.deployment_algorithms.deployment_algorithm", level="INFO"
+        ) as logs:
+            summary = self.deployment_algorithm._get_instrumentation_summary()
+
+        self.assertEqual(
+            summary["counters"],
+            {
+                "simulated_deployments": 2,
+                "simulated_samples": 300,
+                "deployment_metrics_cache_hits": 0,
+                "deployment_metrics_cache_misses": 1,
+                "cost_calculator_cache_hits": 5,
+                "cost_calculator_cache_misses": 1,
+            },
+        )
+        self.assertEqual(summary["samples_per_simulated_deployment"], 150)
+        self.assertIn(json.dumps(summary), logs.output[0])
+
+    def test_calculate_deployment_metrics_batch_home_only(self):
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._home_deployment_metrics = {"cost": 100}
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+
+        result = self.deployment_algorithm._calculate_deployment_metrics_batch([[0, 0]])
+
+        self.assertEqual(result, [{"cost": 100}])
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_not_called()
+
+    def test_calculate_deployment_metrics_batch_cached(self):
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._home_deployment_metrics = {"cost": 100}
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        calculate_batch = self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch
+        calculate_batch.side_effect = lambda deployments: [{"cost": deployment[0]} for deployment in deployments]
+
+        first_result = self.deployment_algorithm._calculate_deployment_metrics_batch([[1, 1], [2, 2], [1, 1]])
+        second_result = self.deployment_algorithm._calculate_deployment_metrics_batch([[2, 2], [3, 3]])
+
+        self.assertEqual(first_result, [{"cost": 1}, {"cost": 2}, {"cost": 1}])
+        self.assertEqual(second_result, [{"cost": 2}, {"cost": 3}])
+        # Duplicates within a batch and deployments of earlier batches are not recalculated
+        self.assertEqual(calculate_batch.call_args_list[0].args, ([[1, 1], [2, 2]],))
+        self.assertEqual(calculate_batch.call_args_list[1].args, ([[3, 3]],))
+
+        # Another hour needs another simulation
+        self.deployment_algorithm._hour_to_run = "1"
+        self.deployment_algorithm._calculate_deployment_metrics_batch([[2, 2]])
+        self.assertEqual(calculate_batch.call_args_list[2].args, ([[2, 2]],))
+        self.assertEqual(
+            self.deployment_algorithm._deployment_metrics_cache.get_statistics(), {"hits": 1, "misses": 4, "size": 4}
+        )
+
+    def test_initialise_home_deployment_cached(self):
+        self.deployment_algorithm._home_region_index = 0
+        self.deployment_algorithm._number_of_instances = 2
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        calculator = self.deployment_algorithm._deployment_metrics_calculator
+        calculator.calculate_deployment_metrics_batch.return_value = [{"cost": 100}]
+
+        self.deployment_algorithm._initialise_home_deployment()
+        _, home_deployment_metrics = self.deployment_algorithm._initialise_home_deployment()
+
+        self.assertEqual(home_deployment_metrics, {"cost": 100})
+        calculator.calculate_deployment_metrics_batch.assert_called_once_with([[0, 0]])
+
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.deployment_algorithm.VectorizedDeploymentMetricsCalculator",
+        MagicMock,
+    )
+    def test_calculate_deployment_metrics_batch_all_hours(self):
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._home_deployment_metrics = {"cost": 100}
+        self.deployment_algorithm._hours_to_run = ["0", "1"]
+        self.deployment_algorithm._hour_to_run = "0"
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        calculator = self.deployment_algorithm._deployment_metrics_calculator
+        calculator.calculate_hourly_deployment_metrics_batch.return_value = [
+            {"0": {"cost": 1, "carbon": 1}, "1": {"cost": 1, "carbon": 2}}
+        ]
+
+        result = self.deployment_algorithm._calculate_deployment_metrics_batch([[1, 1]])
+        self.deployment_algorithm._hour_to_run = "1"
+        next_hour_result = self.deployment_algorithm._calculate_deployment_metrics_batch([[1, 1]])
+
+        # The deployment is simulated once for all the hours to run
+        self.assertEqual(result, [{"cost": 1, "carbon": 1}])
+        self.assertEqual(next_hour_result, [{"cost": 1, "carbon": 2}])
+        calculator.calculate_hourly_deployment_metrics_batch.assert_called_once_with([[1, 1]], ["0", "1"])
+        calculator.calculate_deployment_metrics_batch.assert_not_called()
+
+    @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE", 2)
+    def test_check_deployments_in_batches(self):
+        self.deployment_algorithm._calculate_deployment_metrics_batch = MagicMock(
+            side_effect=lambda batch: [{"cost": deployment[0]} for deployment in batch]
+        )
+        self.deployment_algorithm._is_hard_constraint_failed = MagicMock(
+            side_effect=lambda metrics: metrics["cost"] == 2
+        )
+
+        result = self.deployment_algorithm._check_deployments_in_batches(iter([[1], [2], [3]]))
+
+        self.assertEqual(result, [([1], {"cost": 1}), ([3], {"cost": 3})])
+        self.assertEqual(self.deployment_algorithm._calculate_deployment_metrics_batch.call_count, 2)
+
+    @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE", 1)
+    def test_check_deployments_in_batches_timeout(self):
+        def func(batch):
+            time.sleep(2)
+            return [{"cost": 1} for _ in batch]
+
+        self.deployment_algorithm._calculate_deployment_metrics_batch = MagicMock(side_effect=func)
+        self.deployment_algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+
+        result = self.deployment_algorithm._check_deployments_in_batches([[1], [2]], timeout=1)
+
+        self.assertEqual(result, [([1], {"cost": 1})])
+        self.deployment_algorithm._calculate_deployment_metrics_batch.assert_called_once()
+
+    def test_is_promising_deployment_without_surrogate(self):
+        self.assertTrue(self.deployment_algorithm._is_promising_deployment([1, 1]))
+
+    def test_is_promising_deployment(self):
+        self.deployment_algorithm._ranker = MagicMock(number_one_priority="average_cost")
+        self.deployment_algorithm._surrogate = MagicMock()
+        self.deployment_algorithm._surrogate.predict.side_effect = lambda deployment: {
+            "average_cost": float(sum(deployment))
+        }
+        self.deployment_algorithm._best_surrogate_metric = 2.0
+
+        # Within the tolerance of the prediction for the best simulated deployment
+        self.assertTrue(self.deployment_algorithm._is_promising_deployment([1, 2]))
+        self.assertFalse(self.deployment_algorithm._is_promising_deployment([2, 2]))
+
+    def test_calculate_deployment_metrics_batch_updates_best_surrogate_metric(self):
+        self.deployment_algorithm._home_deployment = [0, 0]
+        self.deployment_algorithm._home_deployment_metrics = {"average_cost": 100}
+        self.deployment_algorithm._ranker = MagicMock(number_one_priority="average_cost")
+        self.deployment_algorithm._surrogate = MagicMock()
+        self.deployment_algorithm._surrogate.predict.side_effect = lambda deployment: {
+            "average_cost": 10.0 * deployment[0]
+        }
+        self.deployment_algorithm._best_simulated_metric = 5.0
+        self.deployment_algorithm._best_surrogate_metric = 50.0
+        self.deployment_algorithm._is_hard_constraint_failed = MagicMock(
+            side_effect=lambda metrics: metrics["average_cost"] == 1
+        )
+        self.deployment_algorithm._deployment_metrics_calculator = MagicMock()
+        self.deployment_algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"average_cost": 1},
+            {"average_cost": 3},
+            {"average_cost": 4},
+        ]
+
+        self.deployment_algorithm._calculate_deployment_metrics_batch([[1, 1], [2, 2], [3, 3]])
+
+        # The deployment failing the hard constraints is ignored
+        self.assertEqual(self.deployment_algorithm._best_simulated_metric, 3)
+        self.assertEqual(self.deployment_algorithm._best_surrogate_metric, 20.0)
+
     @patch.object(DeploymentAlgorithm, "_filter_regions_instance")
     def test_get_permitted_region_indices(self, mock_filter_regions_instance):
         # Arrange
@@ -1,9 +1,16 @@
 import time
 import unittest
+import warnings
 from unittest.mock import MagicMock, patch
+
+import numpy as np
+
 from caribou.deployment_solver.deployment_algorithms.fine_grained_deployment_algorithm import (
     FineGrainedDeploymentAlgorithm,
 )
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
 
 
 class TestFineGrainedDeploymentAlgorithm(unittest.TestCase):
@@ -14,6 +21,42 @@ class TestFineGrainedDeploymentAlgorithm(unittest.TestCase):
     def setUp(self, mock_init):
         mock_workflow_config = MagicMock()
         self._algorithm = FineGrainedDeploymentAlgorithm(mock_workflow_config)
+        self._algorithm._deployment_metrics_cache = DeploymentMetricsCache(100)
+        self._algorithm._surrogate = None
+        self._algorithm._resumable = False
+        self._algorithm._instrumentation = SolverInstrumentation()
+        self._algorithm._warm_start = False
+        self._algorithm._previous_deployments = {}
+        self._algorithm._hour_to_run = None
+        self._algorithm._hours_to_run = [None]
+        self._algorithm._region_indexer = MagicMock()
+        self._algorithm._region_indexer.get_value_indices.return_value = {1: 1, 2: 2}
+        self._algorithm._number_of_instances = 2
+        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
+        self._algorithm._home_deployment = [0, 0]
+        self._algorithm._home_deployment_metrics = {"metric1": 3.0, "metric2": 3.0}
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        self._algorithm._is_hard_constraint_failed = MagicMock()
+        self._algorithm._is_hard_constraint_failed.return_value = False
+        self._algorithm._branch_and_bound = False
+        self._algorithm._home_region_index = 0
+        self._algorithm._ranker = MagicMock()
+        self._algorithm._ranker.number_one_priority = "average_cost"
+
+    def _setup_branch_and_bound(self):
+        # The average cost of a deployment is the sum of its region indices, the lower bounds are exact
+        self._algorithm._branch_and_bound = True
+        self._algorithm._home_deployment_metrics = {"average_cost": 10.0, "tail_cost": 10.0}
+        lower_bounds = np.array([[0.0, 1.0, 2.0], [0.0, 1.0, 2.0]])
+        self._algorithm._get_metric_lower_bounds = MagicMock(
+            return_value={"average_cost": lower_bounds, "tail_cost": lower_bounds}
+        )
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = (
+            lambda deployments: [
+                {"average_cost": float(sum(deployment)), "tail_cost": float(sum(deployment))}
+                for deployment in deployments
+            ]
+        )
 
     def test_run_algorithm(self):
         # Arrange
@@ -31,16 +74,13 @@ class TestFineGrainedDeploymentAlgorithm(unittest.TestCase):
 
     def test_generate_all_possible_fine_deployments(self):
         # Arrange
-        self._algorithm._region_indexer = MagicMock()
-        self._algorithm._region_indexer.get_value_indices.return_value = {1: 1, 2: 2}
-        self._algorithm._number_of_instances = 2
-        self._algorithm._generate_and_check_deployment = MagicMock()
-        self._algorithm._generate_and_check_deployment.side_effect = [
-            ([1, 1], {"metric1": 1.0, "metric2": 2.0}),
-            None,
-            ([2, 1], {"metric1": 1.0, "metric2": 2.0}),
-            None,
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 1.0, "metric2": 2.0},
+            {"metric1": 2.0, "metric2": 2.0},
+            {"metric1": 1.0, "metric2": 2.0},
+            {"metric1": 2.0, "metric2": 2.0},
         ]
+        self._algorithm._is_hard_constraint_failed.side_effect = lambda metrics: metrics["metric1"] == 2.0
 
         # Act
         result = self._algorithm._generate_all_possible_fine_deployments()
@@ -48,72 +88,200 @@ class TestFineGrainedDeploymentAlgorithm(unittest.TestCase):
         # Assert
         expected_result = [([1, 1], {"metric1": 1.0, "metric2": 2.0}), ([2, 1], {"metric1": 1.0, "metric2": 2.0})]
         self.assertEqual(result, expected_result)
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1], [1, 2], [2, 1], [2, 2]]
+        )
 
-    def test_generate_all_possible_fine_deployments_timeout(self):
+    def test_generate_all_possible_fine_deployments_not_permitted(self):
         # Arrange
-        self._algorithm._region_indexer = MagicMock()
-        self._algorithm._region_indexer.get_value_indices.return_value = {1: 1, 2: 2}
-        self._algorithm._number_of_instances = 2
-        self._algorithm._generate_and_check_deployment = MagicMock()
+        self._algorithm._per_instance_permitted_regions = [[0, 2], [0, 1, 2]]
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 1.0, "metric2": 2.0},
+            {"metric1": 2.0, "metric2": 2.0},
+        ]
 
+        # Act
+        result = self._algorithm._generate_all_possible_fine_deployments()
+
+        # Assert
+        self.assertEqual([deployment for deployment, _ in result], [[2, 1], [2, 2]])
+
+    @patch("caribou.deployment_solver.deployment_algorithms.deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE", 2)
+    def test_generate_all_possible_fine_deployments_timeout(self):
+        # Arrange
         results = [
-            ([1, 1], {"metric1": 1.0, "metric2": 2.0}),
-            None,
-            ([2, 1], {"metric1": 1.0, "metric2": 2.0}),
-            None,
+            [{"metric1": 1.0, "metric2": 2.0}, {"metric1": 2.0, "metric2": 2.0}],
+            [{"metric1": 1.0, "metric2": 2.0}, {"metric1": 2.0, "metric2": 2.0}],
         ]
 
         def func(*args, **kwargs):
             time.sleep(2)
             return results.pop(0)
 
-        self._algorithm._generate_and_check_deployment.side_effect = func
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = func
 
         # Act
         result = self._algorithm._generate_all_possible_fine_deployments(timeout=1)
 
         # Assert
-        expected_result = [([1, 1], {"metric1": 1.0, "metric2": 2.0})]
+        expected_result = [([1, 1], {"metric1": 1.0, "metric2": 2.0}), ([1, 2], {"metric1": 2.0, "metric2": 2.0})]
         self.assertEqual(result, expected_result)
-        self._algorithm._generate_and_check_deployment.assert_called_once()
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once()
+
+    def test_generate_all_possible_fine_deployments_surrogate_prefilter(self):
+        self._algorithm._is_promising_deployment = MagicMock(side_effect=lambda deployment: deployment != [1, 2])
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = (
+            lambda deployments: [{"metric1": 1.0} for _ in deployments]
+        )
 
-    def test_generate_and_check_deployment_positive(self):
+        result = self._algorithm._generate_all_possible_fine_deployments()
+
+        self.assertEqual([deployment for deployment, _ in result], [[1, 1], [2, 1], [2, 2]])
+
+    def test_generate_all_possible_fine_deployments_timeout_while_filtering(self):
         # Arrange
-        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
-        self._algorithm._number_of_instances = 2
-        self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
-        }
-        self._algorithm._is_hard_constraint_failed = MagicMock()
-        self._algorithm._is_hard_constraint_failed.return_value = False
-        self._algorithm._home_deployment = None
+        self._algorithm._region_indexer.get_value_indices.return_value = {region: region for region in range(50)}
+        self._algorithm._per_instance_permitted_regions = [list(range(50)), list(range(50))]
+
+        def is_promising_deployment(deployment):
+            # No candidate is promising, and filtering them takes time
+            time.sleep(0.01)
+            return False
+
+        self._algorithm._is_promising_deployment = MagicMock(side_effect=is_promising_deployment)
 
         # Act
-        result = self._algorithm._generate_and_check_deployment((1, 1))
+        result = self._algorithm._generate_all_possible_fine_deployments(timeout=0.1)
 
         # Assert
-        expected_result = ([1, 1], {"metric1": 1.0, "metric2": 2.0})
-        self.assertEqual(result, expected_result)
+        self.assertEqual(result, [])
+        self.assertLess(self._algorithm._is_promising_deployment.call_count, 50)
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_not_called()
 
-    def test_generate_and_check_deployment_negative(self):
-        # Arrange
-        self._algorithm._per_instance_permitted_regions = [[0, 2], [0, 1, 2]]
-        self._algorithm._number_of_instances = 2
-        self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
+    def test_run_algorithm_branch_and_bound(self):
+        self._algorithm._branch_and_bound = True
+        self._algorithm._generate_branch_and_bound_fine_deployments = MagicMock(return_value=[([1, 1], {})])
+
+        result = self._algorithm._run_algorithm(timeout=5)
+
+        self.assertEqual(result, [([1, 1], {})])
+        self._algorithm._generate_branch_and_bound_fine_deployments.assert_called_once_with(5)
+
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.fine_grained_deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE",
+        1,
+    )
+    def test_generate_branch_and_bound_fine_deployments_prunes(self):
+        self._setup_branch_and_bound()
+        self._algorithm._home_deployment_metrics = {"average_cost": 0.0, "tail_cost": 0.0}
+
+        result = self._algorithm._generate_branch_and_bound_fine_deployments()
+
+        # The home deployment is the optimum, so every other deployment is pruned
+        self.assertEqual(result, [([0, 0], {"average_cost": 0.0, "tail_cost": 0.0})])
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_not_called()
+
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.fine_grained_deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE",
+        1,
+    )
+    def test_generate_branch_and_bound_fine_deployments_finds_optimum(self):
+        self._setup_branch_and_bound()
+        self._algorithm._per_instance_permitted_regions = [[1, 2], [2, 1]]
+
+        result = self._algorithm._generate_branch_and_bound_fine_deployments()
+
+        # The first deployment is the optimum, after which the other deployments cannot beat it
+        self.assertEqual(
+            result,
+            [([0, 0], {"average_cost": 10.0, "tail_cost": 10.0}), ([1, 1], {"average_cost": 2.0, "tail_cost": 2.0})],
+        )
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1]]
+        )
+
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.fine_grained_deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE",
+        1,
+    )
+    def test_generate_branch_and_bound_fine_deployments_warm_start(self):
+        self._setup_branch_and_bound()
+        self._algorithm._per_instance_permitted_regions = [[1, 2], [1, 2]]
+        self._algorithm._previous_deployments = {"0": [1, 1]}
+
+        result = self._algorithm._generate_branch_and_bound_fine_deployments()
+
+        # The previous deployment is the optimum, so every other deployment is pruned
+        self.assertEqual(
+            result,
+            [([0, 0], {"average_cost": 10.0, "tail_cost": 10.0}), ([1, 1], {"average_cost": 2.0, "tail_cost": 2.0})],
+        )
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1]]
+        )
+
+    def test_generate_branch_and_bound_fine_deployments_hard_constraints(self):
+        self._setup_branch_and_bound()
+        self._algorithm._per_instance_permitted_regions = [[1, 2], [1, 2]]
+        self._algorithm._is_hard_constraint_failed.side_effect = lambda metrics: metrics["tail_cost"] > 3.0
+
+        result = self._algorithm._generate_branch_and_bound_fine_deployments()
+
+        # The home deployment fails the hard constraints, so nothing is pruned on the priority but
+        # the deployments that must exceed the tail cost are never simulated
+        self.assertEqual(
+            [deployment for deployment, _ in result],
+            [[1, 1], [1, 2], [2, 1]],
+        )
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1], [1, 2], [2, 1]]
+        )
+
+    def test_get_metric_lower_bounds(self):
+        self._algorithm._per_instance_permitted_regions = [[0, 1], [1]]
+        self._algorithm._input_manager = MagicMock()
+        self._algorithm._input_manager.get_node_runtime_distribution.side_effect = (
+            lambda instance, region, is_redirector: {"runtimes": [3.0, 2.0], "relative_performance": region + 1.0}
+        )
+        self._algorithm._input_manager.get_execution_factors.return_value = {
+            "cost_per_second": 2.0,
+            "invocation_cost": 1.0,
+            "energy_factor": 0.5,
         }
-        self._algorithm._is_hard_constraint_failed = MagicMock()
-        self._algorithm._is_hard_constraint_failed.return_value = False
+        self._algorithm._input_manager.get_grid_carbon_intensity.side_effect = lambda region, hour: 10.0 * (region + 1)
+        self._algorithm._get_invocation_probability_lower_bounds = MagicMock(return_value=np.array([1.0, 0.5]))
 
-        # Act
-        result = self._algorithm._generate_and_check_deployment((1, 1))
+        with warnings.catch_warnings():
+            # The infinite bounds of the regions that are not permitted are not multiplied by a weight of 0
+            warnings.simplefilter("error")
+            lower_bounds = self._algorithm._get_metric_lower_bounds()
 
-        # Assert
-        self.assertIsNone(result)
+        np.testing.assert_array_equal(lower_bounds["average_runtime"], [[2.0, 4.0, np.inf], [np.inf, 2.0, np.inf]])
+        np.testing.assert_array_equal(lower_bounds["average_cost"], [[5.0, 9.0, np.inf], [np.inf, 4.5, np.inf]])
+        np.testing.assert_array_equal(lower_bounds["average_carbon"], [[10.0, 40.0, np.inf], [np.inf, 20.0, np.inf]])
+        np.testing.assert_array_equal(lower_bounds["tail_runtime"], [[2.0, 4.0, np.inf], [np.inf, 0.0, np.inf]])
+        np.testing.assert_array_equal(lower_bounds["tail_cost"], [[5.0, 9.0, np.inf], [np.inf, 0.0, np.inf]])
+
+    def test_get_invocation_probability_lower_bounds(self):
+        instances = [
+            {"instance_name": "a", "succeeding_instances": ["b", "c"], "preceding_instances": []},
+            {"instance_name": "b", "succeeding_instances": ["c"], "preceding_instances": ["a"]},
+            {"instance_name": "c", "succeeding_instances": [], "preceding_instances": ["a", "b"]},
+        ]
+        self._algorithm._workflow_config = MagicMock()
+        self._algorithm._workflow_config.instances = {instance["instance_name"]: instance for instance in instances}
+        self._algorithm._instance_indexer = InstanceIndexer(instances)
+        self._algorithm._number_of_instances = 3
+        self._algorithm._input_manager = MagicMock()
+        self._algorithm._input_manager.get_invocation_probability.side_effect = lambda from_instance, to_instance: {
+            (0, 1): 0.5,
+            (0, 2): 0.2,
+            (1, 2): 0.8,
+        }[(from_instance, to_instance)]
+
+        result = self._algorithm._get_invocation_probability_lower_bounds()
+
+        np.testing.assert_array_almost_equal(result, [1.0, 0.5, 0.4])
 
 
 if __name__ == "__main__":
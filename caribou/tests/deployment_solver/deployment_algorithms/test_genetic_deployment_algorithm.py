@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from caribou.deployment_solver.deployment_algorithms.genetic_deployment_algorithm import GeneticDeploymentAlgorithm
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.random_stream import RandomStream
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
+from caribou.deployment_solver.workflow_config import WorkflowConfig
+
+
+class TestGeneticDeploymentAlgorithm(unittest.TestCase):
+    @patch.object(GeneticDeploymentAlgorithm, "__init__", return_value=None)
+    def setUp(self, mock_init):
+        self._algorithm = GeneticDeploymentAlgorithm(MagicMock(spec=WorkflowConfig))
+        self._algorithm._deployment_metrics_cache = DeploymentMetricsCache(1000)
+        self._algorithm._surrogate = None
+        self._algorithm._resumable = False
+        self._algorithm._instrumentation = SolverInstrumentation()
+        self._algorithm._warm_start = False
+        self._algorithm._previous_deployments = {}
+        self._algorithm._hour_to_run = None
+        self._algorithm._hours_to_run = [None]
+        self._algorithm._number_of_instances = 4
+        self._algorithm._region_indexer = MagicMock()
+        self._algorithm._region_indexer.get_value_indices.return_value = {"r0": 0, "r1": 1, "r2": 2, "r3": 3}
+        self._algorithm._instance_indexer = MagicMock()
+        self._algorithm._instance_indexer.get_value_indices.return_value = {"i0": 0, "i1": 1, "i2": 2, "i3": 3}
+        self._algorithm._per_instance_permitted_regions = [[0, 1, 2, 3], [0, 2], [0, 1, 2, 3], [0, 3]]
+        self._algorithm._input_manager = MagicMock()
+        self._algorithm._input_manager.get_random_stream.return_value = RandomStream(0)
+        self._algorithm._ranker = MagicMock()
+        self._algorithm._ranker.number_one_priority = "cost"
+        self._algorithm._home_deployment = [0, 0, 0, 0]
+        self._algorithm._home_deployment_metrics = {"cost": 12.0}
+        self._algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        # The cheapest deployment moves every instance to its highest permitted region
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = (
+            lambda deployments: [{"cost": 12.0 - sum(deployment)} for deployment in deployments]
+        )
+        self._algorithm._setup()
+
+    def _is_permitted(self, deployment):
+        return all(
+            region in self._algorithm._per_instance_permitted_regions[instance]
+            for instance, region in enumerate(deployment)
+        )
+
+    def test_setup(self):
+        self.assertEqual(self._algorithm._population_size, 32)
+        self.assertEqual(self._algorithm._mutation_probability, 0.25)
+        self.assertEqual(self._algorithm._num_generations, 2)
+        np.testing.assert_array_equal(self._algorithm._permitted_region_counts, [4, 2, 4, 2])
+        np.testing.assert_array_equal(self._algorithm._permitted_region_table[3], [0, 3, 0, 0])
+
+    def test_generate_initial_population(self):
+        population = self._algorithm._generate_initial_population()
+
+        self.assertEqual(population.shape, (32, 4))
+        # Seeded with the home deployment (the only permitted coarse deployment)
+        self.assertEqual(population[0].tolist(), [0, 0, 0, 0])
+        for deployment in population.tolist():
+            self.assertTrue(self._is_permitted(deployment))
+
+    def test_generate_initial_population_warm_start(self):
+        self._algorithm._previous_deployments = {"0": [2, 2, 1, 3]}
+
+        population = self._algorithm._generate_initial_population()
+
+        self.assertEqual(population[:2].tolist(), [[0, 0, 0, 0], [2, 2, 1, 3]])
+
+    def test_crossover_and_mutate_keep_permitted_regions(self):
+        population = self._algorithm._generate_initial_population()
+        fitness = np.arange(len(population), dtype=np.float64)
+
+        children = self._algorithm._mutate(self._algorithm._crossover(population, fitness))
+
+        self.assertEqual(children.shape, population.shape)
+        for deployment in children.tolist():
+            self.assertTrue(self._is_permitted(deployment))
+
+    def test_select_parents(self):
+        fitness = np.array([5.0, 1.0, np.inf, 3.0])
+
+        parents = self._algorithm._select_parents(fitness, 100)
+
+        # The least fit individual never wins a tournament of distinct fitter ones
+        self.assertTrue(np.all(parents < 4))
+        self.assertGreater(np.sum(parents == 1), np.sum(parents == 0))
+
+    def test_evaluate_population_hard_constraints(self):
+        self._algorithm._is_hard_constraint_failed.side_effect = lambda metrics: metrics["cost"] < 7.0
+        evaluated_deployments = {}
+
+        fitness = self._algorithm._evaluate_population(np.array([[0, 0, 0, 0], [3, 2, 3, 3]]), evaluated_deployments)
+
+        np.testing.assert_array_equal(fitness, [12.0, np.inf])
+        self.assertEqual(list(evaluated_deployments.keys()), [(0, 0, 0, 0)])
+
+    def test_run_algorithm(self):
+        self._algorithm._num_generations = 20
+
+        deployments = self._algorithm._run_algorithm()
+
+        deployment_keys = [tuple(deployment) for deployment, _ in deployments]
+        self.assertEqual(len(deployment_keys), len(set(deployment_keys)))
+        for deployment, deployment_metrics in deployments:
+            self.assertTrue(self._is_permitted(deployment))
+            self.assertEqual(deployment_metrics, {"cost": 12.0 - sum(deployment)})
+        self.assertIn((3, 2, 3, 3), deployment_keys)
+
+    def test_run_algorithm_batches_generations(self):
+        self._algorithm._run_algorithm()
+
+        calculator = self._algorithm._deployment_metrics_calculator
+        # The initial population and every generation are evaluated as one batch each
+        self.assertLessEqual(calculator.calculate_deployment_metrics_batch.call_count, 3)
+
+    def test_run_algorithm_timeout(self):
+        deployments = self._algorithm._run_algorithm(timeout=0)
+
+        # Only the initial population is evaluated
+        self.assertEqual(
+            self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.call_count, 1
+        )
+        self.assertGreater(len(deployments), 0)
+
+    def test_run_algorithm_all_failed(self):
+        self._algorithm._is_hard_constraint_failed.return_value = True
+
+        deployments = self._algorithm._run_algorithm(timeout=0)
+
+        self.assertEqual(deployments, [([0, 0, 0, 0], {"cost": 12.0})])
+
+
+if __name__ == "__main__":
+    unittest.main()
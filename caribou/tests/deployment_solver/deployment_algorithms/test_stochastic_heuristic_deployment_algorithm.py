@@ -1,3 +1,4 @@
+import multiprocessing
 import time
 import unittest
 from unittest.mock import MagicMock, patch, PropertyMock
@@ -6,6 +7,9 @@ from caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deploy
 )
 from caribou.deployment_solver.deployment_algorithms.deployment_algorithm import DeploymentAlgorithm
 from caribou.deployment_solver.workflow_config import WorkflowConfig
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+from caribou.deployment_solver.models.random_stream import RandomStream
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
 
 
 class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
@@ -13,6 +17,15 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
     def setUp(self, mock_super_init):
         mock_workflow_config = MagicMock(spec=WorkflowConfig)
         self._algorithm = StochasticHeuristicDeploymentAlgorithm(mock_workflow_config)
+        self._algorithm._deployment_metrics_cache = DeploymentMetricsCache(100)
+        self._algorithm._surrogate = None
+        self._algorithm._resumable = False
+        self._algorithm._instrumentation = SolverInstrumentation()
+        self._algorithm._warm_start = False
+        self._algorithm._previous_deployments = {}
+        self._algorithm._search_state = None
+        self._algorithm._hour_to_run = None
+        self._algorithm._hours_to_run = [None]
         self._algorithm._region_indexer = MagicMock()
         self._algorithm._instance_indexer = MagicMock()
 
@@ -44,6 +57,7 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
         self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
         self._algorithm._home_deployment = [1, 1, 1]
         self._algorithm._num_iterations = 2
+        self._algorithm._n_chains = 1
 
         # Act
         result = self._algorithm._run_algorithm()
@@ -52,6 +66,30 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
         expected_result = [([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})]
         self.assertEqual(result, expected_result)
 
+    def test_run_algorithm_warm_start(self):
+        self._algorithm._generate_all_possible_coarse_deployments = MagicMock(
+            return_value=[([1, 1, 1], {"metric1": 1.0})]
+        )
+        self._algorithm._generate_stochastic_heuristic_deployments = MagicMock()
+        self._algorithm._get_warm_start_deployments = MagicMock(return_value=[([2, 1, 2], {"metric1": 0.5})])
+        self._algorithm._ranker = MagicMock()
+        self._algorithm._ranker.number_one_priority = "metric1"
+        self._algorithm._home_deployment_metrics = {"metric1": 1.0}
+        self._algorithm._home_deployment = [1, 1, 1]
+        self._algorithm._bias_regions = set()
+        self._algorithm._n_chains = 1
+
+        result = self._algorithm._run_algorithm()
+
+        # The previous deployment is kept, and the chain starts from it
+        self.assertEqual(result, [([2, 1, 2], {"metric1": 0.5}), ([1, 1, 1], {"metric1": 1.0})])
+        self.assertEqual(self._algorithm._best_deployment_metrics, {"metric1": 0.5})
+        self.assertEqual(self._algorithm._bias_regions, {2})
+        self.assertEqual(
+            self._algorithm._generate_stochastic_heuristic_deployments.call_args.kwargs["initial_deployment"],
+            [2, 1, 2],
+        )
+
     def test_generate_stochastic_heuristic_deployments(self):
         # Arrange
         self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
@@ -60,10 +98,12 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
         self._algorithm._generate_new_deployment = MagicMock()
         self._algorithm._generate_new_deployment.return_value = [2, 2, 2]
         self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 2.0,
-            "metric2": 3.0,
-        }
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {
+                "metric1": 2.0,
+                "metric2": 3.0,
+            }
+        ]
         self._algorithm._is_hard_constraint_failed = MagicMock()
         self._algorithm._is_hard_constraint_failed.return_value = False
         self._algorithm._is_improvement = MagicMock()
@@ -81,21 +121,93 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
         # Assert
         expected_result = [([2, 2, 2], {"metric1": 2.0, "metric2": 3.0})]
         self.assertEqual(result, expected_result)
+        # Duplicate proposals are only evaluated once, in a single batch
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[2, 2, 2]]
+        )
+
+    def test_generate_stochastic_heuristic_deployments_batch(self):
+        # Arrange
+        self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
+        self._algorithm._home_deployment = [1, 1, 1]
+        self._algorithm._num_iterations = 3
+        self._algorithm._generate_new_deployment = MagicMock()
+        self._algorithm._generate_new_deployment.side_effect = [[2, 1, 1], [1, 2, 1], [1, 1, 2]]
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 0.5},
+            {"metric1": 3.0},
+            {"metric1": 0.2},
+        ]
+        self._algorithm._is_hard_constraint_failed = MagicMock()
+        self._algorithm._is_hard_constraint_failed.side_effect = lambda metrics: metrics["metric1"] == 3.0
+        self._algorithm._is_improvement = MagicMock()
+        self._algorithm._is_improvement.return_value = True
+        self._algorithm._temperature = 1.0
+        self._algorithm._max_number_combinations = 10
+
+        result = []
+
+        # Act
+        self._algorithm._generate_stochastic_heuristic_deployments(result)
+
+        # Assert
+        self.assertEqual(result, [([2, 1, 1], {"metric1": 0.5}), ([1, 1, 2], {"metric1": 0.2})])
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[2, 1, 1], [1, 2, 1], [1, 1, 2]]
+        )
+        self.assertAlmostEqual(self._algorithm._temperature, 0.99**2)
+
+    def test_generate_stochastic_heuristic_deployments_surrogate_prefilter(self):
+        # Arrange
+        self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
+        self._algorithm._home_deployment = [1, 1, 1]
+        self._algorithm._num_iterations = 3
+        self._algorithm._generate_new_deployment = MagicMock()
+        self._algorithm._generate_new_deployment.side_effect = [[2, 1, 1], [1, 2, 1], [1, 1, 2]]
+        self._algorithm._is_promising_deployment = MagicMock(side_effect=lambda deployment: deployment != [1, 2, 1])
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 0.5},
+            {"metric1": 0.2},
+        ]
+        self._algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+        self._algorithm._is_improvement = MagicMock(return_value=True)
+        self._algorithm._temperature = 1.0
+        self._algorithm._max_number_combinations = 10
+
+        result = []
 
+        # Act
+        self._algorithm._generate_stochastic_heuristic_deployments(result)
+
+        # Assert
+        self.assertEqual(result, [([2, 1, 1], {"metric1": 0.5}), ([1, 1, 2], {"metric1": 0.2})])
+        # The deployment rejected by the surrogate is never simulated
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[2, 1, 1], [1, 1, 2]]
+        )
+
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deployment_algorithm.DEPLOYMENT_METRICS_BATCH_SIZE",
+        1,
+    )
     def test_generate_stochastic_heuristic_deployments_timeout(self):
         # Arrange
         self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
         self._algorithm._home_deployment = [1, 1, 1]
         self._algorithm._num_iterations = 2
         self._algorithm._generate_new_deployment = MagicMock()
-        self._algorithm._generate_new_deployment.side_effect = [[2, 2, 2], [1, 1, 1]]
+        self._algorithm._generate_new_deployment.side_effect = [[2, 2, 2], [1, 1, 2]]
         self._algorithm._deployment_metrics_calculator = MagicMock()
 
         results = [
-            {
-                "metric1": 2.0,
-                "metric2": 3.0,
-            }
+            [
+                {
+                    "metric1": 2.0,
+                    "metric2": 3.0,
+                }
+            ]
         ]
 
         def func(*args, **kwargs):
@@ -105,7 +217,7 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
             else:
                 raise Exception("Timeout was ignored!")
 
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.side_effect = func
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.side_effect = func
         self._algorithm._is_hard_constraint_failed = MagicMock()
         self._algorithm._is_hard_constraint_failed.return_value = False
         self._algorithm._is_improvement = MagicMock()
@@ -124,6 +236,184 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
         expected_result = [([2, 2, 2], {"metric1": 2.0, "metric2": 3.0})]
         self.assertEqual(result, expected_result)
 
+    def test_advance_chain(self):
+        self._algorithm._generate_new_deployment = MagicMock()
+        self._algorithm._generate_new_deployment.side_effect = [[2, 1, 1], [2, 1, 1], [1, 2, 1], [1, 1, 2]]
+        self._algorithm._deployment_metrics_calculator = MagicMock()
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 0.5},
+            {"metric1": 0.2},
+        ]
+        self._algorithm._home_deployment = [1, 1, 1]
+        self._algorithm._home_deployment_metrics = {"metric1": 1.0}
+        self._algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+        self._algorithm._is_improvement = MagicMock(return_value=True)
+        self._algorithm._temperature = 1.0
+        self._algorithm._max_number_combinations = 10
+        accepted_deployments = []
+
+        current_deployment, n_iterations = self._algorithm._advance_chain(
+            [1, 1, 1], accepted_deployments, {(1, 1, 1)}, 3, float("inf")
+        )
+
+        # The duplicate proposal counts as an iteration
+        self.assertEqual(n_iterations, 3)
+        self.assertEqual(current_deployment, [1, 2, 1])
+        self.assertEqual(accepted_deployments, [([2, 1, 1], {"metric1": 0.5}), ([1, 2, 1], {"metric1": 0.2})])
+
+    def test_advance_chain_checkpoints_search(self):
+        self._algorithm._generate_new_deployment = MagicMock(side_effect=[[2, 1, 1], [1, 2, 1]])
+        self._algorithm._calculate_deployment_metrics_batch = MagicMock(return_value=[{"metric1": 0.5}])
+        self._algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+        self._algorithm._is_improvement = MagicMock(return_value=True)
+        self._algorithm._temperature = 1.0
+        self._algorithm._bias_regions = {2}
+        self._algorithm._best_deployment_metrics = {"metric1": 0.5}
+        self._algorithm._max_number_combinations = 10
+        self._algorithm._n_chains = 1
+        self._algorithm._resumable = True
+        self._algorithm._last_checkpoint_time = 0.0
+        self._algorithm._checkpoint_search = MagicMock()
+
+        with patch(
+            "caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deployment_algorithm."
+            "DEPLOYMENT_METRICS_BATCH_SIZE",
+            1,
+        ):
+            self._algorithm._advance_chain([1, 1, 1], [], {(1, 1, 1)}, 2, float("inf"))
+
+        # The search state after the first batch, with one iteration left
+        search_state = self._algorithm._checkpoint_search.call_args_list[0].args[0]
+        self.assertEqual(search_state["current_deployment"], [2, 1, 1])
+        self.assertEqual(search_state["remaining_iterations"], 1)
+        self.assertEqual(search_state["temperature"], 0.99)
+        self.assertEqual(search_state["bias_regions"], [2])
+        self.assertEqual(sorted(search_state["generated_deployments"]), [[1, 1, 1], [2, 1, 1]])
+
+    def test_run_algorithm_resumes_search(self):
+        self._algorithm._n_chains = 1
+        self._algorithm._resumable = True
+        self._algorithm._search_state = {
+            "current_deployment": [2, 1, 1],
+            "deployments": [[[2, 1, 1], {"metric1": 0.5}]],
+            "generated_deployments": [[1, 1, 1], [2, 1, 1]],
+            "remaining_iterations": 5,
+            "temperature": 0.5,
+            "bias_regions": [2],
+            "best_deployment_metrics": {"metric1": 0.5},
+        }
+        self._algorithm._generate_all_possible_coarse_deployments = MagicMock()
+        self._algorithm._advance_chain = MagicMock(return_value=([2, 1, 1], 2))
+
+        deployments = self._algorithm._run_algorithm()
+
+        # The coarse deployments are not generated again, the chain continues where it stopped
+        self._algorithm._generate_all_possible_coarse_deployments.assert_not_called()
+        current_deployment, _, generated_deployments, n_iterations, _ = self._algorithm._advance_chain.call_args.args
+        self.assertEqual(current_deployment, [2, 1, 1])
+        self.assertEqual(generated_deployments, {(1, 1, 1), (2, 1, 1)})
+        self.assertEqual(n_iterations, 5)
+        self.assertEqual(deployments, [[[2, 1, 1], {"metric1": 0.5}]])
+        self.assertEqual(self._algorithm._temperature, 0.5)
+        self.assertEqual(self._algorithm._bias_regions, {2})
+        self.assertEqual(self._algorithm._search_state["remaining_iterations"], 3)
+
+    def _setup_island_model(self):
+        self._algorithm._number_of_instances = 2
+        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2]]
+        self._algorithm._learning_rate = 1
+        self._algorithm._num_iterations = 40
+        self._algorithm._max_number_combinations = 9
+        self._algorithm._temperature = 1.0
+        self._algorithm._bias_regions = set()
+        self._algorithm._bias_probability = 0.2
+        self._algorithm._ranker = MagicMock()
+        self._algorithm._ranker.number_one_priority = "cost"
+        self._algorithm._home_deployment = [0, 0]
+        self._algorithm._home_deployment_metrics = {"cost": 10.0}
+        self._algorithm._best_deployment_metrics = {"cost": 10.0}
+        self._algorithm._input_manager = MagicMock()
+        self._algorithm._input_manager.get_random_stream.return_value = RandomStream(0)
+        self._algorithm._is_hard_constraint_failed = MagicMock(return_value=False)
+        self._algorithm._calculate_deployment_metrics_batch = lambda deployments: [
+            {"cost": 10.0 - sum(deployment)} for deployment in deployments
+        ]
+        self._algorithm._n_chains = 2
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deployment_algorithm.STOCHASTIC_HEURISTIC_MIGRATION_INTERVAL",
+        4,
+    )
+    def test_generate_island_model_deployments(self):
+        self._setup_island_model()
+        deployments = [([0, 0], {"cost": 10.0})]
+
+        self._algorithm._generate_island_model_deployments(deployments)
+
+        # The accepted deployments of all chains are merged without duplicates
+        deployment_keys = [tuple(deployment) for deployment, _ in deployments]
+        self.assertEqual(deployments[0], ([0, 0], {"cost": 10.0}))
+        self.assertGreater(len(deployments), 1)
+        self.assertEqual(len(deployment_keys), len(set(deployment_keys)))
+        for deployment, deployment_metrics in deployments:
+            self.assertEqual(deployment_metrics, {"cost": 10.0 - sum(deployment)})
+        self.assertEqual(
+            self._algorithm._best_deployment_metrics["cost"], min(metrics["cost"] for _, metrics in deployments)
+        )
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    def test_generate_island_model_deployments_chain_error(self):
+        self._setup_island_model()
+
+        def calculate_deployment_metrics_batch(deployments):
+            raise ValueError("Simulation failed")
+
+        self._algorithm._calculate_deployment_metrics_batch = calculate_deployment_metrics_batch
+
+        with self.assertRaises(ValueError):
+            self._algorithm._generate_island_model_deployments([([0, 0], {"cost": 10.0})])
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(), "Requires the fork start method")
+    @patch(
+        "caribou.deployment_solver.deployment_algorithms.stochastic_heuristic_deployment_algorithm.STOCHASTIC_HEURISTIC_MIGRATION_INTERVAL",
+        4,
+    )
+    def test_generate_island_model_deployments_single_chain_error(self):
+        self._setup_island_model()
+        self._algorithm._num_iterations = 1000000
+        failed_chains = multiprocessing.get_context("fork").Value("i", 0)
+        calculate_deployment_metrics_batch = self._algorithm._calculate_deployment_metrics_batch
+
+        def fail_in_one_chain(deployments):
+            # Only the first chain fails, the other one waits for the migration of the coordinator
+            with failed_chains.get_lock():
+                failed_chains.value += 1
+                if failed_chains.value == 1:
+                    raise ValueError("Simulation failed")
+            return calculate_deployment_metrics_batch(deployments)
+
+        self._algorithm._calculate_deployment_metrics_batch = fail_in_one_chain
+
+        start_time = time.time()
+        with self.assertRaises(ValueError):
+            self._algorithm._generate_island_model_deployments([([0, 0], {"cost": 10.0})], timeout=60)
+        self.assertLess(time.time() - start_time, 30)
+
+    def test_migrate(self):
+        self._algorithm._ranker = MagicMock()
+        self._algorithm._ranker.number_one_priority = "cost"
+        self._algorithm._best_deployment_metrics = {"cost": 5.0}
+        self._algorithm._bias_regions = {1}
+
+        # A worse deployment of another chain only shares its bias regions
+        self.assertEqual(self._algorithm._migrate([1, 1], ([2, 2], {"cost": 6.0}, {2})), [1, 1])
+        self.assertEqual(self._algorithm._bias_regions, {1, 2})
+
+        # A better deployment of another chain becomes the current deployment
+        self.assertEqual(self._algorithm._migrate([1, 1], ([0, 2], {"cost": 4.0}, set())), [0, 2])
+        self.assertEqual(self._algorithm._best_deployment_metrics, {"cost": 4.0})
+
     def test_is_improvement(self):
         # Arrange
         self._algorithm._ranker = MagicMock()
@@ -188,44 +478,37 @@ class TestStochasticHeuristicDeploymentAlgorithm(unittest.TestCase):
 
     def test_generate_all_possible_coarse_deployments(self):
         # Arrange
-        self._algorithm._region_indexer.get_value_indices.return_value = {1: 1, 2: 2}
-        self._algorithm._generate_and_check_deployment = MagicMock()
-        self._algorithm._generate_and_check_deployment.side_effect = [
-            ([1, 1, 1], {"metric1": 1.0, "metric2": 2.0}),
-            None,
-        ]
-
-        # Act
-        result = self._algorithm._generate_all_possible_coarse_deployments()
-
-        # Assert
-        expected_result = [([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})]
-        self.assertEqual(result, expected_result)
-
-    def test_generate_and_check_deployment(self):
-        # Arrange
+        self._algorithm._region_indexer.get_value_indices.return_value = {0: 0, 1: 1, 2: 2}
         self._algorithm._number_of_instances = 3
-        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1, 2], [0, 1, 2]]
-        self._algorithm._generate_deployment = MagicMock()
-        self._algorithm._generate_deployment.return_value = [1, 1, 1]
+        self._algorithm._per_instance_permitted_regions = [[0, 1, 2], [0, 1], [0, 1, 2]]
+        self._algorithm._home_deployment = [0, 0, 0]
+        self._algorithm._home_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
+        self._algorithm._best_deployment_metrics = {"metric1": 1.0, "metric2": 2.0}
         self._algorithm._deployment_metrics_calculator = MagicMock()
-        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics.return_value = {
-            "metric1": 1.0,
-            "metric2": 2.0,
-        }
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.return_value = [
+            {"metric1": 0.5, "metric2": 1.5}
+        ]
         self._algorithm._is_hard_constraint_failed = MagicMock()
         self._algorithm._is_hard_constraint_failed.return_value = False
         self._algorithm._ranker = MagicMock()
         self._algorithm._ranker.number_one_priority = "metric1"
-        self._algorithm._best_deployment_metrics = {"metric1": 0.5, "metric2": 1.5}
-        self._algorithm._home_deployment = None
+        self._algorithm._bias_regions = set()
 
         # Act
-        result = self._algorithm._generate_and_check_deployment(1)
+        result = self._algorithm._generate_all_possible_coarse_deployments()
 
         # Assert
-        expected_result = ([1, 1, 1], {"metric1": 1.0, "metric2": 2.0})
+        expected_result = [
+            ([0, 0, 0], {"metric1": 1.0, "metric2": 2.0}),
+            ([1, 1, 1], {"metric1": 0.5, "metric2": 1.5}),
+        ]
         self.assertEqual(result, expected_result)
+        self._algorithm._deployment_metrics_calculator.calculate_deployment_metrics_batch.assert_called_once_with(
+            [[1, 1, 1]]
+        )
+        # The best deployment and the bias regions are updated
+        self.assertEqual(self._algorithm._best_deployment_metrics, {"metric1": 0.5, "metric2": 1.5})
+        self.assertEqual(self._algorithm._bias_regions, {1})
 
     def test_generate_deployment(self):
         # Arrange
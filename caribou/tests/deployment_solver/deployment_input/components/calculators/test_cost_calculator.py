@@ -221,6 +221,11 @@ class TestCostCalculator(unittest.TestCase):
         self.assertIn(cache_key, self.cost_calculator._execution_conversion_ratio_cache)
         self.assertEqual(self.cost_calculator._execution_conversion_ratio_cache[cache_key], expected_ratio)
 
+        # A second lookup is answered by the cache
+        self.cost_calculator._get_execution_conversion_ratio(instance_name, region_name)
+        self.assertEqual(self.cost_calculator.get_cache_statistics(), {"cache_hits": 1, "cache_misses": 1})
+        self.workflow_loader.get_memory.assert_called_once()
+
     def test_calculate_dynamodb_cost_zero_capacities(self):
         # Define the test data with zero capacities
         current_region_name = "aws:us-east-1"
@@ -1,9 +1,14 @@
 import unittest
 from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from caribou.common.constants import SOLVER_HOME_REGION_TRANSMISSION_LATENCY_DEFAULT
 from caribou.deployment_solver.deployment_input.components.calculator import InputCalculator
 from caribou.deployment_solver.deployment_input.components.loaders.performance_loader import PerformanceLoader
 from caribou.deployment_solver.deployment_input.components.loaders.workflow_loader import WorkflowLoader
 from caribou.deployment_solver.models.indexer import Indexer
+from caribou.deployment_solver.models.random_stream import RandomStream
 from caribou.deployment_solver.deployment_input.components.calculators.runtime_calculator import RuntimeCalculator
 
 
@@ -29,7 +34,7 @@ class TestRuntimeCalculator(unittest.TestCase):
         self.assertEqual(self.runtime_calculator._transmission_latency_distribution_cache, {})
         self.assertEqual(self.runtime_calculator._transmission_size_distribution_cache, {})
 
-    @patch("random.random", return_value=0.0)
+    @patch.object(RandomStream, "random", return_value=0.0)
     def test_calculate_transmission_size_and_latency(self, mock_random):
         # Mock the distribution methods
         self.workflow_loader.get_data_transfer_size_distribution.return_value = [0.1, 0.2, 0.3]
@@ -49,7 +54,7 @@ class TestRuntimeCalculator(unittest.TestCase):
         self.assertEqual(transmission_size, 0.1)
         self.assertEqual(transmission_latency, 0.4)
 
-    @patch("random.random", return_value=0.0)
+    @patch.object(RandomStream, "random", return_value=0.0)
     def test_calculate_simulated_transmission_size_and_latency(self, mock_random):
         # Mock the distribution methods
         self.workflow_loader.get_non_execution_sns_transfer_size.return_value = 0.1
@@ -72,7 +77,7 @@ class TestRuntimeCalculator(unittest.TestCase):
         self.assertEqual(transmission_size, 0.1)
         self.assertEqual(transmission_latency, 0.2)
 
-    @patch("random.random", return_value=0.0)
+    @patch.object(RandomStream, "random", return_value=0.0)
     def test_calculate_node_runtimes_and_data_transfer(self, mock_random):
         # Setup mock data
         self.workflow_loader.get_runtime_distribution.return_value = [5.0, 5.1, 5.2]
@@ -147,7 +152,7 @@ class TestRuntimeCalculator(unittest.TestCase):
         self.assertEqual(latency_distribution, [0.1, 0.2, 0.3])
         self.workflow_loader.get_latency_distribution.assert_not_called()
 
-    @patch("random.random", return_value=0.0)
+    @patch.object(RandomStream, "random", return_value=0.0)
     def test_handle_missing_transmission_latency_distribution(self, mock_random):
         # Mock the loader methods
         self.performance_loader.get_transmission_latency_distribution.return_value = [0.2, 0.3, 0.4]
@@ -167,6 +172,44 @@ class TestRuntimeCalculator(unittest.TestCase):
         # Verify results
         self.assertEqual(missing_distribution, [0.5, 0.6, 0.7])
 
+    def test_setup_fallback_latencies(self):
+        cloud_ping_latencies = {
+            ("region1", "region1"): [0.1, 0.3],
+            ("region1", "region2"): [0.5, 0.7],
+            ("region2", "region1"): [0.4],
+            ("region2", "region2"): [0.05],
+        }
+        self.performance_loader.get_transmission_latency_distribution.side_effect = (
+            lambda from_region, to_region: cloud_ping_latencies[(from_region, to_region)]
+        )
+        self.workflow_loader.get_home_region.return_value = "region1"
+
+        self.runtime_calculator.setup_fallback_latencies(["region1", "region2"])
+
+        np.testing.assert_allclose(self.runtime_calculator._fallback_latency_differences, [[0.0, 0.4], [0.2, 0.0]])
+        self.assertAlmostEqual(self.runtime_calculator._get_fallback_latency_difference("region1", "region2"), 0.4)
+
+    def test_handle_missing_transmission_latency_distribution_precomputed(self):
+        self.runtime_calculator._fallback_region_indices = {"region1": 0, "region2": 1}
+        self.runtime_calculator._fallback_latency_differences = np.array([[0.0, 0.5], [0.5, 0.0]])
+        self.workflow_loader.get_home_region.return_value = "region1"
+        self.workflow_loader.get_latency_distribution.return_value = []
+
+        for data_transfer_size in (1.0, 1.0, 2.0):
+            missing_distribution = self.runtime_calculator._handle_missing_transmission_latency_distribution(
+                self.from_instance_name,
+                self.from_region_name,
+                self.to_instance_name,
+                self.to_region_name,
+                data_transfer_size,
+                is_sync_predecessor=True,
+            )
+            self.assertEqual(missing_distribution, [SOLVER_HOME_REGION_TRANSMISSION_LATENCY_DEFAULT + 2.5])
+
+        # The cloud ping latencies are precomputed and the home region measurements are cached per size
+        self.performance_loader.get_transmission_latency_distribution.assert_not_called()
+        self.assertEqual(self.workflow_loader.get_latency_distribution.call_count, 2)
+
     def test_handle_missing_start_hop_latency_distribution(self):
         # Mock the loader methods
         self.workflow_loader.get_home_region.return_value = self.from_region_name
@@ -231,7 +274,7 @@ class TestRuntimeCalculator(unittest.TestCase):
         self.assertEqual(transmission_size, 0.1)
         self.assertEqual(transmission_latency, 0.25)
 
-    @patch("random.random", return_value=0.0)
+    @patch.object(RandomStream, "random", return_value=0.0)
     def test_calculate_node_runtimes_and_data_transfer_empty_runtime_distribution(self, mock_random):
         # Setup mocks
         self.workflow_loader.get_home_region.return_value = "home_region"
@@ -19,10 +19,14 @@ class TestInputLoader(unittest.TestCase):
         result = self.loader._retrieve_data("table", "key")
         self.assertEqual(result, {"key": "value"})
 
-    @patch.object(InputLoader, "_retrieve_data", return_value={"key": "value"})
-    def test_retrieve_region_data(self, mock_retrieve_data):
-        result = self.loader._retrieve_region_data({"provider1:region1", "provider1:region2"})
-        self.assertEqual(result, {"provider1:region1": {"key": "value"}, "provider1:region2": {"key": "value"}})
+    def test_retrieve_region_data(self):
+        self.client.get_values_from_table.return_value = {"provider1:region1": '{"key": "value"}'}
+        result = self.loader._retrieve_region_data({"provider1:region2", "provider1:region1"})
+        self.assertEqual(result, {"provider1:region1": {"key": "value"}, "provider1:region2": {}})
+        self.client.get_values_from_table.assert_called_once_with(
+            "primary_table", ["provider1:region1", "provider1:region2"]
+        )
+        self.client.get_value_from_table.assert_not_called()
 
     def test_str(self):
         self.assertEqual(str(self.loader), "InputLoader(name=InputLoader)")
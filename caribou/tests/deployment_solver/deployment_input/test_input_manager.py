@@ -61,6 +61,7 @@ class TestInputManager(unittest.TestCase):
         self.input_manager._datacenter_loader.setup = MagicMock()
         self.input_manager._performance_loader.setup = MagicMock()
         self.input_manager._carbon_loader.setup = MagicMock()
+        self.input_manager._runtime_calculator.setup_fallback_latencies = MagicMock()
 
         region_indexer = MagicMock(spec=RegionIndexer)
         region_indexer.get_value_indices = MagicMock(return_value={"provider1:region1": 0, "provider1:region2": 1})
@@ -72,6 +73,9 @@ class TestInputManager(unittest.TestCase):
         self.input_manager._datacenter_loader.setup.assert_called_once()
         self.input_manager._performance_loader.setup.assert_called_once()
         self.input_manager._carbon_loader.setup.assert_called_once()
+        self.input_manager._runtime_calculator.setup_fallback_latencies.assert_called_once_with(
+            ["provider1:region1", "provider1:region2"]
+        )
 
     def test_invalid_workflow_id_in_setup(self):
         self.input_manager._workflow_config.workflow_id = None
@@ -99,15 +103,27 @@ class TestInputManager(unittest.TestCase):
         self.assertEqual(self.input_manager._execution_latency_distribution_cache, {})
         self.assertEqual(self.input_manager._invocation_probability_cache, {})
 
-    def test_get_transmission_info(self):
-        self.input_manager._runtime_calculator = MagicMock()
-        self.input_manager._instance_indexer = MagicMock()
-        self.input_manager._region_indexer = MagicMock()
+    def _setup_index_tables(self):
+        self.input_manager._instance_indexer = InstanceIndexer([{"instance_name": "node1"}, {"instance_name": "node2"}])
+        self.input_manager._region_indexer = RegionIndexer(["region0", "region1", "region2", "region3"])
+        self.input_manager._build_index_tables()
 
-        self.input_manager._instance_indexer.index_to_value.side_effect = ["node1", "node2"]
-        self.input_manager._region_indexer.index_to_value.side_effect = ["region1", "region2"]
+    def test_build_index_tables(self):
+        self._setup_index_tables()
 
-        self.input_manager._runtime_calculator.calculate_transmission_size_and_latency.return_value = (10.0, 1.0)
+        self.assertEqual(self.input_manager._instance_names[0], "node1")
+        self.assertIsNone(self.input_manager._instance_names[-1])
+        self.assertEqual(self.input_manager._region_names[3], "region3")
+        self.assertEqual(self.input_manager._region_names[-2], "aws:us-west-2")
+        self.assertIsNone(self.input_manager._region_names[-1])
+
+    def test_get_transmission_info(self):
+        self._setup_index_tables()
+        self.input_manager._runtime_calculator = MagicMock()
+        self.input_manager._runtime_calculator.get_transmission_size_and_latency_distributions.return_value = (
+            [10.0],
+            [[1.0]],
+        )
 
         result = self.input_manager.get_transmission_info(
             from_instance_index=0,
@@ -123,16 +139,56 @@ class TestInputManager(unittest.TestCase):
         self.assertEqual(result["cumulative_runtime"], 6.0)
         self.assertEqual(result["sns_data_transfer_size"], 10.0)
         self.assertIsNone(result["sync_info"])
+        self.input_manager._runtime_calculator.get_transmission_size_and_latency_distributions.assert_called_once_with(
+            "node1", "region0", "node2", "region1", False, True
+        )
+
+    def test_get_transmission_info_uses_distribution_table(self):
+        self._setup_index_tables()
+        self.input_manager._runtime_calculator = MagicMock()
+        self.input_manager._runtime_calculator.get_transmission_size_and_latency_distributions.return_value = (
+            [1.0, 2.0, 3.0],
+            [[0.1, 0.1], [0.2, 0.3], [0.4, 0.5]],
+        )
+
+        with patch.object(self.input_manager._random_stream, "random", side_effect=[0.5, 0.9, 0.0, 0.0]):
+            first_result = self.input_manager.get_transmission_info(-1, -1, 0, 2, 0.0, False, True)
+            second_result = self.input_manager.get_transmission_info(-1, -1, 0, 2, 1.0, False, True)
+
+        # The distributions are retrieved once, and the start hop has no instance nor region
+        self.input_manager._runtime_calculator.get_transmission_size_and_latency_distributions.assert_called_once_with(
+            None, None, "node1", "region2", False, True
+        )
+        self.assertEqual(first_result["sns_data_transfer_size"], 2.0)
+        self.assertEqual(first_result["cumulative_runtime"], 0.2)
+        self.assertEqual(second_result["sns_data_transfer_size"], 1.0)
+        self.assertEqual(second_result["cumulative_runtime"], 1.1)
+
+    def test_get_node_runtimes_and_data_transfer(self):
+        self._setup_index_tables()
+        self.input_manager._runtime_calculator = MagicMock()
+        self.input_manager._runtime_calculator.get_node_runtime_distribution.return_value = {
+            "runtimes": [1.0, 2.0, 3.0],
+            "auxiliary_data": [[[0.5, 0.01]], [[1.5, 0.02], [1.0, 0.03], [2.0, 0.04]], [[3.0, 0.05]]],
+            "relative_performance": 2.0,
+            "successor_auxiliary_indices": {1: 0},
+            "data_transfer_during_execution_auxiliary_index": 1,
+        }
+
+        with patch.object(self.input_manager._random_stream, "random", side_effect=[0.5, 0.5, 0.0, 0.0]):
+            first_result = self.input_manager.get_node_runtimes_and_data_transfer(0, 1, 1.0, False)
+            second_result = self.input_manager.get_node_runtimes_and_data_transfer(0, 1, 0.0, False)
+
+        self.input_manager._runtime_calculator.get_node_runtime_distribution.assert_called_once_with(
+            "node1", "region1", self.input_manager._instance_indexer, False
+        )
+        self.assertEqual(first_result, ({"current": 5.0, "successors": {1: 3.0}}, 4.0, 0.03))
+        self.assertEqual(second_result, ({"current": 2.0, "successors": {1: 1.0}}, 2.0, 0.01))
 
     def test_calculate_cost_and_carbon_of_instance(self):
+        self._setup_index_tables()
         self.input_manager._cost_calculator = MagicMock()
         self.input_manager._carbon_calculator = MagicMock()
-        self.input_manager._instance_indexer = MagicMock()
-        self.input_manager._region_indexer = MagicMock()
-
-        # Assume there are multiple regions to convert
-        self.input_manager._instance_indexer.index_to_value.side_effect = ["node1"]
-        self.input_manager._region_indexer.index_to_value.side_effect = lambda idx: f"region{idx}"
 
         self.input_manager._cost_calculator.calculate_instance_cost.return_value = 100.0
         self.input_manager._carbon_calculator.calculate_instance_carbon.return_value = (10.0, 20.0)
@@ -141,8 +197,8 @@ class TestInputManager(unittest.TestCase):
             execution_time=10.0,
             instance_index=0,
             region_index=0,
-            data_input_sizes={1: 10.0},
-            data_output_sizes={2: 20.0},
+            data_input_sizes={1: 10.0, -1: 1.0},
+            data_output_sizes={2: 20.0, -2: 2.0},
             sns_data_call_and_output_sizes={3: [5.0]},
             data_transfer_during_execution=15.0,
             dynamodb_read_capacity=5.0,
@@ -154,6 +210,26 @@ class TestInputManager(unittest.TestCase):
         self.assertEqual(result["cost"], 100.0)
         self.assertEqual(result["execution_carbon"], 10.0)
         self.assertEqual(result["transmission_carbon"], 20.0)
+        self.input_manager._carbon_calculator.calculate_instance_carbon.assert_called_once_with(
+            10.0,
+            "node1",
+            "region0",
+            {"region1": 10.0, None: 1.0},
+            {"region2": 20.0, "aws:us-west-2": 2.0},
+            15.0,
+            True,
+            False,
+        )
+        self.input_manager._cost_calculator.calculate_instance_cost.assert_called_once_with(
+            10.0,
+            "node1",
+            "region0",
+            {"region2": 20.0, "aws:us-west-2": 2.0},
+            {"region3": [5.0]},
+            5.0,
+            10.0,
+            True,
+        )
 
     def test_missing_home_region_in_setup(self):
         region_indexer = MagicMock(spec=RegionIndexer)
@@ -0,0 +1,90 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from caribou.deployment_solver.deployment_input.solver_input_snapshot import (
+    SNAPSHOT_HEADER_FORMAT,
+    SolverInputSnapshot,
+)
+
+
+class TestSolverInputSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "solver_inputs.snapshot")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_and_read(self):
+        # Arrange
+        sections = {
+            "workflow_loader": {"workflow_data": {"instance_summary": {"i1": {"invocations": 2}}}},
+            "consider_cfe": False,
+            "energy_factor": 0.005,
+            "latencies": np.arange(12, dtype=np.float64).reshape(3, 4),
+        }
+
+        # Act
+        SolverInputSnapshot.write(self.path, sections)
+        snapshot = SolverInputSnapshot(self.path)
+
+        # Assert
+        self.assertEqual(snapshot.get_section_names(), list(sections.keys()))
+        self.assertEqual(snapshot.get_section("workflow_loader"), sections["workflow_loader"])
+        self.assertFalse(snapshot.get_section("consider_cfe"))
+        self.assertEqual(snapshot.get_section("energy_factor"), 0.005)
+        np.testing.assert_array_equal(snapshot.get_section("latencies"), sections["latencies"])
+        self.assertEqual(os.listdir(self.directory), ["solver_inputs.snapshot"])
+
+    def test_array_section_is_a_view(self):
+        # Arrange
+        SolverInputSnapshot.write(self.path, {"empty": {}, "values": np.arange(5, dtype=np.int32)})
+
+        # Act
+        values = SolverInputSnapshot(self.path).get_section("values")
+
+        # Assert
+        self.assertFalse(values.flags.owndata)
+        self.assertFalse(values.flags.writeable)
+        self.assertEqual(values.dtype, np.int32)
+        self.assertEqual(values.ctypes.data % 64, 0)
+
+    def test_write_array_of_objects(self):
+        with self.assertRaises(ValueError):
+            SolverInputSnapshot.write(self.path, {"values": np.array([{}, []], dtype=object)})
+
+    def test_read_invalid_file(self):
+        # Arrange
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(struct.pack(SNAPSHOT_HEADER_FORMAT, b"NOTSNAP\x00", 1, 0))
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            SolverInputSnapshot(self.path)
+
+    def test_read_unsupported_version(self):
+        # Arrange
+        SolverInputSnapshot.write(self.path, {"consider_cfe": True})
+
+        # Act & Assert
+        with patch(SolverInputSnapshot.__module__ + ".SOLVER_INPUT_SNAPSHOT_VERSION", 2):
+            with self.assertRaises(ValueError):
+                SolverInputSnapshot(self.path)
+
+    def test_get_missing_section(self):
+        # Arrange
+        SolverInputSnapshot.write(self.path, {"consider_cfe": True})
+
+        # Act & Assert
+        with self.assertRaises(KeyError):
+            SolverInputSnapshot(self.path).get_section("carbon_loader")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+import scipy.stats as st
+
+from caribou.deployment_solver.deployment_metrics_calculator.models.streaming_statistics import (
+    StreamingQuantileSketch,
+    StreamingStatistics,
+)
+
+
+class TestStreamingQuantileSketch(unittest.TestCase):
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            StreamingQuantileSketch(1)
+
+    def test_empty_sketch(self):
+        with self.assertRaises(ValueError):
+            StreamingQuantileSketch(10).percentile(95)
+
+    def test_exact_below_capacity(self):
+        samples = np.random.default_rng(0).exponential(size=500)
+        sketch = StreamingQuantileSketch(1024)
+
+        for batch in np.split(samples, 5):
+            sketch.update(batch)
+
+        self.assertEqual(len(sketch), 500)
+        self.assertEqual(sketch.percentile(95), float(np.percentile(samples, 95)))
+
+    def test_bounded_memory_above_capacity(self):
+        samples = np.random.default_rng(0).normal(size=20000)
+        sketch = StreamingQuantileSketch(256)
+
+        for batch in np.split(samples, 100):
+            sketch.update(batch)
+
+        self.assertLess(len(sketch), 256 * 8)
+        self.assertAlmostEqual(sketch.percentile(95), float(np.percentile(samples, 95)), delta=0.1)
+        self.assertAlmostEqual(sketch.percentile(50), float(np.percentile(samples, 50)), delta=0.1)
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    def test_matches_batch_statistics(self):
+        samples = np.random.default_rng(0).lognormal(size=2000)
+        statistics = StreamingStatistics(1024)
+
+        for batch in np.split(samples, 10):
+            statistics.update(batch)
+
+        self.assertEqual(statistics.count, 2000)
+        self.assertAlmostEqual(statistics.mean, float(np.mean(samples)))
+        self.assertAlmostEqual(statistics.variance, float(np.var(samples, ddof=1)))
+
+        ci_low, ci_up = st.t.interval(0.95, len(samples) - 1, loc=np.mean(samples), scale=st.sem(samples))
+        self.assertAlmostEqual(statistics.relative_confidence_interval_width(0.05), (ci_up - ci_low) / np.mean(samples))
+
+    def test_empty_batch(self):
+        statistics = StreamingStatistics(10)
+
+        statistics.update([])
+        statistics.update([2.0])
+
+        self.assertEqual(statistics.count, 1)
+        self.assertEqual(statistics.mean, 2.0)
+        self.assertEqual(statistics.variance, 0.0)
+        self.assertEqual(statistics.percentile(95), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,14 @@ from caribou.deployment_solver.deployment_input.input_manager import InputManage
 from caribou.deployment_solver.deployment_metrics_calculator.models.instance_edge import InstanceEdge
 from caribou.deployment_solver.deployment_metrics_calculator.models.instance_node import InstanceNode
 from caribou.deployment_solver.deployment_metrics_calculator.models.simulated_instance_edge import SimulatedInstanceEdge
+from caribou.deployment_solver.models.random_stream import RandomStream
 
 
 class TestWorkflowInstance(unittest.TestCase):
     def setUp(self):
         self.input_manager = MagicMock(spec=InputManager)
         self.input_manager.get_start_hop_retrieve_wpd_probability.return_value = 0.0
+        self.input_manager.get_random_stream.return_value = RandomStream(0)
         self.instance_deployment_regions = [0, 1, 2]
         self.start_hop_instance_index = 0
         self.consider_from_client_latency = True
@@ -94,7 +96,7 @@ class TestWorkflowInstance(unittest.TestCase):
         self.assertIsInstance(edges, list)
 
     def test_retrieved_wpd_at_function(self):
-        with patch("random.random", return_value=0.1):
+        with patch.object(RandomStream, "random", return_value=0.1):
             self.input_manager.get_start_hop_retrieve_wpd_probability.return_value = 0.5
             result = self.workflow_instance._retrieved_wpd_at_function()
             self.assertTrue(result)
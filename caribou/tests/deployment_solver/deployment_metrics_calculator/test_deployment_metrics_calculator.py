@@ -6,6 +6,7 @@ from caribou.deployment_solver.deployment_input.input_manager import InputManage
 from caribou.deployment_solver.deployment_metrics_calculator.models.workflow_instance import WorkflowInstance
 from caribou.deployment_solver.models.dag import DAG
 from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.random_stream import RandomStream
 from caribou.deployment_solver.models.region_indexer import RegionIndexer
 from caribou.deployment_solver.workflow_config import WorkflowConfig
 from caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator import (
@@ -36,6 +37,7 @@ class TestDeploymentMetricsCalculator(unittest.TestCase):
 
         self.input_manager = MagicMock(spec=InputManager)
         self.input_manager.get_invocation_probability.return_value = 0.5
+        self.input_manager.get_random_stream.return_value = RandomStream(0)
 
         # Mock the probability of WPD retrieval
         self.input_manager.get_start_hop_retrieve_wpd_probability.return_value = 0.7  # Fixed probability for testing
@@ -113,6 +115,20 @@ class TestDeploymentMetricsCalculator(unittest.TestCase):
         self.input_manager.get_invocation_probability.return_value = 0.0
         self.assertFalse(self.calculator._is_invoked(0, 1))
 
+    def test_set_hard_constraints(self):
+        self.calculator.set_hard_constraints(
+            {
+                "cost": {"type": "absolute", "value": 5.0},
+                "runtime": {"type": "relative", "value": 150.0},
+                "carbon": None,
+            },
+            {"tail_cost": 1.0, "tail_runtime": 2.0, "tail_carbon": 3.0},
+        )
+        self.assertEqual(self.calculator._tail_bounds, {"cost": 5.0, "runtime": 3.0})
+
+        self.calculator.set_hard_constraints(None, None)
+        self.assertEqual(self.calculator._tail_bounds, {})
+
     @patch.object(DeploymentMetricsCalculatorSubclass, "_perform_monte_carlo_simulation")
     def test_calculate_deployment_metrics(self, mock_monte_carlo):
         # Define the mock results
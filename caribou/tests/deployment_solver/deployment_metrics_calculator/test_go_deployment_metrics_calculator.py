@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from caribou.deployment_solver.deployment_metrics_calculator.go_deployment_metrics_calculator import (
+    GO_DEPLOYMENT_METRICS,
+    GoDeploymentMetricsCalculator,
+)
+
+
+def calculate_deployment_metrics_direct(deployments, number_of_deployments, number_of_instances, metrics):
+    # Fake of the Go library: the average cost is the sum of the region indices of the deployment
+    deployments_array = np.ctypeslib.as_array(deployments, shape=(number_of_deployments, number_of_instances))
+    metrics_array = np.ctypeslib.as_array(metrics, shape=(number_of_deployments, len(GO_DEPLOYMENT_METRICS)))
+    metrics_array[:, 0] = deployments_array.sum(axis=1)
+    metrics_array[:, 6] = 1.0
+    return 0
+
+
+class TestGoDeploymentMetricsCalculator(unittest.TestCase):
+    def setUp(self):
+        with patch.object(GoDeploymentMetricsCalculator, "__init__", return_value=None):
+            self.calculator = GoDeploymentMetricsCalculator()  # type: ignore
+        self.calculator._caribougo = MagicMock()
+        self.calculator._caribougo.calculateDeploymentMetricsDirect.side_effect = calculate_deployment_metrics_direct
+        self.calculator._caribougo.setupDirect.return_value = 0
+        self.calculator._caribougo.updateDataForNewHourDirect.return_value = 0
+        self.calculator._use_binary_interface = True
+        self.calculator._record_transmission_execution_carbon = False
+
+    def test_setup_go_binary(self):
+        with patch.object(GoDeploymentMetricsCalculator, "to_dict", return_value={"key": "value"}):
+            self.calculator.setup_go_binary()
+
+        self.calculator._caribougo.setupDirect.assert_called_once_with(b'{"key": "value"}', 16)
+
+    def test_setup_go_binary_failure(self):
+        self.calculator._caribougo.setupDirect.return_value = 1
+
+        with patch.object(GoDeploymentMetricsCalculator, "to_dict", return_value={"key": "value"}):
+            with self.assertRaises(RuntimeError):
+                self.calculator.setup_go_binary()
+
+    def test_calculate_deployment_metrics_binary_failure(self):
+        # E.g., the library was not set up
+        self.calculator._caribougo.calculateDeploymentMetricsDirect.side_effect = None
+        self.calculator._caribougo.calculateDeploymentMetricsDirect.return_value = 1
+
+        with self.assertRaises(RuntimeError):
+            self.calculator.calculate_deployment_metrics([1, 1])
+
+    def test_update_data_for_new_hour_binary_failure(self):
+        self.calculator._caribougo.updateDataForNewHourDirect.return_value = 1
+
+        with self.assertRaises(RuntimeError):
+            self.calculator.update_data_for_new_hour("3")
+
+    def test_calculate_deployment_metrics_batch_binary(self):
+        results = self.calculator.calculate_deployment_metrics_batch([[0, 1, 2], [2, 2, 2]])
+
+        self.assertEqual([result["average_cost"] for result in results], [3.0, 6.0])
+        self.assertEqual(set(results[0].keys()), set(GO_DEPLOYMENT_METRICS[:6]))
+        self.calculator._caribougo.goRead.assert_not_called()
+
+    def test_calculate_deployment_metrics_binary_record_carbon(self):
+        self.calculator._record_transmission_execution_carbon = True
+
+        result = self.calculator.calculate_deployment_metrics([1, 1])
+
+        self.assertEqual(result["average_cost"], 2.0)
+        self.assertEqual(result["average_execution_carbon"], 1.0)
+        self.assertEqual(result["average_transmission_carbon"], 0.0)
+
+    def test_update_data_for_new_hour_binary(self):
+        self.calculator.update_data_for_new_hour("3")
+        self.calculator.update_data_for_new_hour(None)
+
+        self.assertEqual(
+            [call.args for call in self.calculator._caribougo.updateDataForNewHourDirect.call_args_list],
+            [(b"3",), (None,)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
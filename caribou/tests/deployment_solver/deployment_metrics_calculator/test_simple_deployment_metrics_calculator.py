@@ -1,58 +1,66 @@
+import multiprocessing
+import os
 import unittest
-from multiprocessing import Queue, Process, Manager
+from multiprocessing import Pipe, Process, shared_memory
+from multiprocessing.connection import Connection
 from unittest.mock import MagicMock, patch, Mock
 
+import numpy as np
+
 from caribou.deployment_solver.deployment_input.input_manager import InputManager
 from caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator import (
     DeploymentMetricsCalculator,
 )
 from caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator import (
+    SAMPLE_METRICS,
     SimpleDeploymentMetricsCalculator,
+    _MappedFileBuffer,
+    _open_samples_buffer,
     _simulation_worker,
 )
+from caribou.deployment_solver.models.random_stream import RandomStream
 
 
 def mock_simulation_worker(
-    n_iterations: int,
-    input_queue: Queue,
-    output_queue: Queue,
+    worker_index: int,
+    samples_buffer_name: str,
+    samples_buffer_mapped_file: bool,
+    samples_shape: tuple[int, int, int],
+    connection: Connection,
 ):
+    samples_buffer = _open_samples_buffer(samples_buffer_name, samples_buffer_mapped_file)
+    samples = np.ndarray(samples_shape, dtype=np.float64, buffer=samples_buffer.buf)
     while True:
-        received_input = input_queue.get()
-        if isinstance(received_input, str) or received_input is None:
-            output_queue.put("OK")
+        received_input = connection.recv()
+        if received_input == "exit":
+            break
+        if isinstance(received_input, tuple):
+            connection.send([{"worker": worker_index, "deployment": deployment} for deployment in received_input])
             continue
-        costs_distribution_list: list[float] = []
-        runtimes_distribution_list: list[float] = []
-        carbons_distribution_list: list[float] = []
-        for _ in range(n_iterations):
-            results = {"cost": 1.0, "runtime": 1.0, "carbon": 1.0}
-            costs_distribution_list.append(results["cost"])
-            runtimes_distribution_list.append(results["runtime"])
-            carbons_distribution_list.append(results["carbon"])
-        output_queue.put(
-            (
-                costs_distribution_list,
-                runtimes_distribution_list,
-                carbons_distribution_list,
-            )
-        )
+        if not (isinstance(received_input, str) or received_input is None):
+            samples[worker_index] = 1.0
+        connection.send("OK")
+    del samples
+    samples_buffer.close()
 
 
 def mock_init_workers(*args, **kwargs):
-    n_processes = args[5]
-    n_iterations = args[6]
-    input_queue = args[7]
-    output_queue = args[8]
+    samples_buffer_name = args[7]
+    samples_buffer_mapped_file = args[8]
+    samples_shape = args[9]
+    connections = args[10]
     pool = []
-    for _ in range(n_processes):
+    for worker_index, connection in enumerate(connections):
         p = Process(
             target=mock_simulation_worker,
             args=(
-                n_iterations,
-                input_queue,
-                output_queue,
+                worker_index,
+                samples_buffer_name,
+                samples_buffer_mapped_file,
+                samples_shape,
+                connection,
             ),
+            daemon=True,
         )
         p.start()
         pool.append(p)
@@ -87,6 +95,66 @@ class TestSimpleDeploymentMetricsCalculator(unittest.TestCase):
         self.assertEqual(mock_calculate_workflow.call_count, 2000)
         mock_calculate_workflow.assert_called_with(deployment)
 
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "calculate_workflow",
+        side_effect=lambda deployment: {"cost": 2.0, "runtime": 1.0, "carbon": 1.0},
+    )
+    def test_perform_monte_carlo_simulation_exceeds_tail_bound(self, mock_calculate_workflow):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=1
+        )
+        self.calculator.set_tail_bounds({"cost": 1.5, "runtime": 1.5})
+
+        results = self.calculator._perform_monte_carlo_simulation([0, 1])
+
+        # Every sample exceeds the cost bound, so the simulation stops after the first batch
+        self.assertEqual(mock_calculate_workflow.call_count, self.calculator.batch_size)
+        self.assertEqual(results["tail_cost"], 2.0)
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "calculate_workflow",
+        return_value={"cost": 1.0, "runtime": 1.0, "carbon": 1.0},
+    )
+    def test_perform_monte_carlo_simulation_within_tail_bound(self, mock_calculate_workflow):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=1
+        )
+        self.calculator.set_tail_bounds({"cost": 1.5})
+
+        self.calculator._perform_monte_carlo_simulation([0, 1])
+
+        self.assertEqual(mock_calculate_workflow.call_count, 2000)
+
+    def test_is_tail_bound_exceeded(self):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=1
+        )
+
+        # 5% of the samples may exceed the bound of the 95th percentile
+        self.assertFalse(self.calculator._is_tail_bound_exceeded({"cost": 10}, 200, 2000))
+        # Not significant enough to stop this early
+        self.assertFalse(self.calculator._is_tail_bound_exceeded({"cost": 16}, 200, 2000))
+        self.assertTrue(self.calculator._is_tail_bound_exceeded({"cost": 10, "runtime": 40}, 200, 2000))
+        self.assertFalse(self.calculator._is_tail_bound_exceeded({}, 200, 2000))
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    def test_set_tail_bounds_parallel(self, mock_init_workers):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=2
+        )
+        self.calculator._broadcast = MagicMock()
+
+        self.calculator.set_tail_bounds({"cost": 1.0})
+
+        self.assertEqual(self.calculator._tail_bounds, {"cost": 1.0})
+        self.calculator._broadcast.assert_called_once_with({"cost": 1.0})
+
     @patch.object(
         SimpleDeploymentMetricsCalculator,
         "_init_workers",
@@ -110,6 +178,173 @@ class TestSimpleDeploymentMetricsCalculator(unittest.TestCase):
         self.assertEqual(results["tail_runtime"], 1.0)
         self.assertEqual(results["tail_carbon"], 1.0)
 
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    def test_perform_monte_carlo_simulation_parallel_record_carbon(self, mock_init_workers):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=3, record_transmission_execution_carbon=True
+        )
+
+        results = self.calculator._perform_monte_carlo_simulation([0, 1, 2, 3])
+
+        self.assertEqual(results["average_execution_carbon"], 1.0)
+        self.assertEqual(results["average_transmission_carbon"], 1.0)
+        # Each worker fills its share of the batch in the shared samples buffer
+        self.assertEqual(self.calculator._samples.shape, (3, len(SAMPLE_METRICS), 66))
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    def test_calculate_deployment_metrics_batch_parallel(self, mock_init_workers):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=2
+        )
+        deployments = [[0, 0], [0, 1], [1, 0]]
+
+        results = self.calculator.calculate_deployment_metrics_batch(deployments)
+
+        # Whole deployments are spread over the workers, the order is preserved
+        self.assertEqual(
+            results,
+            [
+                {"worker": 0, "deployment": [0, 0]},
+                {"worker": 1, "deployment": [0, 1]},
+                {"worker": 0, "deployment": [1, 0]},
+            ],
+        )
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    def test_calculate_deployment_metrics_batch_smaller_than_pool(self, mock_init_workers):
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=4
+        )
+        self.calculator._perform_monte_carlo_simulation = MagicMock(return_value={"average_cost": 1.0})
+
+        results = self.calculator.calculate_deployment_metrics_batch([[0, 0], [0, 1]])
+
+        self.assertEqual(results, [{"average_cost": 1.0}, {"average_cost": 1.0}])
+        self.assertEqual(self.calculator._perform_monte_carlo_simulation.call_count, 2)
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    @patch(
+        "caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator.shared_memory.SharedMemory",
+        side_effect=FileNotFoundError,
+    )
+    def test_perform_monte_carlo_simulation_parallel_without_shared_memory(self, mock_shared_memory, mock_init_workers):
+        # Without /dev/shm (e.g. on AWS Lambda) the samples are shared through a memory mapped file
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=2
+        )
+        self.assertIsInstance(self.calculator._samples_buffer, _MappedFileBuffer)
+        samples_buffer_path = self.calculator._samples_buffer.name
+
+        results = self.calculator._perform_monte_carlo_simulation([0, 1, 2, 3])
+
+        self.assertEqual(results["average_cost"], 1.0)
+        self.assertEqual(results["tail_runtime"], 1.0)
+        del self.calculator
+        self.assertFalse(os.path.exists(samples_buffer_path))
+
+    @patch.object(
+        SimpleDeploymentMetricsCalculator,
+        "_init_workers",
+        side_effect=mock_init_workers,
+    )
+    @patch(
+        "caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator._get_worker_context",
+        return_value=multiprocessing.get_context("spawn"),
+    )
+    def test_setup_parallel_without_fork(self, mock_get_worker_context, mock_init_workers):
+        input_manager = MagicMock()
+
+        self.calculator = SimpleDeploymentMetricsCalculator(
+            MagicMock(), input_manager, MagicMock(), MagicMock(), n_processes=2
+        )
+
+        # The workers are passed the snapshot of this pool, the input manager itself is left untouched
+        snapshot_path = mock_init_workers.call_args.args[2]
+        input_manager.save_snapshot.assert_called_once_with(snapshot_path)
+        self.assertEqual(os.path.dirname(snapshot_path), self.calculator._snapshot_directory)
+        del self.calculator
+        self.assertFalse(os.path.exists(os.path.dirname(snapshot_path)))
+
+    @patch(
+        "caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator.InputManager",
+    )
+    @patch(
+        "caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator.SimpleDeploymentMetricsCalculator",
+    )
+    def test_simulation_worker_from_snapshot(self, mock_calculator, mock_input_manager):
+        workflow_config = MagicMock()
+        samples_shape = (1, len(SAMPLE_METRICS), 1)
+        samples_buffer = shared_memory.SharedMemory(create=True, size=int(np.prod(samples_shape)) * 8)
+        parent_connection, worker_connection = Pipe()
+        parent_connection.send("exit")
+
+        _simulation_worker(
+            input_manager=None,
+            snapshot_path="solver_inputs.snapshot",
+            random_seed=7,
+            workflow_config=workflow_config,
+            region_indexer=MagicMock(),
+            instance_indexer=MagicMock(),
+            tail_latency_threshold=0,
+            record_transmission_execution_carbon=False,
+            worker_index=0,
+            n_iterations=1,
+            samples_buffer_name=samples_buffer.name,
+            samples_buffer_mapped_file=False,
+            samples_shape=samples_shape,
+            connection=worker_connection,
+        )
+
+        mock_input_manager.assert_called_once_with(
+            workflow_config, random_seed=7, snapshot_path="solver_inputs.snapshot"
+        )
+        self.assertIs(mock_calculator.call_args.args[1], mock_input_manager.return_value)
+        samples_buffer.close()
+        samples_buffer.unlink()
+
+    def test_calculate_deployment_metrics_independent_of_batch(self):
+        random_stream = RandomStream(seed=7)
+        input_manager = MagicMock()
+        input_manager.get_random_stream.return_value = random_stream
+        input_manager.reset_random_stream.side_effect = random_stream.reset
+
+        def calculate_workflow(deployment):
+            return {
+                "cost": random_stream.random() * (1 + sum(deployment)),
+                "runtime": random_stream.random() + sum(deployment),
+                "carbon": random_stream.generator.random(),
+            }
+
+        with patch.object(SimpleDeploymentMetricsCalculator, "calculate_workflow", side_effect=calculate_workflow):
+            self.calculator = SimpleDeploymentMetricsCalculator(
+                MagicMock(), input_manager, MagicMock(), MagicMock(), n_processes=2
+            )
+            deployments = [[0, 0], [0, 1], [1, 0], [1, 1]]
+
+            # The samples of the workers sharing one deployment...
+            alone = self.calculator.calculate_deployment_metrics_batch([deployments[1]])
+            # ...and of a worker simulating whole deployments of a batch
+            batch = self.calculator.calculate_deployment_metrics_batch(deployments)
+
+        self.assertEqual(alone[0], batch[1])
+        self.assertNotEqual(batch[0], batch[1])
+
     @patch(
         "caribou.deployment_solver.deployment_metrics_calculator.deployment_metrics_calculator.DeploymentMetricsCalculator",
         autospec=True,
@@ -130,32 +365,45 @@ class TestSimpleDeploymentMetricsCalculator(unittest.TestCase):
         mock_input_manager.alter_carbon_setting.return_value = None
         deployment = [0, 1, 2, 3]
         n_iterations = 5
-        manager = Manager()
-        input_q = manager.Queue()
-        input_q.put("0")
-        input_q.put(deployment)
-        input_q.put("exit")
-        output_q = manager.Queue()
+        samples_shape = (2, len(SAMPLE_METRICS), n_iterations)
+        samples_buffer = shared_memory.SharedMemory(create=True, size=int(np.prod(samples_shape)) * 8)
+        samples = np.ndarray(samples_shape, dtype=np.float64, buffer=samples_buffer.buf)
+        samples.fill(-1.0)
+        parent_connection, worker_connection = Pipe()
+        parent_connection.send("0")
+        parent_connection.send({"cost": 1.0})
+        parent_connection.send(deployment)
+        parent_connection.send("exit")
         _simulation_worker(
             input_manager=mock_input_manager,
+            snapshot_path=None,
+            random_seed=0,
             workflow_config=MagicMock(),
             region_indexer=MagicMock(),
             instance_indexer=MagicMock(),
             tail_latency_threshold=0,
+            record_transmission_execution_carbon=False,
+            worker_index=1,
             n_iterations=n_iterations,
-            input_queue=input_q,
-            output_queue=output_q,
+            samples_buffer_name=samples_buffer.name,
+            samples_buffer_mapped_file=False,
+            samples_shape=samples_shape,
+            connection=worker_connection,
         )
         mock_input_manager.alter_carbon_setting.assert_called_once()
         outputs = []
-        while not output_q.empty():
-            outputs.append(output_q.get())
-        self.assertEqual(len(outputs), 2)
-        self.assertEqual(outputs[0], "OK")
-        cost, runtime, carbon = outputs[1]
-        self.assertEqual(cost, [2.0] * n_iterations)
-        self.assertEqual(runtime, [2.0] * n_iterations)
-        self.assertEqual(carbon, [2.0] * n_iterations)
+        while parent_connection.poll():
+            outputs.append(parent_connection.recv())
+        self.assertEqual(outputs, ["OK", "OK", "OK"])
+        self.assertEqual(samples[1, 0].tolist(), [2.0] * n_iterations)
+        self.assertEqual(samples[1, 1].tolist(), [2.0] * n_iterations)
+        self.assertEqual(samples[1, 2].tolist(), [2.0] * n_iterations)
+        # Metrics missing from the results are recorded as 0 and other workers' rows are untouched
+        self.assertEqual(samples[1, 3].tolist(), [0.0] * n_iterations)
+        self.assertEqual(samples[0].flatten().tolist(), [-1.0] * len(SAMPLE_METRICS) * n_iterations)
+        del samples
+        samples_buffer.close()
+        samples_buffer.unlink()
 
     @patch.object(
         SimpleDeploymentMetricsCalculator,
@@ -178,7 +426,7 @@ class TestSimpleDeploymentMetricsCalculator(unittest.TestCase):
             MagicMock(), MagicMock(), MagicMock(), MagicMock(), n_processes=4
         )
         self.calculator.update_data_for_new_hour("0")
-        self.assertTrue(self.calculator._input_queue.empty())
+        self.assertFalse(any(connection.poll() for connection in self.calculator._connections))
 
 
 if __name__ == "__main__":
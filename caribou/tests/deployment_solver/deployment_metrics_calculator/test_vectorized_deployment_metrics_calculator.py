@@ -0,0 +1,365 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from caribou.common.constants import (
+    CARBON_REGION_TABLE,
+    PERFORMANCE_REGION_TABLE,
+    PROVIDER_REGION_TABLE,
+    WORKFLOW_INSTANCE_TABLE,
+)
+from caribou.deployment_solver.deployment_input.components.loaders.workflow_loader import WorkflowLoader
+from caribou.deployment_solver.deployment_input.input_manager import InputManager
+from caribou.deployment_solver.deployment_metrics_calculator.simple_deployment_metrics_calculator import (
+    SimpleDeploymentMetricsCalculator,
+)
+from caribou.deployment_solver.deployment_metrics_calculator.vectorized_deployment_metrics_calculator import (
+    VectorizedDeploymentMetricsCalculator,
+)
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+from caribou.deployment_solver.models.region_indexer import RegionIndexer
+
+REGIONS = ["aws:us-east-1", "aws:us-west-2", "aws:ca-central-1"]
+HOME_REGION = "aws:us-east-1"
+INSTANCE_NAMES = ["wf-0_0_1-a:entry_point:0", "wf-0_0_1-b:a_0_0:1", "wf-0_0_1-c:a_0_1:2", "wf-0_0_1-d:sync:"]
+# Diamond workflow a -> (b, c) -> d where d is a sync node
+EDGES = [(0, 1, 0.8), (0, 2, 0.6), (1, 3, 1.0), (2, 3, 0.9)]
+
+
+def _size_key(size: float) -> str:
+    return str(WorkflowLoader._round_to_kb(None, size, 10))  # type: ignore
+
+
+def _duration_key(duration: float) -> str:
+    return str(WorkflowLoader._round_to_ms(None, duration, 10))  # type: ignore
+
+
+def _build_workflow_data(deterministic: bool) -> dict[str, Any]:
+    rng = random.Random(1)
+
+    def sample(low: float, high: float) -> float:
+        return low if deterministic else rng.uniform(low, high)
+
+    n_values = 1 if deterministic else 4
+    instance_summary: dict[str, Any] = {}
+    for index, instance_name in enumerate(INSTANCE_NAMES):
+        successors = [edge for edge in EDGES if edge[0] == index]
+        translation: dict[str, int] = {INSTANCE_NAMES[edge[1]]: k for k, edge in enumerate(successors)}
+        translation["data_transfer_during_execution_gb"] = len(successors)
+        at_region = {}
+        for region in REGIONS[:2]:
+            durations = [round(sample(0.5, 2.0), 2) for _ in range(n_values)]
+            auxiliary_data = {
+                _duration_key(duration): [
+                    [sample(0.1, duration) for _ in successors] + [sample(1e-5, 1e-3)] for _ in range(n_values)
+                ]
+                for duration in durations
+            }
+            at_region[region] = {"durations_s": durations, "auxiliary_data": auxiliary_data}
+        to_instance = {}
+        for edge in successors:
+            sizes = [sample(1e-6, 5e-5) for _ in range(n_values)]
+            regions_to_regions = {
+                from_region: {
+                    to_region: {
+                        "transfer_size_gb_to_transfer_latencies_s": {
+                            _size_key(size): [sample(0.05, 0.5) for _ in range(n_values)] for size in sizes
+                        }
+                    }
+                    for to_region in REGIONS[:2]
+                }
+                for from_region in REGIONS[:2]
+            }
+            entry: dict[str, Any] = {
+                "transfer_sizes_gb": sizes,
+                "invocation_probability": 1.0 if deterministic else edge[2],
+                "regions_to_regions": regions_to_regions,
+            }
+            if edge[1] == 3:
+                entry["sync_sizes_gb"] = sample(1e-6, 1e-5)
+                entry["sns_only_sizes_gb"] = sample(1e-6, 1e-5)
+            to_instance[INSTANCE_NAMES[edge[1]]] = entry
+        instance_summary[instance_name] = {
+            "cpu_utilization": 0.3,
+            "executions": {"at_region": at_region, "auxiliary_index_translation": translation},
+            "to_instance": to_instance,
+        }
+
+    # Redirector to start hop transfers
+    sizes = [sample(1e-6, 5e-5) for _ in range(n_values)]
+    instance_summary[INSTANCE_NAMES[0]]["to_instance"][INSTANCE_NAMES[0]] = {
+        "transfer_sizes_gb": sizes,
+        "regions_to_regions": {
+            HOME_REGION: {
+                to_region: {"transfer_size_gb_to_transfer_latencies_s": {_size_key(size): [0.1] for size in sizes}}
+                for to_region in REGIONS[:2]
+            }
+        },
+    }
+    non_execution_info = {"sync_data_response_size_gb": 2e-6, "sns_transfer_size_gb": 3e-6}
+    instance_summary[INSTANCE_NAMES[0]]["to_instance"][INSTANCE_NAMES[1]]["non_execution_info"] = {
+        f"{INSTANCE_NAMES[2]}>{INSTANCE_NAMES[3]}": non_execution_info
+    }
+    instance_summary[INSTANCE_NAMES[0]]["to_instance"][INSTANCE_NAMES[2]]["non_execution_info"] = {
+        f"{INSTANCE_NAMES[1]}>{INSTANCE_NAMES[3]}": non_execution_info
+    }
+
+    redirector_durations = [0.05] if deterministic else [0.05, 0.07]
+    return {
+        "start_hop_summary": {
+            "workflow_placement_decision_size_gb": 2e-6,
+            "wpd_at_function_probability": 1.0 if deterministic else 0.7,
+            "at_redirector": {
+                INSTANCE_NAMES[0]: {
+                    "cpu_utilization": 0.2,
+                    "executions": {
+                        "at_region": {
+                            HOME_REGION: {
+                                "durations_s": redirector_durations,
+                                "auxiliary_data": {
+                                    _duration_key(duration): [[duration * 0.9, 1e-5]]
+                                    for duration in redirector_durations
+                                },
+                            }
+                        },
+                        "auxiliary_index_translation": {INSTANCE_NAMES[0]: 0, "data_transfer_during_execution_gb": 1},
+                    },
+                }
+            },
+            "from_client": {"transfer_sizes_gb": [1e-6] if deterministic else [1e-6, 2e-6], "received_region": {}},
+        },
+        "instance_summary": instance_summary,
+    }
+
+
+def _build_input_manager(
+    deterministic: bool,
+) -> tuple[MagicMock, InputManager, RegionIndexer, InstanceIndexer]:
+    workflow_data = _build_workflow_data(deterministic)
+    carbon_data = {
+        region: {"averages": {"overall": {"carbon_intensity": 100 + 100 * k}, "3": {"carbon_intensity": 50 + 70 * k}}}
+        for k, region in enumerate(REGIONS)
+    }
+    provider_data = {
+        region: {
+            "pue": 1.1 + 0.05 * k,
+            "cfe": 0.1,
+            "transmission_cost": {"provider_data_transfer": 0.02 + 0.01 * k},
+            "sns_cost": {"sns_cost": 5e-7},
+            "dynamodb_cost": {"read_cost": 2.5e-7, "write_cost": 1.25e-6},
+        }
+        for k, region in enumerate(REGIONS)
+    }
+    performance_data = {
+        region: {
+            "relative_performance": 1.0 + 0.1 * k,
+            "transmission_latency": {
+                other: {"latency_distribution": [0.05 + 0.02 * k + 0.01 * j]} for j, other in enumerate(REGIONS)
+            },
+        }
+        for k, region in enumerate(REGIONS)
+    }
+    tables = {
+        CARBON_REGION_TABLE: carbon_data,
+        PERFORMANCE_REGION_TABLE: performance_data,
+        PROVIDER_REGION_TABLE: provider_data,
+    }
+
+    def get_value_from_table(table_name: str, key: str) -> tuple[Any, float]:
+        if table_name == WORKFLOW_INSTANCE_TABLE:
+            return json.dumps(workflow_data), 0.0
+        if table_name in tables:
+            return json.dumps(tables[table_name].get(key, {})), 0.0
+        return None, 0.0
+
+    def get_values_from_table(table_name: str, keys: list[str]) -> dict[str, str]:
+        return {key: json.dumps(tables[table_name][key]) for key in keys if key in tables.get(table_name, {})}
+
+    client = MagicMock()
+    client.get_value_from_table.side_effect = get_value_from_table
+    client.get_values_from_table.side_effect = get_values_from_table
+    client.get_keys.return_value = REGIONS
+
+    workflow_config = MagicMock()
+    workflow_config.workflow_id = "wf"
+    workflow_config.home_region = HOME_REGION
+    workflow_config.instances = {
+        instance_name: {
+            "instance_name": instance_name,
+            "succeeding_instances": [INSTANCE_NAMES[edge[1]] for edge in EDGES if edge[0] == index],
+            "preceding_instances": [],
+            "regions_and_providers": {"providers": {"aws": {"config": {"memory": 1024}}}},
+        }
+        for index, instance_name in enumerate(INSTANCE_NAMES)
+    }
+    with patch("caribou.deployment_solver.deployment_input.input_manager.Endpoints") as mock_endpoints:
+        mock_endpoints.return_value.get_data_collector_client.return_value = client
+        input_manager = InputManager(workflow_config)
+    region_indexer = RegionIndexer(REGIONS)
+    instance_indexer = InstanceIndexer(list(workflow_config.instances.values()))
+    input_manager.setup(region_indexer, instance_indexer)
+    return workflow_config, input_manager, region_indexer, instance_indexer
+
+
+class TestVectorizedDeploymentMetricsCalculator(unittest.TestCase):
+    deployments = [[0, 0, 0, 0], [1, 1, 1, 1], [1, 0, 1, 0], [0, 1, 2, 1]]
+
+    def _build_calculators(
+        self, deterministic: bool, n_samples: int = 2000
+    ) -> tuple[SimpleDeploymentMetricsCalculator, VectorizedDeploymentMetricsCalculator]:
+        workflow_config, input_manager, region_indexer, instance_indexer = _build_input_manager(deterministic)
+        simple_calculator = SimpleDeploymentMetricsCalculator(
+            workflow_config,
+            input_manager,
+            region_indexer,
+            instance_indexer,
+            n_processes=1,
+            record_transmission_execution_carbon=True,
+        )
+        vectorized_calculator = VectorizedDeploymentMetricsCalculator(
+            workflow_config,
+            input_manager,
+            region_indexer,
+            instance_indexer,
+            record_transmission_execution_carbon=True,
+            n_samples=n_samples,
+        )
+        return simple_calculator, vectorized_calculator
+
+    def test_matches_simple_calculator_on_deterministic_inputs(self):
+        for deployment in self.deployments:
+            # Fresh calculators per deployment, as the simple calculator caches the execution
+            # conversion ratio per instance and region regardless of the redirector flag.
+            simple_calculator, vectorized_calculator = self._build_calculators(deterministic=True, n_samples=50)
+            expected = simple_calculator.calculate_deployment_metrics(deployment)
+            result = vectorized_calculator.calculate_deployment_metrics(deployment)
+            self.assertEqual(set(expected.keys()), set(result.keys()))
+            for key, value in expected.items():
+                self.assertAlmostEqual(result[key], value, delta=abs(value) * 1e-9, msg=f"{deployment} {key}")
+
+    def test_matches_simple_calculator_on_stochastic_inputs(self):
+        simple_calculator, vectorized_calculator = self._build_calculators(deterministic=False, n_samples=20000)
+
+        for deployment in self.deployments:
+            expected = simple_calculator.calculate_deployment_metrics(deployment)
+            result = vectorized_calculator.calculate_deployment_metrics(deployment)
+            for key in ("average_cost", "average_runtime", "average_carbon"):
+                self.assertAlmostEqual(result[key], expected[key], delta=abs(expected[key]) * 0.1)
+
+    def test_common_random_numbers(self):
+        simple_calculator, vectorized_calculator = self._build_calculators(deterministic=False, n_samples=200)
+
+        for calculator in (simple_calculator, vectorized_calculator):
+            first_result = calculator.calculate_deployment_metrics([0, 0, 0, 0])
+            calculator.calculate_deployment_metrics([1, 1, 1, 1])
+            # Every deployment is simulated with the same random draws
+            self.assertEqual(calculator.calculate_deployment_metrics([0, 0, 0, 0]), first_result)
+
+    def test_incremental_resimulation(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=False, n_samples=200)
+        full_results = []
+        for deployment in self.deployments:
+            vectorized_calculator._previous_simulation = None
+            full_results.append(vectorized_calculator.calculate_deployment_metrics(deployment))
+
+        # Only re-simulating the nodes affected by the moved instances gives the same results
+        for deployment, full_result in zip(self.deployments, full_results):
+            self.assertEqual(vectorized_calculator.calculate_deployment_metrics(deployment), full_result)
+
+    def test_incremental_resimulation_of_downstream_nodes(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=False, n_samples=10)
+        vectorized_calculator.calculate_deployment_metrics([0, 0, 0, 0])
+
+        with patch.object(
+            vectorized_calculator, "_simulate_node", wraps=vectorized_calculator._simulate_node
+        ) as mock_simulate_node:
+            # Only the moved instance and its successors are simulated again
+            vectorized_calculator.calculate_deployment_metrics([0, 0, 1, 0])
+            self.assertEqual([call.args[0] for call in mock_simulate_node.call_args_list], [2, 3])
+
+            # The non-executed edges of the branches write to the sync table in the region of the sync node
+            mock_simulate_node.reset_mock()
+            vectorized_calculator.calculate_deployment_metrics([0, 0, 1, 1])
+            self.assertEqual([call.args[0] for call in mock_simulate_node.call_args_list], [1, 2, 3])
+
+    def test_update_data_for_new_hour(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=True, n_samples=10)
+        deployment = [1, 0, 1, 0]
+
+        overall = vectorized_calculator.calculate_deployment_metrics(deployment)
+        vectorized_calculator._input_manager.alter_carbon_setting("3")
+        vectorized_calculator.update_data_for_new_hour("3")
+        hourly = vectorized_calculator.calculate_deployment_metrics(deployment)
+
+        self.assertEqual(overall["average_cost"], hourly["average_cost"])
+        self.assertEqual(overall["average_runtime"], hourly["average_runtime"])
+        self.assertLess(hourly["average_carbon"], overall["average_carbon"])
+
+    def test_calculate_hourly_deployment_metrics(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=True, n_samples=10)
+        deployment = [1, 0, 1, 0]
+
+        hourly_metrics = vectorized_calculator.calculate_hourly_deployment_metrics(deployment, [None, "3"])
+        single_hour_metrics = vectorized_calculator.calculate_deployment_metrics(deployment)
+
+        self.assertEqual(set(hourly_metrics.keys()), {None, "3"})
+        self.assertEqual(hourly_metrics[None]["average_cost"], hourly_metrics["3"]["average_cost"])
+        self.assertEqual(hourly_metrics[None]["average_runtime"], hourly_metrics["3"]["average_runtime"])
+        self.assertLess(hourly_metrics["3"]["average_carbon"], hourly_metrics[None]["average_carbon"])
+        self.assertAlmostEqual(hourly_metrics[None]["average_carbon"], single_hour_metrics["average_carbon"])
+
+    def test_simulate_samples(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=False)
+
+        samples = vectorized_calculator.simulate_samples([0, 0, 0, 0], 100)
+
+        self.assertEqual(set(samples.keys()), {"cost", "runtime", "execution_carbon", "transmission_carbon"})
+        for values in samples.values():
+            self.assertEqual(values.shape, (100,))
+
+    def test_matches_on_inputs_loaded_from_snapshot(self):
+        workflow_config, input_manager, region_indexer, instance_indexer = _build_input_manager(deterministic=True)
+        directory = tempfile.mkdtemp()
+        try:
+            snapshot_path = os.path.join(directory, "solver_inputs.snapshot")
+            input_manager.save_snapshot(snapshot_path)
+            # Saving a snapshot does not change how the input manager itself is pickled
+            self.assertIsNone(input_manager._snapshot_path)
+            with patch("caribou.deployment_solver.deployment_input.input_manager.Endpoints") as mock_endpoints:
+                snapshot_input_manager = InputManager(workflow_config, snapshot_path=snapshot_path)
+                # A pickled input manager loaded from a snapshot is loaded from the snapshot again
+                unpickled_input_manager = InputManager.__new__(InputManager)
+                unpickled_input_manager.__setstate__(snapshot_input_manager.__getstate__())
+                mock_endpoints.assert_not_called()
+
+            self.assertEqual(snapshot_input_manager.to_dict(), input_manager.to_dict())
+            for loaded_input_manager in (snapshot_input_manager, unpickled_input_manager):
+                vectorized_calculator = VectorizedDeploymentMetricsCalculator(
+                    workflow_config, input_manager, region_indexer, instance_indexer, n_samples=10
+                )
+                loaded_calculator = VectorizedDeploymentMetricsCalculator(
+                    workflow_config, loaded_input_manager, region_indexer, instance_indexer, n_samples=10
+                )
+                for deployment in self.deployments:
+                    self.assertEqual(
+                        loaded_calculator.calculate_deployment_metrics(deployment),
+                        vectorized_calculator.calculate_deployment_metrics(deployment),
+                    )
+        finally:
+            shutil.rmtree(directory)
+
+    def test_multiple_start_hops_raise(self):
+        _, vectorized_calculator = self._build_calculators(deterministic=True, n_samples=10)
+        vectorized_calculator._prerequisites_dictionary[1] = []
+
+        with self.assertRaises(ValueError):
+            vectorized_calculator._compile_workflow_structure()
+
+
+if __name__ == "__main__":
+    unittest.main()
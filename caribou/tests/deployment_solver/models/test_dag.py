@@ -5,19 +5,36 @@ from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
 import numpy as np
 
 
+def create_dag(num_nodes: int, edges: list[tuple[int, int]]) -> DAG:
+    instances = [
+        {
+            "instance_name": f"node{index}",
+            "succeeding_instances": [f"node{to_index}" for from_index, to_index in edges if from_index == index],
+            "preceding_instances": [f"node{from_index}" for from_index, to_index in edges if to_index == index],
+        }
+        for index in range(num_nodes)
+    ]
+    return DAG(instances, InstanceIndexer(instances))
+
+
 class TestDAG(unittest.TestCase):
-    @patch.object(DAG, "__init__", return_value=None)
-    def setUp(self, mock_init):
-        self.dag = DAG()
-        self.dag._value_indices = {"node1": 0, "node2": 1}
-        self.dag._adj_matrix = np.zeros((2, 2), dtype=int)
+    def setUp(self):
+        self.dag = create_dag(3, [(0, 1), (1, 2)])
 
     def test_add_edge(self):
+        # Arrange
+        dag = create_dag(2, [])
+
         # Act
-        self.dag._add_edge("node1", "node2")
+        dag._add_edge("node0", "node1")
+        dag._add_edge("node0", "node1")
+        dag._add_edge("node0", "unknown")
+        dag._build_adjacency()
 
         # Assert
-        self.assertEqual(self.dag._adj_matrix[0, 1], 1)
+        self.assertEqual(dag.get_successors(0), [1])
+        self.assertEqual(dag.get_predecessors(1), [0])
+        self.assertEqual(dag.number_of_edges, 1)
 
     @patch.object(DAG, "_add_edge")
     def test_init(self, mock_add_edge):
@@ -46,11 +63,17 @@ class TestDAG(unittest.TestCase):
         self.assertEqual(dag._value_indices, {"instance1": 0, "instance2": 1})
         mock_add_edge.assert_called_once_with("instance1", "instance2")
 
-    def test_topological_sort(self):
+    def test_init_csr(self):
         # Arrange
-        self.dag._num_nodes = 3
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [0, 0, 0]])
+        dag = create_dag(4, [(0, 2), (0, 1), (1, 3), (2, 3)])
 
+        # Assert
+        np.testing.assert_array_equal(dag._successor_offsets, [0, 2, 3, 4, 4])
+        np.testing.assert_array_equal(dag._successor_indices, [1, 2, 3, 3])
+        np.testing.assert_array_equal(dag._predecessor_offsets, [0, 0, 1, 2, 4])
+        np.testing.assert_array_equal(dag._predecessor_indices, [0, 0, 1, 2])
+
+    def test_topological_sort(self):
         # Act
         result = self.dag.topological_sort()
 
@@ -59,30 +82,45 @@ class TestDAG(unittest.TestCase):
 
     def test_topological_sort_with_cycle(self):
         # Arrange
-        self.dag._num_nodes = 3
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+        dag = create_dag(3, [(0, 1), (1, 2), (2, 0)])
 
         # Act & Assert
         with self.assertRaises(ValueError):
-            self.dag.topological_sort()
+            dag.topological_sort()
 
     def test_get_preceeding_dict(self):
         # Arrange
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+        dag = create_dag(3, [(0, 1), (1, 2), (2, 0)])
 
         # Act
-        result = self.dag.get_preceeding_dict()
+        result = dag.get_preceeding_dict()
 
         # Assert
         self.assertEqual(result, {0: [1], 1: [2], 2: [0]})
 
-    def test_get_leaf_nodes(self):
+    def test_get_descendants(self):
         # Arrange
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [0, 0, 0]])
-        self.dag._num_nodes = 3
-        self.dag._nodes = [{"instance_name": "node1"}, {"instance_name": "node2"}, {"instance_name": "node3"}]
-        self.dag._value_indices = {"node1": 0, "node2": 1, "node3": 2}
+        dag = create_dag(5, [(0, 1), (0, 2), (1, 3), (2, 3), (3, 4)])
+
+        # Act & Assert
+        self.assertEqual(dag.get_descendants_bitset(0), 0b11110)
+        self.assertEqual(dag.get_descendants_bitset(2), 0b11000)
+        self.assertEqual(dag.get_descendants_bitset(4), 0)
+        self.assertEqual(dag.get_downstream_bitset([1, 2]), 0b11110)
+        self.assertEqual(dag.get_downstream_bitset([]), 0)
 
+    def test_large_fan_out(self):
+        # Arrange
+        num_nodes = 500
+        dag = create_dag(num_nodes, [(0, index) for index in range(1, num_nodes)])
+
+        # Act & Assert
+        self.assertEqual(dag.topological_sort(), list(range(num_nodes)))
+        self.assertEqual(dag.get_descendants_bitset(0), (1 << num_nodes) - 2)
+        self.assertEqual(dag.get_downstream_bitset([num_nodes - 1]), 1 << (num_nodes - 1))
+        self.assertEqual(dag.get_leaf_nodes(), list(range(1, num_nodes)))
+
+    def test_get_leaf_nodes(self):
         # Act
         result = self.dag.get_leaf_nodes()
 
@@ -94,44 +132,38 @@ class TestDAG(unittest.TestCase):
         result = self.dag.get_adj_matrix()
 
         # Assert
-        np.testing.assert_array_equal(result, self.dag._adj_matrix)
+        np.testing.assert_array_equal(result, np.array([[0, 1, 0], [0, 0, 1], [0, 0, 0]]))
 
     def test_num_nodes(self):
-        # Arrange
-        self.dag._num_nodes = 3
-
         # Act
         result = self.dag.num_nodes
 
         # Assert
-        self.assertEqual(result, self.dag._num_nodes)
+        self.assertEqual(result, 3)
 
     def test_nodes(self):
-        # Arrange
-        self.dag._nodes = [1, 2, 3]
-
         # Act
         result = self.dag.nodes
 
         # Assert
-        self.assertEqual(result, self.dag._nodes)
+        self.assertEqual(result, [{"instance_name": "node0"}, {"instance_name": "node1"}, {"instance_name": "node2"}])
 
     def test_number_of_edges(self):
         # Arrange
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+        dag = create_dag(3, [(0, 1), (1, 2), (2, 0)])
 
         # Act
-        result = self.dag.number_of_edges
+        result = dag.number_of_edges
 
         # Assert
         self.assertEqual(result, 3)
 
     def test_get_prerequisites_dict(self):
         # Arrange
-        self.dag._adj_matrix = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+        dag = create_dag(3, [(0, 1), (1, 2), (2, 0)])
 
         # Act
-        result = self.dag.get_prerequisites_dict()
+        result = dag.get_prerequisites_dict()
 
         # Assert
         self.assertEqual(result, {0: [2], 1: [0], 2: [1]})
@@ -0,0 +1,51 @@
+import unittest
+
+from caribou.deployment_solver.models.deployment_metrics_cache import DeploymentMetricsCache
+
+
+class TestDeploymentMetricsCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = DeploymentMetricsCache(2)
+
+    def test_init_invalid_size(self):
+        with self.assertRaises(ValueError):
+            DeploymentMetricsCache(0)
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get([0, 1], None))
+
+        self.cache.put([0, 1], None, {"average_cost": 1.0})
+
+        self.assertEqual(self.cache.get((0, 1), None), {"average_cost": 1.0})
+        self.assertEqual(self.cache.get_statistics(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_keyed_by_hour(self):
+        self.cache.put([0, 1], "1", {"average_carbon": 1.0})
+
+        self.assertIsNone(self.cache.get([0, 1], "2"))
+        self.assertIsNone(self.cache.get([0, 1], None))
+        self.assertEqual(self.cache.get([0, 1], "1"), {"average_carbon": 1.0})
+
+    def test_least_recently_used_eviction(self):
+        self.cache.put([0], None, {"average_cost": 0.0})
+        self.cache.put([1], None, {"average_cost": 1.0})
+        # Accessing [0] makes [1] the least recently used entry
+        self.cache.get([0], None)
+
+        self.cache.put([2], None, {"average_cost": 2.0})
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get([1], None))
+        self.assertEqual(self.cache.get([0], None), {"average_cost": 0.0})
+        self.assertEqual(self.cache.get([2], None), {"average_cost": 2.0})
+
+    def test_items(self):
+        self.cache.put([0], "1", {"average_cost": 0.0})
+        self.cache.put([1], None, {"average_cost": 1.0})
+        self.cache.get([0], "1")
+
+        self.assertEqual(self.cache.items(), [((1,), None, {"average_cost": 1.0}), ((0,), "1", {"average_cost": 0.0})])
+
+
+if __name__ == "__main__":
+    unittest.main()
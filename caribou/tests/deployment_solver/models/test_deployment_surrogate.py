@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock
+
+from caribou.deployment_solver.models.deployment_surrogate import DeploymentSurrogate
+from caribou.deployment_solver.models.instance_indexer import InstanceIndexer
+
+
+class TestDeploymentSurrogate(unittest.TestCase):
+    def setUp(self):
+        # Workflow a -> b, where b is invoked half of the time
+        instances = [
+            {"instance_name": "a", "succeeding_instances": ["b"], "preceding_instances": []},
+            {"instance_name": "b", "succeeding_instances": [], "preceding_instances": ["a"]},
+        ]
+        workflow_config = MagicMock()
+        workflow_config.instances = {instance["instance_name"]: instance for instance in instances}
+
+        self.input_manager = MagicMock()
+        self.input_manager.get_invocation_probability.return_value = 0.5
+        self.input_manager.get_carbon_calculator_settings.return_value = {
+            "energy_factor": 0.1,
+            "carbon_free_intra_region_transmission": True,
+        }
+        self.input_manager.get_node_runtime_distribution.side_effect = lambda instance, region, is_redirector: {
+            "runtimes": [1.0, 3.0],
+            "relative_performance": region + 1.0,
+        }
+        self.input_manager.get_execution_factors.return_value = {
+            "cost_per_second": 1.0,
+            "invocation_cost": 0.5,
+            "energy_factor": 2.0,
+        }
+        self.input_manager.get_transmission_distributions.return_value = ([1.0, 3.0], [[0.1], [0.3]])
+        self.input_manager.get_region_cost_factors.return_value = {"transmission_cost": 0.25}
+        self.input_manager.get_grid_carbon_intensity.side_effect = lambda region, hour: 100.0 * (region + 1)
+
+        self.surrogate = DeploymentSurrogate(workflow_config, self.input_manager, InstanceIndexer(instances))
+
+    def test_init(self):
+        self.assertEqual(self.surrogate._invocation_probabilities, {0: 1.0, 1: 0.5})
+        self.assertEqual(self.surrogate._edge_probabilities, {(0, 1): 0.5})
+
+    def test_predict_same_region(self):
+        result = self.surrogate.predict([0, 0])
+
+        # Execution time of 2 per instance, client and edge latencies of 0.2
+        self.assertAlmostEqual(result["average_runtime"], 4.4)
+        # The intra region transmission is free of egress cost and carbon
+        self.assertAlmostEqual(result["average_cost"], 2.5 + 0.5 * 2.5)
+        self.assertAlmostEqual(result["average_carbon"], 400.0 + 0.5 * 400.0)
+
+    def test_predict_across_regions(self):
+        result = self.surrogate.predict([0, 1])
+
+        self.assertAlmostEqual(result["average_runtime"], 0.2 + 2.0 + 0.2 + 4.0)
+        # Half of the expected 2 GB is transmitted out of region 0 and into region 1
+        self.assertAlmostEqual(result["average_cost"], 2.5 + 0.5 * 4.5 + 1.0 * 0.25)
+        self.assertAlmostEqual(result["average_carbon"], 400.0 + 0.5 * 1600.0 + 1.0 * 0.1 * 200.0)
+
+    def test_predict_fits_terms_once(self):
+        self.surrogate.predict([0, 1])
+        self.surrogate.predict([0, 1])
+
+        self.assertEqual(self.input_manager.get_node_runtime_distribution.call_count, 2)
+        self.assertEqual(self.input_manager.get_transmission_distributions.call_count, 2)
+
+    def test_update_data_for_new_hour(self):
+        self.surrogate.predict([0, 0])
+
+        self.surrogate.update_data_for_new_hour("3")
+        self.surrogate.predict([0, 0])
+
+        self.input_manager.get_grid_carbon_intensity.assert_called_with(0, "3")
+        self.assertEqual(self.input_manager.get_node_runtime_distribution.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from caribou.deployment_solver.models.pareto_archive import ParetoArchive, get_dominance_matrix
+
+
+def metrics(cost, runtime, carbon):
+    return {"average_cost": cost, "average_runtime": runtime, "average_carbon": carbon}
+
+
+class TestParetoArchive(unittest.TestCase):
+    def setUp(self):
+        self.archive = ParetoArchive()
+
+    def test_get_dominance_matrix(self):
+        first_points = np.array([[1.0, 1.0], [2.0, 0.0]])
+        second_points = np.array([[1.0, 2.0], [1.0, 1.0], [3.0, 0.0]])
+
+        np.testing.assert_array_equal(
+            get_dominance_matrix(first_points, second_points),
+            # A point does not dominate an equal point
+            [[True, False, False], [False, False, True]],
+        )
+
+    def test_add(self):
+        self.archive.add(
+            [
+                ([0], metrics(1.0, 1.0, 1.0)),
+                ([1], metrics(2.0, 2.0, 2.0)),
+                ([2], metrics(0.5, 3.0, 1.0)),
+            ]
+        )
+
+        self.assertEqual(self.archive.get_frontier(), [([0], metrics(1.0, 1.0, 1.0)), ([2], metrics(0.5, 3.0, 1.0))])
+
+    def test_add_removes_dominated_frontier(self):
+        self.archive.add([([0], metrics(1.0, 1.0, 1.0)), ([1], metrics(0.5, 3.0, 1.0))])
+
+        self.archive.add([([2], metrics(1.0, 1.0, 0.5))])
+
+        self.assertEqual(self.archive.get_frontier(), [([1], metrics(0.5, 3.0, 1.0)), ([2], metrics(1.0, 1.0, 0.5))])
+
+    def test_add_known_deployment(self):
+        self.archive.add([([0], metrics(1.0, 1.0, 1.0))])
+        self.archive.add([([0], metrics(1.0, 1.0, 1.0)), ([1], metrics(1.0, 1.0, 1.0))])
+
+        # Equal metrics of different deployments are both kept, but a deployment is only kept once
+        self.assertEqual(len(self.archive), 2)
+
+    @patch("caribou.deployment_solver.models.pareto_archive.PARETO_ARCHIVE_CHUNK_SIZE", 3)
+    def test_add_in_chunks(self):
+        random_generator = np.random.default_rng(0)
+        points = random_generator.random((50, 3))
+
+        self.archive.add([([index], metrics(*point)) for index, point in enumerate(points)])
+
+        expected_frontier = [
+            index
+            for index, point in enumerate(points)
+            if not any(np.all(other <= point) and np.any(other < point) for other in points)
+        ]
+        self.assertEqual(sorted(deployment[0] for deployment, _ in self.archive.get_frontier()), expected_frontier)
+
+
+if __name__ == "__main__":
+    unittest.main()
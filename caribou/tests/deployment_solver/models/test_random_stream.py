@@ -0,0 +1,62 @@
+import unittest
+
+from caribou.deployment_solver.models.random_stream import RandomStream
+
+
+class TestRandomStream(unittest.TestCase):
+    def test_seeded_streams_are_reproducible(self):
+        first_stream = RandomStream(42)
+        second_stream = RandomStream(42)
+
+        self.assertEqual([first_stream.random() for _ in range(5)], [second_stream.random() for _ in range(5)])
+        self.assertEqual(first_stream.generator.random(5).tolist(), second_stream.generator.random(5).tolist())
+
+    def test_reset_replays_the_draws(self):
+        stream = RandomStream(42)
+        draws = [stream.random() for _ in range(5)]
+        generator_draws = stream.generator.random(5).tolist()
+
+        stream.reset()
+
+        self.assertEqual([stream.random() for _ in range(5)], draws)
+        self.assertEqual(stream.generator.random(5).tolist(), generator_draws)
+
+    def test_substreams_are_independent(self):
+        stream = RandomStream(42)
+        draws = [stream.random() for _ in range(5)]
+
+        stream.reset(1)
+
+        self.assertNotEqual([stream.random() for _ in range(5)], draws)
+
+    def test_generator_for_key(self):
+        stream = RandomStream(42)
+        draws = stream.generator_for(3).random(5).tolist()
+
+        # The draws of a key do not depend on the draws made for other keys
+        stream.generator_for(1).random(100)
+        self.assertEqual(stream.generator_for(3).random(5).tolist(), draws)
+        self.assertNotEqual(stream.generator_for(1).random(5).tolist(), draws)
+
+    def test_set_state_continues_substream(self):
+        stream = RandomStream(42)
+        stream.reset(1)
+        draws = [stream.random() for _ in range(4)]
+        stream.reset(1)
+        stream.random()
+        stream.random()
+        state = stream.get_state()
+
+        stream.reset(2)
+        stream.random()
+        stream.set_state(state)
+
+        self.assertEqual(stream.substream, 1)
+        self.assertEqual([stream.random() for _ in range(2)], draws[2:])
+
+    def test_unseeded_streams_differ(self):
+        self.assertNotEqual(RandomStream().seed, RandomStream().seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from caribou.deployment_solver.models.solver_instrumentation import SolverInstrumentation
+
+
+class TestSolverInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = SolverInstrumentation()
+
+    @patch("caribou.deployment_solver.models.solver_instrumentation.time.perf_counter")
+    def test_time_phase(self, mock_perf_counter):
+        mock_perf_counter.side_effect = [0.0, 1.0, 10.0, 10.5, 11.0, 13.0]
+
+        with self.instrumentation.time_phase("search"):
+            pass
+        with self.instrumentation.time_phase("search"):
+            with self.instrumentation.time_phase("simulation"):
+                pass
+
+        self.assertEqual(
+            self.instrumentation.get_summary()["phases"],
+            {"search": {"seconds": 4.0, "calls": 2}, "simulation": {"seconds": 0.5, "calls": 1}},
+        )
+
+    def test_time_phase_with_exception(self):
+        with self.assertRaises(ValueError):
+            with self.instrumentation.time_phase("search"):
+                raise ValueError("Failed search")
+
+        # The time up to the exception is still recorded
+        self.assertEqual(self.instrumentation.get_summary()["phases"]["search"]["calls"], 1)
+
+    def test_increment(self):
+        self.instrumentation.increment("simulated_deployments", 16)
+        self.instrumentation.increment("simulated_deployments", 4)
+        self.instrumentation.increment("solved_hours")
+
+        self.assertEqual(
+            self.instrumentation.get_summary()["counters"], {"simulated_deployments": 20, "solved_hours": 1}
+        )
+
+    def test_merge(self):
+        other_instrumentation = SolverInstrumentation()
+        other_instrumentation.increment("solved_hours", 2)
+        with other_instrumentation.time_phase("search"):
+            pass
+        self.instrumentation.increment("solved_hours")
+        with self.instrumentation.time_phase("search"):
+            pass
+
+        self.instrumentation.merge(other_instrumentation.get_summary())
+
+        summary = self.instrumentation.get_summary()
+        self.assertEqual(summary["counters"], {"solved_hours": 3})
+        self.assertEqual(summary["phases"]["search"]["calls"], 2)
+
+    def test_get_summary_without_profile(self):
+        self.instrumentation.start_profiling()
+        self.instrumentation.stop_profiling()
+
+        self.assertNotIn("profile", self.instrumentation.get_summary())
+
+    @patch("caribou.deployment_solver.models.solver_instrumentation.SOLVER_PROFILE_OUTPUT_SIZE", 3)
+    def test_get_summary_with_profile(self):
+        instrumentation = SolverInstrumentation(profile=True)
+
+        instrumentation.start_profiling()
+        sorted(range(1000), key=lambda value: -value)
+        instrumentation.stop_profiling()
+
+        profile = instrumentation.get_summary()["profile"]
+        self.assertEqual(len(profile), 3)
+        # The functions are ordered by their cumulative time
+        cumulative_seconds = [function_stats["cumulative_seconds"] for function_stats in profile]
+        self.assertEqual(cumulative_seconds, sorted(cumulative_seconds, reverse=True))
+        # The summary is uploaded and logged as JSON
+        json.dumps(instrumentation.get_summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -105,6 +105,42 @@ class TestWorkflowConfig(unittest.TestCase):
         # Assert that the result matches the expected result
         self.assertEqual(result, expected_result)
 
+    def test_genetic_deployment_algorithm(self):
+        workflow_config = WorkflowConfig(
+            {**self.workflow_config_dict, "deployment_algorithm": "genetic_deployment_algorithm"}
+        )
+
+        self.assertEqual(workflow_config.deployment_algorithm, "genetic_deployment_algorithm")
+
+    def test_invalid_deployment_algorithm(self):
+        with self.assertRaises(ValueError):
+            WorkflowConfig({**self.workflow_config_dict, "deployment_algorithm": "unknown_deployment_algorithm"})
+
+    def test_deployment_algorithm_options(self):
+        workflow_config = WorkflowConfig(
+            {
+                **self.workflow_config_dict,
+                "deployment_algorithm": "fine_grained_deployment_algorithm",
+                "deployment_algorithm_options": {"branch_and_bound": True, "n_hour_processes": 4},
+            }
+        )
+
+        self.assertEqual(
+            workflow_config.deployment_algorithm_options, {"branch_and_bound": True, "n_hour_processes": 4}
+        )
+        self.assertEqual(WorkflowConfig(self.workflow_config_dict).deployment_algorithm_options, {})
+
+    def test_invalid_deployment_algorithm_options(self):
+        # The coarse grained deployment algorithm has no branch and bound
+        with self.assertRaises(ValueError):
+            WorkflowConfig(
+                {
+                    **self.workflow_config_dict,
+                    "deployment_algorithm": "coarse_grained_deployment_algorithm",
+                    "deployment_algorithm_options": {"branch_and_bound": True},
+                }
+            )
+
     def test_home_region(self):
         self.assertEqual(self.workflow_config.home_region, "provider1:region1")
 
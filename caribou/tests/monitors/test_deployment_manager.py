@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from caribou.monitors.deployment_manager import DeploymentManager
 from caribou.common.constants import (
     DEPLOYMENT_MANAGER_WORKFLOW_INFO_TABLE,
+    DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS,
     TIME_FORMAT,
     DEFAULT_MONITOR_COOLDOWN,
     TIME_FORMAT_DAYS,
@@ -380,6 +381,7 @@ class TestDeploymentManager(unittest.TestCase):
                 "solve_hours": solve_hours,
                 "leftover_tokens": leftover_tokens,
                 "deployment_metrics_calculator_type": self.deployment_manager._deployment_metrics_calculator_type,
+                "continuation": 0,
             },
         )
 
@@ -607,9 +609,81 @@ class TestDeploymentManager(unittest.TestCase):
         # Assert
         mock_calculate_expiry_delta_seconds.assert_called_once_with(leftover_tokens)
         mock_get_workflow_config.assert_called_once_with(workflow_id)
-        mock_run_deployment_algorithm.assert_called_once_with(mock_get_workflow_config.return_value, solve_hours, 3600)
+        mock_run_deployment_algorithm.assert_called_once_with(
+            mock_get_workflow_config.return_value, solve_hours, 3600, True
+        )
         mock_upload_new_workflow_info.assert_called_once_with(leftover_tokens, workflow_id)
 
+    @patch("caribou.monitors.deployment_manager.DeploymentManager._calculate_expiry_delta_seconds")
+    @patch("caribou.monitors.deployment_manager.DeploymentManager._get_workflow_config")
+    @patch("caribou.monitors.deployment_manager.DeploymentManager._run_deployment_algorithm")
+    @patch("caribou.monitors.deployment_manager.DeploymentManager._upload_new_workflow_info")
+    @patch("caribou.monitors.deployment_manager.DeploymentManager.remote_run_deployment_algorithm")
+    def test_run_deployment_algorithm_continuation(
+        self,
+        mock_remote_run_deployment_algorithm,
+        mock_upload_new_workflow_info,
+        mock_run_deployment_algorithm,
+        mock_get_workflow_config,
+        mock_calculate_expiry_delta_seconds,
+    ):
+        # Arrange
+        solve_hours = ["0", "6", "12", "18"]
+        mock_calculate_expiry_delta_seconds.return_value = 3600
+        mock_run_deployment_algorithm.side_effect = lambda workflow_config, hours, expiry, resumable: not resumable
+
+        # Act
+        self.deployment_manager.run_deployment_algorithm("workflow1", solve_hours, 10, 2)
+
+        # Assert
+        # The checkpointed solve is continued in another invocation
+        mock_remote_run_deployment_algorithm.assert_called_once_with("workflow1", solve_hours, 10, 3)
+        mock_upload_new_workflow_info.assert_not_called()
+
+        # Act
+        self.deployment_manager.run_deployment_algorithm(
+            "workflow1", solve_hours, 10, DEPLOYMENT_ALGORITHM_MAX_CONTINUATIONS
+        )
+
+        # Assert
+        # The last continuation is not resumable, so its result is always uploaded
+        self.assertFalse(mock_run_deployment_algorithm.call_args.args[3])
+        mock_remote_run_deployment_algorithm.assert_called_once()
+        mock_upload_new_workflow_info.assert_called_once_with(10, "workflow1")
+
+    @patch("caribou.monitors.deployment_manager.deployment_algorithm_mapping")
+    def test_run_deployment_algorithm_last_invocation(self, mock_deployment_algorithm_mapping):
+        # Arrange
+        self.deployment_manager._deployed_remotely = True
+        workflow_config = MagicMock()
+        workflow_config.deployment_algorithm = "stochastic_heuristic_deployment_algorithm"
+        workflow_config.deployment_algorithm_options = {}
+        deployment_algorithm_class = mock_deployment_algorithm_mapping.get.return_value
+
+        # Act
+        self.deployment_manager._run_deployment_algorithm(workflow_config, ["0"], 3600, resumable=False)
+
+        # Assert
+        # The last invocation continues from the checkpoint, but completes the solve
+        self.assertTrue(deployment_algorithm_class.call_args.kwargs["resumable"])
+        deployment_algorithm_class.return_value.remove_checkpoint.assert_not_called()
+        deployment_algorithm_class.return_value.run.assert_called_once_with(["0"], last_invocation=True)
+
+    @patch("caribou.monitors.deployment_manager.deployment_algorithm_mapping")
+    def test_run_deployment_algorithm_options(self, mock_deployment_algorithm_mapping):
+        # Arrange
+        workflow_config = MagicMock()
+        workflow_config.deployment_algorithm = "stochastic_heuristic_deployment_algorithm"
+        workflow_config.deployment_algorithm_options = {"n_chains": 4, "surrogate_prefilter": True}
+        deployment_algorithm_class = mock_deployment_algorithm_mapping.get.return_value
+
+        # Act
+        self.deployment_manager._run_deployment_algorithm(workflow_config, ["0"], 3600)
+
+        # Assert
+        self.assertEqual(deployment_algorithm_class.call_args.kwargs["n_chains"], 4)
+        self.assertTrue(deployment_algorithm_class.call_args.kwargs["surrogate_prefilter"])
+
     @patch("caribou.monitors.deployment_manager.WorkflowConfig")
     def test_get_workflow_config(self, mock_workflow_config):
         # Arrange